@@ -0,0 +1,68 @@
+"""
+Benchmark: chained pandas analysis vs the fused NumPy pipeline.
+
+Runs both paths over synthetic OHLCV histories and reports the best
+wall time and the peak traced memory of each.
+
+Usage:
+    python benchmarks/bench_analysis_pipeline.py [--bars 2500 100000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import (analyze, calculate_volatility, calculate_technical_indicators,
+                      calculate_seasonal_trends, calculate_volume_analysis)
+from providers import generate_ohlcv
+
+
+def chained(df):
+    df = calculate_volatility(df)
+    df = calculate_technical_indicators(df)
+    trends = calculate_seasonal_trends(df)
+    df, monthly_vol = calculate_volume_analysis(df)
+    return df, trends, monthly_vol
+
+
+def measure(func, df, repeat):
+    func(df)  # warm-up
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, nargs='+', default=[2500, 100_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'bars':>9} {'path':<16} {'time (ms)':>10} {'peak (MB)':>10}")
+    for bars in args.bars:
+        df = generate_ohlcv(seed=1, periods=bars)
+        rows = {
+            'chained pandas': measure(chained, df, args.repeat),
+            'fused float64': measure(analyze, df, args.repeat),
+            'fused float32': measure(lambda d: analyze(d, float32=True), df, args.repeat),
+        }
+        for name, (seconds, peak) in rows.items():
+            print(f"{bars:>9} {name:<16} {seconds * 1e3:>10.2f} {peak / 2**20:>10.2f}")
+        base = rows['chained pandas']
+        fused = rows['fused float64']
+        print(f"{'':>9} speedup x{base[0] / fused[0]:.1f}, peak memory x{base[1] / fused[1]:.1f} lower")
+
+
+if __name__ == '__main__':
+    main()
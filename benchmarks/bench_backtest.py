@@ -0,0 +1,83 @@
+"""
+Benchmark: SMA crossover parameter sweep, pandas loops vs the vectorised backtester.
+
+Backtests a grid of fast/slow SMA windows on a synthetic universe three
+ways: a pandas loop per ticker and combination (timed over a sample of
+tickers and scaled to the universe), `backtest.sweep` in one process,
+and `backtest.sweep` on a process pool that maps the close array from
+shared memory.
+
+Usage:
+    python benchmarks/bench_backtest.py [--tickers 200] [--bars 2500] [--sample 10] [--workers 0] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from backtest import sweep, parameter_grid
+from providers import ReplayProvider
+from universe import UniversePanel
+
+GRID = {'fast': [5, 10, 20, 30, 50], 'slow': [50, 100, 150, 200, 250]}
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def pandas_sweep(frames, combos, cost_bps=10):
+    rows = []
+    for close in frames:
+        for params in combos:
+            signal = (close.rolling(params['fast']).mean() > close.rolling(params['slow']).mean()).astype(float)
+            held = signal.shift().fillna(0)
+            returns = held * close.pct_change().fillna(0) - held.diff().fillna(held).abs() * cost_bps / 1e4
+            equity = (1 + returns).cumprod()
+            rows.append((equity.iloc[-1], (equity / equity.cummax() - 1).min(),
+                         returns.mean() / returns.std() * 252 ** 0.5))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--bars', type=int, default=2500)
+    parser.add_argument('--sample', type=int, default=10, help="tickers timed in the pandas loop")
+    parser.add_argument('--workers', type=int, default=0, help="pool size (0: one per CPU)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tickers = [f"T{i:04d}.NS" for i in range(args.tickers)]
+    data = ReplayProvider().download(tickers, period=f"{args.bars // 250 + 1}y").tail(args.bars)
+    panel = UniversePanel.from_download(data, tickers)
+    combos = parameter_grid('sma_cross', GRID)
+    frames = [data['Adj Close'][ticker] for ticker in tickers[:args.sample]]
+    workers = args.workers or os.cpu_count()
+
+    rows = {
+        'pandas loop': best_of(lambda: pandas_sweep(frames, combos), 1) * args.tickers / len(frames),
+        'vectorised, 1 process': best_of(lambda: sweep(panel, 'sma_cross', GRID, workers=1), args.repeat),
+    }
+    if workers > 1:
+        rows[f'vectorised, {workers} processes'] = best_of(
+            lambda: sweep(panel, 'sma_cross', GRID, workers=workers), args.repeat)
+
+    backtests = args.tickers * len(combos)
+    print(f"{args.tickers} tickers x {len(data)} bars x {len(combos)} combinations = {backtests} backtests, "
+          f"close array {panel['Adj Close'].nbytes / 1e6:.1f} MB in shared memory")
+    print(f"{'path':<26} {'time (s)':>9} {'backtests/s':>12}")
+    for name, seconds in rows.items():
+        print(f"{name:<26} {seconds:>9.2f} {backtests / seconds:>12.0f}")
+    print(f"speedup x{rows['pandas loop'] / min(list(rows.values())[1:]):.0f} vs pandas")
+
+
+if __name__ == '__main__':
+    main()
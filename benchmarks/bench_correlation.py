@@ -0,0 +1,87 @@
+"""
+Benchmark: N x N rolling correlation heatmap for a ticker universe.
+
+Compares, for a synthetic universe (Nifty 50 sized, 10 years by default):
+  * a pandas `rolling().corr()` call per pair of tickers,
+  * pandas' pairwise `DataFrame.rolling().corr()`,
+  * `analysis.rolling_correlation`, which works from cumulative
+    cross-product sums,
+and times the heatmap figure built from the latest date.
+
+Usage:
+    python benchmarks/bench_correlation.py [--tickers 50] [--bars 2500] [--window 60] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import pct_change, rolling_correlation
+from components import create_correlation_heatmap_fast
+from providers import ReplayProvider
+from universe import UniversePanel
+from plotly.io.json import to_json_plotly
+
+
+def best_of(func, repeat):
+    func()  # warm-up
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def pairwise_loop(returns, window):
+    columns = list(returns.columns)
+    out = np.full((len(columns), len(columns), len(returns)), np.nan)
+    for i, a in enumerate(columns):
+        for j in range(i, len(columns)):
+            out[i, j] = out[j, i] = returns[a].rolling(window).corr(returns[columns[j]]).to_numpy()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=50)
+    parser.add_argument('--bars', type=int, default=2500)
+    parser.add_argument('--window', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tickers = [f"T{i:03d}.NS" for i in range(args.tickers)]
+    data = ReplayProvider().download(tickers, period=f"{args.bars // 250 + 1}y").tail(args.bars)
+    panel = UniversePanel.from_download(data, tickers)
+    returns = pct_change(panel['Adj Close'])
+    frame = panel.frame('Adj Close').pct_change()
+
+    fast = rolling_correlation(returns, args.window)
+    reference = pairwise_loop(frame, args.window)
+    error = np.nanmax(np.abs(fast - reference))
+
+    def heatmap():
+        matrix = rolling_correlation(returns, args.window)[..., -1]
+        return to_json_plotly(create_correlation_heatmap_fast(tickers, matrix))
+
+    rows = {
+        'pandas per pair': best_of(lambda: pairwise_loop(frame, args.window), 1),
+        'pandas pairwise': best_of(lambda: frame.rolling(args.window).corr(), 1),
+        'cumulative sums': best_of(lambda: rolling_correlation(returns, args.window), args.repeat),
+        'heatmap (total)': best_of(heatmap, args.repeat),
+    }
+
+    print(f"{len(tickers)} tickers x {len(data)} bars, {args.window}-bar window (max abs diff {error:.1e})")
+    print(f"{'path':<18} {'time (ms)':>10}")
+    for name, seconds in rows.items():
+        print(f"{name:<18} {seconds * 1e3:>10.1f}")
+    print(f"speedup x{rows['pandas per pair'] / rows['cumulative sums']:.0f} vs pandas per pair, "
+          f"x{rows['pandas pairwise'] / rows['cumulative sums']:.0f} vs pandas pairwise")
+
+
+if __name__ == '__main__':
+    main()
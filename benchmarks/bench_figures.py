@@ -0,0 +1,83 @@
+"""
+Benchmark: plotly graph_objects/express figure builders vs the fast dict builders.
+
+Builds every dashboard figure both ways from the same AnalysisResult and
+reports build time, JSON serialisation time (what Dash does with the
+figure afterwards) and payload size.
+
+Usage:
+    python benchmarks/bench_figures.py [--bars 2500] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from plotly.io.json import to_json_plotly
+
+import components
+from analysis import analyze, calculate_sector_performance
+from providers import ReplayProvider, generate_ohlcv
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=2500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    result = analyze(generate_ohlcv(seed=1, periods=args.bars))
+    tickers = ["TCS.NS", "INFY.NS", "WIPRO.NS", "TECHM.NS", "LTIM.NS"]
+    sector = calculate_sector_performance(ReplayProvider().download(tickers, period="5y")['Adj Close'])
+
+    charts = {
+        'main': (lambda: [components.create_main_chart(result)],
+                 lambda: [components.create_main_chart_fast(result)]),
+        'technical': (lambda: components.create_technical_charts(result),
+                      lambda: components.create_technical_charts_fast(result)),
+        'volatility': (lambda: [components.create_volatility_chart(result)],
+                       lambda: [components.create_volatility_chart_fast(result)]),
+        'seasonal': (lambda: components.create_seasonal_charts(result.seasonal),
+                     lambda: components.create_seasonal_charts_fast(result.seasonal)),
+        'volume': (lambda: components.create_volume_chart(result, result.monthly_volume),
+                   lambda: components.create_volume_chart_fast(result, result.monthly_volume)),
+        'sector': (lambda: [components.create_sector_chart(sector)],
+                   lambda: [components.create_sector_chart_fast(sector)]),
+    }
+
+    # Warm up both paths (template loading, plotly validators)
+    for slow, fast in charts.values():
+        slow(), fast()
+
+    print(f"{args.bars} bars, best of {args.repeat}")
+    print(f"{'chart':<11} {'build ms':>9} {'fast ms':>8} {'json ms':>8} {'fast ms':>8} {'KB':>7} {'fast KB':>8}")
+    totals = [0.0] * 6
+    for name, (slow, fast) in charts.items():
+        slow_build, slow_figs = best_of(slow, args.repeat)
+        fast_build, fast_figs = best_of(fast, args.repeat)
+        slow_json, slow_payload = best_of(lambda: [to_json_plotly(f) for f in slow_figs], args.repeat)
+        fast_json, fast_payload = best_of(lambda: [to_json_plotly(f) for f in fast_figs], args.repeat)
+        row = [slow_build * 1e3, fast_build * 1e3, slow_json * 1e3, fast_json * 1e3,
+               sum(map(len, slow_payload)) / 1024, sum(map(len, fast_payload)) / 1024]
+        totals = [t + v for t, v in zip(totals, row)]
+        print(f"{name:<11} {row[0]:>9.2f} {row[1]:>8.2f} {row[2]:>8.2f} {row[3]:>8.2f} {row[4]:>7.0f} {row[5]:>8.0f}")
+    print(f"{'total':<11} {totals[0]:>9.2f} {totals[1]:>8.2f} {totals[2]:>8.2f} {totals[3]:>8.2f} "
+          f"{totals[4]:>7.0f} {totals[5]:>8.0f}")
+    print(f"build speedup x{totals[0] / totals[1]:.1f}, build+serialise speedup "
+          f"x{(totals[0] + totals[2]) / (totals[1] + totals[3]):.1f}")
+
+
+if __name__ == '__main__':
+    main()
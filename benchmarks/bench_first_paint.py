@@ -0,0 +1,103 @@
+"""
+Benchmark: time to first paint of the progressive dashboard.
+
+Replays what a browser does for one ticker: the overview request (metric
+cards and price charts), then the panel requests in parallel once the
+overview has returned its result key. Sources get their own latency, so
+slow news and sector downloads no longer hold back the first paint.
+
+"first paint" is when the overview returns. "complete" is when the last
+panel returns, which is when the single dashboard callback used to show
+anything at all. Cold runs start from empty caches; warm runs repeat the
+request with every stage cached.
+
+Usage:
+    python benchmarks/bench_first_paint.py [--repeat 5] [--news-latency 1.5] [--sector-latency 2.0]
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+os.environ.setdefault('TAPE_REFRESH_INTERVAL', '0')
+
+import data_loader
+from providers import ReplayProvider, set_provider
+
+
+class SlowSourceProvider(ReplayProvider):
+    """Replay provider with a separate latency per kind of request."""
+
+    def __init__(self, prices, sector, info, news):
+        super().__init__()
+        self.latencies = {"prices": prices, "sector": sector, "info": info, "news": news}
+
+    def download(self, tickers, *args, **kwargs):
+        time.sleep(self.latencies["prices" if isinstance(tickers, str) else "sector"])
+        return super().download(tickers, *args, **kwargs)
+
+    def info(self, ticker):
+        time.sleep(self.latencies["info"])
+        return super().info(ticker)
+
+    def news(self, ticker):
+        time.sleep(self.latencies["news"])
+        return super().news(ticker)
+
+
+def load_page(app, ticker):
+    """Returns (first paint, complete) in seconds for one page load."""
+    started = time.perf_counter()
+    outputs = app.update_dashboard(1, ticker)
+    first_paint = time.perf_counter() - started
+    with ThreadPoolExecutor(max_workers=len(app.PANELS)) as pool:
+        list(pool.map(lambda name: app.update_panel(name, outputs[2]), app.PANELS))
+    return first_paint, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--price-latency', type=float, default=0.2, help="seconds")
+    parser.add_argument('--info-latency', type=float, default=0.3, help="seconds")
+    parser.add_argument('--news-latency', type=float, default=1.5, help="seconds")
+    parser.add_argument('--sector-latency', type=float, default=2.0, help="seconds")
+    parser.add_argument('--ticker', default='RELIANCE.NS')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    set_provider(SlowSourceProvider(args.price_latency, args.sector_latency, args.info_latency, args.news_latency))
+    cache_dir = tempfile.mkdtemp()
+    data_loader.CACHE_DIR = cache_dir
+    runs = {"cold": [], "warm": []}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            import app
+            for _ in range(args.repeat):
+                # A fresh cache directory and result store per cold run
+                data_loader.CACHE_DIR = tempfile.mkdtemp(dir=cache_dir)
+                app.dashboard_results = app.ResultStore("dashboard-results")
+                runs["cold"].append(load_page(app, args.ticker))
+                runs["warm"].append(load_page(app, args.ticker))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"latency: prices {args.price_latency:.1f} s, info {args.info_latency:.1f} s, "
+          f"news {args.news_latency:.1f} s, sector {args.sector_latency:.1f} s")
+    print(f"{'run':<6} {'first paint (s)':>16} {'complete (s)':>13}")
+    for name, samples in runs.items():
+        first_paint = statistics.median(sample[0] for sample in samples)
+        complete = statistics.median(sample[1] for sample in samples)
+        print(f"{name:<6} {first_paint:>16.3f} {complete:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
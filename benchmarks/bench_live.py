@@ -0,0 +1,104 @@
+"""
+Benchmark: live chart updates vs re-sending the figures on every new bar.
+
+Replays a trading day of 1-minute bars into an IntradayFeed and, after
+each minute, updates the open intraday charts two ways:
+  * rebuild: analyse the bar window again and send all four figures
+    (what clicking GO does),
+  * live: update the LiveStream and send a Patch per chart with only the
+    new bars (what the live mode sends),
+and reports the server time and response size per update at points
+through the session. Live updates should stay flat as the session grows.
+
+Usage:
+    python benchmarks/bench_live.py [--interval 1m] [--history 750min] [--minutes 750]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from plotly.io.json import to_json_plotly
+
+from analysis import analyze, window_bars
+from components import (create_main_chart_reduced, create_technical_charts_fast, create_volatility_chart_reduced,
+                        add_forming_bar, plain_arrays, compact_figure, trace_lengths, live_patch)
+from intraday import IntradayFeed, INTERVALS, INTRADAY_WINDOWS
+from live import LiveStream
+from providers import generate_ohlcv
+
+CHARTS = ('main', 'rsi', 'macd', 'volatility')
+
+
+def session_minutes(minutes, start="2024-03-04 09:15"):
+    # Whole NSE sessions of 375 minutes, one per business day
+    days = pd.bdate_range(start, periods=minutes // 375 + 1)
+    stamps = [day + pd.Timedelta(hours=9, minutes=15) + pd.Timedelta(minutes=m) for day in days for m in range(375)]
+    return generate_ohlcv(seed=1, dates=pd.DatetimeIndex(stamps[:minutes]))
+
+
+def build_figures(bars, interval):
+    result = analyze(bars.iloc[:-1], windows=INTRADAY_WINDOWS, interval=INTERVALS[interval])
+    everything = len(result) + 1
+    figures = {
+        'main': add_forming_bar(create_main_chart_reduced(result, budget=everything), bars.iloc[-1:]),
+        'volatility': create_volatility_chart_reduced(result, budget=everything),
+    }
+    figures['rsi'], figures['macd'] = create_technical_charts_fast(result)
+    return {chart: compact_figure(plain_arrays(figure)) for chart, figure in figures.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interval', default="1m", choices=list(INTERVALS))
+    parser.add_argument('--history', default="750min")
+    parser.add_argument('--minutes', type=int, default=750)
+    args = parser.parse_args()
+
+    minutes = session_minutes(args.minutes + 30)
+    feed = IntradayFeed(args.history)
+    feed.add_bars(minutes.iloc[:30])
+    stream = LiveStream(args.interval, args.history)
+    bars = feed.frame(args.interval)
+    figures = build_figures(bars, args.interval)
+    lengths = {chart: trace_lengths(figures[chart], chart) for chart in CHARTS}
+    capacity = window_bars(args.history, INTERVALS[args.interval])
+    after = bars.index[-2].as_unit('ns').value
+
+    checkpoints = set(np.linspace(0, args.minutes - 1, 6).astype(int))
+    print(f"{args.interval} bars, {args.history} window, {args.minutes} minutes replayed")
+    print("live: mean per update since the previous row; rebuild: once, at the row's minute")
+    print(f"{'minute':>7} {'bars':>6} {'rebuild ms':>11} {'rebuild KB':>11} {'live ms':>8} {'live KB':>8}")
+    live_seconds = live_bytes = updates = 0
+    for minute in range(args.minutes):
+        feed.add_bars(minutes.iloc[30 + minute:31 + minute])
+
+        started = time.perf_counter()
+        rows, forming = stream.read(feed, after)
+        if len(rows):
+            after = rows.index[-1].as_unit('ns').value
+            patches = [live_patch(chart, rows, lengths[chart], capacity, forming if chart == 'main' else None)
+                       for chart in CHARTS]
+            live_bytes += sum(len(to_json_plotly(patch)) for patch in patches)
+            updates += 1
+        live_seconds += time.perf_counter() - started
+
+        if minute in checkpoints:
+            started = time.perf_counter()
+            window = feed.frame(args.interval)
+            rebuilt = build_figures(window, args.interval)
+            rebuild_bytes = sum(len(to_json_plotly(figure)) for figure in rebuilt.values())
+            rebuild_seconds = time.perf_counter() - started
+            updates = max(updates, 1)
+            print(f"{minute:>7} {len(window):>6} {rebuild_seconds * 1000:>11.2f} {rebuild_bytes / 1024:>11.1f} "
+                  f"{live_seconds / updates * 1000:>8.2f} {live_bytes / updates / 1024:>8.2f}")
+            live_seconds = live_bytes = updates = 0
+
+
+if __name__ == '__main__':
+    main()
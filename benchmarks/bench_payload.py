@@ -0,0 +1,134 @@
+"""
+Benchmark: dashboard figure payloads, full precision vs the compact wire encoding.
+
+Builds the ten figures of a daily dashboard (price, RSI, MACD and
+volatility charts, the two seasonal charts and the four sector charts)
+from synthetic replay data, and for each set reports:
+  * JSON bytes as Dash serialises them, and after gzip/brotli,
+  * time to compact the figures (components.compact_figure), to serialise
+    them and to compress the JSON.
+"before" sends the builders' figures as they are (full float64 arrays and
+ISO datetimes); "after" sends them through compact_figure.
+
+Usage:
+    python benchmarks/bench_payload.py [--bars 2500] [--tickers 8] [--repeat 5]
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from plotly.io.json import to_json_plotly
+
+import components
+from analysis import analyze, calculate_sector_performance, pct_change, rolling_correlation, rolling_beta
+from calendar_index import calendar_index
+from compression import compress, brotli
+from providers import ReplayProvider, generate_ohlcv
+from universe import UniversePanel, seasonality_matrix
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def dashboard_figures(bars, tickers):
+    """The figures of the overview, seasonal and sector panels, built as app.py builds them."""
+    result = analyze(generate_ohlcv(seed=1, periods=bars))
+    calendar = calendar_index(result.index)
+    returns = result['Daily Return']
+
+    names = [f"T{i:03d}.NS" for i in range(tickers)]
+    data = ReplayProvider().download(names, period=f"{bars // 250 + 1}y").tail(bars)
+    panel = UniversePanel.from_download(data, names)
+    panel_returns = pct_change(panel['Adj Close'])
+    correlation = rolling_correlation(panel_returns, 60)
+    beta = rolling_beta(panel_returns[0], panel_returns[1], 60)
+
+    rsi_fig, macd_fig = components.create_technical_charts_fast(result)
+    return {
+        'main': components.create_main_chart_reduced(result),
+        'rsi': rsi_fig,
+        'macd': macd_fig,
+        'volatility': components.create_volatility_chart_reduced(result),
+        'seasonal month': components.create_seasonal_stats_chart_fast(
+            calendar.table(returns, 'month', ('mean', 'median', 'hit_rate')), "Monthly Returns"),
+        'seasonal day': components.create_seasonal_stats_chart_fast(
+            calendar.table(returns, 'weekday', ('mean', 'median', 'hit_rate')), "Day-of-Week Returns"),
+        'sector': components.create_sector_chart_fast(calculate_sector_performance(panel.frame('Adj Close'))),
+        'correlation': components.create_correlation_heatmap_fast(panel.tickers, correlation[..., -1]),
+        'beta': components.create_beta_chart_fast(panel.index, correlation[0, 1], beta, names[1], 60),
+        'seasonality': components.create_seasonality_heatmap_fast(seasonality_matrix(panel, 'month')),
+    }
+
+
+def measure(figures, compact, repeat):
+    """Bytes and times of sending `figures` with or without the compact encoding."""
+    def prepare():
+        fresh = copy.deepcopy(figures)
+        started = time.perf_counter()
+        if compact:
+            for figure in fresh.values():
+                components.compact_figure(figure)
+        return time.perf_counter() - started, fresh
+
+    compact_seconds = min(prepare()[0] for _ in range(repeat))
+    prepared = prepare()[1]
+    serialise_seconds, payloads = best_of(lambda: {name: to_json_plotly(f).encode() for name, f in prepared.items()},
+                                          repeat)
+    body = b"".join(payloads.values())
+    row = {
+        'per_figure': {name: len(payload) for name, payload in payloads.items()},
+        'json': len(body), 'compact_ms': compact_seconds * 1e3, 'serialise_ms': serialise_seconds * 1e3,
+    }
+    gzip_seconds, gzipped = best_of(lambda: compress(body, 'gzip'), repeat)
+    row.update(gzip=len(gzipped), gzip_ms=gzip_seconds * 1e3)
+    if brotli is not None:
+        brotli_seconds, brotlied = best_of(lambda: compress(body, 'br'), repeat)
+        row.update(br=len(brotlied), br_ms=brotli_seconds * 1e3)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=2500)
+    parser.add_argument('--tickers', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    figures = dashboard_figures(args.bars, args.tickers)
+    components.COMPACT_FIGURES = True
+    before = measure(figures, False, args.repeat)
+    after = measure(figures, True, args.repeat)
+
+    print(f"{len(figures)} figures, {args.bars} daily bars, {args.tickers}-ticker sector, "
+          f"{components.FIGURE_DIGITS} significant digits, best of {args.repeat}")
+    print(f"{'figure':<15} {'before KB':>10} {'after KB':>9}")
+    for name in figures:
+        print(f"{name:<15} {before['per_figure'][name] / 1024:>10.1f} {after['per_figure'][name] / 1024:>9.1f}")
+
+    print()
+    encodings = ['json', 'gzip'] + (['br'] if brotli is not None else [])
+    print(f"{'':<7}" + "".join(f"{name + ' KB':>10}" for name in encodings)
+          + f"{'compact ms':>12}{'json ms':>9}{'gzip ms':>9}" + (f"{'br ms':>8}" if brotli is not None else ""))
+    for label, row in (('before', before), ('after', after)):
+        line = f"{label:<7}" + "".join(f"{row[name] / 1024:>10.1f}" for name in encodings)
+        line += f"{row['compact_ms']:>12.2f}{row['serialise_ms']:>9.2f}{row['gzip_ms']:>9.2f}"
+        if brotli is not None:
+            line += f"{row['br_ms']:>8.2f}"
+        print(line)
+    print(f"sent: {before['json'] / 1024:.0f} KB -> {after[encodings[-1]] / 1024:.0f} KB "
+          f"(x{before['json'] / after[encodings[-1]]:.1f} smaller)")
+
+
+if __name__ == '__main__':
+    main()
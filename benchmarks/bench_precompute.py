@@ -0,0 +1,55 @@
+"""
+Benchmark: full analysis vs the precomputed, memory-mapped store.
+
+Builds a store from a history minus its last bars, then times
+`load_analysis` (store slices plus the new bars) against `analyze` over
+the full history.
+
+Usage:
+    python benchmarks/bench_precompute.py [--bars 2500 10000] [--new-bars 1] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import data_loader
+import precompute
+from analysis import analyze
+from providers import generate_ohlcv
+
+
+def best_of(func, repeat):
+    func()  # warm-up
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, nargs='+', default=[2500, 10_000])
+    parser.add_argument('--new-bars', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'bars':>9} {'analyze (ms)':>13} {'store (ms)':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        data_loader.CACHE_DIR = cache_dir
+        for bars in args.bars:
+            df = generate_ohlcv(seed=1, periods=bars)
+            ticker = f"BENCH{bars}.NS"
+            precompute.write_analytics(ticker, df.iloc[:-args.new_bars] if args.new_bars else df)
+            full = best_of(lambda: analyze(df), args.repeat)
+            stored = best_of(lambda: precompute.load_analysis(ticker, df), args.repeat)
+            print(f"{bars:>9} {full * 1e3:>13.2f} {stored * 1e3:>11.2f} {full / stored:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: screening a universe, per-ticker pandas vs compiled conditions.
+
+Screens a synthetic universe (2000 tickers by default) with the example
+conditions two ways: a per-ticker loop that computes the indicators with
+pandas and evaluates the condition as boolean Series (timed over a
+subset and scaled to the universe), and screener.compile_condition
+evaluated over one `analyze_universe` panel. The analysis is timed once,
+shared by every condition, as the dashboard shares it between scans.
+
+Usage:
+    python benchmarks/bench_screener.py [--tickers 2000] [--bars 500] [--sample 100] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import calculate_technical_indicators
+from providers import ReplayProvider
+from screener import compile_condition, screen
+from universe import UniversePanel, analyze_universe
+
+CONDITIONS = {
+    "RSI < 30 and MACD crosses above Signal_Line":
+        lambda df: (df['RSI'] < 30) & (df['MACD'] > df['Signal_Line'])
+        & (df['MACD'].shift() <= df['Signal_Line'].shift()),
+    "close above SMA_200 with volume > 2x avg(volume, 20)":
+        lambda df: (df['Adj Close'] > df['SMA_200']) & (df['Volume'] > 2 * df['Volume'].rolling(20).mean()),
+    "change(close, 20) > 10 or not (rsi between 40 and 60)":
+        lambda df: (df['Adj Close'].pct_change(20) * 100 > 10) | ~((df['RSI'] >= 40) & (df['RSI'] <= 60)),
+}
+
+
+def best_of(func, repeat):
+    func()  # warm-up
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=2000)
+    parser.add_argument('--bars', type=int, default=500)
+    parser.add_argument('--sample', type=int, default=100, help="tickers timed in the per-ticker loop")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tickers = [f"T{i:04d}.NS" for i in range(args.tickers)]
+    data = ReplayProvider().download(tickers, period=f"{args.bars // 250 + 1}y").tail(args.bars)
+    sample = tickers[:args.sample]
+    frames = [data.xs(ticker, axis=1, level=1)[['Adj Close', 'Volume']] for ticker in sample]
+    scale = len(tickers) / len(sample)
+
+    panel_seconds = best_of(lambda: UniversePanel.from_download(data, tickers), args.repeat)
+    panel = UniversePanel.from_download(data, tickers)
+    analysis_seconds = best_of(lambda: analyze_universe(panel), args.repeat)
+    analysed = analyze_universe(panel)
+
+    print(f"{len(tickers)} tickers x {len(data)} bars, per-ticker loop timed over {len(sample)}, best of {args.repeat}")
+    print(f"panel {panel_seconds * 1e3:.1f} ms, analyze_universe {analysis_seconds * 1e3:.1f} ms (once per refresh)")
+    print(f"{'condition':<56} {'pandas ms':>10} {'compiled ms':>12} {'matches':>8} {'speedup':>8}")
+    for text, reference in CONDITIONS.items():
+        def per_ticker():
+            return [bool(reference(calculate_technical_indicators(frame)).iloc[-1]) for frame in frames]
+        pandas_seconds = best_of(per_ticker, args.repeat) * scale
+        compiled = compile_condition(text)
+        compiled_seconds = best_of(lambda: screen(analysed, compiled), args.repeat)
+        matches = len(screen(analysed, compiled))
+        print(f"{text:<56} {pandas_seconds * 1e3:>10.1f} {compiled_seconds * 1e3:>12.2f} {matches:>8} "
+              f"{'x%.0f' % (pandas_seconds / compiled_seconds):>8}")
+    print(f"a cold scan (analysis + condition) vs pandas: "
+          f"x{pandas_seconds / (analysis_seconds + compiled_seconds):.1f}")
+
+
+if __name__ == '__main__':
+    main()
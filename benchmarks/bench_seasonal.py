@@ -0,0 +1,96 @@
+"""
+Benchmark: seasonal statistics via pandas groupbys vs the integer calendar index.
+
+For one ticker, times the original `calculate_seasonal_trends` +
+monthly volume implementation (string day names, copied frame, one
+groupby per table) against the same tables from a cached CalendarIndex.
+Then it times mean, median and hit rate per month for a whole universe:
+one pandas groupby-agg per ticker against one `aggregate` pass over the
+(tickers, dates) panel.
+
+Usage:
+    python benchmarks/bench_seasonal.py [--tickers 50] [--bars 2500] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import calculate_seasonal_trends, pct_change
+from calendar_index import calendar_index
+from providers import ReplayProvider
+from universe import UniversePanel
+
+
+def best_of(func, repeat):
+    func()  # warm-up
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def groupby_seasonal(df):
+    """The pandas implementation calculate_seasonal_trends / calculate_volume_analysis used to have."""
+    df = df.copy()
+    df['Month'] = df.index.month
+    df['Day'] = df.index.day_name()
+    df['Year'] = df.index.year
+    monthly = df.groupby('Month')['Daily Return'].mean()
+    days = df.groupby('Day')['Daily Return'].mean().reindex(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'])
+    yearly = df.groupby('Year')['Daily Return'].mean()
+    volume = df.groupby('Month')['Volume'].mean()
+    return monthly, days, yearly, volume
+
+
+def hit_rate(returns):
+    return (returns.dropna() > 0).mean() * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, default=50)
+    parser.add_argument('--bars', type=int, default=2500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tickers = [f"T{i:03d}.NS" for i in range(args.tickers)]
+    data = ReplayProvider().download(tickers, period=f"{args.bars // 250 + 1}y").tail(args.bars)
+    panel = UniversePanel.from_download(data, tickers)
+    df = data.xs(tickers[0], axis=1, level=1).copy()
+    df['Daily Return'] = df['Adj Close'].pct_change()
+
+    single = {
+        'pandas groupbys': best_of(lambda: groupby_seasonal(df), args.repeat),
+        'calendar index': best_of(lambda: (calculate_seasonal_trends(df), calendar_index(df.index).table(
+            df['Volume'].to_numpy(dtype=np.float64), 'month')), args.repeat),
+    }
+
+    returns = pct_change(panel['Adj Close'])
+    frames = [panel.series(ticker, 'Adj Close').pct_change() for ticker in tickers]
+    stats = ('mean', 'median', 'hit_rate')
+    universe = {
+        'pandas per ticker': best_of(
+            lambda: [r.groupby(r.index.month).agg(['mean', 'median', hit_rate]) for r in frames], args.repeat),
+        'calendar index': best_of(lambda: calendar_index(panel.index).aggregate(returns, 'month', stats), args.repeat),
+    }
+
+    reference = frames[0].groupby(frames[0].index.month).median().to_numpy()
+    fast = calendar_index(panel.index).aggregate(returns, 'month', stats)['median'][0]
+    print(f"{len(df)} bars; max abs median diff {np.nanmax(np.abs(reference - fast)):.1e}")
+    print(f"{'seasonal tables, 1 ticker':<34} {'time (ms)':>10}")
+    for name, seconds in single.items():
+        print(f"  {name:<32} {seconds * 1e3:>10.2f}")
+    print(f"{f'mean/median/hit rate, {len(tickers)} tickers':<34} {'time (ms)':>10}")
+    for name, seconds in universe.items():
+        print(f"  {name:<32} {seconds * 1e3:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: cold start of the dashboard.
+
+Starts a fresh interpreter for each run and measures
+  * import time of each module `app` imports (python -X importtime),
+  * total `import app` time,
+  * time until the first dashboard request has been served.
+
+Runs use the offline replay provider with the tape refresher disabled, so
+only local work is measured. The script fails (exit code 1) when the
+median timings exceed the budgets, or when a module that should load
+lazily is imported with `app`.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--import-budget 2.5] [--first-request-budget 5.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+
+# Modules that must only be imported on first use
+LAZY_MODULES = ['scipy.signal', 'sklearn', 'yfinance', 'plotly.express', 'rich']
+
+FIRST_REQUEST = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+eager = [name for name in {lazy!r} if name in sys.modules]
+app.update_dashboard(1, "RELIANCE.NS")
+served = time.perf_counter()
+print(json.dumps({{"import": imported - started, "first_request": served - started, "eager": eager}}))
+"""
+
+
+def run_python(args, env):
+    return subprocess.run([sys.executable, *args], cwd=SRC_DIR, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def import_times(env):
+    """Cumulative import time (seconds) of each module imported directly by app."""
+    stderr = run_python(['-X', 'importtime', '-c', 'import app'], env).stderr
+    times = {}
+    children = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting shows as two spaces per level; a module is listed after its children
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children[name.strip()] = int(cumulative) / 1e6
+        elif depth == 0:
+            if name.strip() == 'app':
+                times = dict(children, app=int(cumulative) / 1e6)
+            children = {}
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--import-budget', type=float, default=2.5, help="seconds")
+    parser.add_argument('--first-request-budget', type=float, default=5.0, help="seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, STOCK_DATA_PROVIDER='replay', STOCK_CACHE_DIR=cache_dir,
+                   TAPE_REFRESH_INTERVAL='0', PYTHONDONTWRITEBYTECODE='1')
+        run_python(['-c', 'import app'], env)  # warm the OS file cache
+
+        module_runs = [import_times(env) for _ in range(args.repeat)]
+        request_runs = []
+        for _ in range(args.repeat):
+            # Each run starts from an empty OHLCV cache, like a fresh worker
+            for root, _, files in os.walk(cache_dir):
+                for name in files:
+                    os.remove(os.path.join(root, name))
+            stdout = run_python(['-c', FIRST_REQUEST.format(lazy=LAZY_MODULES)], env).stdout
+            request_runs.append(json.loads(stdout.strip().splitlines()[-1]))
+
+    print(f"{'module':<28} {'median (ms)':>12}")
+    names = sorted(module_runs[0], key=lambda n: -module_runs[0][n])
+    for name in names:
+        median = statistics.median(run.get(name, 0.0) for run in module_runs)
+        print(f"{name:<28} {median * 1e3:>12.1f}")
+
+    import_median = statistics.median(run['import'] for run in request_runs)
+    request_median = statistics.median(run['first_request'] for run in request_runs)
+    eager = sorted({name for run in request_runs for name in run['eager']})
+    print()
+    print(f"import app:    {import_median:.2f} s (budget {args.import_budget:.2f} s)")
+    print(f"first request: {request_median:.2f} s (budget {args.first_request_budget:.2f} s)")
+    print(f"lazy modules imported eagerly: {', '.join(eager) or 'none'}")
+
+    failed = (import_median > args.import_budget or request_median > args.first_request_budget or eager)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,359 @@
+"""
+Benchmark suite: every analysis function and chart builder on synthetic data.
+
+Times each public function of analysis.py and each create_* builder of
+components.py, and profiles its memory (the tracemalloc peak of one extra
+call). The cases are:
+  * single-ticker functions over --bars histories. Up to DAILY_LIMIT bars
+    these are business days; beyond that they are 1-minute NSE session
+    bars, since a million daily bars do not fit datetime64[ns],
+  * panel functions over --tickers tickers of --panel-bars bars each,
+  * the full update_dashboard path and every panel callback, cold (new
+    ticker) and warm, against the offline replay provider.
+
+Results are written as JSON (--output). For each case the file holds
+the best and median time, the peak memory and, for charts, the JSON
+payload size. It also holds regression thresholds: the measurement
+times (1 + tolerance), plus an absolute floor. Pass an earlier results
+file as --baseline to check against its thresholds; the script exits
+with code 1 if any case is slower or larger.
+
+Usage:
+    python benchmarks/bench_suite.py [--bars 1000 10000 100000 1000000] [--tickers 1 10 100 500]
+        [--panel-bars 2500] [--repeat 3] [--filter analysis.] [--output benchmarks/results.json]
+        [--baseline benchmarks/baseline.json] [--time-tolerance 0.5] [--memory-tolerance 0.25]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from plotly.io.json import to_json_plotly
+
+import analysis
+import components
+from calendar_index import calendar_index
+from providers import generate_ohlcv
+from universe import UniversePanel, analyze_universe, seasonality_matrix
+
+# Longest history generated as daily bars; longer ones are 1-minute bars
+DAILY_LIMIT = 50_000
+# NSE cash session: 09:15 to 15:30, 375 one-minute bars
+SESSION_OPEN = np.timedelta64(9 * 60 + 15, 'm')
+SESSION_MINUTES = 375
+# Cases whose largest intermediate array would exceed this many float64s are skipped
+MAX_ELEMENTS = 100_000_000
+# Thresholds never fall below the measurement plus these (noise on tiny cases)
+MIN_TIME_SLACK = 0.002
+MIN_MEMORY_SLACK = 1 << 20
+# Cases slower than this per call are timed once (plotly graph_objects at 1M bars takes ~40 s)
+SLOW_CASE_SECONDS = 5.0
+WINDOW = 60
+
+
+def synthetic_ohlcv(bars, seed=0):
+    """
+    Synthetic OHLCV history of `bars` rows.
+
+    Args:
+        bars (int): Number of bars.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Daily bars up to DAILY_LIMIT, 1-minute session bars beyond.
+    """
+    if bars <= DAILY_LIMIT:
+        return generate_ohlcv(seed=seed, periods=bars)
+    days = generate_ohlcv(seed=seed, periods=-(-bars // SESSION_MINUTES)).index.to_numpy()
+    minutes = SESSION_OPEN + np.arange(SESSION_MINUTES) * np.timedelta64(1, 'm')
+    dates = (days[:, None] + minutes[None, :]).ravel()[:bars]
+    # Per-minute moves scaled down from the daily defaults
+    return generate_ohlcv(seed=seed, dates=dates, drift=0.0003 / SESSION_MINUTES,
+                          volatility=0.015 / np.sqrt(SESSION_MINUTES))
+
+
+def synthetic_panel(tickers, bars, seed=0):
+    """(tickers, bars) UniversePanel of synthetic histories sharing one calendar."""
+    frames = [generate_ohlcv(seed=seed + i, periods=bars) for i in range(tickers)]
+    names = [f"T{i:03d}.NS" for i in range(tickers)]
+    fields = {name: np.stack([frame[name].to_numpy() for frame in frames])
+              for name in ('Adj Close', 'Close', 'High', 'Low', 'Open', 'Volume')}
+    return UniversePanel(names, frames[0].index, fields)
+
+
+def single_ticker_cases(bars):
+    """(name, func) pairs over one `bars`-bar history."""
+    df = synthetic_ohlcv(bars)
+    result = analysis.analyze(df)
+    frame = result.to_frame()
+    close = df['Adj Close'].to_numpy()
+    returns = result['Daily Return']
+    volume = df['Volume'].to_numpy(dtype=np.float64)
+    half = bars // 2
+    sums = analysis.calendar_sums(df.index, returns, volume)
+    head = analysis.calendar_sums(df.index[:half], returns[:half], volume[:half])
+    tail = analysis.calendar_sums(df.index[half:], returns[half:], volume[half:])
+    pair = np.stack([returns, returns[::-1]])
+    correlation = analysis.rolling_correlation(pair, WINDOW)[0, 1]
+    beta = analysis.rolling_beta(pair[0], pair[1], WINDOW)
+    table = calendar_index(df.index).table(returns, 'month', ('mean', 'median', 'hit_rate'))
+
+    yield 'analysis.calculate_volatility', lambda: analysis.calculate_volatility(df)
+    yield 'analysis.calculate_seasonal_trends', lambda: analysis.calculate_seasonal_trends(frame)
+    yield 'analysis.calculate_volume_analysis', lambda: analysis.calculate_volume_analysis(df)
+    yield 'analysis.calculate_technical_indicators', lambda: analysis.calculate_technical_indicators(df)
+    yield 'analysis.predict_price', lambda: analysis.predict_price(df)
+    yield 'analysis.analyze', lambda: analysis.analyze(df)
+    yield 'analysis.analyze[float32]', lambda: analysis.analyze(df, float32=True)
+    yield 'analysis.pct_change', lambda: analysis.pct_change(close)
+    yield 'analysis.rolling_mean', lambda: analysis.rolling_mean(close, 50)
+    yield 'analysis.rolling_std', lambda: analysis.rolling_std(returns, 30)
+    yield 'analysis.ema', lambda: analysis.ema(close, 26)
+    yield 'analysis.rsi', lambda: analysis.rsi(close)
+    yield 'analysis.rolling_ols', lambda: analysis.rolling_ols(close, WINDOW)
+    yield 'analysis.calendar_sums', lambda: analysis.calendar_sums(df.index, returns, volume)
+    yield 'analysis.merge_calendar_sums', lambda: analysis.merge_calendar_sums(head, tail)
+    yield 'analysis.seasonal_from_sums', lambda: analysis.seasonal_from_sums(sums)
+    yield 'analysis.walk_forward_evaluation', lambda: analysis.walk_forward_evaluation(df['Adj Close'], WINDOW)
+
+    yield 'components.create_main_chart', lambda: components.create_main_chart(frame)
+    yield 'components.create_technical_charts', lambda: components.create_technical_charts(frame)
+    yield 'components.create_volatility_chart', lambda: components.create_volatility_chart(frame)
+    yield 'components.create_seasonal_charts', lambda: components.create_seasonal_charts(result.seasonal)
+    yield 'components.create_volume_chart', lambda: components.create_volume_chart(frame, result.monthly_volume)
+    yield 'components.create_main_chart_fast', lambda: components.create_main_chart_fast(result)
+    yield 'components.create_technical_charts_fast', lambda: components.create_technical_charts_fast(result)
+    yield 'components.create_volatility_chart_fast', lambda: components.create_volatility_chart_fast(result)
+    yield 'components.create_seasonal_charts_fast', lambda: components.create_seasonal_charts_fast(result.seasonal)
+    yield 'components.create_volume_chart_fast', lambda: components.create_volume_chart_fast(result, result.monthly_volume)
+    yield 'components.create_main_chart_reduced', lambda: components.create_main_chart_reduced(result)
+    yield 'components.create_volatility_chart_reduced', lambda: components.create_volatility_chart_reduced(result)
+    yield 'components.create_seasonal_stats_chart_fast', lambda: components.create_seasonal_stats_chart_fast(table, "Monthly")
+    yield 'components.create_beta_chart_fast', lambda: components.create_beta_chart_fast(
+        df.index, correlation, beta, "^NSEI", WINDOW)
+
+
+def panel_cases(tickers, bars):
+    """(name, func) pairs over a (tickers, bars) universe."""
+    panel = synthetic_panel(tickers, bars)
+    close = panel['Adj Close']
+    returns = analysis.pct_change(close)
+    market = returns.mean(axis=0)
+    prices = panel.frame('Adj Close')
+    performance = analysis.calculate_sector_performance(prices)
+    matrix = seasonality_matrix(panel, 'month')
+
+    yield 'analysis.pct_change', lambda: analysis.pct_change(close)
+    yield 'analysis.rolling_mean', lambda: analysis.rolling_mean(close, 50)
+    yield 'analysis.rolling_std', lambda: analysis.rolling_std(returns, 30)
+    yield 'analysis.ema', lambda: analysis.ema(close, 26)
+    yield 'analysis.rsi', lambda: analysis.rsi(close)
+    yield 'analysis.rolling_ols', lambda: analysis.rolling_ols(close, WINDOW)
+    yield 'analysis.rolling_beta', lambda: analysis.rolling_beta(returns, market, WINDOW)
+    # (N, N, T) outputs
+    if tickers * tickers * bars <= MAX_ELEMENTS:
+        yield 'analysis.rolling_covariance', lambda: analysis.rolling_covariance(returns, WINDOW)
+        yield 'analysis.rolling_correlation', lambda: analysis.rolling_correlation(returns, WINDOW)
+    yield 'analysis.calculate_sector_performance', lambda: analysis.calculate_sector_performance(prices)
+    yield 'analysis.walk_forward_evaluation', lambda: analysis.walk_forward_evaluation(prices, WINDOW)
+    yield 'universe.analyze_universe', lambda: analyze_universe(panel)
+    yield 'universe.seasonality_matrix', lambda: seasonality_matrix(panel, 'month')
+
+    latest = np.corrcoef(np.nan_to_num(returns[:, -WINDOW:])) if tickers > 1 else np.ones((1, 1))
+    yield 'components.create_sector_chart', lambda: components.create_sector_chart(performance)
+    yield 'components.create_sector_chart_fast', lambda: components.create_sector_chart_fast(performance)
+    yield 'components.create_correlation_heatmap_fast', lambda: components.create_correlation_heatmap_fast(
+        panel.tickers, latest)
+    yield 'components.create_seasonality_heatmap_fast', lambda: components.create_seasonality_heatmap_fast(matrix)
+
+
+def measure(func, repeat):
+    """
+    Times `func` and profiles its memory.
+
+    Each sample runs enough calls to take at least 0.2 s (timeit's
+    autorange), so sub-millisecond functions are not lost in timer noise.
+
+    Returns:
+        dict: best_seconds, median_seconds, peak_bytes, calls per sample,
+        samples and the last result.
+    """
+    timer = timeit.Timer(func)
+    number, first = timer.autorange()
+    if first / number > SLOW_CASE_SECONDS:
+        samples = [first / number]
+    else:
+        samples = [seconds / number for seconds in timer.repeat(repeat, number)]
+    tracemalloc.start()
+    try:
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'best_seconds': min(samples), 'median_seconds': statistics.median(samples),
+            'peak_bytes': peak, 'calls': number, 'samples': len(samples), 'result': result}
+
+
+def payload_bytes(result):
+    """Serialised size of a create_* result (one figure or a list/tuple of them)."""
+    figures = result if isinstance(result, (list, tuple)) else [result]
+    return sum(len(to_json_plotly(figure)) for figure in figures)
+
+
+def dashboard_cases(repeat):
+    """
+    Times update_dashboard and each panel callback against the replay provider.
+
+    Cold runs use a ticker not seen before (empty caches, analysis from
+    scratch); warm runs repeat a ticker already shown.
+    """
+    os.environ.update(STOCK_DATA_PROVIDER='replay', TAPE_REFRESH_INTERVAL='0')
+    os.environ.setdefault('STOCK_CACHE_DIR', tempfile.mkdtemp(prefix='bench-suite-'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+
+    def render(ticker):
+        timings = {}
+        started = time.perf_counter()
+        outputs = app.update_dashboard(1, ticker)
+        timings['update_dashboard'] = time.perf_counter() - started
+        for name in app.PANELS:
+            started = time.perf_counter()
+            app.update_panel(name, outputs[2])
+            timings[f'update_panel[{name}]'] = time.perf_counter() - started
+        return timings
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        render("WARMUP.NS")  # lazy imports (sklearn, scipy.signal, rich)
+        cold = [render(f"BENCH{run}.NS") for run in range(repeat)]
+        warm = [render("BENCH0.NS") for _ in range(repeat)]
+        tracemalloc.start()
+        try:
+            render("PEAK.NS")
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    for label, runs in (('cold', cold), ('warm', warm)):
+        for stage in runs[0]:
+            samples = [run[stage] for run in runs]
+            yield f'dashboard.{stage}[{label}]', {
+                'best_seconds': min(samples), 'median_seconds': statistics.median(samples),
+                'peak_bytes': peak if label == 'cold' and stage == 'update_dashboard' else None,
+                'calls': 1, 'samples': len(samples)}
+
+
+def thresholds(record, time_tolerance, memory_tolerance):
+    seconds = record['best_seconds']
+    record['max_seconds'] = max(seconds * (1 + time_tolerance), seconds + MIN_TIME_SLACK)
+    if record.get('peak_bytes') is not None:
+        peak = record['peak_bytes']
+        record['max_peak_bytes'] = int(max(peak * (1 + memory_tolerance), peak + MIN_MEMORY_SLACK))
+    return record
+
+
+def regressions(results, baseline):
+    """Cases slower or larger than the baseline's thresholds, as printable strings."""
+    found = []
+    for case, record in results.items():
+        limit = baseline.get(case)
+        if limit is None:
+            continue
+        if record['best_seconds'] > limit['max_seconds']:
+            found.append(f"{case}: {record['best_seconds'] * 1e3:.2f} ms > {limit['max_seconds'] * 1e3:.2f} ms")
+        if record.get('peak_bytes') is not None and limit.get('max_peak_bytes') is not None \
+                and record['peak_bytes'] > limit['max_peak_bytes']:
+            found.append(f"{case}: peak {record['peak_bytes'] / 2**20:.1f} MB > {limit['max_peak_bytes'] / 2**20:.1f} MB")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument('--tickers', type=int, nargs='+', default=[1, 10, 100, 500])
+    parser.add_argument('--panel-bars', type=int, default=2500)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--filter', default='', help="regex; only cases whose name matches run")
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results.json'))
+    parser.add_argument('--baseline', help="earlier results file to check against")
+    parser.add_argument('--time-tolerance', type=float, default=0.5)
+    parser.add_argument('--memory-tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+    selected = re.compile(args.filter)
+
+    groups = [(f'bars={bars}', {'bars': bars, 'tickers': 1}, lambda bars=bars: single_ticker_cases(bars))
+              for bars in args.bars]
+    groups += [(f'tickers={tickers}', {'bars': args.panel_bars, 'tickers': tickers},
+                lambda tickers=tickers: panel_cases(tickers, args.panel_bars)) for tickers in args.tickers]
+
+    results = {}
+    print(f"{'case':<62} {'best ms':>10} {'median ms':>10} {'peak MB':>8} {'KB':>8}")
+    for label, params, cases in groups:
+        for name, func in cases():
+            case = f'{name}[{label}]'
+            if not selected.search(case):
+                continue
+            record = measure(func, args.repeat)
+            result = record.pop('result')
+            if name.startswith('components.'):
+                record['payload_bytes'] = payload_bytes(result)
+            results[case] = thresholds(dict(record, function=name, **params), args.time_tolerance, args.memory_tolerance)
+            payload = f"{record['payload_bytes'] / 1024:>8.0f}" if 'payload_bytes' in record else f"{'':>8}"
+            print(f"{case:<62} {record['best_seconds'] * 1e3:>10.3f} {record['median_seconds'] * 1e3:>10.3f} "
+                  f"{record['peak_bytes'] / 2**20:>8.1f} {payload}")
+
+    if selected.search('dashboard.'):
+        for case, record in dashboard_cases(args.repeat):
+            if not selected.search(case):
+                continue
+            results[case] = thresholds(dict(record, function=case.split('[')[0]), args.time_tolerance,
+                                       args.memory_tolerance)
+            peak = f"{record['peak_bytes'] / 2**20:>8.1f}" if record['peak_bytes'] is not None else f"{'':>8}"
+            print(f"{case:<62} {record['best_seconds'] * 1e3:>10.3f} {record['median_seconds'] * 1e3:>10.3f} {peak}")
+
+    report = {
+        'meta': {
+            'created': pd.Timestamp.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpus': os.cpu_count(),
+            'repeat': args.repeat,
+            'time_tolerance': args.time_tolerance,
+            'memory_tolerance': args.memory_tolerance,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+    print(f"\n{len(results)} cases written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f)['results'])
+        for line in found:
+            print(f"REGRESSION {line}")
+        print(f"{len(found)} regressions against {args.baseline}")
+        sys.exit(1 if found else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: many users opening the same ticker at the same moment.
+
+Starts worker processes that each fire concurrent dashboard requests
+(the overview, then every panel) for one ticker at once, against the offline replay provider with
+injected latency and a cold cache. It counts the backend calls (price
+downloads, info and news lookups) and reports the wall time, with
+request coalescing on and off.
+
+Usage:
+    python benchmarks/bench_thundering_herd.py [--processes 4] [--threads 8] [--latency 0.2]
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+
+
+def render_page(app, ticker):
+    """The requests a browser makes for one ticker: the overview, then each panel."""
+    outputs = app.update_dashboard(1, ticker)
+    for name in app.PANELS:
+        app.update_panel(name, outputs[2])
+    return outputs
+
+
+def worker(barrier, results, threads, ticker):
+    sys.path.append(SRC_DIR)
+    warnings.simplefilter('ignore')
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+        from providers import get_provider
+
+        barrier.wait()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            outputs = list(pool.map(lambda _: render_page(app, ticker), range(threads)))
+        elapsed = time.perf_counter() - started
+    ok = all(out[-1] == ticker for out in outputs)
+    results.put((dict(get_provider().calls), elapsed, ok))
+
+
+def run(processes, threads, latency, ticker, coalesce):
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ.update(STOCK_DATA_PROVIDER='replay', REPLAY_LATENCY=str(latency), STOCK_CACHE_DIR=cache_dir,
+                          TAPE_REFRESH_INTERVAL='0', COALESCE_REQUESTS='1' if coalesce else '0')
+        barrier = context.Barrier(processes)
+        results = context.Queue()
+        workers = [context.Process(target=worker, args=(barrier, results, threads, ticker))
+                   for _ in range(processes)]
+        for process in workers:
+            process.start()
+        rows = [results.get() for _ in workers]
+        for process in workers:
+            process.join()
+
+    calls = {}
+    for row_calls, _, _ in rows:
+        for name, count in row_calls.items():
+            calls[name] = calls.get(name, 0) + count
+    return calls, max(row[1] for row in rows), all(row[2] for row in rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.2, help="seconds per backend call")
+    parser.add_argument('--ticker', default='RELIANCE.NS')
+    args = parser.parse_args()
+
+    requests = args.processes * args.threads
+    print(f"{requests} simultaneous requests ({args.processes} processes x {args.threads} threads), "
+          f"{args.latency:.2f} s backend latency")
+    print(f"{'coalescing':<12} {'downloads':>10} {'info':>6} {'news':>6} {'wall (s)':>9} {'all ok':>7}")
+    for coalesce in (False, True):
+        calls, wall, ok = run(args.processes, args.threads, args.latency, args.ticker, coalesce)
+        print(f"{'on' if coalesce else 'off':<12} {calls['download']:>10} {calls['info']:>6} "
+              f"{calls['news']:>6} {wall:>9.2f} {str(ok):>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: walk-forward evaluation of the 60-day trend forecast.
+
+Compares refitting scikit-learn's LinearRegression on every window (what
+a loop over `predict_price` would do) with the single-pass `rolling_ols`
+used by `walk_forward_evaluation`.
+
+Usage:
+    python benchmarks/bench_walk_forward.py [--bars 2500] [--window 60]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import rolling_ols
+from providers import generate_ohlcv
+
+
+def sklearn_loop(prices, window):
+    from sklearn.linear_model import LinearRegression
+    predictions = np.full(len(prices), np.nan)
+    t = np.arange(len(prices), dtype=np.float64).reshape(-1, 1)
+    for end in range(window, len(prices) + 1):
+        model = LinearRegression().fit(t[end - window:end], prices[end - window:end])
+        predictions[end - 1] = model.predict([[end]])[0]
+    return predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=2500)
+    parser.add_argument('--window', type=int, default=60)
+    args = parser.parse_args()
+
+    prices = generate_ohlcv(seed=1, periods=args.bars)['Adj Close'].to_numpy()
+
+    started = time.perf_counter()
+    expected = sklearn_loop(prices, args.window)
+    loop_time = time.perf_counter() - started
+
+    rolling_ols(prices, args.window)  # warm-up
+    started = time.perf_counter()
+    predictions = rolling_ols(prices, args.window)['prediction']
+    vector_time = time.perf_counter() - started
+
+    error = np.nanmax(np.abs(predictions - expected))
+    print(f"{args.bars} bars, {args.bars - args.window + 1} windows of {args.window}")
+    print(f"sklearn per window: {loop_time * 1e3:10.1f} ms")
+    print(f"rolling_ols:        {vector_time * 1e3:10.2f} ms (x{loop_time / vector_time:.0f}, max diff {error:.2e})")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
 import pandas as pd
 import numpy as np
 
+from calendar_index import calendar_index
+
+# Bars per year used to annualise returns, volatility and turnover
+TRADING_DAYS = 252
+
 def calculate_volatility(df):
     """
     Calculates daily returns and rolling volatility.
@@ -27,23 +32,19 @@ def calculate_seasonal_trends(df):
     Returns:
         dict: Dictionary containing Series for monthly, day_of_week, and yearly returns.
     """
-    df = df.copy()
-    df['Month'] = df.index.month
-    df['Day'] = df.index.day_name()
-    df['Year'] = df.index.year
+    calendar = calendar_index(df.index)
+    returns = df['Daily Return'].to_numpy(dtype=np.float64)
     
-    monthly_returns = df.groupby('Month')['Daily Return'].mean()
-    day_of_week_returns = df.groupby('Day')['Daily Return'].mean()
-    # Reorder days
-    days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-    day_of_week_returns = day_of_week_returns.reindex(days_order)
+    def means(by):
+        return calendar.table(returns, by)['mean'].rename('Daily Return')
     
-    yearly_returns = df.groupby('Year')['Daily Return'].mean()
+    # Weekdays only, in calendar order
+    day_of_week_returns = calendar.table(returns, 'weekday', present_only=False)['mean'].iloc[:5]
     
     return {
-        'monthly': monthly_returns,
-        'day_of_week': day_of_week_returns,
-        'yearly': yearly_returns
+        'monthly': means('month'),
+        'day_of_week': day_of_week_returns.where(calendar.rows('weekday')[:5] > 0).rename('Daily Return'),
+        'yearly': means('year')
     }
 
 def calculate_volume_analysis(df):
@@ -59,10 +60,9 @@ def calculate_volume_analysis(df):
     df = df.copy()
     df['Volume_MA20'] = df['Volume'].rolling(window=20).mean()
     
-    df['Month'] = df.index.month
-    monthly_volume = df.groupby('Month')['Volume'].mean()
+    monthly_volume = calendar_index(df.index).table(df['Volume'].to_numpy(dtype=np.float64), 'month')['mean']
     
-    return df, monthly_volume
+    return df, monthly_volume.rename('Volume')
 
 def calculate_sector_performance(sector_df):
     """
@@ -76,9 +76,6 @@ def calculate_sector_performance(sector_df):
     """
     return sector_df.pct_change().cumsum()
 
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
-
 def predict_price(df, days=60):
     """
     Predicts the next day's closing price using Linear Regression.
@@ -90,6 +87,9 @@ def predict_price(df, days=60):
     Returns:
         dict: Dictionary with 'predicted_price', 'score', and 'trend'.
     """
+    # sklearn takes longer to import than the rest of the app's analysis code; load it on first use
+    from sklearn.linear_model import LinearRegression
+    
     df = df.copy().dropna()
     if len(df) < days:
         return None
@@ -144,3 +144,559 @@ def calculate_technical_indicators(df):
     df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
     
     return df
+
+
+# ---------------------------------------------------------------------------
+# NumPy kernels
+#
+# All kernels work along the last axis, so they accept a single series
+# (dates,) or a panel (tickers, dates). Rolling windows follow pandas'
+# default min_periods: a window containing a NaN yields NaN.
+# ---------------------------------------------------------------------------
+
+def _prefix_sums(values, squares=False):
+    """
+    Returns zero-padded cumulative sums of values (NaN as 0) and valid counts.
+    
+    With `squares`, also returns the cumulative sum of squares. Values are
+    centred on their mean first so the sum of squares keeps its precision.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    
+    counts = np.pad(np.cumsum(valid, axis=-1), pad)
+    if squares:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            centre = np.nansum(filled, axis=-1, keepdims=True) / np.maximum(counts[..., -1:], 1)
+        filled = np.where(valid, filled - centre, 0.0)
+        return np.pad(np.cumsum(filled, axis=-1), pad), np.pad(np.cumsum(filled * filled, axis=-1), pad), counts
+    return np.pad(np.cumsum(filled, axis=-1), pad), counts
+
+def _window_diff(prefix, window):
+    """Sum over each trailing window from a zero-padded prefix sum."""
+    out = np.full(prefix.shape[:-1] + (prefix.shape[-1] - 1,), np.nan)
+    if window <= out.shape[-1]:
+        out[..., window - 1:] = prefix[..., window:] - prefix[..., :-window]
+    return out
+
+def _window_mean(csum, counts, window):
+    sums = _window_diff(csum, window)
+    full = _window_diff(counts, window) == window
+    return np.where(full, sums / window, np.nan)
+
+def _window_std(csum, csum2, counts, window, ddof=1):
+    sums = _window_diff(csum, window)
+    sums2 = _window_diff(csum2, window)
+    full = _window_diff(counts, window) == window
+    var = (sums2 - sums * sums / window) / (window - ddof)
+    return np.where(full, np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+def rolling_mean(values, window):
+    """Trailing rolling mean along the last axis (pandas `rolling(window).mean()`)."""
+    csum, counts = _prefix_sums(values)
+    return _window_mean(csum, counts, window)
+
+def rolling_std(values, window, ddof=1):
+    """Trailing rolling standard deviation along the last axis (pandas `rolling(window).std()`)."""
+    csum, csum2, counts = _prefix_sums(values, squares=True)
+    return _window_std(csum, csum2, counts, window, ddof)
+
+def _centred(values):
+    """Values minus their mean with NaN as 0, and the valid mask."""
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    centre = filled.sum(axis=-1, keepdims=True) / np.maximum(valid.sum(axis=-1, keepdims=True), 1)
+    return np.where(valid, filled - centre, 0.0), valid
+
+def _window_sums_inplace(values, window):
+    """
+    Trailing window sums along the last axis, overwriting `values` with its cumulative sum.
+
+    Skips the zero-padded copy of `_prefix_sums`, which matters for
+    (tickers, tickers, dates) cross products.
+    """
+    np.cumsum(values, axis=-1, out=values)
+    out = np.full_like(values, np.nan)
+    if window <= values.shape[-1]:
+        out[..., window - 1] = values[..., window - 1]
+        np.subtract(values[..., window:], values[..., :-window], out=out[..., window:])
+    return out
+
+def rolling_covariance(values, window, ddof=1):
+    """
+    Rolling covariance of every pair of rows of a (tickers, dates) array.
+
+    Computed from cumulative sums of the cross products, so the whole
+    N x N matrix for every date costs a few array passes instead of one
+    pandas `rolling().cov()` per pair. Like pandas, a window with a NaN in
+    either series yields NaN.
+
+    Args:
+        values (np.ndarray): (tickers, dates) array, e.g. daily returns.
+        window (int): Window length in bars.
+        ddof (int): Delta degrees of freedom (default: 1, as pandas).
+
+    Returns:
+        np.ndarray: (tickers, tickers, dates) covariances.
+    """
+    centred, valid = _centred(values)
+    sums = _window_sums_inplace(centred.copy(), window)
+    full = _window_sums_inplace(valid.astype(np.float64), window) == window
+
+    cross = centred[:, None, :] * centred[None, :, :]
+    cov = _window_sums_inplace(cross, window)
+    del cross
+    cov -= sums[:, None, :] * sums[None, :, :] / window
+    cov /= window - ddof
+    cov[~(full[:, None, :] & full[None, :, :])] = np.nan
+    return cov
+
+def rolling_correlation(values, window):
+    """
+    Rolling Pearson correlation of every pair of rows of a (tickers, dates) array.
+
+    Matches pandas `a.rolling(window).corr(b)` for each pair (a, b).
+
+    Args:
+        values (np.ndarray): (tickers, dates) array, e.g. daily returns.
+        window (int): Window length in bars.
+
+    Returns:
+        np.ndarray: (tickers, tickers, dates) correlations; the diagonal is 1
+        wherever the series has a full window.
+    """
+    corr = rolling_covariance(values, window)
+    n = corr.shape[0]
+    std = np.sqrt(np.maximum(corr[np.arange(n), np.arange(n)], 0.0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr /= std[:, None, :] * std[None, :, :]
+    np.clip(corr, -1.0, 1.0, out=corr)
+    return corr
+
+def rolling_beta(values, benchmark, window):
+    """
+    Rolling beta of each row of `values` against a benchmark series.
+
+    Args:
+        values (np.ndarray): (tickers, dates) or (dates,) returns.
+        benchmark (np.ndarray): (dates,) benchmark returns.
+        window (int): Window length in bars.
+
+    Returns:
+        np.ndarray: Betas, the shape of `values`; NaN where either series has
+        a NaN in the window.
+    """
+    centred, valid = _centred(values)
+    bench, bench_valid = _centred(benchmark)
+    sums = _window_sums_inplace(centred.copy(), window)
+    bench_sums = _window_sums_inplace(bench.copy(), window)
+    cross = _window_sums_inplace(centred * bench, window)
+    bench_sq = _window_sums_inplace(bench * bench, window)
+    full = _window_sums_inplace((valid & bench_valid).astype(np.float64), window) == window
+
+    cov = cross - sums * bench_sums / window
+    var = bench_sq - bench_sums * bench_sums / window
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(full & (var > 0), cov / var, np.nan)
+
+def pct_change(values):
+    """Period-over-period change along the last axis; the first element is NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    out[..., 0] = np.nan
+    np.divide(values[..., 1:], values[..., :-1], out=out[..., 1:])
+    out[..., 1:] -= 1.0
+    return out
+
+def ema(values, span):
+    """
+    Exponential moving average along the last axis (pandas `ewm(span, adjust=False)`).
+    
+    Each series starts at its first valid value; leading NaNs stay NaN and
+    interior NaNs carry the previous value forward.
+    """
+    # scipy.signal is slow to import, so it is only loaded by the first EMA
+    from scipy.signal import lfilter
+    
+    values = np.asarray(values, dtype=np.float64)
+    alpha = 2.0 / (span + 1.0)
+    valid = ~np.isnan(values)
+    if valid.all():
+        filled = values
+        leading = None
+    else:
+        # Back-fill leading NaNs with the first valid value and forward-fill gaps
+        idx = np.where(valid, np.arange(values.shape[-1]), 0)
+        np.maximum.accumulate(idx, axis=-1, out=idx)
+        first = np.argmax(valid, axis=-1)[..., None]
+        idx = np.where(np.cumsum(valid, axis=-1) == 0, first, idx)
+        filled = np.take_along_axis(values, idx, axis=-1)
+        leading = np.cumsum(valid, axis=-1) == 0
+    
+    zi = (1.0 - alpha) * filled[..., :1]
+    out = lfilter([alpha], [1.0, -(1.0 - alpha)], filled, axis=-1, zi=zi)[0]
+    if leading is not None:
+        out[leading] = np.nan
+    return out
+
+def rsi(values, window=14):
+    """
+    RSI along the last axis using rolling means of gains and losses.
+    
+    Same definition as `calculate_technical_indicators`: a missing delta
+    (such as the first bar) counts as a zero gain and loss.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    delta = np.zeros_like(values)
+    delta[..., 1:] = values[..., 1:] - values[..., :-1]
+    return _rsi_from_delta(delta, window)
+
+def _rsi_from_delta(delta, window):
+    with np.errstate(invalid='ignore'):
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+    gain = rolling_mean(gains, window)
+    loss = rolling_mean(losses, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+def rolling_ols(values, window):
+    """
+    Rolling least-squares trend line over every trailing window, along the last axis.
+    
+    Fits y = intercept + slope * t on the last `window` values, where t is
+    the bar position (0, 1, 2, ...), exactly like `predict_price`. All
+    windows come from one set of prefix sums, so the cost is O(n)
+    whatever the window length. Windows containing a NaN yield NaN.
+    
+    Args:
+        values (np.ndarray): Prices, shape (dates,) or (tickers, dates).
+        window (int): Number of bars per fit.
+        
+    Returns:
+        dict: 'slope', 'intercept', 'r2' and 'prediction' (the fitted line
+        one bar past the window), each aligned with the window's last bar.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    csum, csum2, counts = _prefix_sums(values, squares=True)
+    t = np.arange(values.shape[-1], dtype=np.float64)
+    # _prefix_sums centres each series on its mean; centre the t * y sums the same way
+    valid = ~np.isnan(values)
+    means = _series_means(values, valid)
+    centred = np.where(valid, values - means, 0.0)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    csum_ty = np.pad(np.cumsum(t * centred, axis=-1), pad)
+    del centred
+    
+    sum_y = _window_diff(csum, window)
+    sum_y2 = _window_diff(csum2, window)
+    sum_ty = _window_diff(csum_ty, window)
+    full = _window_diff(counts, window) == window
+    
+    # Positions in a window are consecutive, so their mean and spread are closed-form
+    t_mean = t - (window - 1) / 2.0
+    sxx = window * (window * window - 1) / 12.0
+    sxy = sum_ty - t_mean * sum_y
+    syy = sum_y2 - sum_y * sum_y / window
+    
+    slope = sxy / sxx
+    mean_y = sum_y / window + means
+    intercept = mean_y - slope * t_mean
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # A flat window is fitted perfectly (sklearn's score gives 1.0 as well)
+        r2 = np.where(syy > 0, sxy * sxy / (sxx * syy), 1.0)
+    
+    def masked(a):
+        return np.where(full, a, np.nan)
+    return {
+        'slope': masked(slope),
+        'intercept': masked(intercept),
+        'r2': masked(np.minimum(r2, 1.0)),
+        'prediction': masked(mean_y + slope * (window + 1) / 2.0),
+    }
+
+def _series_means(values, valid):
+    """Mean of each series' valid values, shaped for broadcasting along the last axis."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total = np.where(valid, values, 0.0).sum(axis=-1, keepdims=True)
+        return total / np.maximum(valid.sum(axis=-1, keepdims=True), 1)
+
+def calendar_sums(index, returns, volume):
+    """
+    Per-month, weekday and year sums behind the seasonal averages.
+    
+    Sums and counts (rather than means) can be merged, so a precomputed
+    history and the bars that came after it combine exactly.
+    
+    Args:
+        index (pd.DatetimeIndex): Bar timestamps.
+        returns (np.ndarray): Daily returns (NaNs skipped).
+        volume (np.ndarray): Volumes (NaNs skipped).
+        
+    Returns:
+        dict: 'first_year' plus 'rows', 'return_sum', 'return_count' arrays
+        for 'month' (12), 'weekday' (7) and 'year', and the month's
+        'volume_sum' and 'volume_count'.
+    """
+    calendar = calendar_index(index)
+    sums = {'first_year': calendar.first_year}
+    for name in ('month', 'weekday', 'year'):
+        grouped = calendar.aggregate(returns, name, ('sum', 'count'))
+        sums[f'{name}_rows'] = calendar.rows(name)
+        sums[f'{name}_return_sum'], sums[f'{name}_return_count'] = grouped['sum'], grouped['count']
+    grouped = calendar.aggregate(volume, 'month', ('sum', 'count'))
+    sums['month_volume_sum'], sums['month_volume_count'] = grouped['sum'], grouped['count']
+    return sums
+
+def merge_calendar_sums(a, b):
+    """Adds two `calendar_sums` results (the year arrays are aligned on calendar year)."""
+    if not a['year_rows'].any():
+        return b
+    if not b['year_rows'].any():
+        return a
+    first_year = min(a['first_year'], b['first_year'])
+    last_year = max(a['first_year'] + len(a['year_rows']), b['first_year'] + len(b['year_rows']))
+    merged = {'first_year': first_year}
+    for key in a:
+        if key == 'first_year':
+            continue
+        if key.startswith('year_'):
+            out = np.zeros(last_year - first_year, dtype=np.result_type(a[key], b[key]))
+            for part in (a, b):
+                offset = part['first_year'] - first_year
+                out[offset:offset + len(part[key])] += part[key]
+            merged[key] = out
+        else:
+            merged[key] = a[key] + b[key]
+    return merged
+
+def seasonal_from_sums(sums):
+    """
+    Builds `calculate_seasonal_trends` / `calculate_volume_analysis` style
+    Series from `calendar_sums`.
+    
+    Returns:
+        dict, pd.Series: Seasonal trends ('monthly', 'day_of_week',
+        'yearly') and monthly average volume.
+    """
+    def means(name, kind='return'):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums[f'{name}_{kind}_sum'] / sums[f'{name}_{kind}_count']
+    
+    # int32 like DatetimeIndex.month / .year, which groupby keys would carry
+    month_present = (np.flatnonzero(sums['month_rows']) + 1).astype(np.int32)
+    year_offsets = np.flatnonzero(sums['year_rows'])
+    year_present = (year_offsets + sums['first_year']).astype(np.int32)
+    day_present = sums['weekday_rows'][:5] > 0
+    
+    seasonal = {
+        'monthly': pd.Series(means('month')[month_present - 1], index=pd.Index(month_present, name='Month'),
+                             name='Daily Return'),
+        'day_of_week': pd.Series(np.where(day_present, means('weekday')[:5], np.nan),
+                                 index=pd.Index(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'], name='Day'),
+                                 name='Daily Return'),
+        'yearly': pd.Series(means('year')[year_offsets], index=pd.Index(year_present, name='Year'),
+                            name='Daily Return'),
+    }
+    monthly_volume = pd.Series(means('month', 'volume')[month_present - 1],
+                               index=pd.Index(month_present, name='Month'), name='Volume')
+    return seasonal, monthly_volume
+
+
+class AnalysisResult:
+    """
+    Output of the fused `analyze` pipeline.
+    
+    Columns are NumPy arrays sharing one DatetimeIndex, so the chart
+    builders in components.py can read `result['SMA_50']` and
+    `result.index` just like a DataFrame without a copy per step.
+    """
+    
+    def __init__(self, index, columns, seasonal, monthly_volume, labels=None):
+        self.index = index
+        self.columns = columns
+        self.seasonal = seasonal
+        self.monthly_volume = monthly_volume
+        # Window of each rolling column for chart legends, e.g. '50-Day' or '1h'
+        self.labels = labels or {}
+    
+    def __getitem__(self, name):
+        return self.columns[name]
+    
+    def __contains__(self, name):
+        return name in self.columns
+    
+    def __len__(self):
+        return len(self.index)
+    
+    @property
+    def empty(self):
+        return len(self.index) == 0
+    
+    def to_frame(self):
+        """Returns the columns as a DataFrame (for code that still needs pandas)."""
+        return pd.DataFrame(self.columns, index=self.index, copy=False)
+
+
+# Window of each rolling column of `analyze`, in bars
+DAILY_WINDOWS = {
+    'RollingVol_30': 30,
+    'RollingVol_90': 90,
+    'SMA_50': 50,
+    'SMA_200': 200,
+    'RSI': 14,
+    'Volume_MA20': 20,
+}
+
+def bar_interval(index):
+    """Typical spacing of a DatetimeIndex (the median gap), e.g. 1 day or 5 minutes."""
+    if len(index) < 2:
+        return pd.Timedelta(days=1)
+    return pd.Timedelta(int(np.median(np.diff(index.as_unit('ns').asi8))), unit='ns')
+
+def window_bars(window, interval):
+    """
+    Converts a window length to bars.
+    
+    Args:
+        window (int or str): Bars, or a span of bar time such as '30min'
+            or '2h'. Time spans count bars, so a '1h' window over 5-minute
+            bars is 12 bars even when it crosses the overnight gap.
+        interval (pd.Timedelta or str): Bar interval.
+        
+    Returns:
+        int: Number of bars (at least 2).
+    """
+    if isinstance(window, (int, np.integer)):
+        return int(window)
+    return max(2, int(round(pd.Timedelta(window) / pd.Timedelta(interval))))
+
+def window_label(window, interval):
+    """Legend text of a window: '50-Day' for daily bars, '50-Bar' or the time span otherwise."""
+    if not isinstance(window, (int, np.integer)):
+        return str(window)
+    return f"{window}-Day" if pd.Timedelta(interval) >= pd.Timedelta(days=1) else f"{window}-Bar"
+
+def analyze(df, float32=False, windows=None, interval=None):
+    """
+    Computes every derived column of the dashboard in one pass over NumPy arrays.
+    
+    Replaces the chain calculate_volatility -> calculate_technical_indicators
+    -> calculate_seasonal_trends -> calculate_volume_analysis without copying
+    the frame at each step, and shares intermediate results (prefix sums,
+    price deltas) between indicators.
+    
+    Args:
+        df (pd.DataFrame): Stock data with 'Adj Close' and 'Volume'.
+        float32 (bool): Store derived columns as float32 to halve their memory.
+            Accumulations still run in float64.
+        windows (dict): Window per rolling column, overriding DAILY_WINDOWS;
+            bars or time spans (see `window_bars`). Column names keep
+            their daily defaults (e.g. 'SMA_50').
+        interval (pd.Timedelta or str): Bar interval for time-span windows
+            (default: inferred from the index).
+        
+    Returns:
+        AnalysisResult: Source and derived columns, seasonal trends and
+        monthly average volume.
+    """
+    windows = dict(DAILY_WINDOWS, **(windows or {}))
+    interval = pd.Timedelta(interval) if interval is not None else bar_interval(df.index)
+    bars = {column: window_bars(window, interval) for column, window in windows.items()}
+    labels = {column: window_label(window, interval) for column, window in windows.items()}
+    dtype = np.float32 if float32 else np.float64
+    index = df.index
+    columns = {name: df[name].to_numpy() for name in df.columns}
+    close = df['Adj Close'].to_numpy(dtype=np.float64)
+    
+    # Returns and volatility share one set of prefix sums
+    returns = pct_change(close)
+    rsum, rsum2, rcount = _prefix_sums(returns, squares=True)
+    columns['Daily Return'] = returns.astype(dtype, copy=False)
+    columns['RollingVol_30'] = _window_std(rsum, rsum2, rcount, bars['RollingVol_30']).astype(dtype, copy=False)
+    columns['RollingVol_90'] = _window_std(rsum, rsum2, rcount, bars['RollingVol_90']).astype(dtype, copy=False)
+    del rsum, rsum2, rcount
+    
+    # Moving averages share the price prefix sums
+    csum, ccount = _prefix_sums(close)
+    columns['SMA_50'] = _window_mean(csum, ccount, bars['SMA_50']).astype(dtype, copy=False)
+    columns['SMA_200'] = _window_mean(csum, ccount, bars['SMA_200']).astype(dtype, copy=False)
+    del csum, ccount
+    
+    # RSI reuses the price delta
+    delta = np.zeros_like(close)
+    delta[1:] = close[1:] - close[:-1]
+    columns['RSI'] = _rsi_from_delta(delta, bars['RSI']).astype(dtype, copy=False)
+    del delta
+    
+    # MACD (12, 26, 9)
+    macd = ema(close, 12) - ema(close, 26)
+    columns['MACD'] = macd.astype(dtype, copy=False)
+    columns['Signal_Line'] = ema(macd, 9).astype(dtype, copy=False)
+    del macd
+    
+    # Volume
+    volume = df['Volume'].to_numpy(dtype=np.float64)
+    columns['Volume_MA20'] = rolling_mean(volume, bars['Volume_MA20']).astype(dtype, copy=False)
+    
+    # Seasonal trends and monthly volume from integer calendar codes
+    seasonal, monthly_volume = seasonal_from_sums(calendar_sums(index, returns, volume))
+    
+    return AnalysisResult(index, columns, seasonal, monthly_volume, labels)
+
+
+def walk_forward_evaluation(prices, windows=(60,)):
+    """
+    Scores `predict_price`'s linear trend forecast over the whole history.
+    
+    For every bar, the trend line fitted on the preceding `window` bars
+    predicts the next close, as `predict_price` would have done on that
+    day. All fits come from `rolling_ols`, so evaluating every window
+    length for every ticker takes one vectorised pass each.
+    
+    Args:
+        prices (pd.Series or pd.DataFrame): Closing prices of one ticker,
+            or a (dates x tickers) frame such as `fetch_sector_data` returns.
+        windows (int or list): Fit window length(s) in bars.
+        
+    Returns:
+        pd.DataFrame: One row per (Ticker, Window) with the number of
+        forecasts, MAE, RMSE, MAPE (%), directional hit rate (%) and mean R².
+    """
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame(prices.name if prices.name is not None else 'Adj Close')
+    windows = [windows] if np.isscalar(windows) else list(windows)
+    panel = prices.to_numpy(dtype=np.float64).T
+    
+    # Forecast made at bar i is scored against bar i + 1
+    current = panel[:, :-1]
+    actual = panel[:, 1:]
+    actual_move = actual - current
+    
+    rows = []
+    for window in windows:
+        fit = rolling_ols(panel, window)
+        predicted = fit['prediction'][:, :-1]
+        r2 = fit['r2'][:, :-1]
+        scored = ~np.isnan(predicted) & ~np.isnan(actual)
+        error = np.where(scored, predicted - actual, 0.0)
+        n = scored.sum(axis=-1)
+        moved = scored & (actual_move != 0)
+        hits = moved & (np.sign(predicted - current) == np.sign(actual_move))
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            metrics = {
+                'Forecasts': n,
+                'MAE': np.abs(error).sum(axis=-1) / n,
+                'RMSE': np.sqrt((error * error).sum(axis=-1) / n),
+                'MAPE': np.abs(np.where(scored, error / actual, 0.0)).sum(axis=-1) / n * 100,
+                'Hit Rate': hits.sum(axis=-1) / moved.sum(axis=-1) * 100,
+                'Mean R2': np.where(scored, r2, 0.0).sum(axis=-1) / n,
+            }
+        for i, ticker in enumerate(prices.columns):
+            rows.append({'Ticker': ticker, 'Window': window, **{k: v[i] for k, v in metrics.items()}})
+    
+    return pd.DataFrame(rows).set_index(['Ticker', 'Window'])
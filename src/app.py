@@ -1,24 +1,43 @@
+import json
+import os
+import time
+
 import dash
 from dash import dcc, html, Input, Output, State
 import dash_bootstrap_components as dbc
+import flask
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
-
-from data_loader import fetch_stock_data, fetch_sector_data, fetch_stock_news, fetch_fundamentals, fetch_nifty50_ticker_data
-from analysis import calculate_volatility, calculate_seasonal_trends, calculate_volume_analysis, calculate_sector_performance, predict_price, calculate_technical_indicators
-from components import create_volatility_chart, create_seasonal_charts, create_volume_chart, create_sector_chart, create_main_chart, create_technical_charts
-
-# Rich Console
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.layout import Layout
-from rich import box
 
-console = Console()
+from data_loader import fetch_stock_data, fetch_intraday_data, fetch_universe_data, fetch_stock_news, fetch_fundamentals, fetch_concurrently, shared_cache_stats, get_data_cache
+from analysis import analyze, window_bars, calculate_sector_performance, predict_price, walk_forward_evaluation, pct_change, rolling_correlation, rolling_beta
+from components import create_volatility_chart_reduced, create_seasonal_stats_chart_fast, create_seasonality_heatmap_fast, create_sector_chart_fast, create_main_chart_reduced, create_technical_charts_fast, create_correlation_heatmap_fast, create_beta_chart_fast, add_session_breaks, add_forming_bar, plain_arrays, compact_figure, trace_lengths, live_patch
+from downsample import visible_range
+from tape import TapeRefresher, read_tape_snapshot, TAPE_POLL_INTERVAL
+from coalesce import SingleFlight
+from compression import ResponseCompressor, COMPRESS_RESPONSES
+from precompute import load_analysis
+from result_store import ResultStore
+from providers import get_provider
+from sectors import sector_universe, MARKET_INDEX
+from calendar_index import calendar_index
+from universe import analyze_universe, seasonality_matrix
+from screener import compile_condition, screen, load_universe, ScreenerError
+from intraday import INTERVALS, INTRADAY_WINDOWS, INTRADAY_HISTORY
+from live import live_update, LIVE_POLL_INTERVAL
+import metrics
+from metrics import span
+from plotly.io.json import to_json_plotly
 
 def print_terminal_report(ticker, info, df):
     """Prints a rich terminal report."""
+    # Imported here so worker startup does not pay for rich
+    from rich.console import Console
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich import box
+    
+    console = Console()
     console.clear()
     
     # Header
@@ -50,15 +69,120 @@ def print_terminal_report(ticker, info, df):
     console.print(fund_table)
     console.print(f"[bold green]Analysis Complete for {ticker}[/bold green]")
 
+# History and rolling window (bars) of the sector comparison; peers come from sectors.py
+SECTOR_PERIOD = "5y"
+SECTOR_WINDOW = 60
+# Statistics of the seasonal charts
+SEASONAL_STATS = ('mean', 'median', 'hit_rate')
+# History of the screener universe: enough for SMA_200 and the bars before it
+SCREENER_PERIOD = "2y"
+# Seconds an analysed screener universe is reused before it is downloaded again
+SCREENER_REFRESH_INTERVAL = int(os.environ.get("SCREENER_REFRESH_INTERVAL", 900))
+# Seconds after a failed screener download before a scan downloads again
+SCREENER_RETRY_INTERVAL = int(os.environ.get("SCREENER_RETRY_INTERVAL", 60))
+# Matching tickers listed by the screener
+SCREENER_MAX_ROWS = 50
+
+# Per-source timeouts (seconds) for the dashboard's data fetches
+SOURCE_TIMEOUTS = {
+    "prices": 20,
+    "intraday": 10,
+    "fundamentals": 8,
+    "sector": 15,
+    "news": 5,
+    # One download for the whole screener universe
+    "screener": 120,
+}
+
+# Bump when the dashboard's output components change so cached results are not reused
+LAYOUT_VERSION = 6
+# Share one computation between identical concurrent requests (0 disables, for benchmarking)
+COALESCE_REQUESTS = os.environ.get("COALESCE_REQUESTS", "1") != "0"
+# Identical concurrent dashboard requests wait for one computation
+dashboard_flight = SingleFlight("dashboard")
+# Prices and analysis of recently shown tickers, shared by the panel callbacks
+dashboard_results = ResultStore("dashboard-results")
+# The analysed screener universe, the largest result: one kept at a time
+screener_results = ResultStore("screener-results", max_entries=1)
+# When the last screener download failed, so scans back off instead of retrying it
+screener_failure = {"at": 0.0}
+
 # Initialize App
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.CYBORG])
+# Charts are created inside callbacks, so their zoom callbacks target ids not yet in the layout
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.CYBORG], suppress_callback_exceptions=True)
 server = app.server
 
-# Fetch Nifty 50 Ticker Data on startup
-print("Initializing ticker tape with Nifty 50 data...")
-ticker_tape_data = fetch_nifty50_ticker_data()
+@server.route("/cache-stats")
+def cache_stats():
+    """Hit/miss counters of the shared news and fundamentals cache, for sizing it."""
+    return flask.jsonify(shared_cache_stats())
+
+@server.route("/dashboard-timings", methods=["GET", "POST"])
+def dashboard_timings():
+    """
+    Median and 95th percentile duration of each dashboard stage.
+
+    Server stages are the metrics spans; the browser posts 'first_paint',
+    the time from the request to the metrics grid showing.
+    """
+    if flask.request.method == "POST":
+        payload = flask.request.get_json(force=True, silent=True) or {}
+        try:
+            seconds = float(payload.get("seconds"))
+        except (TypeError, ValueError):
+            return "", 400
+        if payload.get("stage") != "first_paint" or not 0 <= seconds < 600:
+            return "", 400
+        metrics.observe("first_paint", seconds)
+        return "", 204
+    return flask.jsonify(metrics.stage_summary())
+
+@server.route("/metrics")
+def metrics_endpoint():
+    """Stage latencies, cache results, rows and payload sizes in Prometheus text format."""
+    return flask.Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
-def create_ticker_tape():
+def _first_output(output):
+    """Component id of the first output of a callback's output string."""
+    return output.lstrip(".").split(".", 1)[0]
+
+@server.after_request
+def record_response_size(response):
+    """Records the size of each callback response, labelled by its first output."""
+    if (metrics.METRICS_ENABLED and response.status_code == 200
+            and flask.request.path.endswith("/_dash-update-component") and not response.direct_passthrough):
+        payload = flask.request.get_json(silent=True) or {}
+        output = _first_output(str(payload.get("output", "")))
+        # The output comes from the client: only the app's own callbacks get a
+        # series of their own, so the number of series stays fixed
+        if output not in {_first_output(key) for key in app.callback_map}:
+            output = "other"
+        metrics.observe_bytes(f"response.{output}", response.calculate_content_length() or len(response.get_data()))
+    return response
+
+# Registered after record_response_size so it runs before it (Flask runs
+# after_request hooks last registered first): the recorded sizes are the bytes sent
+response_compressor = ResponseCompressor()
+
+@server.after_request
+def compress_response(response):
+    """Compresses responses for the browser's Accept-Encoding (see compression.py)."""
+    if COMPRESS_RESPONSES:
+        response = response_compressor(response, flask.request.accept_encodings, flask.request.path)
+    return response
+
+# Ticker tape: served from the shared snapshot and refreshed in the background,
+# so startup never waits on the 50-symbol download. The thread starts with the
+# first request rather than on import, so importing the app (tests, tools,
+# a WSGI server's master process) downloads nothing
+tape_refresher = TapeRefresher()
+
+@server.before_request
+def start_tape_refresher():
+    """Starts the tape refresher in the process serving requests (no-op once running)."""
+    tape_refresher.start()
+
+def create_ticker_tape(ticker_tape_data):
     items = []
     for item in ticker_tape_data:
         # Match new success/danger colors
@@ -68,262 +192,766 @@ def create_ticker_tape():
             html.Span(item["price"], className="me-2"),
             html.Span(item["change"], style={"color": color})
         ], className="ticker-item"))
-    
+
     # Duplicate items for seamless loop
     items_duplicate = items.copy()
-    
-    return html.Div(
-        html.Div(items + items_duplicate, className="ticker-content"), 
-        className="ticker-tape"
-    )
-
-# Layout
-app.layout = html.Div([
-    # Ticker Tape
-    create_ticker_tape(),
-    
-    # Main Dashboard Container
-    html.Div([
-        # Metrics Grid
-        html.Div(id="metrics-grid", className="metrics-grid"),
-        
-        # Dashboard Grid (Charts + Sidebar)
+
+    return html.Div(items + items_duplicate, className="ticker-content")
+
+def panel_loading(container_id):
+    """Spinner shown in a panel until its callback has filled it."""
+    return dcc.Loading(type="dot", color="#3b82f6", children=[html.Div(id=container_id)])
+
+def serve_layout():
+    """Builds the page per request so each visit starts from the latest tape snapshot."""
+    snapshot = read_tape_snapshot()
+    return html.Div([
+        # Ticker and bar interval currently shown, used by the chart zoom callbacks
+        dcc.Store(id="active-ticker"),
+        dcc.Store(id="active-interval"),
+        # Intraday charts on the page: last completed bar and trace lengths, advanced by live updates
+        dcc.Store(id="live-cursor"),
+        dcc.Interval(id="live-interval", interval=LIVE_POLL_INTERVAL * 1000, disabled=True),
+        # Ticker and result key of the overview, which starts the panel callbacks
+        dcc.Store(id="dashboard-key"),
+        # Browser clock (ms) when the current request started, for time to first paint
+        dcc.Store(id="paint-started", data=0),
+
+        # Ticker Tape, re-rendered when the shared snapshot changes
+        dcc.Store(id="tape-version", data=snapshot["fetched_at"] if snapshot else None),
+        dcc.Interval(id="tape-interval", interval=TAPE_POLL_INTERVAL * 1000),
+        html.Div(create_ticker_tape(snapshot["items"] if snapshot else []),
+                 id="ticker-tape", className="ticker-tape"),
+
+        # Main Dashboard Container
         html.Div([
-            # Main Content - Charts
-            html.Div([
-                dcc.Loading(
-                    id="loading-charts",
-                    type="cube",
-                    color="#3b82f6", # Royal Blue
-                    children=[html.Div(id="charts-container")]
-                )
-            ], className="main-content"),
-            
-            # Sidebar
+            # Metrics Grid
+            html.Div(id="metrics-grid", className="metrics-grid"),
+
+            # Dashboard Grid (Charts + Sidebar)
             html.Div([
-                # Search/Input Card
+                # Main Content - Charts
                 html.Div([
-                    html.H6("STOCK ANALYZER", className="terminal-header mb-3"),
-                    html.Label("Ticker Symbol", className="text-secondary small mb-2"),
+                    dcc.Loading(
+                        id="loading-charts",
+                        type="cube",
+                        color="#3b82f6", # Royal Blue
+                        children=[html.Div(id="charts-container")]
+                    ),
+                    # Filled in after the main charts
+                    panel_loading("seasonal-container"),
+                    panel_loading("sector-container"),
+                ], className="main-content"),
+
+                # Sidebar
+                html.Div([
+                    # Search/Input Card
                     html.Div([
+                        html.H6("STOCK ANALYZER", className="terminal-header mb-3"),
+                        html.Label("Ticker Symbol", className="text-secondary small mb-2"),
+                        html.Div([
+                            dbc.Input(
+                                id="ticker-input",
+                                placeholder="RELIANCE.NS",
+                                type="text",
+                                value="RELIANCE.NS",
+                                className="me-2"
+                            ),
+                            dbc.Button("GO", id="analyze-btn", color="primary", style={"width": "80px"}),
+                        ], className="d-flex mb-3"),
+                        html.Label("Bars", className="text-secondary small mb-2"),
+                        dbc.Select(
+                            id="interval-select",
+                            options=[{"label": "Daily", "value": "1d"}] + [
+                                {"label": f"{interval[:-1]} min", "value": interval} for interval in INTERVALS],
+                            value="1d",
+                            className="mb-3"
+                        ),
+                        dbc.Switch(id="live-switch", label="Live updates (intraday)", value=False, className="mb-2"),
+                        html.Div(id="live-status", className="text-muted small mb-2"),
+                        html.Div(id="first-paint", className="text-muted small"),
+                    ], className="sidebar-card"),
+
+                    # Screener over the whole universe
+                    html.Div([
+                        html.H6("SCREENER", className="terminal-header mb-3"),
                         dbc.Input(
-                            id="ticker-input", 
-                            placeholder="RELIANCE.NS", 
-                            type="text", 
-                            value="RELIANCE.NS", 
-                            className="me-2"
+                            id="screener-input",
+                            placeholder="RSI < 30 and MACD crosses above Signal_Line",
+                            type="text",
+                            value="RSI < 30 and MACD crosses above Signal_Line",
+                            className="mb-2"
                         ),
-                        dbc.Button("GO", id="analyze-btn", color="primary", style={"width": "80px"}),
-                    ], className="d-flex mb-3"),
-                ], className="sidebar-card"),
-                
-                # Terminal Panels
-                html.Div(id="terminal-panels-container"),
-                
-                # Prediction Card
-                html.Div(id="prediction-container"),
-                
-                # News Feed
-                html.Div([
-                    html.H6("LIVE NEWS", className="terminal-header mb-3"),
-                    html.Div(id="news-feed-container", className="news-feed")
-                ], className="sidebar-card")
-            ], className="sidebar")
-        ], className="dashboard-container")
+                        dbc.Button("SCAN", id="screener-btn", color="primary", className="mb-3", style={"width": "100%"}),
+                        panel_loading("screener-results"),
+                    ], className="sidebar-card"),
+
+                    # Terminal Panels
+                    panel_loading("terminal-panels-container"),
+
+                    # Prediction Card
+                    panel_loading("prediction-container"),
+
+                    # News Feed
+                    html.Div([
+                        html.H6("LIVE NEWS", className="terminal-header mb-3"),
+                        panel_loading("news-feed-container")
+                    ], className="sidebar-card")
+                ], className="sidebar")
+            ], className="dashboard-container")
+        ])
     ])
-])
+
+app.layout = serve_layout
+
+def fetch_source(name, func, args, default):
+    """Fetches one dashboard source with its timeout, returning `default` on failure."""
+    return fetch_concurrently({name: (func, args, default)}, timeouts=SOURCE_TIMEOUTS)[name]
+
+def dashboard_key(ticker, df):
+    """Identity of a ticker's dashboard: provider, ticker, latest bar and layout version."""
+    return f"{get_provider().name}:{ticker.upper()}:{df.index[-1].isoformat()}:v{LAYOUT_VERSION}"
+
+def dashboard_state(ticker, key, df=None):
+    """
+    Prices and analysis behind a dashboard key, computed once per worker.
+
+    The overview passes the prices it fetched; a panel served by another
+    worker reads them from the OHLCV cache and the precomputed store.
+    """
+    def compute():
+        prices = fetch_stock_data(ticker) if df is None else df
+        return {"df": prices, "analysis": load_analysis(ticker, prices) if not prices.empty else None}
+    return dashboard_results.get_or_compute(key, compute)
+
+def cached_output(name, key, build):
+    """
+    Returns build()'s children, reusing what any worker rendered for `key`.
+
+    `build` returns (children, complete); incomplete output, rendered
+    from a source's fallback value, is not stored so it is retried on
+    the next request.
+
+    Args:
+        name (str): Panel name, the stage label of its spans.
+        key (str): Result key of the output.
+        build (callable): Renders the output.
+    """
+    cache = get_data_cache()
+
+    def compute():
+        with span(f"render.{name}") as s:
+            cached = cache.get("dashboard", key)
+            if cached is not None:
+                s.set(cache="hit")
+                return cached
+            s.set(cache="miss")
+            children, complete = build()
+        if complete:
+            # Stored as plain JSON (Dash's own serialisation) so any worker can send it
+            with span(f"serialise.{name}") as s:
+                payload = to_json_plotly(children)
+                s.set(bytes=len(payload))
+            cache.set("dashboard", key, json.loads(payload))
+        return children
+
+    if not COALESCE_REQUESTS:
+        return compute()
+    return dashboard_flight.do(key, compute)
 
 @app.callback(
     [Output("metrics-grid", "children"),
      Output("charts-container", "children"),
-     Output("news-feed-container", "children"),
-     Output("prediction-container", "children"),
-     Output("terminal-panels-container", "children")],
+     Output("dashboard-key", "data"),
+     Output("active-interval", "data"),
+     Output("active-ticker", "data"),
+     Output("live-cursor", "data")],
     Input("analyze-btn", "n_clicks"),
-    State("ticker-input", "value")
+    State("ticker-input", "value"),
+    State("interval-select", "value")
 )
-def update_dashboard(n_clicks, ticker):
+def update_dashboard(n_clicks, ticker, interval="1d"):
+    """
+    First stage: the metric cards and price charts.
+
+    Its result key starts the panel callbacks, which fill in the
+    seasonal, sector, news, forecast and market data panels as each
+    finishes. With an intraday interval the price, technical and
+    volatility charts show that interval's bars, and can be kept live
+    (see stream_live_bars); the panels stay daily.
+    """
     if not ticker:
-        return [], dbc.Alert("Enter Ticker", color="warning"), [], [], []
-    
+        return [], dbc.Alert("Enter Ticker", color="warning"), None, None, None, None
+
+    interval = interval or "1d"
     try:
-        # Fetch Data
-        df = fetch_stock_data(ticker)
-        if df.empty:
-            return dbc.Alert(f"No data found for ticker symbol '{ticker}'. Please check the symbol and try again.", color="danger", className="glass-card"), [], [], []
-        
-        # Fetch Fundamentals
-        fund_info = fetch_fundamentals(ticker)
-        
-        # Print to Console (Rich)
-        print_terminal_report(ticker, fund_info, df)
-        
-        # 1. Analysis & Charts
-        df = calculate_volatility(df)
-        df = calculate_technical_indicators(df) # Add technicals
-        trends = calculate_seasonal_trends(df)
-        df, monthly_vol = calculate_volume_analysis(df)
-        
-        main_fig = create_main_chart(df)
-        rsi_fig, macd_fig = create_technical_charts(df)
-        vol_fig = create_volatility_chart(df)
-        monthly_fig, day_fig, yearly_fig = create_seasonal_charts(trends)
-        
-        # Sector
-        sector_tickers = ["TCS.NS", "INFY.NS", "WIPRO.NS", "TECHM.NS", "LTIM.NS"]
-        sector_data = fetch_sector_data(sector_tickers)
-        sector_fig = create_sector_chart(calculate_sector_performance(sector_data)) if not sector_data.empty else {}
-
-        # 0. Metric Cards
-        current_price = fund_info.get('currentPrice', 0)
-        open_price = fund_info.get('open', current_price)
-        day_change = current_price - open_price if current_price and open_price else 0
-        day_change_pct = (day_change / open_price * 100) if open_price and open_price != 0 else 0
-        
-        volume = fund_info.get('volume', 0)
-        market_cap = fund_info.get('marketCap', 0)
-        
-        # Format large numbers
-        def format_number(num):
-            if num >= 1e12:
-                return f"₹{num/1e12:.2f}T"
-            elif num >= 1e9:
-                return f"₹{num/1e9:.2f}B"
-            elif num >= 1e6:
-                return f"₹{num/1e6:.2f}M"
-            elif num >= 1e3:
-                return f"₹{num/1e3:.2f}K"
-            return f"₹{num:.2f}"
-        
-        metric_cards = [
-            # Current Price Card
-            html.Div([
-                html.Div("Current Price", className="metric-label"),
-                html.Div(f"₹{current_price:.2f}" if current_price else "N/A", className="metric-value"),
-                html.Div([
-                    html.Span("▲" if day_change >= 0 else "▼"),
-                    html.Span(f"{abs(day_change_pct):.2f}%")
-                ], className=f"metric-change {'positive' if day_change >= 0 else 'negative'}")
-            ], className="metric-card animate-fade-in"),
-            
-            # Day Change Card
-            html.Div([
-                html.Div("Day Change", className="metric-label"),
-                html.Div(f"₹{abs(day_change):.2f}" if day_change else "0.00", className="metric-value"),
-                html.Div([
-                    html.Span("Open: "),
-                    html.Span(f"₹{open_price:.2f}" if open_price else "N/A")
-                ], className="metric-change", style={"color": "var(--text-secondary)"})
-            ], className="metric-card animate-fade-in delay-1"),
-            
-            # Volume Card
-            html.Div([
-                html.Div("Volume", className="metric-label"),
-                html.Div(f"{volume:,.0f}" if volume else "N/A", className="metric-value", style={"fontSize": "1.5rem"}),
-                html.Div("Trading Volume", className="metric-change", style={"color": "var(--text-secondary)"})
-            ], className="metric-card animate-fade-in delay-2"),
-            
-            # Market Cap Card
+        with span("callback.overview"):
+            if not COALESCE_REQUESTS:
+                return overview(ticker, interval)
+            return dashboard_flight.do(f"{get_provider().name}:{ticker.upper()}:{interval}",
+                                       lambda: overview(ticker, interval))
+    except Exception as e:
+        return [], dbc.Alert(f"An error occurred: {str(e)}", color="danger", className="glass-card"), None, None, None, None
+
+def overview(ticker, interval="1d"):
+    # Prices come first: their latest bar is part of the result key, and a
+    # fresh OHLCV cache makes this a local read
+    df = fetch_source("prices", fetch_stock_data, (ticker,), pd.DataFrame())
+    if df.empty:
+        return [], dbc.Alert(f"No data found for ticker symbol '{ticker}'. Please check the symbol and try again.", color="danger", className="glass-card"), None, None, None, None
+
+    key = dashboard_key(ticker, df)
+    cursor = None
+    if interval == "1d":
+        metric_cards, charts = cached_output("overview", f"{key}:overview", lambda: build_overview(ticker, key, df))
+    else:
+        # Intraday bars change every poll, so they are rendered per request (coalesced) rather than cached
+        bars = fetch_source("intraday", fetch_intraday_data, (ticker, interval), pd.DataFrame())
+        if len(bars) < 2:
+            return [], dbc.Alert(f"No {interval} bars found for '{ticker}'.", color="warning", className="glass-card"), None, None, None, None
+        metric_cards, charts, cursor = build_intraday_overview(ticker, bars, interval)
+    return metric_cards, charts, {"ticker": ticker, "key": key}, interval, ticker, cursor
+
+def format_number(num):
+    """Formats large rupee amounts (market cap) with a T/B/M/K suffix."""
+    if num >= 1e12:
+        return f"₹{num/1e12:.2f}T"
+    elif num >= 1e9:
+        return f"₹{num/1e9:.2f}B"
+    elif num >= 1e6:
+        return f"₹{num/1e6:.2f}M"
+    elif num >= 1e3:
+        return f"₹{num/1e3:.2f}K"
+    return f"₹{num:.2f}"
+
+def create_metric_cards(fund_info):
+    current_price = fund_info.get('currentPrice', 0)
+    open_price = fund_info.get('open', current_price)
+    day_change = current_price - open_price if current_price and open_price else 0
+    day_change_pct = (day_change / open_price * 100) if open_price and open_price != 0 else 0
+
+    volume = fund_info.get('volume', 0)
+    market_cap = fund_info.get('marketCap', 0)
+
+    return [
+        # Current Price Card
+        html.Div([
+            html.Div("Current Price", className="metric-label"),
+            html.Div(f"₹{current_price:.2f}" if current_price else "N/A", className="metric-value"),
             html.Div([
-                html.Div("Market Cap", className="metric-label"),
-                html.Div(format_number(market_cap) if market_cap else "N/A", className="metric-value"),
-                html.Div(f"P/E: {fund_info.get('trailingPE', 'N/A')}", className="metric-change", style={"color": "var(--text-secondary)"})
-            ], className="metric-card animate-fade-in delay-3")
-        ]
-
-        # 1. Charts - Updated to use chart-card class
-        charts = html.Div([
-            html.Div(dcc.Graph(figure=main_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up"),
+                html.Span("▲" if day_change >= 0 else "▼"),
+                html.Span(f"{abs(day_change_pct):.2f}%")
+            ], className=f"metric-change {'positive' if day_change >= 0 else 'negative'}")
+        ], className="metric-card animate-fade-in"),
+
+        # Day Change Card
+        html.Div([
+            html.Div("Day Change", className="metric-label"),
+            html.Div(f"₹{abs(day_change):.2f}" if day_change else "0.00", className="metric-value"),
             html.Div([
-                html.Div([
-                    html.Div(dcc.Graph(figure=rsi_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up delay-1", style={"width": "49%"}),
-                    html.Div(dcc.Graph(figure=macd_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up delay-1", style={"width": "49%"}),
-                ], style={"display": "flex", "gap": "20px", "justifyContent": "space-between"}),
-            ]),
-            html.Div(dcc.Graph(figure=vol_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up delay-2"),
+                html.Span("Open: "),
+                html.Span(f"₹{open_price:.2f}" if open_price else "N/A")
+            ], className="metric-change", style={"color": "var(--text-secondary)"})
+        ], className="metric-card animate-fade-in delay-1"),
+
+        # Volume Card
+        html.Div([
+            html.Div("Volume", className="metric-label"),
+            html.Div(f"{volume:,.0f}" if volume else "N/A", className="metric-value", style={"fontSize": "1.5rem"}),
+            html.Div("Trading Volume", className="metric-change", style={"color": "var(--text-secondary)"})
+        ], className="metric-card animate-fade-in delay-2"),
+
+        # Market Cap Card
+        html.Div([
+            html.Div("Market Cap", className="metric-label"),
+            html.Div(format_number(market_cap) if market_cap else "N/A", className="metric-value"),
+            html.Div(f"P/E: {fund_info.get('trailingPE', 'N/A')}", className="metric-change", style={"color": "var(--text-secondary)"})
+        ], className="metric-card animate-fade-in delay-3")
+    ]
+
+def intraday_analysis(bars, interval):
+    """Indicators of intraday bars, with windows in bar time (INTRADAY_WINDOWS)."""
+    with span("analysis.intraday") as s:
+        s.set(rows=len(bars))
+        return analyze(bars, windows=INTRADAY_WINDOWS, interval=INTERVALS[interval])
+
+def chart_cards(main_fig, rsi_fig, macd_fig, vol_fig):
+    """Lays out the price, technical and volatility charts."""
+    return html.Div([
+        html.Div(dcc.Graph(id="main-chart", figure=main_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up"),
+        html.Div([
             html.Div([
-                html.Div([
-                    html.Div(dcc.Graph(figure=monthly_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up delay-2", style={"width": "49%"}),
-                    html.Div(dcc.Graph(figure=day_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up delay-2", style={"width": "49%"}),
-                ], style={"display": "flex", "gap": "20px", "justifyContent": "space-between"}),
-            ]),
-            html.Div(dcc.Graph(figure=sector_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up delay-3")
-        ])
-        
-        # 2. News Feed
-        news_items = fetch_stock_news(ticker)
-        news_components = []
-        if news_items:
-            for item in news_items[:10]: # Show top 10
-                title = item.get('title', 'No Title')
-                publisher = item.get('publisher', 'Unknown')
-                link = item.get('link', '#')
-                
-                card = html.Div([
-                    html.A(html.H6(title, className="news-title"), href=link, target="_blank", className="text-decoration-none"),
-                    html.Div(f"{publisher}", className="news-meta")
-                ], className="news-card animate-fade-in")
-                news_components.append(card)
-        else:
-            news_components.append(html.P("No recent news found.", className="text-secondary"))
-            
-        # 3. ML Prediction
+                html.Div(dcc.Graph(id="rsi-chart", figure=rsi_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up delay-1", style={"width": "49%"}),
+                html.Div(dcc.Graph(id="macd-chart", figure=macd_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up delay-1", style={"width": "49%"}),
+            ], style={"display": "flex", "gap": "20px", "justifyContent": "space-between"}),
+        ]),
+        html.Div(dcc.Graph(id="volatility-chart", figure=vol_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up delay-2"),
+    ])
+
+def build_overview(ticker, key, df):
+    """Renders the metric cards and the daily price, technical and volatility charts."""
+    fund_info = fetch_source("fundamentals", fetch_fundamentals, (ticker,), {})
+
+    # Single fused pass, no per-step DataFrame copies; the panels reuse it
+    result = dashboard_state(ticker, key, df)["analysis"]
+
+    with span("figures.overview"):
+        main_fig = compact_figure(create_main_chart_reduced(result))
+        rsi_fig, macd_fig = map(compact_figure, create_technical_charts_fast(result))
+        vol_fig = compact_figure(create_volatility_chart_reduced(result))
+    return [create_metric_cards(fund_info), chart_cards(main_fig, rsi_fig, macd_fig, vol_fig)], bool(fund_info)
+
+def build_intraday_overview(ticker, bars, interval):
+    """
+    Renders the metric cards and the charts of intraday bars.
+
+    The completed bars fill the chart traces; the forming bar is drawn on
+    its own so live updates can replace it. The window of bars is small
+    and bounded (INTRADAY_HISTORY), so the charts are sent unreduced, as
+    plain lists a live update can extend, and zoom in the browser.
+
+    Args:
+        ticker (str): Ticker symbol.
+        bars (pd.DataFrame): Intraday bars, the forming bar last.
+        interval (str): Interval of `bars`.
+
+    Returns:
+        tuple: Metric cards, charts and the live cursor of the charts.
+    """
+    fund_info = fetch_source("fundamentals", fetch_fundamentals, (ticker,), {})
+    completed = bars.iloc[:-1]
+    result = intraday_analysis(completed, interval)
+
+    with span("figures.intraday") as s:
+        everything = len(result) + 1
+        figures = {
+            "main": add_forming_bar(create_main_chart_reduced(result, budget=everything), bars.iloc[-1:]),
+            "volatility": create_volatility_chart_reduced(result, budget=everything),
+        }
+        figures["rsi"], figures["macd"] = create_technical_charts_fast(result)
+        for fig in figures.values():
+            compact_figure(add_session_breaks(plain_arrays(fig)))
+        s.set(rows=len(result))
+
+    cursor = {
+        "ticker": ticker,
+        "interval": interval,
+        "time": completed.index[-1].isoformat(),
+        "capacity": window_bars(INTRADAY_HISTORY, INTERVALS[interval]),
+        "lengths": {chart: trace_lengths(fig, chart) for chart, fig in figures.items()},
+    }
+    charts = chart_cards(figures["main"], figures["rsi"], figures["macd"], figures["volatility"])
+    return create_metric_cards(fund_info), charts, cursor
+
+def build_seasonal_panel(ticker, key):
+    result = dashboard_state(ticker, key)["analysis"]
+    # One calendar index per date range; each table is a bincount pass, medians a single sort
+    with span("analysis.seasonal") as s:
+        calendar = calendar_index(result.index)
+        returns = result['Daily Return']
+        monthly = calendar.table(returns, 'month', SEASONAL_STATS)
+        days = calendar.table(returns, 'weekday', SEASONAL_STATS)
+        s.set(rows=len(calendar))
+    with span("figures.seasonal"):
+        monthly_fig = compact_figure(create_seasonal_stats_chart_fast(monthly, "Monthly Returns"))
+        day_fig = compact_figure(create_seasonal_stats_chart_fast(days, "Day-of-Week Returns"))
+    return html.Div([
+        html.Div([
+            html.Div(dcc.Graph(figure=monthly_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up", style={"width": "49%"}),
+            html.Div(dcc.Graph(figure=day_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up", style={"width": "49%"}),
+        ], style={"display": "flex", "gap": "20px", "justifyContent": "space-between"}),
+    ]), True
+
+def sector_panel_data(ticker, key):
+    """
+    Prices of the ticker's sector peers and benchmark indices.
+
+    Shared by every ticker of the sector until the latest bar changes, so
+    moving between peers does not download the sector again.
+    """
+    universe = sector_universe(ticker)
+    tickers = list(dict.fromkeys(universe["tickers"] + [universe["index"], MARKET_INDEX]))
+    last_bar = dashboard_state(ticker, key)["df"].index[-1]
+    group = universe["sector"] or ticker.upper()
+    sector_key = f"{get_provider().name}:sector:{group}:{last_bar.isoformat()}"
+    panel = dashboard_results.get(sector_key)
+    if panel is None:
+        panel = fetch_source("sector", fetch_universe_data, (tickers, SECTOR_PERIOD), None)
+        if panel is not None:
+            dashboard_results.put(sector_key, panel)
+    return universe, panel
+
+def build_sector_panel(ticker, key):
+    universe, panel = sector_panel_data(ticker, key)
+    if panel is None or panel.empty:
+        return html.Div(html.P("No sector data found.", className="text-secondary"), className="chart-card"), False
+
+    close = panel['Adj Close']
+    returns = pct_change(close)
+    rows = {name: i for i, name in enumerate(panel.tickers)}
+    ticker_row = rows[ticker.upper()]
+    # Compare with the sector index, or the market when the sector index has no prices
+    benchmark = universe["index"]
+    if np.isnan(close[rows[benchmark]]).all():
+        benchmark = MARKET_INDEX
+
+    with span("analysis.sector") as s:
+        # Full N x N rolling correlation in one pass; the heatmap shows its latest date
+        correlation = rolling_correlation(returns, SECTOR_WINDOW)
+        beta = rolling_beta(returns[ticker_row], returns[rows[benchmark]], SECTOR_WINDOW)
+        performance = calculate_sector_performance(panel.frame('Adj Close'))
+        seasonality = seasonality_matrix(panel, 'month')
+        s.set(rows=returns.size)
+
+    title = f"{universe['sector']} Sector" if universe["sector"] else ticker.upper()
+    with span("figures.sector"):
+        performance_fig = create_sector_chart_fast(performance)
+        performance_fig['layout']['title']['text'] = f"{title} Performance Comparison"
+        heatmap_fig = create_correlation_heatmap_fast(
+            panel.tickers, correlation[..., -1], f"{SECTOR_WINDOW}-Day Return Correlation")
+        beta_fig = create_beta_chart_fast(panel.index, correlation[ticker_row, rows[benchmark]], beta,
+                                          benchmark, SECTOR_WINDOW)
+        seasonality_fig = create_seasonality_heatmap_fast(seasonality)
+        for fig in (performance_fig, heatmap_fig, beta_fig, seasonality_fig):
+            compact_figure(fig)
+
+    return html.Div([
+        html.Div(dcc.Graph(figure=performance_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up"),
+        html.Div([
+            html.Div(dcc.Graph(figure=heatmap_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up", style={"width": "49%"}),
+            html.Div(dcc.Graph(figure=beta_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up", style={"width": "49%"}),
+        ], style={"display": "flex", "gap": "20px", "justifyContent": "space-between"}),
+        html.Div(dcc.Graph(figure=seasonality_fig, config={'displayModeBar': False}), className="chart-card animate-slide-up"),
+    ]), True
+
+def build_news_panel(ticker, key):
+    news_items = fetch_source("news", fetch_stock_news, (ticker,), [])
+    news_components = []
+    if news_items:
+        for item in news_items[:10]: # Show top 10
+            title = item.get('title', 'No Title')
+            publisher = item.get('publisher', 'Unknown')
+            link = item.get('link', '#')
+
+            card = html.Div([
+                html.A(html.H6(title, className="news-title"), href=link, target="_blank", className="text-decoration-none"),
+                html.Div(f"{publisher}", className="news-meta")
+            ], className="news-card animate-fade-in")
+            news_components.append(card)
+    else:
+        news_components.append(html.P("No recent news found.", className="text-secondary"))
+    return news_components, bool(news_items)
+
+def build_prediction_panel(ticker, key):
+    df = dashboard_state(ticker, key)["df"]
+    with span("analysis.prediction") as s:
         prediction = predict_price(df)
-        if prediction:
-            current = prediction['current_price']
-            pred = prediction['predicted_price']
-            change = ((pred - current) / current) * 100
-            # Premium Palette Colors
-            color = "#10b981" if change > 0 else "#ef4444"
-            arrow = "▲" if change > 0 else "▼"
-            
-            pred_card = html.Div([
-                html.H6("AI FORECAST", className="terminal-header mb-3"),
-                html.Div([
-                    html.Span(f"{pred:.2f}", className="prediction-value", style={"fontSize": "2rem", "color": color}),
-                    html.Span(f" {arrow} {change:.2f}%", style={"color": color, "fontSize": "1rem", "marginLeft": "10px", "fontWeight": "600"})
-                ], style={"marginBottom": "8px"}),
-                html.Div(f"Confidence: {prediction['score']:.2f}", className="text-muted small")
-            ], className="sidebar-card animate-fade-in")
-        else:
-            pred_card = html.Div([
-                html.H6("AI FORECAST", className="terminal-header mb-3"),
-                html.P("Not enough data", className="text-secondary small")
-            ], className="sidebar-card")
-
-        # 4. Terminal Panels - Wrapped in sidebar card
-        def create_row(label, value):
-            return html.Div([
-                html.Span(label, className="terminal-label"),
-                html.Span(str(value), className="terminal-value")
-            ], className="terminal-row")
-
-        terminal_panels = html.Div([
-            html.H6("MARKET DATA", className="terminal-header mb-3"),
-            # Price Panel
-            html.Div([
-                create_row("Current", f"{fund_info.get('currency', '')} {fund_info.get('currentPrice', 'N/A')}"),
-                create_row("Open", fund_info.get('open', 'N/A')),
-                create_row("High", fund_info.get('dayHigh', 'N/A')),
-                create_row("Low", fund_info.get('dayLow', 'N/A')),
-            ], className="mb-3"),
-            
-            html.Hr(style={"borderColor": "var(--glass-border)", "margin": "16px 0"}),
-            
-            html.H6("FUNDAMENTALS", className="terminal-header mb-3", style={"marginTop": "16px"}),
-            # Fundamentals Panel
-            html.Div([
-                create_row("Market Cap", fund_info.get('marketCap', 'N/A')),
-                create_row("P/E Ratio", fund_info.get('trailingPE', 'N/A')),
-                create_row("P/B Ratio", fund_info.get('priceToBook', 'N/A')),
-                create_row("Div Yield", fund_info.get('dividendYield', 'N/A')),
-            ])
-        ], className="sidebar-card animate-fade-in")
+        s.set(rows=len(df))
+    if not prediction:
+        return html.Div([
+            html.H6("AI FORECAST", className="terminal-header mb-3"),
+            html.P("Not enough data", className="text-secondary small")
+        ], className="sidebar-card"), True
+
+    # How the same 60-day trend forecast did over the loaded history
+    with span("analysis.backtest"):
+        backtest = walk_forward_evaluation(df['Adj Close'].dropna(), 60).iloc[0]
+    current = prediction['current_price']
+    pred = prediction['predicted_price']
+    change = ((pred - current) / current) * 100
+    # Premium Palette Colors
+    color = "#10b981" if change > 0 else "#ef4444"
+    arrow = "▲" if change > 0 else "▼"
+
+    return html.Div([
+        html.H6("AI FORECAST", className="terminal-header mb-3"),
+        html.Div([
+            html.Span(f"{pred:.2f}", className="prediction-value", style={"fontSize": "2rem", "color": color}),
+            html.Span(f" {arrow} {change:.2f}%", style={"color": color, "fontSize": "1rem", "marginLeft": "10px", "fontWeight": "600"})
+        ], style={"marginBottom": "8px"}),
+        html.Div(f"Confidence: {prediction['score']:.2f}", className="text-muted small"),
+        html.Div(f"Backtest: {backtest['Hit Rate']:.0f}% direction hits, MAE {backtest['MAE']:.2f}",
+                 className="text-muted small")
+    ], className="sidebar-card animate-fade-in"), True
+
+def build_terminal_panel(ticker, key):
+    # A shared cache hit: the overview fetched the same fields
+    fund_info = fetch_source("fundamentals", fetch_fundamentals, (ticker,), {})
+
+    # Print to Console (Rich)
+    print_terminal_report(ticker, fund_info, dashboard_state(ticker, key)["df"])
+
+    def create_row(label, value):
+        return html.Div([
+            html.Span(label, className="terminal-label"),
+            html.Span(str(value), className="terminal-value")
+        ], className="terminal-row")
+
+    return html.Div([
+        html.H6("MARKET DATA", className="terminal-header mb-3"),
+        # Price Panel
+        html.Div([
+            create_row("Current", f"{fund_info.get('currency', '')} {fund_info.get('currentPrice', 'N/A')}"),
+            create_row("Open", fund_info.get('open', 'N/A')),
+            create_row("High", fund_info.get('dayHigh', 'N/A')),
+            create_row("Low", fund_info.get('dayLow', 'N/A')),
+        ], className="mb-3"),
+
+        html.Hr(style={"borderColor": "var(--glass-border)", "margin": "16px 0"}),
+
+        html.H6("FUNDAMENTALS", className="terminal-header mb-3", style={"marginTop": "16px"}),
+        # Fundamentals Panel
+        html.Div([
+            create_row("Market Cap", fund_info.get('marketCap', 'N/A')),
+            create_row("P/E Ratio", fund_info.get('trailingPE', 'N/A')),
+            create_row("P/B Ratio", fund_info.get('priceToBook', 'N/A')),
+            create_row("Div Yield", fund_info.get('dividendYield', 'N/A')),
+        ])
+    ], className="sidebar-card animate-fade-in"), bool(fund_info)
+
+# Panels filled in after the overview, each by its own callback and cached on its own:
+# name -> (container id, builder(ticker, key) -> (children, complete))
+PANELS = {
+    "seasonal": ("seasonal-container", build_seasonal_panel),
+    "sector": ("sector-container", build_sector_panel),
+    "news": ("news-feed-container", build_news_panel),
+    "prediction": ("prediction-container", build_prediction_panel),
+    "terminal": ("terminal-panels-container", build_terminal_panel),
+}
+
+def update_panel(name, dashboard):
+    """
+    Renders one panel for the overview's result key.
+
+    Args:
+        name (str): Panel name, a key of PANELS.
+        dashboard (dict): The dashboard-key store: 'ticker' and 'key'.
 
-        return metric_cards, charts, news_components, pred_card, terminal_panels
+    Returns:
+        The panel's children (empty while no ticker is shown).
+    """
+    if not dashboard:
+        return []
+    try:
+        build = PANELS[name][1]
+        with span(f"callback.{name}"):
+            return cached_output(name, f"{dashboard['key']}:{name}", lambda: build(dashboard["ticker"], dashboard["key"]))
+    except Exception as e:
+        return dbc.Alert(f"Could not load {name}: {str(e)}", color="danger", className="glass-card")
+
+def register_panel_callback(name, container_id):
+    # A separate callback per panel, so each is a separate request that shows when it finishes
+    @app.callback(Output(container_id, "children"), Input("dashboard-key", "data"))
+    def panel_callback(dashboard):
+        return update_panel(name, dashboard)
+    return panel_callback
+
+for _name, (_container_id, _) in PANELS.items():
+    register_panel_callback(_name, _container_id)
+
+def screener_panel():
+    """
+    The analysed screener universe (screener.load_universe).
+
+    Downloaded in one request and analysed in one pass for all tickers,
+    then reused for SCREENER_REFRESH_INTERVAL seconds by every scan. The
+    scans of one worker share a download in progress; after a failed one,
+    scans report the failure for SCREENER_RETRY_INTERVAL seconds without
+    downloading again.
+
+    Returns:
+        UniversePanel: Panel with the indicator fields, or None if the
+        download failed.
+    """
+    if time.time() - screener_failure["at"] < SCREENER_RETRY_INTERVAL:
+        return None
+    bucket = int(time.time() // SCREENER_REFRESH_INTERVAL) if SCREENER_REFRESH_INTERVAL else 0
+
+    def compute():
+        panel = fetch_source("screener", fetch_universe_data, (load_universe(), SCREENER_PERIOD), None)
+        if panel is None or panel.empty:
+            screener_failure["at"] = time.time()
+            return None
+        with span("analysis.screener") as s:
+            s.set(rows=panel['Adj Close'].size)
+            return analyze_universe(panel)
+    return screener_results.get_or_compute(f"{get_provider().name}:screener:{bucket}", compute)
+
+def create_screener_table(matches, universe_size):
+    """Lists the tickers a scan found, with the values the condition read."""
+    if matches.empty:
+        return html.P(f"No match among {universe_size} tickers.", className="text-secondary small")
+    columns = list(matches.columns[:3].drop('Since', errors='ignore'))
+    header = html.Thead(html.Tr([html.Th("Ticker")] + [html.Th("Close" if c == "Adj Close" else c) for c in columns]
+                                + [html.Th("Since")]))
+    rows = [
+        html.Tr([html.Td(ticker.replace(".NS", ""))] + [html.Td(f"{row[c]:,.2f}") for c in columns]
+                + [html.Td(row['Since'].strftime("%d %b"))])
+        for ticker, row in matches.head(SCREENER_MAX_ROWS).iterrows()
+    ]
+    return html.Div([
+        html.Div(f"{len(matches)} of {universe_size} tickers match", className="text-muted small mb-2"),
+        dbc.Table([header, html.Tbody(rows)], size="sm", hover=True, className="small mb-0"),
+    ])
+
+@app.callback(
+    Output("screener-results", "children"),
+    Input("screener-btn", "n_clicks"),
+    State("screener-input", "value"),
+    prevent_initial_call=True
+)
+def run_screener(n_clicks, text):
+    """Screens the universe and lists the tickers that meet the condition on their latest bar."""
+    try:
+        condition = compile_condition(text)
+        with span("callback.screener") as s:
+            panel = screener_panel()
+            if panel is None:
+                return dbc.Alert("Could not download the screener universe.", color="danger", className="small")
+            with span("analysis.screen"):
+                matches = screen(panel, condition)
+            s.set(rows=len(panel))
+        return create_screener_table(matches, len(panel))
+    except ScreenerError as e:
+        return dbc.Alert(str(e), color="warning", className="small")
+    except Exception as e:
+        return dbc.Alert(f"Screener failed: {str(e)}", color="danger", className="small")
+
+# Time to first paint, measured in the browser: from the click (or page
+# navigation, for the initial request) to the metric cards arriving
+app.clientside_callback(
+    """
+    function(nClicks) {
+        return nClicks ? performance.now() : 0;
+    }
+    """,
+    Output("paint-started", "data"),
+    Input("analyze-btn", "n_clicks"),
+)
+
+app.clientside_callback(
+    """
+    function(metrics, started) {
+        if (!metrics || !metrics.length || started === null || started === undefined) {
+            return window.dash_clientside.no_update;
+        }
+        const seconds = (performance.now() - started) / 1000;
+        navigator.sendBeacon("/dashboard-timings", JSON.stringify({stage: "first_paint", seconds: seconds}));
+        return "First paint in " + Math.round(seconds * 1000) + " ms";
+    }
+    """,
+    Output("first-paint", "children"),
+    Input("metrics-grid", "children"),
+    State("paint-started", "data"),
+)
+
+@app.callback(
+    [Output("ticker-tape", "children"),
+     Output("tape-version", "data")],
+    Input("tape-interval", "n_intervals"),
+    State("tape-version", "data")
+)
+def update_ticker_tape(n_intervals, version):
+    """Pushes the shared tape snapshot to the page when a worker has refreshed it."""
+    snapshot = read_tape_snapshot()
+    if snapshot is None or snapshot["fetched_at"] == version:
+        return dash.no_update, dash.no_update
+    return create_ticker_tape(snapshot["items"]), snapshot["fetched_at"]
+
+def rezoom_chart(relayout_data, ticker, interval, build_figure):
+    """Rebuilds a reduced chart for the range the user zoomed or panned to."""
+    x_range = visible_range(relayout_data)
+    if x_range is None or not ticker:
+        return dash.no_update
+    x_range = None if x_range == 'reset' else x_range
+    if interval in INTERVALS:
+        # Intraday charts are sent unreduced, so the browser zooms them on its own
+        return dash.no_update
+    df = fetch_stock_data(ticker)
+    if df.empty:
+        return dash.no_update
+    return compact_figure(build_figure(load_analysis(ticker, df), x_range))
+
+@app.callback(
+    Output("main-chart", "figure"),
+    Input("main-chart", "relayoutData"),
+    State("active-ticker", "data"),
+    State("active-interval", "data"),
+    prevent_initial_call=True
+)
+def rezoom_main_chart(relayout_data, ticker, interval):
+    return rezoom_chart(relayout_data, ticker, interval, create_main_chart_reduced)
+
+@app.callback(
+    Output("volatility-chart", "figure"),
+    Input("volatility-chart", "relayoutData"),
+    State("active-ticker", "data"),
+    State("active-interval", "data"),
+    prevent_initial_call=True
+)
+def rezoom_volatility_chart(relayout_data, ticker, interval):
+    return rezoom_chart(relayout_data, ticker, interval, create_volatility_chart_reduced)
+
+# Live updates poll only while switched on and intraday charts are showing
+app.clientside_callback(
+    """
+    function(live, cursor) {
+        return !(live && cursor);
+    }
+    """,
+    Output("live-interval", "disabled"),
+    Input("live-switch", "value"),
+    Input("live-cursor", "data"),
+)
+
+# Charts grown by a live update, in LIVE_TRACES order
+LIVE_CHARTS = ("main", "rsi", "macd", "volatility")
+
+@app.callback(
+    [Output("main-chart", "figure", allow_duplicate=True),
+     Output("rsi-chart", "figure"),
+     Output("macd-chart", "figure"),
+     Output("volatility-chart", "figure", allow_duplicate=True),
+     Output("live-cursor", "data", allow_duplicate=True),
+     Output("live-status", "children")],
+    Input("live-interval", "n_intervals"),
+    State("live-cursor", "data"),
+    prevent_initial_call=True
+)
+def stream_live_bars(n_intervals, cursor):
+    """
+    Appends the bars completed since the page's cursor to the open charts.
+
+    Each chart gets a Patch with only the new bars (and the redrawn
+    forming bar) instead of a new figure; charts are capped at the
+    cursor's capacity, so the response and the figures stay the same
+    size all session. Nothing is sent while no bar has changed.
+    """
+    unchanged = (dash.no_update,) * len(LIVE_CHARTS)
+    if not cursor:
+        return unchanged + (dash.no_update, "")
+    try:
+        with span("callback.live"):
+            update = live_update(cursor["ticker"], cursor["interval"], cursor["time"])
+            if update is None:
+                return unchanged + (dash.no_update, "Live updates paused: no intraday data")
+            rows, forming = update
+            status = f"Live · {forming.index[-1]:%H:%M} · ₹{forming['Close'].iloc[-1]:.2f}" if len(forming) else ""
+            forming_key = forming.to_json(orient="split", date_format="iso")
+            if rows.empty and forming_key == cursor.get("forming"):
+                return unchanged + (dash.no_update, status)
 
+            lengths = cursor["lengths"]
+            # Without new rows only the main chart's forming bar changes
+            patches = tuple(live_patch(chart, rows, lengths[chart], cursor["capacity"],
+                                       forming if chart == "main" else None)
+                            if chart == "main" or not rows.empty else dash.no_update
+                            for chart in LIVE_CHARTS)
+            if not rows.empty:
+                cursor = dict(cursor, time=rows.index[-1].isoformat())
+            return patches + (dict(cursor, lengths=lengths, forming=forming_key), status)
     except Exception as e:
-        return [], dbc.Alert(f"An error occurred: {str(e)}", color="danger", className="glass-card"), [], html.Div(), html.Div()
+        return unchanged + (dash.no_update, f"Live updates paused: {str(e)}")
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,410 @@
+"""
+Vectorised strategy backtests over a ticker universe.
+
+A strategy turns indicators into target positions (1 long, 0 flat, -1
+short) for every ticker and date of a (tickers, dates) close array. The
+position decided at a bar's close is held over the next bar, so a signal
+never trades on the price that produced it. Trading costs are charged on
+every change of position, in basis points of the traded value.
+
+Sweep mode runs a grid of strategy parameters for every ticker on a
+process pool. The close array is placed in shared memory once, and the
+workers map it instead of receiving a copy with every task:
+
+    python src/backtest.py --strategy sma_cross --grid fast=10,20,50 slow=100,150,200
+"""
+import argparse
+import itertools
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from analysis import TRADING_DAYS, ema, pct_change, rolling_mean, rsi
+
+# Cost of trading the whole position once, in basis points (brokerage, taxes and slippage)
+COST_BPS = 10
+# Processes of a parameter sweep (0: one per CPU)
+SWEEP_WORKERS = int(os.environ.get("SWEEP_WORKERS", 0))
+# 'spawn' starts clean workers; 'fork' starts faster but copies the parent's threads' locks
+SWEEP_START_METHOD = os.environ.get("SWEEP_START_METHOD", "spawn")
+
+
+# ---------------------------------------------------------------------------
+# Strategies: close (tickers, dates) -> target positions (tickers, dates).
+# `cache` holds the indicators of one close array by window, so the
+# combinations of a sweep that share a window compute it once.
+# ---------------------------------------------------------------------------
+
+def _cached(cache, key, compute):
+    if key not in cache:
+        cache[key] = compute()
+    return cache[key]
+
+def hold_between(entries, exits):
+    """
+    Positions that open on an entry signal and close on the next exit.
+
+    Args:
+        entries (np.ndarray): Boolean array, True where a position opens.
+        exits (np.ndarray): Boolean array, True where it closes (wins over an
+            entry on the same bar).
+
+    Returns:
+        np.ndarray: 1.0 from each entry up to the next exit, else 0.0.
+    """
+    state = np.where(exits, 0.0, np.where(entries, 1.0, np.nan))
+    dates = np.arange(state.shape[-1])
+    # Forward-fill the last signal; before the first one the position is flat
+    last = np.where(np.isnan(state), -1, dates)
+    np.maximum.accumulate(last, axis=-1, out=last)
+    held = np.take_along_axis(state, np.maximum(last, 0), axis=-1)
+    held[last < 0] = 0.0
+    return held
+
+def sma_cross(close, cache, fast=50, slow=200, short=False):
+    """Long while the fast SMA is above the slow one (the golden cross); short below it if `short`."""
+    fast_sma = _cached(cache, ('sma', fast), lambda: rolling_mean(close, fast))
+    slow_sma = _cached(cache, ('sma', slow), lambda: rolling_mean(close, slow))
+    with np.errstate(invalid='ignore'):
+        return np.where(fast_sma > slow_sma, 1.0, np.where(short & (fast_sma < slow_sma), -1.0, 0.0))
+
+def rsi_reversion(close, cache, window=14, lower=30, upper=70):
+    """Long from an RSI below `lower` (oversold) until it rises above `upper`."""
+    values = _cached(cache, ('rsi', window), lambda: rsi(close, window))
+    with np.errstate(invalid='ignore'):
+        return hold_between(values < lower, values > upper)
+
+def macd_cross(close, cache, fast=12, slow=26, signal=9, short=False):
+    """Long while the MACD line is above its signal line; short below it if `short`."""
+    macd = _cached(cache, ('macd', fast, slow),
+                   lambda: _cached(cache, ('ema', fast), lambda: ema(close, fast))
+                   - _cached(cache, ('ema', slow), lambda: ema(close, slow)))
+    line = _cached(cache, ('signal', fast, slow, signal), lambda: ema(macd, signal))
+    with np.errstate(invalid='ignore'):
+        return np.where(macd > line, 1.0, np.where(short & (macd < line), -1.0, 0.0))
+
+# Name -> (function, default parameters, whether a parameter combination makes sense)
+STRATEGIES = {
+    'sma_cross': (sma_cross, {'fast': 50, 'slow': 200, 'short': False}, lambda p: p['fast'] < p['slow']),
+    'rsi_reversion': (rsi_reversion, {'window': 14, 'lower': 30, 'upper': 70}, lambda p: p['lower'] < p['upper']),
+    'macd_cross': (macd_cross, {'fast': 12, 'slow': 26, 'signal': 9, 'short': False}, lambda p: p['fast'] < p['slow']),
+}
+
+
+# ---------------------------------------------------------------------------
+# Backtest
+# ---------------------------------------------------------------------------
+
+def simulate(close, positions, cost_bps=COST_BPS, cache=None):
+    """
+    P&L of target positions, bar by bar.
+
+    Args:
+        close (np.ndarray): (tickers, dates) or (dates,) closing prices.
+        positions (np.ndarray): Target positions of the same shape, decided
+            at each bar's close; NaN counts as flat.
+        cost_bps (float): Cost per unit of position traded, in basis points.
+        cache (dict): The strategy's cache, to reuse the close's returns.
+
+    Returns:
+        dict: 'held' (the position over each bar), 'returns' (the
+        strategy's net return of each bar), 'traded' (position traded at
+        the start of each bar) and 'asset' (the close-to-close return, NaN
+        where either close is missing).
+    """
+    cache = {} if cache is None else cache
+    asset = _cached(cache, 'asset', lambda: pct_change(close))
+    filled = _cached(cache, 'filled', lambda: np.nan_to_num(asset))
+    held = np.zeros_like(asset)
+    held[..., 1:] = np.nan_to_num(positions[..., :-1])
+    traded = np.abs(np.diff(held, axis=-1, prepend=0.0))
+    returns = held * filled - traded * (cost_bps / 1e4)
+    return {'held': held, 'returns': returns, 'traded': traded, 'asset': asset}
+
+def _statistics(sim, periods_per_year=TRADING_DAYS, cache=None):
+    """Per-ticker statistics of a `simulate` result, as arrays over the leading axes."""
+    cache = {} if cache is None else cache
+    returns, held, asset = sim['returns'], sim['held'], sim['asset']
+    valid = _cached(cache, 'valid', lambda: ~np.isnan(asset))
+    bars = _cached(cache, 'bars', lambda: valid.sum(axis=-1))
+    buy_hold = _cached(cache, 'buy_hold', lambda: np.prod(1.0 + np.nan_to_num(asset), axis=-1) - 1.0)
+    equity = np.cumprod(1.0 + returns, axis=-1)
+    drawdown = equity / np.maximum.accumulate(equity, axis=-1) - 1.0
+    entries = (held[..., 1:] != 0) & (held[..., 1:] != held[..., :-1])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        masked = np.where(valid, returns, 0.0)
+        mean = masked.sum(axis=-1) / bars
+        std = np.sqrt(np.maximum(np.einsum('...i,...i->...', masked, masked) - bars * mean * mean, 0.0) / (bars - 1))
+        total = equity[..., -1]
+        return {
+            'Total Return': (total - 1.0) * 100,
+            'CAGR': (total ** (periods_per_year / bars) - 1.0) * 100,
+            'Volatility': std * math.sqrt(periods_per_year) * 100,
+            'Sharpe': mean / std * math.sqrt(periods_per_year),
+            'Max Drawdown': drawdown.min(axis=-1) * 100,
+            'Turnover': sim['traded'].sum(axis=-1) / bars * periods_per_year,
+            'Trades': entries.sum(axis=-1),
+            'Exposure': np.where(valid, np.abs(held), 0.0).sum(axis=-1) / bars * 100,
+            'Buy & Hold': buy_hold * 100,
+        }
+
+
+class BacktestResult:
+    """
+    Output of `backtest`: bar-by-bar arrays for every ticker.
+
+    Attributes:
+        tickers (list): Row labels of the arrays.
+        index (pd.DatetimeIndex): Dates of the arrays' last axis.
+        held (np.ndarray): Position held over each bar.
+        returns (np.ndarray): Net strategy return of each bar.
+        equity (np.ndarray): Growth of 1 invested at the start.
+        drawdown (np.ndarray): Equity below its running peak (fraction, <= 0).
+        traded (np.ndarray): Position traded at the start of each bar.
+    """
+
+    def __init__(self, tickers, index, sim, periods_per_year=TRADING_DAYS):
+        self.tickers = tickers
+        self.index = index
+        self.held = sim['held']
+        self.returns = sim['returns']
+        self.traded = sim['traded']
+        self.equity = np.cumprod(1.0 + self.returns, axis=-1)
+        self.drawdown = self.equity / np.maximum.accumulate(self.equity, axis=-1) - 1.0
+        self._sim = sim
+        self.periods_per_year = periods_per_year
+
+    def stats(self):
+        """
+        Performance of each ticker.
+
+        Returns:
+            pd.DataFrame: One row per ticker with the total return, CAGR,
+            annualised volatility (%), Sharpe ratio, maximum drawdown (%),
+            annual turnover (position traded per year), trades, exposure
+            (% of bars in the market) and the buy-and-hold return (%).
+        """
+        return pd.DataFrame(_statistics(self._sim, self.periods_per_year),
+                            index=pd.Index(self.tickers, name='Ticker'))
+
+    def equity_frame(self):
+        """Returns the equity curves as a (dates x tickers) DataFrame."""
+        return pd.DataFrame(self.equity.T, index=self.index, columns=self.tickers)
+
+
+def backtest(panel, strategy='sma_cross', cost_bps=COST_BPS, **params):
+    """
+    Backtests a strategy on every ticker of a panel.
+
+    Args:
+        panel (universe.UniversePanel): Panel with 'Adj Close'.
+        strategy (str or np.ndarray): A name from STRATEGIES, or target
+            positions (tickers, dates) computed elsewhere, e.g. by
+            `condition_positions`.
+        cost_bps (float): Trading cost in basis points.
+        **params: Strategy parameters overriding its defaults.
+
+    Returns:
+        BacktestResult: Positions, returns, equity and drawdown per ticker.
+    """
+    close = panel['Adj Close']
+    if isinstance(strategy, str):
+        func, defaults, _ = STRATEGIES[strategy]
+        positions = func(close, {}, **{**defaults, **params})
+    else:
+        positions = strategy
+    return BacktestResult(panel.tickers, panel.index, simulate(close, positions, cost_bps))
+
+
+def condition_positions(panel, entry, exit=None):
+    """
+    Long positions from screener conditions.
+
+    Args:
+        panel (universe.UniversePanel): Analysed panel (`analyze_universe`).
+        entry (str): Condition that opens a position, e.g. 'RSI < 30'.
+        exit (str): Condition that closes it. Without one, the position is
+            held exactly while `entry` holds.
+
+    Returns:
+        np.ndarray: (tickers, dates) positions for `backtest`.
+    """
+    # Imported here so the sweep workers do not load the screener's parser
+    from screener import compile_condition
+
+    fields = list(panel.fields)
+    entries = compile_condition(entry, fields).evaluate(panel)
+    if exit is None:
+        return entries.astype(np.float64)
+    return hold_between(entries, compile_condition(exit, fields).evaluate(panel))
+
+
+# ---------------------------------------------------------------------------
+# Parameter sweep
+# ---------------------------------------------------------------------------
+
+# Worker state: the shared close array, attached once per process
+_shared = {}
+
+def parameter_grid(strategy, grid):
+    """
+    Parameter combinations of a sweep, skipping those that make no sense (e.g. fast >= slow).
+
+    Args:
+        strategy (str): A name from STRATEGIES.
+        grid (dict): Parameter name -> list of values; others keep their defaults.
+
+    Returns:
+        list: One dict of parameters per combination.
+    """
+    _, defaults, valid = STRATEGIES[strategy]
+    unknown = set(grid) - set(defaults)
+    if unknown:
+        raise ValueError(f"{strategy} has no parameter {', '.join(sorted(unknown))}")
+    names = list(grid)
+    combos = [{**defaults, **dict(zip(names, values))} for values in itertools.product(*grid.values())]
+    return [combo for combo in combos if valid(combo)]
+
+def _attach(name, shape, dtype):
+    """Pool initializer: maps the shared close array into this worker."""
+    block = shared_memory.SharedMemory(name=name)
+    _shared['block'] = block
+    _shared['close'] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _run_combos(close, strategy, combos, cost_bps, periods_per_year):
+    func = STRATEGIES[strategy][0]
+    cache = {}
+    return [_statistics(simulate(close, func(close, cache, **params), cost_bps, cache), periods_per_year, cache)
+            for params in combos]
+
+def _sweep_task(args):
+    return _run_combos(_shared['close'], *args)
+
+def _chunks(combos, leading, workers):
+    """
+    Splits combinations into chunks that share the value of the `leading` parameter.
+
+    Each group of equal leading values is one chunk, so a worker computes
+    that parameter's indicator once for the whole chunk. With fewer groups
+    than workers, groups are split evenly so every worker has a chunk.
+    """
+    groups = [list(group) for _, group in itertools.groupby(combos, key=lambda p: p.get(leading))]
+    pieces = max(1, math.ceil(workers / len(groups)))
+    chunks = []
+    for group in groups:
+        bounds = np.linspace(0, len(group), min(pieces, len(group)) + 1).round().astype(int)
+        chunks.extend(group[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:]))
+    return chunks
+
+def sweep(panel, strategy, grid, cost_bps=COST_BPS, workers=None, periods_per_year=TRADING_DAYS):
+    """
+    Backtests every parameter combination of a grid on every ticker.
+
+    Combinations are grouped into chunks by the value of the grid's first
+    parameter, so a worker computes that parameter's indicator window once
+    per chunk (see `_chunks`).
+    With more than one worker the close array is copied once into shared
+    memory and mapped by each process of the pool.
+
+    Args:
+        panel (universe.UniversePanel): Panel with 'Adj Close'.
+        strategy (str): A name from STRATEGIES.
+        grid (dict): Parameter name -> list of values, e.g.
+            {'fast': [10, 20, 50], 'slow': [100, 200]}.
+        cost_bps (float): Trading cost in basis points.
+        workers (int): Processes (default: SWEEP_WORKERS, or one per CPU);
+            1 runs in this process.
+        periods_per_year (int): Bars per year, for annualising.
+
+    Returns:
+        pd.DataFrame: One row per (Ticker, parameters...) with the
+        statistics of `BacktestResult.stats`.
+    """
+    combos = parameter_grid(strategy, grid)
+    if not combos:
+        raise ValueError("The grid has no valid parameter combination")
+    close = np.ascontiguousarray(panel['Adj Close'], dtype=np.float64)
+    workers = workers or SWEEP_WORKERS or os.cpu_count() or 1
+    # Grid order is kept: chunks are runs of combinations with the same leading value
+    chunks = _chunks(combos, next(iter(grid), None), workers)
+    workers = min(workers, len(chunks))
+
+    if workers <= 1:
+        results = [_run_combos(close, strategy, chunk, cost_bps, periods_per_year) for chunk in chunks]
+    else:
+        block = shared_memory.SharedMemory(create=True, size=close.nbytes)
+        try:
+            shared = np.ndarray(close.shape, dtype=close.dtype, buffer=block.buf)
+            shared[:] = close
+            del shared
+            context = multiprocessing.get_context(SWEEP_START_METHOD)
+            with ProcessPoolExecutor(workers, mp_context=context, initializer=_attach,
+                                     initargs=(block.name, close.shape, close.dtype.str)) as pool:
+                results = list(pool.map(_sweep_task, [(strategy, chunk, cost_bps, periods_per_year)
+                                                      for chunk in chunks]))
+        finally:
+            block.close()
+            block.unlink()
+
+    names = list(grid)
+    rows = []
+    for chunk, stats in zip(chunks, results):
+        for params, values in zip(chunk, stats):
+            for i, ticker in enumerate(panel.tickers):
+                rows.append({'Ticker': ticker, **{name: params[name] for name in names},
+                             **{key: value[i] for key, value in values.items()}})
+    return pd.DataFrame(rows).set_index(['Ticker'] + names)
+
+
+def _parse_grid(items):
+    """['fast=10,20', 'slow=100'] -> {'fast': [10, 20], 'slow': [100]}."""
+    grid = {}
+    for item in items:
+        name, _, values = item.partition('=')
+        grid[name] = [_parse_value(v) for v in values.split(',') if v]
+    return grid
+
+def _parse_value(text):
+    if text.lower() in ('true', 'false'):
+        return text.lower() == 'true'
+    return float(text) if '.' in text else int(text)
+
+
+def main():
+    import data_loader
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', nargs='+', default=None, help="default: the Nifty 50")
+    parser.add_argument('--period', default="10y")
+    parser.add_argument('--strategy', default='sma_cross', choices=sorted(STRATEGIES))
+    parser.add_argument('--grid', nargs='+', default=[], help="name=v1,v2,... per swept parameter")
+    parser.add_argument('--cost-bps', type=float, default=COST_BPS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=10, help="combinations listed, by mean Sharpe ratio")
+    args = parser.parse_args()
+
+    panel = data_loader.fetch_universe_data(args.tickers or data_loader.NIFTY50_SYMBOLS, args.period)
+    if panel is None:
+        return
+    grid = _parse_grid(args.grid)
+    started = time.perf_counter()
+    results = sweep(panel, args.strategy, grid, args.cost_bps, args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"{len(results)} backtests ({len(panel)} tickers x {len(results) // len(panel)} combinations) "
+          f"in {elapsed:.1f} s")
+    if grid:
+        summary = results.groupby(level=list(grid)).mean()
+        print(summary.sort_values('Sharpe', ascending=False).head(args.top).round(2).to_string())
+    else:
+        print(results.round(2).to_string())
+
+
+if __name__ == '__main__':
+    main()
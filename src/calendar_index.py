@@ -0,0 +1,166 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+WEEKDAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Statistics CalendarIndex.aggregate can compute, all from one pass over the values
+STATISTICS = ('count', 'sum', 'mean', 'median', 'hit_rate')
+
+# Calendar indexes kept per process (most recently used first out)
+CALENDAR_CACHE_SIZE = 64
+
+
+class CalendarIndex:
+    """
+    Integer calendar codes of a DatetimeIndex.
+
+    Holds zero-based month, weekday, year and ISO week codes, so grouped
+    statistics are `np.bincount` calls on integer keys instead of
+    pandas groupbys on string or derived columns. Use `calendar_index`
+    to share one instance between every aggregation over the same dates.
+    """
+
+    # Group name -> index name of the labels
+    GROUPS = {'month': 'Month', 'weekday': 'Day', 'year': 'Year', 'week': 'Week'}
+
+    def __init__(self, index):
+        self.index = index
+        years = np.asarray(index.year, dtype=np.intp)
+        self.first_year = int(years.min()) if len(years) else 0
+        self.codes = {
+            'month': np.asarray(index.month, dtype=np.intp) - 1,
+            'weekday': np.asarray(index.dayofweek, dtype=np.intp),
+            'year': years - self.first_year,
+            'week': np.asarray(index.isocalendar().week, dtype=np.intp) - 1,
+        }
+        self.sizes = {
+            'month': 12,
+            'weekday': 7,
+            'year': int(self.codes['year'].max()) + 1 if len(years) else 0,
+            'week': 53,
+        }
+
+    def __len__(self):
+        return len(self.index)
+
+    def labels(self, by):
+        """Group labels: month and week numbers, weekday names or calendar years."""
+        if by == 'weekday':
+            return pd.Index(WEEKDAY_NAMES, name=self.GROUPS[by])
+        # int32 like DatetimeIndex.month / .year, which groupby keys would carry
+        start = self.first_year if by == 'year' else 1
+        return pd.Index(np.arange(start, start + self.sizes[by], dtype=np.int32), name=self.GROUPS[by])
+
+    def rows(self, by):
+        """Number of dates in each group, NaN values included."""
+        return np.bincount(self.codes[by], minlength=self.sizes[by])
+
+    def aggregate(self, values, by, stats=('mean',)):
+        """
+        Grouped statistics of one or many series over the calendar groups.
+
+        NaNs are skipped. Counts, sums and hit rates are weighted bincounts;
+        medians come from a single sort of the values by group. Groups
+        without values give NaN (0 for counts and sums).
+
+        Args:
+            values (np.ndarray): (dates,) or (tickers, dates) values.
+            by (str): 'month', 'weekday', 'year' or 'week'.
+            stats (tuple): Names from STATISTICS; 'hit_rate' is the
+                percentage of positive values.
+
+        Returns:
+            dict: stat -> array of shape (groups,) or (tickers, groups).
+        """
+        unknown = set(stats) - set(STATISTICS)
+        if unknown:
+            raise ValueError(f"Unknown statistics: {sorted(unknown)}")
+        values = np.asarray(values, dtype=np.float64)
+        panel = np.atleast_2d(values)
+        rows = panel.shape[0]
+        size = self.sizes[by]
+
+        # One key per (ticker, group) pair
+        valid = ~np.isnan(panel)
+        keys = (np.arange(rows)[:, None] * size + self.codes[by][None, :])[valid]
+        flat = panel[valid]
+        count = np.bincount(keys, minlength=rows * size)
+
+        out = {}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if 'count' in stats:
+                out['count'] = count
+            if 'sum' in stats or 'mean' in stats:
+                sums = np.bincount(keys, weights=flat, minlength=rows * size)
+                if 'sum' in stats:
+                    out['sum'] = sums
+                if 'mean' in stats:
+                    out['mean'] = np.where(count > 0, sums / count, np.nan)
+            if 'hit_rate' in stats:
+                hits = np.bincount(keys, weights=flat > 0, minlength=rows * size)
+                out['hit_rate'] = np.where(count > 0, hits / count * 100, np.nan)
+        if 'median' in stats:
+            # Sort by value, then stably by key; small integer keys take NumPy's radix sort
+            by_value = np.argsort(flat)
+            ordered, ordered_keys = flat[by_value], keys[by_value]
+            if rows * size <= np.iinfo(np.int16).max:
+                ordered_keys = ordered_keys.astype(np.int16)
+            ordered = ordered[np.argsort(ordered_keys, kind='stable')]
+            starts = np.cumsum(count) - count
+            last = max(len(ordered) - 1, 0)
+            lower = np.minimum(starts + (count - 1) // 2, last)
+            upper = np.minimum(starts + count // 2, last)
+            if len(ordered):
+                out['median'] = np.where(count > 0, (ordered[lower] + ordered[upper]) / 2, np.nan)
+            else:
+                out['median'] = np.full(rows * size, np.nan)
+
+        shape = (size,) if values.ndim == 1 else (rows, size)
+        return {stat: out[stat].reshape(shape) for stat in stats}
+
+    def table(self, values, by, stats=('mean',), present_only=True):
+        """
+        Grouped statistics of one series as a DataFrame.
+
+        Args:
+            values (np.ndarray): (dates,) values.
+            by (str): Calendar group.
+            stats (tuple): Statistics, one column each.
+            present_only (bool): Drop groups with no dates (default: True).
+
+        Returns:
+            pd.DataFrame: One row per group label.
+        """
+        table = pd.DataFrame(self.aggregate(values, by, stats), index=self.labels(by))
+        return table[self.rows(by) > 0] if present_only else table
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def calendar_index(index):
+    """
+    Returns the CalendarIndex of a DatetimeIndex, built once per distinct index.
+
+    Indexes are matched by content (timestamps, unit and time zone), so a
+    re-read or sliced copy of the same dates reuses the cached codes.
+    """
+    # A 128-bit digest: a colliding key would silently serve another index's codes
+    digest = hashlib.blake2b(np.ascontiguousarray(index.asi8).data, digest_size=16).digest()
+    key = (len(index), str(index.dtype), digest)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+    built = CalendarIndex(index)
+    with _cache_lock:
+        _cache[key] = built
+        while len(_cache) > CALENDAR_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return built
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalesce within each process only
+    fcntl = None
+
+import data_loader
+
+
+class _Call:
+    """One in-flight computation that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time.
+
+    Callers in the same process that ask for a key already being computed
+    wait for that computation and share its result. Across processes, the
+    computations for a key are serialised with a file lock, so a worker
+    that waited can find the result the first one stored in a shared
+    cache instead of recomputing it. With `cross_process=False` the file
+    lock is skipped: for results kept in each process's own memory, where
+    waiting on another worker would only delay computing it again.
+    """
+
+    def __init__(self, name, cross_process=True):
+        self.name = name
+        self.cross_process = cross_process
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {"leaders": 0, "followers": 0}
+
+    def _lock_path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(data_loader.CACHE_DIR, "locks", f"{self.name}.{digest}.lock")
+
+    def do(self, key, func):
+        """
+        Returns func(), computed once for all concurrent callers with the same key.
+
+        Args:
+            key (str): Identity of the computation.
+            func (callable): Computes the result; only the leader calls it.
+
+        Returns:
+            Any: The leader's result (its exception is re-raised to every caller).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["leaders"] += 1
+            else:
+                self.stats["followers"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_locked(key, func)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run_locked(self, key, func):
+        if fcntl is None or not self.cross_process:
+            return func()
+        path = self._lock_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as lock_file:
+            # Blocks while another worker process computes the same key
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                return func()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
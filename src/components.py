@@ -1,6 +1,12 @@
+import base64
+import os
+
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+from dash import Patch
+
+from downsample import lttb_indices, resample_ohlc, choose_resolution, visible_slice, RESOLUTION_NAMES
 
 # Premium Fintech Palette
 COLORS = {
@@ -37,6 +43,7 @@ def update_layout_common(fig, title, height=None):
 
 def create_volatility_chart(df):
     """Creates a figure for volatility analysis."""
+    from plotly.subplots import make_subplots
     fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
                         vertical_spacing=0.1, subplot_titles=('Price History', 'Volatility (Rolling Std Dev)'))
     
@@ -55,6 +62,7 @@ def create_volatility_chart(df):
 
 def create_seasonal_charts(trends_data):
     """Creates figures for seasonal trends."""
+    import plotly.express as px
     # Monthly Trend
     monthly_fig = px.bar(trends_data['monthly'], x=trends_data['monthly'].index, y=trends_data['monthly'].values,
                          title="Average Monthly Returns", labels={'y': 'Avg Return', 'index': 'Month'})
@@ -77,6 +85,7 @@ def create_seasonal_charts(trends_data):
 
 def create_volume_chart(df, monthly_volume):
     """Creates figures for volume analysis."""
+    import plotly.express as px
     # Volume over time with MA
     vol_fig = go.Figure()
     vol_fig.add_trace(go.Bar(x=df.index, y=df['Volume'], name='Volume', marker_color='rgba(255, 255, 255, 0.1)'))
@@ -93,12 +102,14 @@ def create_volume_chart(df, monthly_volume):
 
 def create_sector_chart(sector_perf):
     """Creates a figure for sector comparison."""
+    import plotly.express as px
     fig = px.line(sector_perf, x=sector_perf.index, y=sector_perf.columns, title="Sector Performance Comparison")
     update_layout_common(fig, "Sector Performance Comparison", height=500)
     return fig
 
 def create_main_chart(df):
     """Creates the main candlestick chart with volume and MA overlays."""
+    from plotly.subplots import make_subplots
     fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
                         vertical_spacing=0.05, row_heights=[0.7, 0.3])
 
@@ -116,8 +127,8 @@ def create_main_chart(df):
                              line=dict(color=COLORS['cyan'], width=1)), row=1, col=1)
 
     # Volume
-    colors = [COLORS['success'] if row['Open'] - row['Adj Close'] >= 0 
-              else COLORS['danger'] for index, row in df.iterrows()]
+    colors = np.where(np.asarray(df['Open']) - np.asarray(df['Adj Close']) >= 0,
+                      COLORS['success'], COLORS['danger'])
     fig.add_trace(go.Bar(x=df.index, y=df['Volume'], name='Volume', marker_color=colors), row=2, col=1)
 
     update_layout_common(fig, "Price Action & Volume", height=700)
@@ -142,3 +153,739 @@ def create_technical_charts(df):
     update_layout_common(macd_fig, "MACD", height=300)
     
     return rsi_fig, macd_fig
+
+
+# ---------------------------------------------------------------------------
+# Fast figure builders
+#
+# The *_fast functions draw the same figures as the create_* functions
+# above, but emit plain figure dicts from precomputed arrays (such as an
+# analysis.AnalysisResult). They skip plotly's per-property validation,
+# encode numeric arrays as base64 typed arrays directly and share a single
+# copy of the dark template.
+# ---------------------------------------------------------------------------
+
+_TYPED_ARRAY_DTYPES = {
+    'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8',
+}
+_INT32_MAX = np.iinfo(np.int32).max
+
+_templates = {}
+
+def _dark_template():
+    """Returns the plotly_dark template as a dict, built once per process."""
+    if 'plotly_dark' not in _templates:
+        import plotly.io as pio
+        _templates['plotly_dark'] = pio.templates['plotly_dark'].to_plotly_json()
+    return _templates['plotly_dark']
+
+def _typed(values):
+    """Encodes a numeric array as a plotly.js typed array spec."""
+    values = np.asarray(values)
+    if values.dtype == np.int64 or values.dtype == np.uint64:
+        in_range = values.size == 0 or (values.min() >= 0 and values.max() <= _INT32_MAX)
+        values = values.astype(np.int32 if in_range else np.float64)
+    dtype = _TYPED_ARRAY_DTYPES.get(str(values.dtype))
+    if dtype is None or values.size == 0:
+        return values
+    spec = {'dtype': dtype, 'bdata': base64.b64encode(np.ascontiguousarray(values)).decode('ascii')}
+    if values.ndim > 1:
+        # Heatmap z: plotly.js reads the row-major layout from the shape
+        spec['shape'] = ', '.join(str(size) for size in values.shape)
+    return spec
+
+def _base_layout(title, height=None):
+    """Dict equivalent of update_layout_common on a fresh figure."""
+    layout = {
+        'template': _dark_template(),
+        'paper_bgcolor': COLORS['background'],
+        'plot_bgcolor': COLORS['background'],
+        'font': {'family': FONT_FAMILY, 'color': COLORS['text']},
+        'title': {'text': title, 'font': {'size': 14, 'color': COLORS['secondary']}},
+        'xaxis': {'showgrid': False, 'showline': True, 'linecolor': COLORS['grid']},
+        'yaxis': {'showgrid': True, 'gridcolor': COLORS['grid'], 'showline': False},
+        'margin': {'l': 10, 'r': 10, 't': 40, 'b': 10},
+        'hovermode': 'x unified',
+    }
+    if height:
+        layout['height'] = height
+    return layout
+
+def _stacked_layout(title, height, row_heights, spacing, subplot_titles=None):
+    """Dict equivalent of make_subplots(rows=2, shared_xaxes=True) + update_layout_common."""
+    layout = _base_layout(title, height)
+    rows = len(row_heights)
+    total = float(sum(row_heights))
+    # Same arithmetic as make_subplots: rows are stacked upwards from the bottom one
+    heights = [(1.0 - spacing * (rows - 1)) * (h / total) for h in reversed(row_heights)]
+    annotations = []
+    for row in range(1, rows + 1):
+        k = rows - row
+        start = sum(heights[:k]) + k * spacing
+        domain = [min(max(start, 0.0), 1.0), min(max(start + heights[k], 0.0), 1.0)]
+        suffix = '' if row == 1 else str(row)
+        layout.setdefault(f'xaxis{suffix}', {}).update({'anchor': f'y{suffix}', 'domain': [0.0, 1.0]})
+        layout.setdefault(f'yaxis{suffix}', {}).update({'anchor': f'x{suffix}', 'domain': domain})
+        if subplot_titles:
+            annotations.append({
+                'font': {'size': 16}, 'showarrow': False, 'text': subplot_titles[row - 1],
+                'x': 0.5, 'xanchor': 'center', 'xref': 'paper',
+                'y': domain[1], 'yanchor': 'bottom', 'yref': 'paper',
+            })
+    # Shared x axis: upper rows follow the bottom axis and hide their tick labels
+    bottom = f'x{rows}'
+    for row in range(1, rows):
+        suffix = '' if row == 1 else str(row)
+        layout[f'xaxis{suffix}'].update({'matches': bottom, 'showticklabels': False})
+    if annotations:
+        layout['annotations'] = annotations
+    return layout
+
+def _label(data, column, default):
+    """Window label of a rolling column (AnalysisResult.labels), e.g. '50-Day' or '1h'."""
+    return getattr(data, 'labels', {}).get(column, default)
+
+def _line(x, y, name, color, width=None, dash=None, axis=None):
+    line = {'color': color}
+    if dash:
+        line['dash'] = dash
+    if width is not None:
+        line['width'] = width
+    trace = {'type': 'scatter', 'x': x, 'y': _typed(y), 'name': name, 'line': line}
+    if axis:
+        trace['xaxis'], trace['yaxis'] = axis
+    return trace
+
+def _px_bar(series, color, y_label, title):
+    """Dict equivalent of the px.bar figures in create_seasonal_charts."""
+    layout = _base_layout(title)
+    layout['xaxis'].update({'anchor': 'y', 'domain': [0.0, 1.0], 'title': {'text': 'x'}})
+    layout['yaxis'].update({'anchor': 'x', 'domain': [0.0, 1.0], 'title': {'text': y_label}})
+    layout['legend'] = {'tracegroupgap': 0}
+    layout['barmode'] = 'relative'
+    index = series.index
+    x = _typed(index.to_numpy()) if index.dtype.kind in 'iuf' else list(index)
+    return {
+        'data': [{
+            'type': 'bar', 'x': x, 'y': _typed(series.to_numpy(dtype=np.float64)),
+            'hovertemplate': f'x=%{{x}}<br>{y_label}=%{{y}}<extra></extra>',
+            'legendgroup': '', 'name': '', 'orientation': 'v', 'showlegend': False,
+            'textposition': 'auto', 'xaxis': 'x', 'yaxis': 'y',
+            'marker': {'color': color, 'pattern': {'shape': ''}, 'line': {'width': 0}},
+        }],
+        'layout': layout,
+    }
+
+def create_volatility_chart_fast(data):
+    """Fast equivalent of create_volatility_chart."""
+    x = data.index
+    layout = _stacked_layout("Price & Volatility Analysis", 600, [1, 1], 0.1,
+                             subplot_titles=('Price History', 'Volatility (Rolling Std Dev)'))
+    return {
+        'data': [
+            _line(x, data['Adj Close'], 'Adj Close', COLORS['primary'], width=2, axis=('x', 'y')),
+            _line(x, data['RollingVol_30'], f"{_label(data, 'RollingVol_30', '30-Day')} Volatility", COLORS['warning'],
+                  width=1.5, axis=('x2', 'y2')),
+            _line(x, data['RollingVol_90'], f"{_label(data, 'RollingVol_90', '90-Day')} Volatility", COLORS['purple'],
+                  width=1.5, dash='dash', axis=('x2', 'y2')),
+        ],
+        'layout': layout,
+    }
+
+def create_seasonal_charts_fast(trends_data):
+    """Fast equivalent of create_seasonal_charts."""
+    return (
+        _px_bar(trends_data['monthly'], COLORS['primary'], 'Avg Return', "Average Monthly Returns"),
+        _px_bar(trends_data['day_of_week'], COLORS['cyan'], 'Avg Return', "Average Day-of-Week Returns"),
+        _px_bar(trends_data['yearly'], COLORS['purple'], 'Avg Return', "Average Yearly Returns"),
+    )
+
+def create_volume_chart_fast(data, monthly_volume):
+    """Fast equivalent of create_volume_chart."""
+    x = data.index
+    vol_fig = {
+        'data': [
+            {'type': 'bar', 'x': x, 'y': _typed(data['Volume']), 'name': 'Volume',
+             'marker': {'color': 'rgba(255, 255, 255, 0.1)'}},
+            _line(x, data['Volume_MA20'], f"{_label(data, 'Volume_MA20', '20-Day')} MA", COLORS['cyan'], width=1.5),
+        ],
+        'layout': _base_layout("Volume Analysis", height=400),
+    }
+    monthly_vol_fig = _px_bar(monthly_volume, COLORS['secondary'], 'Avg Volume', "Average Monthly Volume")
+    return vol_fig, monthly_vol_fig
+
+def create_sector_chart_fast(sector_perf):
+    """Fast equivalent of create_sector_chart."""
+    layout = _base_layout("Sector Performance Comparison", height=500)
+    layout['xaxis'].update({'anchor': 'y', 'domain': [0.0, 1.0], 'title': {'text': sector_perf.index.name or 'index'}})
+    layout['yaxis'].update({'anchor': 'x', 'domain': [0.0, 1.0], 'title': {'text': 'value'}})
+    legend_title = sector_perf.columns.name or 'variable'
+    layout['legend'] = {'title': {'text': legend_title}, 'tracegroupgap': 0}
+    x_label = sector_perf.index.name or 'index'
+    colorway = _dark_template()['layout']['colorway']
+
+    traces = []
+    for i, column in enumerate(sector_perf.columns):
+        traces.append({
+            'type': 'scatter', 'mode': 'lines', 'x': sector_perf.index,
+            'y': _typed(sector_perf[column].to_numpy(dtype=np.float64)),
+            'name': column, 'legendgroup': column, 'showlegend': True, 'orientation': 'v',
+            'hovertemplate': f'{legend_title}={column}<br>{x_label}=%{{x}}<br>value=%{{y}}<extra></extra>',
+            'line': {'color': colorway[i % len(colorway)], 'dash': 'solid'},
+            'marker': {'symbol': 'circle'}, 'xaxis': 'x', 'yaxis': 'y',
+        })
+    return {'data': traces, 'layout': layout}
+
+def create_correlation_heatmap_fast(labels, matrix, title="Return Correlation"):
+    """
+    Heatmap of a correlation matrix, e.g. one date of `analysis.rolling_correlation`.
+
+    Args:
+        labels (list): Row and column names.
+        matrix (np.ndarray): (n, n) correlations in [-1, 1].
+        title (str): Chart title.
+
+    Returns:
+        dict: Plotly figure.
+    """
+    layout = _base_layout(title, height=max(350, 60 + 28 * len(labels)))
+    layout['hovermode'] = 'closest'
+    layout['xaxis'].update({'showline': False, 'tickangle': -45})
+    layout['yaxis'].update({'showgrid': False, 'autorange': 'reversed'})
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return {
+        'data': [{
+            'type': 'heatmap', 'x': list(labels), 'y': list(labels), 'z': _typed(matrix),
+            'zmin': -1.0, 'zmax': 1.0,
+            'colorscale': [[0.0, COLORS['danger']], [0.5, '#1f2937'], [1.0, COLORS['success']]],
+            'hovertemplate': '%{y} / %{x}<br>correlation=%{z:.2f}<extra></extra>',
+            # Cell labels only while they stay legible
+            'texttemplate': '%{z:.2f}' if len(labels) <= 12 else '',
+        }],
+        'layout': layout,
+    }
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+def _calendar_labels(labels):
+    """Axis labels for calendar groups: month names for months, strings otherwise."""
+    if labels.name == 'Month':
+        return [MONTH_NAMES[month - 1] for month in labels]
+    return [str(label) for label in labels]
+
+def create_seasonal_stats_chart_fast(table, title):
+    """
+    Mean and median return per calendar group, with the hit rate on a second axis.
+
+    Args:
+        table (pd.DataFrame): `CalendarIndex.table` output with 'mean',
+            'median' and 'hit_rate' columns.
+        title (str): Chart title.
+
+    Returns:
+        dict: Plotly figure.
+    """
+    x = _calendar_labels(table.index)
+    layout = _base_layout(title)
+    layout['yaxis'].update({'title': {'text': 'Daily Return (%)'}})
+    layout['yaxis2'] = {'overlaying': 'y', 'side': 'right', 'range': [0, 100], 'showgrid': False,
+                        'title': {'text': 'Hit Rate (%)'}}
+    layout['legend'] = {'orientation': 'h', 'y': -0.15}
+    return {
+        'data': [
+            {'type': 'bar', 'x': x, 'y': _typed(table['mean'].to_numpy(dtype=np.float64) * 100), 'name': 'Mean',
+             'marker': {'color': COLORS['primary'], 'line': {'width': 0}}},
+            {'type': 'scatter', 'mode': 'markers', 'x': x, 'y': _typed(table['median'].to_numpy(dtype=np.float64) * 100),
+             'name': 'Median', 'marker': {'color': COLORS['warning'], 'symbol': 'diamond', 'size': 8}},
+            {'type': 'scatter', 'mode': 'lines+markers', 'x': x, 'y': _typed(table['hit_rate'].to_numpy(dtype=np.float64)),
+             'name': 'Hit Rate', 'yaxis': 'y2', 'line': {'color': COLORS['cyan'], 'width': 1.5, 'dash': 'dot'}},
+        ],
+        'layout': layout,
+    }
+
+def create_seasonality_heatmap_fast(matrix, title="Average Daily Return by Month (%)"):
+    """
+    Heatmap of a (tickers x calendar groups) seasonality matrix.
+
+    Args:
+        matrix (pd.DataFrame): `universe.seasonality_matrix` output (returns).
+        title (str): Chart title.
+
+    Returns:
+        dict: Plotly figure, with a colour scale centred on zero.
+    """
+    values = matrix.to_numpy(dtype=np.float64) * 100
+    finite = values[np.isfinite(values)]
+    limit = float(np.abs(finite).max()) if finite.size else 1.0
+    layout = _base_layout(title, height=max(350, 60 + 28 * len(matrix)))
+    layout['hovermode'] = 'closest'
+    layout['xaxis'].update({'showline': False})
+    layout['yaxis'].update({'showgrid': False, 'autorange': 'reversed'})
+    return {
+        'data': [{
+            'type': 'heatmap', 'x': _calendar_labels(matrix.columns), 'y': [str(t) for t in matrix.index],
+            'z': _typed(values), 'zmin': -limit, 'zmax': limit, 'zmid': 0.0,
+            'colorscale': [[0.0, COLORS['danger']], [0.5, '#1f2937'], [1.0, COLORS['success']]],
+            'hovertemplate': '%{y} %{x}<br>return=%{z:.3f}%<extra></extra>',
+        }],
+        'layout': layout,
+    }
+
+def create_beta_chart_fast(index, correlation, beta, benchmark, window):
+    """
+    Rolling correlation and beta of a ticker against its benchmark index.
+
+    Args:
+        index (pd.DatetimeIndex): Dates.
+        correlation (np.ndarray): Rolling correlation with the benchmark.
+        beta (np.ndarray): Rolling beta against the benchmark.
+        benchmark (str): Benchmark name for the title.
+        window (int): Window length in bars, for the title.
+
+    Returns:
+        dict: Plotly figure with correlation on top and beta below.
+    """
+    layout = _stacked_layout(f"Rolling {window}-Day Correlation & Beta vs {benchmark}", 450, [1, 1], 0.1,
+                             subplot_titles=('Correlation', 'Beta'))
+    return {
+        'data': [
+            _line(index, correlation, 'Correlation', COLORS['cyan'], width=1.5, axis=('x', 'y')),
+            _line(index, beta, 'Beta', COLORS['warning'], width=1.5, axis=('x2', 'y2')),
+        ],
+        'layout': layout,
+    }
+
+def create_main_chart_fast(data):
+    """Fast equivalent of create_main_chart."""
+    x = data.index
+    layout = _stacked_layout("Price Action & Volume", 700, [0.7, 0.3], 0.05)
+    layout['xaxis']['rangeslider'] = {'visible': False}
+    layout['xaxis2']['rangeslider'] = {'visible': False}
+
+    # Volume bar colours as 0/1 codes on a two-colour scale instead of one string per bar
+    up = (np.asarray(data['Open']) - np.asarray(data['Adj Close']) >= 0).astype(np.uint8)
+    return {
+        'data': [
+            {'type': 'candlestick', 'x': x, 'open': _typed(data['Open']), 'high': _typed(data['High']),
+             'low': _typed(data['Low']), 'close': _typed(data['Adj Close']), 'name': 'OHLC',
+             'increasing': {'line': {'color': COLORS['success']}},
+             'decreasing': {'line': {'color': COLORS['danger']}},
+             'xaxis': 'x', 'yaxis': 'y'},
+            _line(x, data['SMA_50'], f"{_label(data, 'SMA_50', '50-Day')} SMA", COLORS['warning'],
+                  width=1, axis=('x', 'y')),
+            _line(x, data['SMA_200'], f"{_label(data, 'SMA_200', '200-Day')} SMA", COLORS['cyan'],
+                  width=1, axis=('x', 'y')),
+            {'type': 'bar', 'x': x, 'y': _typed(data['Volume']), 'name': 'Volume',
+             'marker': {'color': _typed(up), 'cmin': 0, 'cmax': 1,
+                        'colorscale': [[0, COLORS['danger']], [1, COLORS['success']]]},
+             'xaxis': 'x2', 'yaxis': 'y2'},
+        ],
+        'layout': layout,
+    }
+
+def create_technical_charts_fast(data):
+    """Fast equivalent of create_technical_charts."""
+    x = data.index
+    rsi_layout = _base_layout("Relative Strength Index (RSI)", height=300)
+    rsi_layout['shapes'] = [
+        {'type': 'line', 'xref': 'x domain', 'yref': 'y', 'x0': 0, 'x1': 1, 'y0': level, 'y1': level,
+         'line': {'color': color, 'dash': 'dash'}, 'opacity': 0.5}
+        for level, color in ((70, COLORS['danger']), (30, COLORS['success']))
+    ]
+    rsi_fig = {'data': [_line(x, data['RSI'], 'RSI', COLORS['purple'])], 'layout': rsi_layout}
+
+    macd = np.asarray(data['MACD'])
+    signal = np.asarray(data['Signal_Line'])
+    macd_fig = {
+        'data': [
+            _line(x, macd, 'MACD', COLORS['cyan']),
+            _line(x, signal, 'Signal', COLORS['warning']),
+            {'type': 'bar', 'x': x, 'y': _typed(macd - signal), 'name': 'Histogram',
+             'marker': {'color': 'rgba(255,255,255,0.1)'}},
+        ],
+        'layout': _base_layout("MACD", height=300),
+    }
+    return rsi_fig, macd_fig
+
+
+# Nights and weekends hidden on intraday axes (NSE session 09:15 to 15:30)
+SESSION_BREAKS = [
+    {'bounds': ['sat', 'mon']},
+    {'bounds': [15.5, 9.25], 'pattern': 'hour'},
+]
+
+def add_session_breaks(figure):
+    """Hides the hours between sessions on every x axis of an intraday figure."""
+    for name, axis in figure['layout'].items():
+        if name.startswith('xaxis'):
+            axis['rangebreaks'] = SESSION_BREAKS
+    return figure
+
+
+# ---------------------------------------------------------------------------
+# Compact wire encoding
+#
+# compact_figure shrinks a built figure just before it is sent. Each float
+# series is rounded to FIGURE_DIGITS significant digits, but never to
+# fewer than FIGURE_DECIMALS decimal places, so a price keeps its paise
+# however large it is. A series whose values fit in 6 digits is sent as a
+# float32 typed array (float32 holds any 6-digit decimal exactly), a series
+# of larger prices (an index at 24567.85) as float64; a
+# whole-number series (volumes, colour codes) goes in the narrowest integer
+# type that holds it. Dates are sent as the shortest ISO string of each
+# ('2024-03-04' for a daily bar, '2024-03-04T09:15' for a minute bar):
+# numbers would be smaller, but plotly.js reads numbers on a date axis in
+# the browser's time zone.
+# ---------------------------------------------------------------------------
+
+# Send figures in the compact encoding (0 sends the builders' full precision, for benchmarking)
+COMPACT_FIGURES = os.environ.get("COMPACT_FIGURES", "1") != "0"
+# Significant digits kept of each float value; above 6 floats are sent as float64
+FIGURE_DIGITS = int(os.environ.get("FIGURE_DIGITS", 6))
+# Decimal places every float value keeps, whatever its size (a price's paise)
+FIGURE_DECIMALS = int(os.environ.get("FIGURE_DECIMALS", 2))
+# Significant digits float32 holds exactly
+_FLOAT32_DIGITS = 6
+
+_INTEGER_TYPES = (np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32)
+
+def _significant(values, digits, decimals=None):
+    """Rounds each value to `digits` significant digits, or to at least `decimals` decimal places."""
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    exponent = digits - 1 - np.nan_to_num(magnitude, nan=0.0, posinf=0.0, neginf=0.0)
+    if decimals is not None:
+        exponent = np.maximum(exponent, decimals)
+    # Scale by exact powers of ten (multiply or divide), so each result is
+    # the float closest to its decimal and prints as that decimal
+    up = 10.0 ** np.maximum(exponent, 0)
+    down = 10.0 ** np.maximum(-exponent, 0)
+    return np.rint(values * up / down) * down / up
+
+def _whole(values):
+    """Whether every finite value is a whole number (volumes, counts, codes)."""
+    finite = values[np.isfinite(values)]
+    return bool((finite == np.rint(finite)).all())
+
+def _narrow(values, digits):
+    """A numeric array in the narrowest type that keeps it as compact_figure rounds it."""
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iuf' or values.size == 0:
+        return values
+    if values.dtype.kind == 'f' and not np.isfinite(values).any():
+        return values.astype(np.float32)
+    if values.dtype.kind in 'iu' or _whole(values):
+        # Whole numbers are kept exactly: in an integer type, or as floats when some are missing
+        low, high = np.nanmin(values), np.nanmax(values)
+        if values.dtype.kind in 'iu' or not np.isnan(values).any():
+            for dtype in _INTEGER_TYPES:
+                limits = np.iinfo(dtype)
+                if limits.min <= low and high <= limits.max:
+                    return values.astype(dtype)
+        return values.astype(np.float32 if max(abs(low), abs(high)) <= 2 ** 24 else np.float64)
+    # Past 10 ** (6 - FIGURE_DECIMALS) a value keeps more than 6 digits and needs float64
+    small = np.nanmax(np.abs(values)) < 10.0 ** (_FLOAT32_DIGITS - FIGURE_DECIMALS)
+    rounded = _significant(values, digits, FIGURE_DECIMALS)
+    return rounded.astype(np.float32 if digits <= _FLOAT32_DIGITS and small else np.float64)
+
+def _round_list(values, digits):
+    """A plain list of floats rounded as compact_figure rounds a series, whole numbers kept as they are."""
+    array = np.asarray(values, dtype=np.float64)
+    if _whole(array):
+        return array.tolist()
+    return _significant(array, digits, FIGURE_DECIMALS).tolist()
+
+def _compact_dates(values):
+    """Each datetime as the shortest ISO string that keeps it, in wall-clock time."""
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return np.datetime_as_string(index.to_numpy(), unit='auto').tolist()
+
+def _is_dates(value):
+    if isinstance(value, pd.DatetimeIndex):
+        return True
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind == 'M'
+    return isinstance(value, list) and len(value) > 0 and isinstance(value[0], pd.Timestamp)
+
+def _compact_values(value, digits, dates):
+    """Compact form of one trace attribute, or the value itself if it is not an array."""
+    if _is_dates(value):
+        # Traces often share one index: convert it once (`dates` holds the lists by the index's id)
+        if id(value) not in dates:
+            dates[id(value)] = (value, _compact_dates(value))
+        return dates[id(value)][1]
+    if isinstance(value, dict) and 'bdata' in value:
+        values = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+        if 'shape' in value:
+            values = values.reshape([int(size) for size in value['shape'].split(',')])
+        return _typed(_narrow(values, digits))
+    if isinstance(value, np.ndarray):
+        return _typed(_narrow(value, digits))
+    if isinstance(value, list) and value and all(isinstance(v, float) for v in value):
+        # Plain lists (live charts) stay lists, of shorter numbers
+        return _round_list(value, digits)
+    return value
+
+def compact_figure(figure, digits=None):
+    """
+    Re-encodes a figure's trace arrays compactly for sending (see above).
+
+    Does nothing while COMPACT_FIGURES is off.
+
+    Args:
+        figure (dict): Figure dict from a *_fast or *_reduced builder, or
+            with plain lists (plain_arrays).
+        digits (int): Significant digits kept of float values (default: FIGURE_DIGITS).
+
+    Returns:
+        dict: The same figure, modified in place.
+    """
+    if not COMPACT_FIGURES:
+        return figure
+    digits = digits or FIGURE_DIGITS
+    dates = {}
+
+    def encode(container):
+        for key, value in container.items():
+            if isinstance(value, dict) and 'bdata' not in value:
+                encode(value)
+            else:
+                container[key] = _compact_values(value, digits, dates)
+
+    for trace in figure['data']:
+        encode(trace)
+    return figure
+
+def _wire_dates(index):
+    """Dates of a live update, encoded as compact_figure encodes the chart's."""
+    return _compact_dates(index) if COMPACT_FIGURES else list(index)
+
+def _wire_values(values):
+    """Values of a live update, rounded as compact_figure rounds the chart's."""
+    values = np.asarray(values)
+    if COMPACT_FIGURES and values.dtype.kind == 'f':
+        return _round_list(values, FIGURE_DIGITS)
+    return values.tolist()
+
+
+# ---------------------------------------------------------------------------
+# Live intraday figures
+#
+# A live chart is sent once, then grown in place: each poll returns a Patch
+# that appends the newly completed bars to every trace and drops as many
+# of the oldest, so responses and figures stay the same size all session.
+# The bar still forming is drawn by two extra traces on the main chart and
+# replaced on each poll.
+# ---------------------------------------------------------------------------
+
+# Row column behind each attribute of each trace, in trace order, besides 'x'.
+# 'Up' is the volume colour code and 'Histogram' MACD minus signal, as in the builders.
+LIVE_TRACES = {
+    'main': [
+        {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'},
+        {'y': 'SMA_50'},
+        {'y': 'SMA_200'},
+        {'y': 'Volume', 'marker.color': 'Up'},
+    ],
+    'rsi': [{'y': 'RSI'}],
+    'macd': [{'y': 'MACD'}, {'y': 'Signal_Line'}, {'y': 'Histogram'}],
+    'volatility': [{'y': 'Close'}, {'y': 'RollingVol_30'}, {'y': 'RollingVol_90'}],
+}
+
+def plain_arrays(figure):
+    """
+    Replaces the typed-array specs of a figure's traces with lists.
+
+    Patch operations extend lists; plotly.js keeps a typed array's spec
+    (not an array) in the figure, so a live chart is sent as plain lists.
+    """
+    def decode(container):
+        for key, value in container.items():
+            if isinstance(value, dict) and 'bdata' in value:
+                container[key] = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype']).tolist()
+            elif isinstance(value, dict):
+                decode(value)
+            elif isinstance(value, np.ndarray):
+                container[key] = value.tolist()
+
+    for trace in figure['data']:
+        decode(trace)
+    return figure
+
+def trace_lengths(figure, chart):
+    """Points in each live trace of a figure (see LIVE_TRACES)."""
+    return [len(trace['x']) for trace in figure['data'][:len(LIVE_TRACES[chart])]]
+
+def _forming_traces(bars):
+    x = _wire_dates(bars.index)
+    return [
+        {'type': 'candlestick', 'x': x, 'open': _wire_values(bars['Open']), 'high': _wire_values(bars['High']),
+         'low': _wire_values(bars['Low']), 'close': _wire_values(bars['Close']), 'name': 'Forming', 'opacity': 0.5,
+         'showlegend': False, 'increasing': {'line': {'color': COLORS['success']}},
+         'decreasing': {'line': {'color': COLORS['danger']}}, 'xaxis': 'x', 'yaxis': 'y'},
+        {'type': 'bar', 'x': x, 'y': _wire_values(bars['Volume']), 'name': 'Forming', 'showlegend': False,
+         'marker': {'color': COLORS['secondary']}, 'opacity': 0.5, 'xaxis': 'x2', 'yaxis': 'y2'},
+    ]
+
+def add_forming_bar(figure, bars):
+    """
+    Draws the bars still forming on a main chart as two extra traces.
+
+    Args:
+        figure (dict): Main chart of the completed bars.
+        bars (pd.DataFrame): Forming bars with Open, High, Low, Close and Volume.
+    """
+    figure['data'].extend(_forming_traces(bars))
+    return figure
+
+def _live_values(rows, column):
+    if column == 'Up':
+        return (rows['Open'].to_numpy() - rows['Close'].to_numpy() >= 0).astype(int).tolist()
+    if column == 'Histogram':
+        return _wire_values(rows['MACD'].to_numpy() - rows['Signal_Line'].to_numpy())
+    return _wire_values(rows[column])
+
+def live_patch(chart, rows, lengths, capacity, forming=None):
+    """
+    Patch appending newly completed bars to an open live chart.
+
+    Args:
+        chart (str): 'main', 'rsi', 'macd' or 'volatility' (a key of LIVE_TRACES).
+        rows (pd.DataFrame): New bars with OHLCV and indicator columns (live.COLUMNS).
+        lengths (list): Points in each trace of the open figure; updated in place.
+        capacity (int): Maximum points kept per trace.
+        forming (pd.DataFrame): Bars still forming, redrawn on the main chart.
+
+    Returns:
+        dash.Patch: Operations whose size depends on the new bars only.
+    """
+    patch = Patch()
+    x = _wire_dates(rows.index)
+    for i, columns in enumerate(LIVE_TRACES[chart] if len(rows) else []):
+        drop = max(0, lengths[i] + len(rows) - capacity)
+        for attribute, values in [('x', x)] + [(a, _live_values(rows, c)) for a, c in columns.items()]:
+            target = patch['data'][i]
+            for part in attribute.split('.'):
+                target = target[part]
+            target.extend(values)
+            for _ in range(drop):
+                del target[0]
+        lengths[i] += len(rows) - drop
+    if chart == 'main' and forming is not None:
+        first = len(LIVE_TRACES['main'])
+        for offset, trace in enumerate(_forming_traces(forming)):
+            for attribute in ('x', 'open', 'high', 'low', 'close', 'y'):
+                if attribute in trace:
+                    patch['data'][first + offset][attribute] = trace[attribute]
+    return patch
+
+
+# ---------------------------------------------------------------------------
+# Reduced (downsampled) figures
+#
+# Long histories are reduced on the server before they reach the browser:
+# candles are rolled up to weekly or monthly bars and lines are thinned
+# with LTTB, so each chart stays within its point budget. Zooming in
+# (reported through relayoutData) rebuilds the figure for the visible
+# range, reaching full daily resolution once it fits the budget.
+# ---------------------------------------------------------------------------
+
+# Maximum points per trace sent to the browser, per chart
+CHART_POINT_BUDGETS = {
+    'main': 800,
+    'volatility': 1500,
+}
+
+def _reduced_line(x, y, budget, name, color, width=None, dash=None, axis=None):
+    keep = lttb_indices(x, y, budget)
+    return _line(x[keep], np.asarray(y)[keep], name, color, width=width, dash=dash, axis=axis)
+
+def _keep_range(layout, axis, x_range):
+    """Pins the x axis to the range the user is looking at."""
+    if x_range is not None:
+        layout[axis]['range'] = [str(x_range[0]), str(x_range[1])]
+
+def create_main_chart_reduced(data, x_range=None, budget=None):
+    """
+    Main chart reduced to a point budget for the visible range.
+    
+    Args:
+        data (AnalysisResult or pd.DataFrame): Analysed stock data.
+        x_range (tuple): Visible (start, end) timestamps, or None for all history.
+        budget (int): Maximum points per trace (default: CHART_POINT_BUDGETS['main']).
+        
+    Returns:
+        dict: Figure dict in the style of create_main_chart_fast.
+    """
+    budget = budget or CHART_POINT_BUDGETS['main']
+    window = visible_slice(data.index, x_range, margin=0.5 if x_range else 0)
+    index = data.index[window]
+    resolution = choose_resolution(len(index), budget)
+    
+    bars = resample_ohlc(index, np.asarray(data['Open'])[window], np.asarray(data['High'])[window],
+                         np.asarray(data['Low'])[window], np.asarray(data['Adj Close'])[window],
+                         np.asarray(data['Volume'])[window], resolution)
+    title = "Price Action & Volume"
+    if resolution != 'D':
+        title = f"{title} ({RESOLUTION_NAMES[resolution]})"
+    layout = _stacked_layout(title, 700, [0.7, 0.3], 0.05)
+    layout['xaxis']['rangeslider'] = {'visible': False}
+    layout['xaxis2']['rangeslider'] = {'visible': False}
+    _keep_range(layout, 'xaxis2', x_range)
+    layout['meta'] = {'resolution': resolution}
+    
+    up = (bars['Open'] - bars['Close'] >= 0).astype(np.uint8)
+    return {
+        'data': [
+            {'type': 'candlestick', 'x': bars['index'], 'open': _typed(bars['Open']), 'high': _typed(bars['High']),
+             'low': _typed(bars['Low']), 'close': _typed(bars['Close']), 'name': 'OHLC',
+             'increasing': {'line': {'color': COLORS['success']}},
+             'decreasing': {'line': {'color': COLORS['danger']}},
+             'xaxis': 'x', 'yaxis': 'y'},
+            _reduced_line(index, np.asarray(data['SMA_50'])[window], budget,
+                          f"{_label(data, 'SMA_50', '50-Day')} SMA", COLORS['warning'], width=1, axis=('x', 'y')),
+            _reduced_line(index, np.asarray(data['SMA_200'])[window], budget,
+                          f"{_label(data, 'SMA_200', '200-Day')} SMA", COLORS['cyan'], width=1, axis=('x', 'y')),
+            {'type': 'bar', 'x': bars['index'], 'y': _typed(bars['Volume']), 'name': 'Volume',
+             'marker': {'color': _typed(up), 'cmin': 0, 'cmax': 1,
+                        'colorscale': [[0, COLORS['danger']], [1, COLORS['success']]]},
+             'xaxis': 'x2', 'yaxis': 'y2'},
+        ],
+        'layout': layout,
+    }
+
+def create_volatility_chart_reduced(data, x_range=None, budget=None):
+    """
+    Volatility chart with every line thinned by LTTB to the point budget.
+    
+    Args:
+        data (AnalysisResult or pd.DataFrame): Analysed stock data.
+        x_range (tuple): Visible (start, end) timestamps, or None for all history.
+        budget (int): Maximum points per trace (default: CHART_POINT_BUDGETS['volatility']).
+        
+    Returns:
+        dict: Figure dict in the style of create_volatility_chart_fast.
+    """
+    budget = budget or CHART_POINT_BUDGETS['volatility']
+    window = visible_slice(data.index, x_range, margin=0.5 if x_range else 0)
+    x = data.index[window]
+    layout = _stacked_layout("Price & Volatility Analysis", 600, [1, 1], 0.1,
+                             subplot_titles=('Price History', 'Volatility (Rolling Std Dev)'))
+    _keep_range(layout, 'xaxis2', x_range)
+    return {
+        'data': [
+            _reduced_line(x, np.asarray(data['Adj Close'])[window], budget, 'Adj Close', COLORS['primary'],
+                          width=2, axis=('x', 'y')),
+            _reduced_line(x, np.asarray(data['RollingVol_30'])[window], budget,
+                          f"{_label(data, 'RollingVol_30', '30-Day')} Volatility", COLORS['warning'],
+                          width=1.5, axis=('x2', 'y2')),
+            _reduced_line(x, np.asarray(data['RollingVol_90'])[window], budget,
+                          f"{_label(data, 'RollingVol_90', '90-Day')} Volatility", COLORS['purple'],
+                          width=1.5, dash='dash', axis=('x2', 'y2')),
+        ],
+        'layout': layout,
+    }
@@ -0,0 +1,127 @@
+"""
+Compression of the dashboard's HTTP responses.
+
+Dash sends callback results and its layout as JSON text. Figures, even in
+the compact encoding, and the component trees around them repeat keys,
+digits and base64 text that gzip or brotli shrink several times over.
+ResponseCompressor encodes a Flask response for the client's
+Accept-Encoding, preferring brotli when the brotli package is installed.
+Static bodies (Dash's JavaScript bundles, the same bytes on every page
+load) are compressed once and reused.
+"""
+import gzip
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:  # brotli is optional: gzip only
+    brotli = None
+
+# Compress responses (0 sends them as they are, for benchmarking)
+COMPRESS_RESPONSES = os.environ.get("COMPRESS_RESPONSES", "1") != "0"
+# Bodies smaller than this are sent as they are: the saving would not pay for the work
+COMPRESS_MIN_BYTES = 1024
+# Fast settings: callback responses are compressed on every request
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 5
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/css', 'text/plain',
+                      'text/javascript', 'application/javascript')
+
+
+def choose_encoding(accept_encodings):
+    """
+    Content encoding to send for a request.
+
+    Args:
+        accept_encodings (werkzeug.datastructures.Accept): The request's
+            parsed Accept-Encoding header.
+
+    Returns:
+        str: 'br', 'gzip' or None.
+    """
+    for encoding in (('br',) if brotli is not None else ()) + ('gzip',):
+        if accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def compress(data, encoding):
+    """Compresses bytes with 'br' or 'gzip' (without a timestamp, so equal bodies compress equally)."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class ResponseCompressor:
+    """
+    Compresses Flask responses, keeping the compressed static bodies.
+
+    A body is static when the response has an ETag or a cache lifetime:
+    its compressed form is kept, least recently used dropped beyond
+    `cache_size`, keyed by the tag or path and the encoding.
+    """
+
+    def __init__(self, min_bytes=COMPRESS_MIN_BYTES, cache_size=32):
+        self.min_bytes = min_bytes
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"compressed": 0, "cached": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def _static_key(self, response, path):
+        tag = response.get_etag()[0]
+        if tag:
+            return tag
+        if response.cache_control.max_age:
+            return path
+        return None
+
+    def _compressed(self, key, encoding, data):
+        if key is None:
+            return compress(data, encoding)
+        with self._lock:
+            body = self._cache.get((key, encoding))
+            if body is not None:
+                self._cache.move_to_end((key, encoding))
+                self.stats["cached"] += 1
+                return body
+        body = compress(data, encoding)
+        with self._lock:
+            self._cache[(key, encoding)] = body
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return body
+
+    def __call__(self, response, accept_encodings, path=""):
+        """
+        Compresses `response` in place if the client accepts it and it is worth it.
+
+        Args:
+            response (flask.Response): A finished response.
+            accept_encodings (werkzeug.datastructures.Accept): The request's Accept-Encoding.
+            path (str): Request path, the key of a static body without an ETag.
+
+        Returns:
+            flask.Response: The same response.
+        """
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+        # Caches must keep the encodings apart even when this one is sent as it is
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(accept_encodings)
+        data = response.get_data()
+        if encoding is None or len(data) < self.min_bytes:
+            return response
+
+        body = self._compressed(self._static_key(response, path), encoding, data)
+        if len(body) >= len(data):
+            return response
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        self.stats["compressed"] += 1
+        self.stats["bytes_in"] += len(data)
+        self.stats["bytes_out"] += len(body)
+        return response
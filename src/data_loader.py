@@ -1,39 +1,260 @@
-import yfinance as yf
+import numpy as np
 import pandas as pd
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
-def fetch_stock_data(ticker, period="10y"):
+from intraday import FeedRegistry
+from metrics import span
+from providers import get_provider, period_start
+from shared_cache import get_shared_cache
+from universe import UniversePanel, ticker_tape_items
+
+# On-disk OHLCV cache (one Parquet file per ticker and adjustment mode)
+CACHE_DIR = os.environ.get(
+    "STOCK_CACHE_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".cache"))
+)
+# Cached history younger than this is served without touching the network
+OHLCV_CACHE_TTL = int(os.environ.get("OHLCV_CACHE_TTL", 15 * 60))
+# Slack between a period's start date and the first trading day actually listed
+PERIOD_START_SLACK = pd.Timedelta(days=7)
+# Seconds between provider polls for a ticker's intraday bars
+INTRADAY_REFRESH_INTERVAL = int(os.environ.get("INTRADAY_REFRESH_INTERVAL", 30))
+# 1-minute history requested when a ticker is first watched (yfinance serves up to 7 days)
+INTRADAY_BACKFILL_PERIOD = "5d"
+
+def _cache_path(ticker, auto_adjust):
+    """Returns the Parquet cache file for a ticker and adjustment mode."""
+    safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+    mode = "adj" if auto_adjust else "raw"
+    # Separate directories per provider so replayed data never mixes with live data
+    return os.path.join(CACHE_DIR, "ohlcv", get_provider().name, f"{safe_ticker}.{mode}.parquet")
+
+def _read_cache(path):
+    """Reads a cached OHLCV frame, returning None if missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        print(f"Ignoring unreadable cache file {path}: {e}")
+        return None
+
+def _write_cache(path, data):
+    """Atomically writes an OHLCV frame to the cache (a failed write only logs)."""
+    # Unique per thread as well as per process: request threads may write the same ticker at once
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Could not write cache file {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _download_ohlcv(ticker, auto_adjust, period=None, start=None, interval="1d"):
+    """Downloads OHLCV bars for one ticker and normalises the frame."""
+    with span("provider.download") as s:
+        data = get_provider().download(ticker, period=period, start=start, auto_adjust=auto_adjust,
+                                       interval=interval)
+        s.set(rows=0 if data is None else len(data))
+    
+    if data is None or data.empty:
+        return pd.DataFrame()
+    
+    # Ensure index is datetime
+    data.index = pd.to_datetime(data.index)
+    
+    # Flatten MultiIndex columns if present (yfinance sometimes returns MultiIndex)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    
+    return data
+
+def _history_rescaled(cached, delta, overlap):
+    """Whether the provider's prices for the `overlap` bar differ from the cached ones."""
+    if overlap is None or overlap not in delta.index:
+        return False
+    columns = [column for column in ("Close", "Adj Close") if column in cached.columns and column in delta.columns]
+    before = cached.loc[overlap, columns].to_numpy(dtype=np.float64)
+    after = delta.loc[overlap, columns].to_numpy(dtype=np.float64)
+    return not np.isclose(before, after, rtol=1e-6, equal_nan=True).all()
+
+def fetch_stock_data(ticker, period="10y", auto_adjust=False, use_cache=True):
     """
     Fetches historical stock data for a given ticker.
     
+    History is kept in an on-disk Parquet cache keyed by ticker and
+    adjustment mode. A repeat request reads the cache and only downloads
+    the bars from the last two cached dates onwards; a request within
+    OHLCV_CACHE_TTL seconds of the last download skips the network. If
+    the provider's price for a bar already cached has changed (a split or
+    dividend rescaled its adjusted history), the full period is downloaded
+    again.
+    
     Args:
         ticker (str): The stock ticker symbol (e.g., "RELIANCE.NS").
         period (str): The data period to download (default: "10y").
+        auto_adjust (bool): Whether to download split/dividend adjusted OHLC.
+        use_cache (bool): Whether to read and update the on-disk cache.
         
     Returns:
         pd.DataFrame: DataFrame containing the stock data.
     """
     print(f"Fetching data for {ticker}...")
+    with span("fetch.prices") as s:
+        data = _fetch_stock_data(ticker, period, auto_adjust, use_cache, s)
+        s.set(rows=len(data))
+        return data
+
+def _fetch_stock_data(ticker, period, auto_adjust, use_cache, s):
+    """Body of fetch_stock_data; records the cache result on the span `s`."""
     try:
-        # Download data
-        data = yf.download(ticker, period=period, progress=False, auto_adjust=False)
+        if not use_cache:
+            data = _download_ohlcv(ticker, auto_adjust, period=period)
+            if data.empty:
+                print(f"No data found for {ticker}.")
+            return data
         
-        if data.empty:
-            print(f"No data found for {ticker}.")
-            return pd.DataFrame()
-            
-        # Ensure index is datetime
-        data.index = pd.to_datetime(data.index)
+        path = _cache_path(ticker, auto_adjust)
+        cached = _read_cache(path)
+        start = period_start(period)
+        if start is not None and cached is not None and cached.index.tz is not None:
+            start = start.tz_localize(cached.index.tz)
         
-        # Flatten MultiIndex columns if present (yfinance sometimes returns MultiIndex)
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.get_level_values(0)
-            
+        # A ticker listed after the period start (a recent IPO) never has a
+        # bar near it: the cache also covers any period starting at or after
+        # the one its full download asked for, since that returned all bars
+        requested = cached.attrs.get("requested_start") if cached is not None else None
+        covers_period = (
+            cached is not None and not cached.empty and start is not None
+            and (cached.index[0] <= start + PERIOD_START_SLACK
+                 or (requested is not None and pd.Timestamp(requested) <= start.tz_localize(None)))
+        )
+        
+        data = None
+        if covers_period:
+            is_fresh = time.time() - os.path.getmtime(path) < OHLCV_CACHE_TTL
+            if is_fresh:
+                s.set(cache="hit")
+                data = cached
+            else:
+                s.set(cache="refresh")
+                # Re-fetch from the bar before the last cached one: the last may
+                # have been partial, the one before is complete and is checked
+                # against the provider's
+                overlap = cached.index[-2] if len(cached) > 1 else None
+                try:
+                    delta = _download_ohlcv(ticker, auto_adjust, start=cached.index[-1] if overlap is None else overlap)
+                except Exception as e:
+                    print(f"Delta fetch failed for {ticker}, serving cached data: {e}")
+                    delta = pd.DataFrame()
+                if delta.empty:
+                    data = cached
+                elif _history_rescaled(cached, delta, overlap):
+                    # A split or dividend rescaled the provider's adjusted history:
+                    # the cached bars are on the old basis, so download them all again
+                    print(f"Adjusted history of {ticker} changed, re-downloading {period}")
+                else:
+                    data = pd.concat([cached[cached.index < delta.index[0]], delta])
+                    data = data[~data.index.duplicated(keep="last")]
+                if data is not None:
+                    data.attrs = dict(cached.attrs)
+                    _write_cache(path, data)
+        if data is None:
+            s.set(cache="miss")
+            data = _download_ohlcv(ticker, auto_adjust, period=period)
+            if data.empty:
+                print(f"No data found for {ticker}.")
+                return pd.DataFrame()
+            # Kept in the Parquet metadata: the bars from here on are all the provider has
+            data.attrs["requested_start"] = None if start is None else start.tz_localize(None).isoformat()
+            _write_cache(path, data)
+        
+        if start is not None:
+            if data.index.tz is not None and start.tz is None:
+                start = start.tz_localize(data.index.tz)
+            data = data[data.index >= start]
         return data
     except Exception as e:
         print(f"Error fetching data for {ticker}: {e}")
         return pd.DataFrame()
 
+# Live intraday bars of recently watched tickers, bounded in bars and tickers
+intraday_feeds = FeedRegistry()
+
+def fetch_intraday_data(ticker, interval="5m"):
+    """
+    Fetches intraday bars for a ticker from its in-memory feed.
+    
+    The feed polls the provider's 1-minute bars at most every
+    INTRADAY_REFRESH_INTERVAL seconds, downloading only the bars since
+    the last poll, and aggregates them into 1m, 5m and 15m bars. Each
+    interval keeps a fixed window (intraday.INTRADAY_HISTORY), so memory
+    does not grow over the session.
+    
+    Args:
+        ticker (str): The stock ticker symbol.
+        interval (str): "1m", "5m" or "15m".
+        
+    Returns:
+        pd.DataFrame: OHLCV bars, the forming bar last; empty on failure.
+    """
+    print(f"Fetching {interval} bars for {ticker}...")
+    with span("fetch.intraday") as s:
+        try:
+            feed = _refresh_intraday_feed(ticker, s)
+            with feed.lock:
+                data = feed.frame(interval)
+        except Exception as e:
+            print(f"Error fetching intraday data for {ticker}: {e}")
+            data = pd.DataFrame()
+        s.set(rows=len(data))
+        return data
+
+def refresh_intraday_feed(ticker):
+    """
+    Returns a ticker's intraday feed after polling the provider if it is due.
+    
+    Unlike fetch_intraday_data it builds no frame, so callers that only
+    need the newest bars (live chart updates) do work in proportion to
+    what changed.
+    
+    Args:
+        ticker (str): The stock ticker symbol.
+        
+    Returns:
+        IntradayFeed: The feed (read it under `feed.lock`), or None on failure.
+    """
+    with span("fetch.intraday_feed") as s:
+        try:
+            return _refresh_intraday_feed(ticker, s)
+        except Exception as e:
+            print(f"Error refreshing intraday data for {ticker}: {e}")
+            return None
+
+def _refresh_intraday_feed(ticker, s):
+    """Polls the provider for new 1-minute bars if due; records the cache result on the span `s`."""
+    feed = intraday_feeds.get(ticker)
+    # One poll per ticker at a time; concurrent callers then read the fresh bars
+    with feed.lock:
+        if time.time() - feed.updated_at < INTRADAY_REFRESH_INTERVAL:
+            s.set(cache="hit")
+        else:
+            start = feed.last_time
+            s.set(cache="miss" if start is None else "refresh")
+            if start is None:
+                bars = _download_ohlcv(ticker, False, period=INTRADAY_BACKFILL_PERIOD, interval="1m")
+            else:
+                bars = _download_ohlcv(ticker, False, start=start, interval="1m")
+            feed.add_bars(bars)
+            feed.updated_at = time.time()
+    return feed
+
 def fetch_sector_data(tickers, period="5y"):
     """
     Fetches 'Adj Close' data for multiple tickers for sector comparison.
@@ -47,7 +268,9 @@ def fetch_sector_data(tickers, period="5y"):
     """
     print(f"Fetching sector data for {tickers}...")
     try:
-        data = yf.download(tickers, period=period, progress=False, auto_adjust=False)['Adj Close']
+        with span("provider.download") as s:
+            data = get_provider().download(tickers, period=period, auto_adjust=False)['Adj Close']
+            s.set(rows=len(data))
         
         if data.empty:
             print("No sector data found.")
@@ -58,6 +281,22 @@ def fetch_sector_data(tickers, period="5y"):
         print(f"Error fetching sector data: {e}")
         return pd.DataFrame()
 
+# Fields of the provider's info split by how fast they go stale (see shared_cache.CACHE_TTLS)
+FUNDAMENTAL_FIELDS = ["marketCap", "trailingPE", "priceToBook", "dividendYield"]
+QUOTE_FIELDS = ["currentPrice", "open", "dayHigh", "dayLow", "volume"]
+
+def get_data_cache():
+    """Returns the cache of news and fundamentals shared by all worker processes."""
+    return get_shared_cache(CACHE_DIR)
+
+def shared_cache_stats():
+    """Returns the hit/miss counters and size of the shared cache per data type."""
+    return get_data_cache().stats()
+
+def _cache_key(ticker_symbol):
+    # Separate entries per provider so replayed data never mixes with live data
+    return f"{get_provider().name}:{ticker_symbol.upper()}"
+
 def fetch_stock_news(ticker_symbol):
     """
     Fetches news for a given ticker.
@@ -68,9 +307,26 @@ def fetch_stock_news(ticker_symbol):
     Returns:
         list: List of news dictionaries.
     """
+    with span("fetch.news") as s:
+        s.set(cache="hit")
+        
+        def download():
+            s.set(cache="miss")
+            return _download_news(ticker_symbol)
+        
+        try:
+            news = get_data_cache().get_or_fetch("news", _cache_key(ticker_symbol), download)
+        except Exception as e:
+            print(f"Error fetching news for {ticker_symbol}: {e}")
+            news = []
+        s.set(rows=len(news))
+        return news
+
+def _download_news(ticker_symbol):
+    """Downloads and formats the news of one ticker (see fetch_stock_news)."""
     try:
-        ticker = yf.Ticker(ticker_symbol)
-        news = ticker.news
+        with span("provider.news"):
+            news = get_provider().news(ticker_symbol)
         formatted_news = []
         for item in news:
             try:
@@ -101,98 +357,165 @@ def fetch_fundamentals(ticker_symbol):
     Returns:
         dict: Dictionary containing fundamental data.
     """
+    with span("fetch.fundamentals") as s:
+        return _fetch_fundamentals(ticker_symbol, s)
+
+def _fetch_fundamentals(ticker_symbol, s):
+    """Body of fetch_fundamentals; records the cache result on the span `s`."""
+    key = _cache_key(ticker_symbol)
     try:
-        ticker = yf.Ticker(ticker_symbol)
-        info = ticker.info
-        
-        return {
-            "marketCap": info.get("marketCap"),
-            "trailingPE": info.get("trailingPE"),
-            "priceToBook": info.get("priceToBook"),
-            "dividendYield": info.get("dividendYield"),
-            "currentPrice": info.get("currentPrice"),
-            "open": info.get("open"),
-            "dayHigh": info.get("dayHigh"),
-            "dayLow": info.get("dayLow"),
-            "volume": info.get("volume"),
-            "currency": info.get("currency", "INR")
-        }
+        cache = get_data_cache()
+        # Quote fields go stale within minutes, valuation ratios within hours
+        quote = cache.get("quote", key)
+        fundamentals = cache.get("fundamentals", key)
+        if quote is not None and fundamentals is not None:
+            s.set(cache="hit")
+            return {**fundamentals, **quote}
+    except Exception as e:
+        print(f"Shared cache unavailable, fetching fundamentals directly: {e}")
+        cache = None
+    
+    s.set(cache="miss")
+    try:
+        with span("provider.info"):
+            info = get_provider().info(ticker_symbol)
+        
+        quote = {field: info.get(field) for field in QUOTE_FIELDS}
+        fundamentals = {field: info.get(field) for field in FUNDAMENTAL_FIELDS}
+        if all(value is None for value in (*quote.values(), *fundamentals.values())):
+            # An empty info (throttled or unknown ticker) is a failure: not cached for hours
+            print(f"No fundamentals found for {ticker_symbol}.")
+            return {}
+        quote["currency"] = info.get("currency", "INR")
+        if cache is not None:
+            try:
+                cache.set("quote", key, quote)
+                cache.set("fundamentals", key, fundamentals)
+            except Exception as e:
+                print(f"Error caching fundamentals for {ticker_symbol}: {e}")
+        return {**fundamentals, **quote}
     except Exception as e:
         print(f"Error fetching fundamentals for {ticker_symbol}: {e}")
         return {}
 
-def fetch_nifty50_ticker_data():
+# Nifty 50 companies (as of 2024)
+NIFTY50_SYMBOLS = [
+    "RELIANCE.NS", "TCS.NS", "HDFCBANK.NS", "INFY.NS", "ICICIBANK.NS",
+    "HINDUNILVR.NS", "ITC.NS", "SBIN.NS", "BHARTIARTL.NS", "KOTAKBANK.NS",
+    "LT.NS", "AXISBANK.NS", "BAJFINANCE.NS", "ASIANPAINT.NS", "MARUTI.NS",
+    "HCLTECH.NS", "SUNPHARMA.NS", "TITAN.NS", "ULTRACEMCO.NS", "NESTLEIND.NS",
+    "ONGC.NS", "NTPC.NS", "TATAMOTORS.NS", "WIPRO.NS", "POWERGRID.NS",
+    "M&M.NS", "TECHM.NS", "ADANIPORTS.NS", "COALINDIA.NS", "BAJAJFINSV.NS",
+    "DIVISLAB.NS", "TATASTEEL.NS", "CIPLA.NS", "DRREDDY.NS", "EICHERMOT.NS",
+    "HINDALCO.NS", "INDUSINDBK.NS", "HDFCLIFE.NS", "SBILIFE.NS", "GRASIM.NS",
+    "BPCL.NS", "HEROMOTOCO.NS", "JSWSTEEL.NS", "BRITANNIA.NS", "APOLLOHOSP.NS",
+    "ADANIENT.NS", "TATACONSUM.NS", "BAJAJ-AUTO.NS", "LTIM.NS", "UPL.NS"
+]
+
+def fetch_universe_data(tickers, period="1y"):
+    """
+    Fetches OHLCV history for a ticker universe in one download.
+    
+    Args:
+        tickers (list): List of ticker symbols.
+        period (str): Data period (default: "1y").
+        
+    Returns:
+        UniversePanel: (tickers x dates) panel, or None if nothing was found.
+    """
+    print(f"Fetching universe data for {len(tickers)} tickers...")
+    try:
+        with span("provider.download") as s:
+            data = get_provider().download(tickers, period=period, auto_adjust=False)
+            s.set(rows=len(data) * len(tickers))
+        
+        if data.empty:
+            print("No universe data found.")
+            return None
+            
+        return UniversePanel.from_download(data, tickers)
+    except Exception as e:
+        print(f"Error fetching universe data: {e}")
+        return None
+
+def fetch_nifty50_ticker_data(fallback=True):
     """
     Fetches current price data for Nifty 50 companies.
     
+    Args:
+        fallback (bool): Return static index levels if the download fails
+            (default: True). Without it, a failure returns an empty list.
+    
     Returns:
         list: List of dictionaries with symbol, price, and change data.
     """
-    # Nifty 50 companies (as of 2024)
-    nifty50_symbols = [
-        "RELIANCE.NS", "TCS.NS", "HDFCBANK.NS", "INFY.NS", "ICICIBANK.NS",
-        "HINDUNILVR.NS", "ITC.NS", "SBIN.NS", "BHARTIARTL.NS", "KOTAKBANK.NS",
-        "LT.NS", "AXISBANK.NS", "BAJFINANCE.NS", "ASIANPAINT.NS", "MARUTI.NS",
-        "HCLTECH.NS", "SUNPHARMA.NS", "TITAN.NS", "ULTRACEMCO.NS", "NESTLEIND.NS",
-        "ONGC.NS", "NTPC.NS", "TATAMOTORS.NS", "WIPRO.NS", "POWERGRID.NS",
-        "M&M.NS", "TECHM.NS", "ADANIPORTS.NS", "COALINDIA.NS", "BAJAJFINSV.NS",
-        "DIVISLAB.NS", "TATASTEEL.NS", "CIPLA.NS", "DRREDDY.NS", "EICHERMOT.NS",
-        "HINDALCO.NS", "INDUSINDBK.NS", "HDFCLIFE.NS", "SBILIFE.NS", "GRASIM.NS",
-        "BPCL.NS", "HEROMOTOCO.NS", "JSWSTEEL.NS", "BRITANNIA.NS", "APOLLOHOSP.NS",
-        "ADANIENT.NS", "TATACONSUM.NS", "BAJAJ-AUTO.NS", "LTIM.NS", "UPL.NS"
-    ]
-    
-    ticker_data = []
-    
     try:
         print(f"Fetching Nifty 50 ticker data...")
-        # Fetch data for all symbols at once (much faster)
-        data = yf.download(nifty50_symbols, period="1d", progress=False, auto_adjust=False)
+        # Fetch data for all symbols at once and format them as one panel
+        with span("provider.download") as s:
+            data = get_provider().download(NIFTY50_SYMBOLS, period="1d", auto_adjust=False)
+            s.set(rows=len(data) * len(NIFTY50_SYMBOLS))
         
         if data.empty:
             print("No ticker data found.")
             return []
         
-        # Process each symbol
-        for symbol in nifty50_symbols:
-            try:
-                # Get the latest row
-                if len(nifty50_symbols) > 1:
-                    # Multiple symbols - data has MultiIndex columns
-                    close = data['Close'][symbol].iloc[-1] if symbol in data['Close'].columns else None
-                    open_price = data['Open'][symbol].iloc[-1] if symbol in data['Open'].columns else None
-                else:
-                    # Single symbol
-                    close = data['Close'].iloc[-1]
-                    open_price = data['Open'].iloc[-1]
-                
-                if close is not None and open_price is not None:
-                    change = close - open_price
-                    change_pct = (change / open_price) * 100 if open_price != 0 else 0
-                    
-                    # Clean symbol name
-                    display_symbol = symbol.replace(".NS", "")
-                    
-                    ticker_data.append({
-                        "symbol": display_symbol,
-                        "price": f"{close:.2f}",
-                        "change": f"{'+' if change >= 0 else ''}{change_pct:.2f}%"
-                    })
-            except Exception as e:
-                print(f"Error processing {symbol}: {e}")
-                continue
-        
+        ticker_data = ticker_tape_items(UniversePanel.from_download(data, NIFTY50_SYMBOLS))
         print(f"Successfully fetched data for {len(ticker_data)} companies.")
         return ticker_data
         
     except Exception as e:
         print(f"Error fetching Nifty 50 ticker data: {e}")
+        if not fallback:
+            return []
         # Return fallback static data
         return [
             {"symbol": "NIFTY 50", "price": "24,300", "change": "+0.5%"},
             {"symbol": "SENSEX", "price": "80,100", "change": "+0.4%"},
         ]
 
+# Bounded pool shared by all requests so a burst of clicks cannot spawn unbounded threads
+FETCH_POOL_SIZE = int(os.environ.get("FETCH_POOL_SIZE", 8))
+_fetch_pool = ThreadPoolExecutor(max_workers=FETCH_POOL_SIZE, thread_name_prefix="fetch")
+
+def fetch_concurrently(jobs, timeouts=None, default_timeout=15):
+    """
+    Runs independent fetch jobs concurrently on the shared fetch pool.
+    
+    Each job gets its own deadline, measured from dispatch. A job that
+    raises or misses its deadline yields its default value instead, so
+    callers can still use the sources that succeeded. Jobs that time out
+    keep running in the background until the provider call returns.
+    
+    Args:
+        jobs (dict): Maps a source name to (func, args, default).
+        timeouts (dict): Maps a source name to its timeout in seconds.
+        default_timeout (float): Timeout for sources missing from `timeouts`.
+        
+    Returns:
+        dict: Maps each source name to its result or default value.
+    """
+    timeouts = timeouts or {}
+    started = time.monotonic()
+    futures = {
+        name: _fetch_pool.submit(func, *args)
+        for name, (func, args, default) in jobs.items()
+    }
+    
+    results = {}
+    for name, future in futures.items():
+        default = jobs[name][2]
+        deadline = started + timeouts.get(name, default_timeout)
+        try:
+            results[name] = future.result(timeout=max(0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            print(f"Source '{name}' timed out after {timeouts.get(name, default_timeout)}s.")
+            results[name] = default
+        except Exception as e:
+            print(f"Source '{name}' failed: {e}")
+            results[name] = default
+    return results
+
 if __name__ == "__main__":
     # Test the function
     df = fetch_stock_data("RELIANCE.NS", period="1mo")
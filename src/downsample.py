@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+# Candle resolutions from finest to coarsest, with their approximate bars per period
+RESOLUTIONS = [('D', 1), ('W', 5), ('M', 21)]
+RESOLUTION_NAMES = {'D': 'Daily', 'W': 'Weekly', 'M': 'Monthly'}
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Picks the points of a line to keep with Largest-Triangle-Three-Buckets.
+
+    NaN points are never selected, so a series with a NaN warm-up period
+    (such as a 200-day SMA) is reduced over its defined part only.
+
+    Args:
+        x (np.ndarray): Increasing x values (numbers or datetime64).
+        y (np.ndarray): y values, possibly with NaNs.
+        threshold (int): Maximum number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted integer positions of the kept points.
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64)
+    x = x.astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if threshold >= n or threshold < 3:
+        return valid if threshold >= n else valid[np.linspace(0, n - 1, max(threshold, 0), dtype=int)]
+
+    xs, ys = x[valid] - x[valid[0]], y[valid]
+    # Bucket edges over the interior points; first and last points are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    # Each bucket's triangle is closed by the average of the following bucket
+    next_starts = np.r_[edges[1:-1], n - 1]
+    next_stops = np.r_[edges[2:], n]
+    counts = next_stops - next_starts
+    csum_x = np.r_[0.0, np.cumsum(xs)]
+    csum_y = np.r_[0.0, np.cumsum(ys)]
+    avg_x = ((csum_x[next_stops] - csum_x[next_starts]) / counts).tolist()
+    avg_y = ((csum_y[next_stops] - csum_y[next_starts]) / counts).tolist()
+
+    # The selected point of each bucket depends on the previous selection, so
+    # this loop is sequential; plain floats beat per-bucket NumPy calls here
+    xl, yl, bounds = xs.tolist(), ys.tolist(), edges.tolist()
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        xa, ya, nx, ny = xl[a], yl[a], avg_x[i], avg_y[i]
+        best, best_area = bounds[i], -1.0
+        for j in range(bounds[i], bounds[i + 1]):
+            area = abs((xa - nx) * (yl[j] - ya) - (xa - xl[j]) * (ny - ya))
+            if area > best_area:
+                best, best_area = j, area
+        a = best
+        kept.append(a)
+    kept.append(n - 1)
+    return valid[kept]
+
+
+def period_codes(index, resolution):
+    """
+    Integer bucket of each timestamp for a candle resolution.
+
+    Args:
+        index (pd.DatetimeIndex): Bar timestamps.
+        resolution (str): 'D', 'W' (Monday-based weeks) or 'M'.
+
+    Returns:
+        np.ndarray: One int64 code per bar; equal codes share a candle.
+    """
+    days = np.asarray(index.values.astype('datetime64[D]').astype(np.int64))
+    if resolution == 'D':
+        return days
+    if resolution == 'W':
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        return (days + 3) // 7
+    if resolution == 'M':
+        return np.asarray(index.year, dtype=np.int64) * 12 + np.asarray(index.month, dtype=np.int64)
+    raise ValueError(f"Unknown resolution: {resolution}")
+
+
+def resample_ohlc(index, open_, high, low, close, volume, resolution):
+    """
+    Rolls daily bars up into weekly or monthly candles without pandas resample.
+
+    Args:
+        index (pd.DatetimeIndex): Sorted bar timestamps.
+        open_, high, low, close, volume (np.ndarray): Daily bar arrays.
+        resolution (str): 'D', 'W' or 'M'.
+
+    Returns:
+        dict: 'index' (first timestamp of each candle) and the aggregated
+        'Open', 'High', 'Low', 'Close' and 'Volume' arrays.
+    """
+    if resolution == 'D' or len(index) == 0:
+        return {'index': index, 'Open': np.asarray(open_), 'High': np.asarray(high),
+                'Low': np.asarray(low), 'Close': np.asarray(close), 'Volume': np.asarray(volume)}
+
+    codes = period_codes(index, resolution)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+    return {
+        'index': index[starts],
+        'Open': np.asarray(open_)[starts],
+        'High': np.fmax.reduceat(np.asarray(high, dtype=np.float64), starts),
+        'Low': np.fmin.reduceat(np.asarray(low, dtype=np.float64), starts),
+        'Close': np.asarray(close)[ends],
+        'Volume': np.add.reduceat(np.asarray(volume, dtype=np.float64), starts),
+    }
+
+
+def choose_resolution(n_bars, budget):
+    """Returns the finest candle resolution that fits `n_bars` daily bars into `budget` points."""
+    for resolution, bars_per_period in RESOLUTIONS:
+        if n_bars / bars_per_period <= budget:
+            return resolution
+    return RESOLUTIONS[-1][0]
+
+
+def visible_range(relayout_data):
+    """
+    Extracts the visible x range from a dcc.Graph's relayoutData.
+
+    Args:
+        relayout_data (dict): relayoutData from the graph (any x axis).
+
+    Returns:
+        tuple or str or None: (start, end) timestamps after a zoom or pan,
+        'reset' after an autorange (double-click), None for other events.
+    """
+    if not relayout_data:
+        return None
+    for key, value in relayout_data.items():
+        if key.startswith('xaxis') and key.endswith('.autorange') and value:
+            return 'reset'
+    for key in relayout_data:
+        if key.startswith('xaxis') and key.endswith('.range[0]'):
+            axis = key[:-len('.range[0]')]
+            end = relayout_data.get(f'{axis}.range[1]')
+            if end is not None:
+                return pd.Timestamp(relayout_data[key]), pd.Timestamp(end)
+        if key.startswith('xaxis') and key.endswith('.range'):
+            start, end = relayout_data[key]
+            return pd.Timestamp(start), pd.Timestamp(end)
+    return None
+
+
+def visible_slice(index, x_range, margin=0.5):
+    """
+    Positions of the bars inside a visible range plus a margin on each side.
+
+    The margin (a fraction of the visible span) keeps short pans inside
+    data that is already in the browser.
+
+    Args:
+        index (pd.DatetimeIndex): Sorted bar timestamps.
+        x_range (tuple): (start, end) timestamps, or None for everything.
+        margin (float): Extra span loaded on each side.
+
+    Returns:
+        slice: Positional slice into `index`.
+    """
+    if x_range is None:
+        return slice(0, len(index))
+    start, end = x_range
+    pad = (end - start) * margin
+    lo = index.searchsorted(start - pad, side='left')
+    hi = index.searchsorted(end + pad, side='right')
+    return slice(int(lo), int(hi))
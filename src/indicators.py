@@ -0,0 +1,320 @@
+import math
+
+import pandas as pd
+
+NAN = float("nan")
+
+
+class SMA:
+    """
+    Simple moving average updated in O(1) per bar from a ring-buffer sum.
+
+    Matches `Series.rolling(window).mean()`: NaN until `window` values
+    have been seen.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._buffer = [0.0] * window
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+        # Values in the window that are non-zero; lets an all-zero window return exactly 0
+        self._nonzero = 0
+        self._since_resum = 0
+
+    def update(self, value):
+        """Adds a value and returns the current average."""
+        old = self._buffer[self._pos]
+        if self._count == self.window:
+            self._sum -= old
+            self._nonzero -= old != 0
+        else:
+            self._count += 1
+
+        self._buffer[self._pos] = value
+        self._pos = (self._pos + 1) % self.window
+        self._sum += value
+        self._nonzero += value != 0
+
+        # Recompute the sum once per window to stop floating point drift (amortised O(1))
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            self._sum = math.fsum(self._buffer[:self._count])
+            self._since_resum = 0
+
+        return self.value
+
+    @property
+    def value(self):
+        if self._count < self.window:
+            return NAN
+        if self._nonzero == 0:
+            return 0.0
+        return self._sum / self.window
+
+    def to_state(self):
+        return {
+            "window": self.window,
+            "buffer": list(self._buffer),
+            "pos": self._pos,
+            "count": self._count,
+            "sum": self._sum,
+            "nonzero": self._nonzero,
+            "since_resum": self._since_resum,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        sma = cls(state["window"])
+        sma._buffer = list(state["buffer"])
+        sma._pos = state["pos"]
+        sma._count = state["count"]
+        sma._sum = state["sum"]
+        sma._nonzero = state["nonzero"]
+        sma._since_resum = state["since_resum"]
+        return sma
+
+
+class RollingStd:
+    """
+    Rolling sample standard deviation updated in O(1) per value.
+
+    Matches `analysis.rolling_std` (`Series.rolling(window).std()`): NaN
+    until the last `window` values are all defined. Used for the rolling
+    volatility of returns, whose first value is NaN.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._buffer = [NAN] * window
+        self._pos = 0
+        self._valid = 0
+        self._sum = 0.0
+        self._sum2 = 0.0
+        self._since_resum = 0
+
+    def update(self, value):
+        """Adds a value (NaN for a missing one) and returns the current deviation."""
+        value = float(value)
+        old = self._buffer[self._pos]
+        if not math.isnan(old):
+            self._valid -= 1
+            self._sum -= old
+            self._sum2 -= old * old
+        self._buffer[self._pos] = value
+        self._pos = (self._pos + 1) % self.window
+        if not math.isnan(value):
+            self._valid += 1
+            self._sum += value
+            self._sum2 += value * value
+
+        # Same drift guard as SMA: an exact re-sum once per window
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            defined = [v for v in self._buffer if not math.isnan(v)]
+            self._sum = math.fsum(defined)
+            self._sum2 = math.fsum(v * v for v in defined)
+            self._since_resum = 0
+
+        return self.value
+
+    @property
+    def value(self):
+        if self._valid < self.window or self.window < 2:
+            return NAN
+        var = (self._sum2 - self._sum * self._sum / self.window) / (self.window - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class EMA:
+    """
+    Exponential moving average carrying only its last value.
+
+    Matches `Series.ewm(span=span, adjust=False).mean()`, which starts
+    at the first value.
+    """
+
+    def __init__(self, span):
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = None
+
+    def update(self, value):
+        """Adds a value and returns the current average."""
+        if self.value is None:
+            self.value = value
+        else:
+            self.value = self.alpha * value + (1.0 - self.alpha) * self.value
+        return self.value
+
+    def to_state(self):
+        return {"span": self.span, "value": self.value}
+
+    @classmethod
+    def from_state(cls, state):
+        ema = cls(state["span"])
+        ema.value = state["value"]
+        return ema
+
+
+class RSI:
+    """
+    Relative Strength Index from simple moving averages of gains and losses.
+
+    Uses the same definition as `analysis.calculate_technical_indicators`
+    (rolling means, not Wilder smoothing), including a zero gain and loss
+    for the first bar.
+    """
+
+    def __init__(self, window=14):
+        self.window = window
+        self.prev = None
+        self.gain = SMA(window)
+        self.loss = SMA(window)
+
+    def update(self, price):
+        """Adds a price and returns the current RSI."""
+        delta = 0.0 if self.prev is None else price - self.prev
+        self.prev = price
+        gain = self.gain.update(delta if delta > 0 else 0.0)
+        loss = self.loss.update(-delta if delta < 0 else 0.0)
+
+        if math.isnan(gain) or math.isnan(loss):
+            return NAN
+        if loss == 0:
+            return 100.0 if gain > 0 else NAN
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def to_state(self):
+        return {
+            "window": self.window,
+            "prev": self.prev,
+            "gain": self.gain.to_state(),
+            "loss": self.loss.to_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        rsi = cls(state["window"])
+        rsi.prev = state["prev"]
+        rsi.gain = SMA.from_state(state["gain"])
+        rsi.loss = SMA.from_state(state["loss"])
+        return rsi
+
+
+class MACD:
+    """MACD line and signal line from three carried EMAs."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(self, price):
+        """Adds a price and returns (macd, signal)."""
+        macd = self.fast.update(price) - self.slow.update(price)
+        return macd, self.signal.update(macd)
+
+    def to_state(self):
+        return {
+            "fast": self.fast.to_state(),
+            "slow": self.slow.to_state(),
+            "signal": self.signal.to_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        macd = cls()
+        macd.fast = EMA.from_state(state["fast"])
+        macd.slow = EMA.from_state(state["slow"])
+        macd.signal = EMA.from_state(state["signal"])
+        return macd
+
+
+class IndicatorEngine:
+    """
+    Streaming version of `analysis.calculate_technical_indicators`.
+
+    Each new bar updates SMA_50, SMA_200, RSI, MACD and Signal_Line in
+    constant time. The state round-trips through a JSON-friendly dict, so
+    a warm engine can be saved after a backfill and restored later.
+
+    The windows default to the daily ones; intraday charts pass their
+    windows in bars (see `analysis.window_bars`), keeping the column names.
+    """
+    COLUMNS = ['SMA_50', 'SMA_200', 'RSI', 'MACD', 'Signal_Line']
+
+    def __init__(self, sma_50=50, sma_200=200, rsi=14):
+        self.sma_50 = SMA(sma_50)
+        self.sma_200 = SMA(sma_200)
+        self.rsi = RSI(rsi)
+        self.macd = MACD(12, 26, 9)
+        self.last_timestamp = None
+        self.bars = 0
+
+    def update(self, price, timestamp=None):
+        """
+        Feeds one bar's 'Adj Close' into every indicator.
+
+        Args:
+            price (float): Closing price of the new bar.
+            timestamp (pd.Timestamp): Bar timestamp, remembered for `update_frame`.
+
+        Returns:
+            dict: Latest value of each indicator column.
+        """
+        price = float(price)
+        macd, signal = self.macd.update(price)
+        values = {
+            'SMA_50': self.sma_50.update(price),
+            'SMA_200': self.sma_200.update(price),
+            'RSI': self.rsi.update(price),
+            'MACD': macd,
+            'Signal_Line': signal,
+        }
+        if timestamp is not None:
+            self.last_timestamp = pd.Timestamp(timestamp)
+        self.bars += 1
+        return values
+
+    def update_frame(self, df):
+        """
+        Feeds only the rows of `df` newer than the last bar seen.
+
+        Args:
+            df (pd.DataFrame): Stock data with 'Adj Close' and a DatetimeIndex.
+
+        Returns:
+            pd.DataFrame: Indicator values for the new rows.
+        """
+        if self.last_timestamp is not None:
+            df = df[df.index > self.last_timestamp]
+        rows = [self.update(price, timestamp) for timestamp, price in df['Adj Close'].items()]
+        return pd.DataFrame(rows, index=df.index, columns=self.COLUMNS)
+
+    def backfill(self, df):
+        """Alias of `update_frame` for warming a fresh engine from history."""
+        return self.update_frame(df)
+
+    def to_state(self):
+        return {
+            "sma_50": self.sma_50.to_state(),
+            "sma_200": self.sma_200.to_state(),
+            "rsi": self.rsi.to_state(),
+            "macd": self.macd.to_state(),
+            "last_timestamp": None if self.last_timestamp is None else self.last_timestamp.isoformat(),
+            "bars": self.bars,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        engine = cls()
+        engine.sma_50 = SMA.from_state(state["sma_50"])
+        engine.sma_200 = SMA.from_state(state["sma_200"])
+        engine.rsi = RSI.from_state(state["rsi"])
+        engine.macd = MACD.from_state(state["macd"])
+        if state["last_timestamp"] is not None:
+            engine.last_timestamp = pd.Timestamp(state["last_timestamp"])
+        engine.bars = state["bars"]
+        return engine
@@ -0,0 +1,434 @@
+"""
+Intraday OHLCV bars built from a tick, quote or 1-minute bar feed.
+
+Each watched ticker has an IntradayFeed holding one BarAggregator per
+interval in INTERVALS. Completed bars are written to fixed-size ring
+buffers (RollingBars) covering INTRADAY_HISTORY of bar time, and the
+number of feeds is capped by FeedRegistry, so memory stays flat however
+long the session runs and however many ticks arrive.
+
+Timestamps are kept as exchange wall-clock time (tz-aware inputs are
+converted to their own time zone, then made naive), which is what the
+charts show.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from analysis import window_bars
+
+# Intraday intervals (yfinance names) and their length
+INTERVALS = {
+    "1m": pd.Timedelta(minutes=1),
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+}
+# Bar time kept per ticker and interval: two NSE sessions of 375 minutes
+INTRADAY_HISTORY = os.environ.get("INTRADAY_HISTORY", "750min")
+# Tickers with intraday bars in memory; the least recently used is dropped first
+INTRADAY_MAX_TICKERS = int(os.environ.get("INTRADAY_MAX_TICKERS", 200))
+# Rolling windows of the intraday charts, in bar time (see analysis.window_bars)
+INTRADAY_WINDOWS = {
+    'RollingVol_30': '30min',
+    'RollingVol_90': '90min',
+    'SMA_50': '1h',
+    'SMA_200': '3h',
+    'RSI': 14,
+    'Volume_MA20': '20min',
+}
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(FIELDS))
+DAY_NS = 86_400 * 10**9
+
+
+def _wall_ns(timestamp):
+    """Nanoseconds of a timestamp's wall-clock time (its own time zone, if any)."""
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tz is not None:
+        timestamp = timestamp.tz_localize(None)
+    return timestamp.value
+
+
+def _index_ns(index):
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ns').asi8
+
+
+def _frame(times, values):
+    """yfinance-style OHLCV frame from int64 times and (5, n) values."""
+    close = values[CLOSE]
+    return pd.DataFrame({
+        'Adj Close': close,
+        'Close': close,
+        'High': values[HIGH],
+        'Low': values[LOW],
+        'Open': values[OPEN],
+        'Volume': values[VOLUME],
+    }, index=pd.DatetimeIndex(times.astype('datetime64[ns]'), name='Datetime'))
+
+
+def _group_bars(times, values, step):
+    """
+    Rolls sorted bars or ticks up into `step`-nanosecond buckets.
+
+    Returns:
+        np.ndarray, np.ndarray: Bucket start times and (5, buckets) OHLCV values.
+    """
+    buckets = times - times % step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    grouped = np.empty((len(FIELDS), len(starts)))
+    grouped[OPEN] = values[OPEN, starts]
+    grouped[HIGH] = np.fmax.reduceat(values[HIGH], starts)
+    grouped[LOW] = np.fmin.reduceat(values[LOW], starts)
+    grouped[CLOSE] = values[CLOSE, ends]
+    grouped[VOLUME] = np.add.reduceat(values[VOLUME], starts)
+    return buckets[starts], grouped
+
+
+def resample_bars(df, interval):
+    """
+    Aggregates finer OHLCV bars (e.g. 1-minute) into `interval` bars.
+
+    Args:
+        df (pd.DataFrame): Sorted bars with Open, High, Low, Close and Volume.
+        interval (str): A key of INTERVALS.
+
+    Returns:
+        pd.DataFrame: Bars labelled by their start time.
+    """
+    if df.empty:
+        return df
+    values = np.vstack([df[name].to_numpy(dtype=np.float64) for name in FIELDS])
+    times, grouped = _group_bars(_index_ns(df.index), values, INTERVALS[interval].value)
+    return _frame(times, grouped)
+
+
+class RollingBars:
+    """
+    Fixed-capacity ring buffer of OHLCV bars.
+
+    The arrays are allocated once; appending beyond the capacity
+    overwrites the oldest bars, so memory never grows. `width` sets the
+    number of values per bar, for rows other than OHLCV.
+    """
+
+    def __init__(self, capacity, width=len(FIELDS)):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros((width, capacity))
+        self._end = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        return self.times.nbytes + self.values.nbytes
+
+    def extend(self, times, values):
+        """Appends bars: (n,) int64 times and (width, n) values, oldest first."""
+        if len(times) > self.capacity:
+            times, values = times[-self.capacity:], values[:, -self.capacity:]
+        positions = (self._end + np.arange(len(times))) % self.capacity
+        self.times[positions] = times
+        self.values[:, positions] = values
+        self._end = (self._end + len(times)) % self.capacity
+        self._count = min(self._count + len(times), self.capacity)
+
+    def arrays(self):
+        """Copies of the stored (times, values), oldest first."""
+        return self.tail(self._count)
+
+    def tail(self, n):
+        """Copies of the newest `n` (times, values), oldest first."""
+        n = min(n, self._count)
+        order = (self._end - n + np.arange(n)) % self.capacity
+        return self.times[order], self.values[:, order]
+
+    def since(self, time):
+        """
+        The bars after `time` (int64 ns, or None for all), oldest first.
+
+        Walks back from the newest bar, so the cost is the number of bars
+        returned, not the capacity.
+        """
+        if time is None:
+            return self.arrays()
+        n = 0
+        while n < self._count and self.times[(self._end - n - 1) % self.capacity] > time:
+            n += 1
+        return self.tail(n)
+
+
+class BarAggregator:
+    """
+    Builds one interval's OHLCV bars from ticks, quotes or finer bars.
+
+    The bar still forming is kept apart from the completed ones. Input
+    older than the forming bar (a late tick) is dropped and counted in
+    `late`.
+    """
+
+    def __init__(self, interval, history=INTRADAY_HISTORY):
+        self.interval = interval
+        self.step = INTERVALS[interval].value
+        self.bars = RollingBars(window_bars(history, INTERVALS[interval]))
+        # [bucket start (ns), open, high, low, close, volume]
+        self.current = None
+        self.late = 0
+        self._day = None
+        self._day_volume = 0.0
+
+    @property
+    def nbytes(self):
+        return self.bars.nbytes
+
+    def _complete(self, bar):
+        self.bars.extend(np.array([bar[0]], dtype=np.int64), np.array(bar[1:], dtype=np.float64)[:, None])
+        return (pd.Timestamp(bar[0]),) + tuple(bar[1:])
+
+    def add_bar(self, timestamp, open_, high, low, close, volume=0.0):
+        """
+        Merges a tick or finer bar into the forming bar.
+
+        Returns:
+            tuple: The bar this input completed, as (timestamp, open, high,
+            low, close, volume), or None.
+        """
+        ns = _wall_ns(timestamp)
+        bucket = ns - ns % self.step
+        current = self.current
+        if current is None or bucket > current[0]:
+            completed = self._complete(current) if current is not None else None
+            self.current = [bucket, float(open_), float(high), float(low), float(close), float(volume)]
+            return completed
+        if bucket < current[0]:
+            self.late += 1
+            return None
+        current[2] = max(current[2], float(high))
+        current[3] = min(current[3], float(low))
+        current[4] = float(close)
+        current[5] += float(volume)
+        return None
+
+    def add_tick(self, timestamp, price, size=0.0):
+        """Merges one trade (or a price with no size)."""
+        return self.add_bar(timestamp, price, price, price, price, size)
+
+    def add_quote(self, timestamp, price, day_volume):
+        """
+        Merges a quote carrying the session's cumulative volume.
+
+        The bar gets the volume traded since the previous quote; the first
+        quote of a day brings all the volume traded before it.
+        """
+        day = _wall_ns(timestamp) // DAY_NS
+        same_day = day == self._day and day_volume >= self._day_volume
+        size = day_volume - self._day_volume if same_day else day_volume
+        self._day, self._day_volume = day, day_volume
+        return self.add_tick(timestamp, price, size)
+
+    def add_frame(self, df):
+        """
+        Merges sorted finer bars in one vectorised pass.
+
+        Args:
+            df (pd.DataFrame): Bars with Open, High, Low, Close and Volume.
+
+        Returns:
+            int: Number of bars completed.
+        """
+        df = df[df['Close'].notna()]
+        if df.empty:
+            return 0
+        times = _index_ns(df.index)
+        values = np.vstack([df[name].to_numpy(dtype=np.float64) for name in FIELDS])
+        values[VOLUME] = np.nan_to_num(values[VOLUME])
+        if self.current is not None:
+            keep = times >= self.current[0]
+            self.late += int((~keep).sum())
+            times, values = times[keep], values[:, keep]
+            if len(times) == 0:
+                return 0
+
+        bucket_times, grouped = _group_bars(times, values, self.step)
+        first = 0
+        current = self.current
+        if current is not None and bucket_times[0] == current[0]:
+            current[2] = max(current[2], grouped[HIGH, 0])
+            current[3] = min(current[3], grouped[LOW, 0])
+            current[4] = grouped[CLOSE, 0]
+            current[5] += grouped[VOLUME, 0]
+            first = 1
+        if first == len(bucket_times):
+            return 0
+
+        # Everything before the last new bucket is complete, including the old forming bar
+        done_times, done_values = bucket_times[first:-1], grouped[:, first:-1]
+        if current is not None:
+            done_times = np.r_[np.int64(current[0]), done_times]
+            done_values = np.hstack([np.array(current[1:])[:, None], done_values])
+        self.bars.extend(done_times, done_values)
+        self.current = [int(bucket_times[-1])] + grouped[:, -1].tolist()
+        return len(done_times)
+
+    def forming(self, pending=None):
+        """
+        The bars not yet written to `bars`, oldest first.
+
+        That is the forming bar, preceded by the bar `pending` would
+        complete if it starts a later bucket.
+
+        Args:
+            pending (tuple): A provisional finer bar (timestamp ns, open,
+                high, low, close, volume) to include without merging it.
+
+        Returns:
+            list: [timestamp ns, open, high, low, close, volume] per bar.
+        """
+        tail = []
+        current = list(self.current) if self.current is not None else None
+        if pending is not None:
+            bucket = pending[0] - pending[0] % self.step
+            if current is None or bucket > current[0]:
+                if current is not None:
+                    tail.append(current)
+                current = [bucket] + list(pending[1:])
+            elif bucket == current[0]:
+                current = [current[0], current[1], max(current[2], pending[2]), min(current[3], pending[3]),
+                           pending[4], current[5] + pending[5]]
+        if current is not None:
+            tail.append(current)
+        return tail
+
+    def frame(self, pending=None):
+        """
+        The completed bars plus the forming one, oldest first.
+
+        Args:
+            pending (tuple): A provisional finer bar to include without
+                merging it (see `forming`).
+
+        Returns:
+            pd.DataFrame: yfinance-style OHLCV bars.
+        """
+        times, values = self.bars.arrays()
+        tail = self.forming(pending)
+        if tail:
+            times = np.r_[times, np.array([bar[0] for bar in tail], dtype=np.int64)]
+            values = np.hstack([values, np.array([bar[1:] for bar in tail], dtype=np.float64).T])
+        return _frame(times, values)
+
+
+class IntradayFeed:
+    """
+    Intraday bars of one ticker at every interval of INTERVALS.
+
+    Feed it ticks, quotes or source bars such as the provider's 1-minute
+    bars. Providers re-send their latest bar while it is still forming,
+    so the newest source bar stays pending (shown, not merged) until a
+    later one arrives.
+    """
+
+    def __init__(self, history=INTRADAY_HISTORY):
+        self.aggregators = {interval: BarAggregator(interval, history) for interval in INTERVALS}
+        self.pending = None
+        # time.time() of the last provider poll, set by the caller
+        self.updated_at = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return sum(aggregator.nbytes for aggregator in self.aggregators.values())
+
+    @property
+    def last_time(self):
+        """Timestamp of the newest source bar, tick or quote seen."""
+        if self.pending is not None:
+            return pd.Timestamp(self.pending[0])
+        latest = [a.current[0] for a in self.aggregators.values() if a.current is not None]
+        return pd.Timestamp(max(latest)) if latest else None
+
+    def add_tick(self, timestamp, price, size=0.0):
+        """Merges one trade into every interval; returns {interval: completed bar or None}."""
+        return {interval: a.add_tick(timestamp, price, size) for interval, a in self.aggregators.items()}
+
+    def add_quote(self, timestamp, price, day_volume):
+        """Merges a quote with cumulative day volume into every interval."""
+        return {interval: a.add_quote(timestamp, price, day_volume) for interval, a in self.aggregators.items()}
+
+    def add_bars(self, df):
+        """
+        Merges sorted source bars; the newest stays pending.
+
+        Rows older than the pending bar were merged already and are
+        skipped; a row with the pending bar's timestamp replaces it.
+        """
+        if df is None or df.empty:
+            return
+        df = df[df['Close'].notna()]
+        times = _index_ns(df.index)
+        if self.pending is not None:
+            keep = times >= self.pending[0]
+            df, times = df[keep], times[keep]
+        if df.empty:
+            return
+
+        commit = df.iloc[:-1]
+        if self.pending is not None and times[0] > self.pending[0]:
+            # A later bar arrived, so the pending one is final
+            pending = pd.DataFrame([self.pending[1:]], columns=list(FIELDS),
+                                   index=pd.DatetimeIndex([self.pending[0]]).as_unit('ns'))
+            commit = pd.concat([pending, commit[list(FIELDS)]])
+        if not commit.empty:
+            for aggregator in self.aggregators.values():
+                aggregator.add_frame(commit)
+        last = df.iloc[-1]
+        self.pending = (int(times[-1]),) + tuple(float(last[name]) for name in FIELDS)
+
+    def frame(self, interval):
+        """OHLCV bars of one interval, the forming bar included."""
+        return self.aggregators[interval].frame(self.pending)
+
+    def forming(self, interval):
+        """Bars of one interval not yet completed, as BarAggregator.forming lists."""
+        return self.aggregators[interval].forming(self.pending)
+
+
+class FeedRegistry:
+    """IntradayFeeds by ticker, least recently used dropped beyond `max_tickers`."""
+
+    def __init__(self, max_tickers=INTRADAY_MAX_TICKERS, history=INTRADAY_HISTORY):
+        self.max_tickers = max_tickers
+        self.history = history
+        self._feeds = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._feeds)
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(feed.nbytes for feed in self._feeds.values())
+
+    def get(self, ticker):
+        """Returns the ticker's feed, creating it if needed."""
+        key = ticker.upper()
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = self._feeds[key] = IntradayFeed(self.history)
+                while len(self._feeds) > self.max_tickers:
+                    self._feeds.popitem(last=False)
+            else:
+                self._feeds.move_to_end(key)
+            return feed
@@ -0,0 +1,175 @@
+"""
+Live updates of the intraday charts.
+
+A LiveStream per ticker and interval turns the feed's completed bars into
+chart rows (OHLCV plus the streaming indicators) once, however many
+browsers watch it. Each browser keeps a cursor, the time of the last
+completed bar its charts show, and polls for the rows after it, so a
+poll costs the same at the end of the session as at the start: the
+provider poll fetches only new minutes, the indicators update in O(1)
+per bar and the response carries only the new rows.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from analysis import window_bars
+from data_loader import refresh_intraday_feed
+from indicators import IndicatorEngine, RollingStd
+from intraday import INTERVALS, INTRADAY_HISTORY, INTRADAY_MAX_TICKERS, INTRADAY_WINDOWS, FIELDS, CLOSE, RollingBars
+from metrics import span
+
+# Seconds between a live page's polls; the provider itself is polled at most
+# every data_loader.INTRADAY_REFRESH_INTERVAL
+LIVE_POLL_INTERVAL = int(os.environ.get("LIVE_POLL_INTERVAL", 5))
+
+# Values of a chart row, in row order
+COLUMNS = FIELDS + ('SMA_50', 'SMA_200', 'RSI', 'MACD', 'Signal_Line', 'RollingVol_30', 'RollingVol_90')
+
+
+def _rows_frame(times, values, columns):
+    return pd.DataFrame(values.T, index=pd.DatetimeIndex(times.astype('datetime64[ns]'), name='Datetime'),
+                        columns=list(columns))
+
+
+class LiveStream:
+    """
+    Chart rows of one ticker's bars at one interval.
+
+    The indicators are the streaming versions (indicators.py) of the
+    columns `analysis.analyze` computes with INTRADAY_WINDOWS, so the rows
+    continue a chart built from the same bars. Rows are kept in a ring
+    buffer of INTRADAY_HISTORY, like the bars.
+    """
+
+    def __init__(self, interval, history=INTRADAY_HISTORY, windows=INTRADAY_WINDOWS):
+        step = INTERVALS[interval]
+        self.interval = interval
+        self.windows = {column: window_bars(window, step) for column, window in windows.items()}
+        self.rows = RollingBars(window_bars(history, step), width=len(COLUMNS))
+        self.feed = None
+        # Time (ns) of the newest bar taken from the feed
+        self.last = None
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.engine = IndicatorEngine(self.windows['SMA_50'], self.windows['SMA_200'], self.windows['RSI'])
+        self.vol_30 = RollingStd(self.windows['RollingVol_30'])
+        self.vol_90 = RollingStd(self.windows['RollingVol_90'])
+        self.prev_close = None
+
+    def update(self, feed):
+        """
+        Adds the bars `feed` completed since the last update.
+
+        Call it holding `feed.lock` and `self.lock`.
+
+        Args:
+            feed (intraday.IntradayFeed): The ticker's feed.
+
+        Returns:
+            int: Number of new rows.
+        """
+        if feed is not self.feed:
+            # The ticker's feed was dropped and created again: start over from its bars
+            self.feed, self.last = feed, None
+            self.rows = RollingBars(self.rows.capacity, width=len(COLUMNS))
+            self._reset()
+        bars = feed.aggregators[self.interval].bars
+        times, values = bars.since(self.last)
+        if len(times) == 0:
+            return 0
+        if self.last is not None and len(times) == len(bars):
+            # Bars between the last update and the oldest one kept were never seen
+            self._reset()
+
+        rows = np.empty((len(COLUMNS), len(times)))
+        rows[:len(FIELDS)] = values
+        for i, close in enumerate(values[CLOSE]):
+            change = close / self.prev_close - 1.0 if self.prev_close is not None else np.nan
+            self.prev_close = close
+            indicators = self.engine.update(close)
+            rows[len(FIELDS):, i] = [indicators[name] for name in IndicatorEngine.COLUMNS] + [
+                self.vol_30.update(change), self.vol_90.update(change)]
+        self.rows.extend(times, rows)
+        self.last = int(times[-1])
+        return len(times)
+
+    def read(self, feed, after):
+        """
+        Updates from `feed` and returns the rows after `after` and the bars still forming.
+
+        Args:
+            feed (intraday.IntradayFeed): The ticker's feed.
+            after (int): Time (ns) of the last completed bar a page shows.
+
+        Returns:
+            tuple: (rows, forming) DataFrames, `rows` with COLUMNS and
+            `forming` with OHLCV for the bars after the newest row.
+        """
+        with feed.lock, self.lock:
+            self.update(feed)
+            times, values = self.rows.since(after)
+            forming = feed.forming(self.interval)
+
+        newest = times[-1] if len(times) else after
+        forming = [bar for bar in forming if bar[0] > newest]
+        forming_times = np.array([bar[0] for bar in forming], dtype=np.int64)
+        forming_values = np.array([bar[1:] for bar in forming], dtype=np.float64).reshape(-1, len(FIELDS)).T
+        return _rows_frame(times, values, COLUMNS), _rows_frame(forming_times, forming_values, FIELDS)
+
+
+class StreamRegistry:
+    """LiveStreams by ticker and interval, least recently used dropped beyond `max_streams`."""
+
+    def __init__(self, max_streams=INTRADAY_MAX_TICKERS * len(INTERVALS), history=INTRADAY_HISTORY):
+        self.max_streams = max_streams
+        self.history = history
+        self._streams = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._streams)
+
+    def get(self, ticker, interval):
+        """Returns the stream of a ticker and interval, creating it if needed."""
+        key = (ticker.upper(), interval)
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = LiveStream(interval, self.history)
+                while len(self._streams) > self.max_streams:
+                    self._streams.popitem(last=False)
+            else:
+                self._streams.move_to_end(key)
+            return stream
+
+
+# Rows of recently watched tickers, shared by every live page of the worker
+live_streams = StreamRegistry()
+
+
+def live_update(ticker, interval, after):
+    """
+    Chart rows completed after a page's cursor, and the bars still forming.
+
+    Args:
+        ticker (str): The stock ticker symbol.
+        interval (str): A key of INTERVALS.
+        after (str or pd.Timestamp): Last completed bar the page shows.
+
+    Returns:
+        tuple: (rows, forming) DataFrames (see LiveStream.read); None if
+        the provider could not be polled.
+    """
+    with span("live.update") as s:
+        feed = refresh_intraday_feed(ticker)
+        if feed is None:
+            return None
+        rows, forming = live_streams.get(ticker, interval).read(feed, pd.Timestamp(after).as_unit('ns').value)
+        s.set(rows=len(rows))
+        return rows, forming
@@ -0,0 +1,256 @@
+"""
+In-process timing spans and counters, exposed in Prometheus text format.
+
+Wrap each stage of a request in a span:
+
+    with span("fetch.prices") as s:
+        df = ...
+        s.set(cache="hit", rows=len(df))
+
+A span records its duration in a latency histogram, and optionally a
+cache hit or miss, the rows processed and the payload bytes produced.
+Labels are limited to stage names (never tickers), so the number of
+series stays small. A span costs a few microseconds, so spans can stay
+on in production. Set DASHBOARD_METRICS=0 to turn them off.
+
+Every worker process keeps its own registry, and /metrics reports the
+worker that serves the request.
+"""
+import bisect
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+METRICS_ENABLED = os.environ.get("DASHBOARD_METRICS", "1") != "0"
+
+# Prefix of every exported metric name
+NAMESPACE = "stock_dashboard"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7)
+# Recent durations kept per stage for the median / p95 summary
+RECENT_SAMPLES = 500
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels[name] for name in self.labelnames), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (+Inf last), sum and count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][position] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels):
+        state = self._values.get(tuple(labels[name] for name in self.labelnames))
+        return state[2] if state else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+
+class Registry:
+    """The metrics of one process, rendered together for /metrics."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Returns every metric in Prometheus text exposition format (0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    f"{NAMESPACE}_stage_seconds", "Duration of each dashboard stage.", ["stage"]))
+STAGE_ERRORS = REGISTRY.register(Counter(
+    f"{NAMESPACE}_stage_errors_total", "Stages that raised an exception.", ["stage"]))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    f"{NAMESPACE}_cache_requests_total", "Cache lookups per stage by result (hit, miss, refresh).", ["stage", "result"]))
+ROWS_PROCESSED = REGISTRY.register(Counter(
+    f"{NAMESPACE}_rows_total", "Rows (bars, headlines, tickers) processed per stage.", ["stage"]))
+PAYLOAD_BYTES = REGISTRY.register(Histogram(
+    f"{NAMESPACE}_payload_bytes", "Serialised size of outputs and responses.", ["stage"], BYTES_BUCKETS))
+
+_recent = {}
+_recent_lock = threading.Lock()
+
+
+class Span:
+    """Attributes of one timed stage; see `span`."""
+
+    __slots__ = ("stage", "cache", "rows", "bytes")
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.cache = None
+        self.rows = None
+        self.bytes = None
+
+    def set(self, cache=None, rows=None, bytes=None):
+        """
+        Records what the stage did.
+
+        Args:
+            cache (str): Cache result, e.g. "hit" or "miss".
+            rows (int): Rows processed.
+            bytes (int): Size of the serialised output.
+        """
+        if cache is not None:
+            self.cache = cache
+        if rows is not None:
+            self.rows = rows
+        if bytes is not None:
+            self.bytes = bytes
+
+
+class _NoopSpan:
+    def set(self, cache=None, rows=None, bytes=None):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def observe(stage, seconds):
+    """Records a duration measured elsewhere (e.g. the browser's first paint)."""
+    if not METRICS_ENABLED:
+        return
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    with _recent_lock:
+        samples = _recent.get(stage)
+        if samples is None:
+            samples = _recent[stage] = deque(maxlen=RECENT_SAMPLES)
+        samples.append(seconds)
+
+
+def observe_bytes(stage, size):
+    """Records the size of a serialised output."""
+    if METRICS_ENABLED:
+        PAYLOAD_BYTES.observe(size, stage=stage)
+
+
+@contextmanager
+def span(stage):
+    """
+    Times a stage and records the attributes set on the yielded Span.
+
+    Exceptions are counted in STAGE_ERRORS and re-raised.
+    """
+    if not METRICS_ENABLED:
+        yield _NOOP_SPAN
+        return
+    current = Span(stage)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        observe(stage, time.perf_counter() - started)
+        if current.cache is not None:
+            CACHE_REQUESTS.inc(stage=stage, result=current.cache)
+        if current.rows is not None:
+            ROWS_PROCESSED.inc(current.rows, stage=stage)
+        if current.bytes is not None:
+            PAYLOAD_BYTES.observe(current.bytes, stage=stage)
+
+
+def stage_summary():
+    """
+    Median and 95th percentile of each stage's recent durations.
+
+    Returns:
+        dict: {stage: {"count", "median", "p95"}} in seconds.
+    """
+    with _recent_lock:
+        samples = {stage: sorted(values) for stage, values in _recent.items()}
+    return {
+        stage: {
+            "count": len(values),
+            "median": statistics.median(values),
+            "p95": values[min(len(values) - 1, int(0.95 * len(values)))],
+        }
+        for stage, values in samples.items()
+    }
+
+
+def render():
+    """Returns the process's metrics in Prometheus text format."""
+    return REGISTRY.render()
@@ -0,0 +1,284 @@
+"""
+Nightly precomputed analytics for the coverage universe.
+
+Run after market close:
+
+    python src/precompute.py [--tickers RELIANCE.NS TCS.NS ...] [--period 10y]
+
+For each ticker it runs the analysis pipeline over the full history and
+writes every column as a .npy file, with a small meta.json holding the
+index length, the streaming indicator state and the seasonal sums.
+The dashboard memory-maps those files and only computes the bars that
+arrived after the build.
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+import data_loader
+from analysis import (AnalysisResult, analyze, calendar_sums, merge_calendar_sums, pct_change,
+                      rolling_mean, rolling_std, seasonal_from_sums)
+from indicators import IndicatorEngine
+from metrics import span
+from providers import get_provider
+
+# Bars of history the tail computation needs from the store (longest rolling window - 1)
+_TAIL_CONTEXT = {'Daily Return': 89, 'Volume': 19}
+
+# Stores opened by this process: directory -> (meta mtime, store)
+_open_stores = {}
+
+
+def _store_dir(ticker):
+    safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+    return os.path.join(data_loader.CACHE_DIR, "analytics", get_provider().name, safe_ticker)
+
+
+def _column_file(name):
+    return re.sub(r"[^A-Za-z0-9_]", "_", name) + ".npy"
+
+
+def write_analytics(ticker, df):
+    """
+    Analyses a full history and writes it to the ticker's store.
+
+    Args:
+        ticker (str): Stock ticker.
+        df (pd.DataFrame): Stock data with 'Adj Close' and 'Volume'.
+
+    Returns:
+        str: The store directory.
+    """
+    result = analyze(df)
+    engine = IndicatorEngine()
+    engine.backfill(df)
+
+    path = _store_dir(ticker)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    index = df.index
+    naive = index.tz_localize(None) if index.tz is not None else index
+    np.save(os.path.join(tmp_path, "index.npy"), naive.values)
+    columns = {}
+    for name, values in result.columns.items():
+        columns[name] = _column_file(name)
+        np.save(os.path.join(tmp_path, columns[name]), np.ascontiguousarray(values, dtype=np.float64))
+
+    sums = calendar_sums(index, result['Daily Return'], np.asarray(result['Volume'], dtype=np.float64))
+    meta = {
+        "ticker": ticker,
+        "rows": len(index),
+        "tz": None if index.tz is None else str(index.tz),
+        "last_bar": index[-1].isoformat(),
+        "built_at": time.time(),
+        "columns": columns,
+        "engine": engine.to_state(),
+        "calendar": {key: value if key == 'first_year' else value.tolist() for key, value in sums.items()},
+    }
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    # Swap the new build in; readers holding the old files keep their mapping
+    old_path = f"{path}.{os.getpid()}.old"
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return path
+
+
+def read_analytics(ticker):
+    """
+    Opens a ticker's store with every column memory-mapped read-only.
+
+    Returns:
+        dict: 'meta', 'index' (pd.DatetimeIndex) and 'columns' (name ->
+        np.memmap), or None if the ticker has no store.
+    """
+    path = _store_dir(ticker)
+    meta_path = os.path.join(path, "meta.json")
+    try:
+        mtime = os.stat(meta_path).st_mtime_ns
+    except OSError:
+        return None
+    opened = _open_stores.get(path)
+    if opened is not None and opened[0] == mtime:
+        return opened[1]
+
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        index = pd.DatetimeIndex(np.load(os.path.join(path, "index.npy"), mmap_mode="r"))
+        if meta["tz"] is not None:
+            index = index.tz_localize(meta["tz"])
+        columns = {name: np.load(os.path.join(path, file), mmap_mode="r") for name, file in meta["columns"].items()}
+    except Exception as e:
+        print(f"Ignoring unreadable analytics store {path}: {e}")
+        return None
+
+    store = {"meta": meta, "index": index, "columns": columns}
+    _open_stores[path] = (mtime, store)
+    return store
+
+
+def _tail_columns(store, tail):
+    """Derived columns for the bars after the store's last bar."""
+    columns = store["columns"]
+    close = tail['Adj Close'].to_numpy(dtype=np.float64)
+    volume = tail['Volume'].to_numpy(dtype=np.float64)
+    n = len(tail)
+
+    returns = pct_change(np.r_[columns['Adj Close'][-1], close])[1:]
+    recent_returns = np.r_[columns['Daily Return'][-_TAIL_CONTEXT['Daily Return']:], returns]
+    recent_volume = np.r_[columns['Volume'][-_TAIL_CONTEXT['Volume']:], volume]
+
+    engine = IndicatorEngine.from_state(store["meta"]["engine"])
+    indicators = engine.update_frame(tail)
+
+    derived = {
+        'Daily Return': returns,
+        'RollingVol_30': rolling_std(recent_returns, 30)[-n:],
+        'RollingVol_90': rolling_std(recent_returns, 90)[-n:],
+        'Volume_MA20': rolling_mean(recent_volume, 20)[-n:],
+    }
+    for name in IndicatorEngine.COLUMNS:
+        derived[name] = indicators[name].to_numpy()
+    return derived, calendar_sums(tail.index, returns, volume)
+
+
+def load_analysis(ticker, df):
+    """
+    Returns `analyze(df)`, served from the precomputed store when possible.
+
+    Stored columns are read as zero-copy slices of the memory-mapped
+    files; only bars newer than the nightly build are computed. The
+    store is used when `df` holds exactly its bars from `df`'s first bar
+    on, plus any newer ones. Otherwise the history is analysed in full:
+    when the store is missing, when a corporate action rewrote the
+    adjusted history, when `df` starts before the store, or when `df`
+    has a gap.
+
+    When `df` starts after the store's first bar (the period slid since
+    the build), the seasonal tables are recounted over `df`'s dates, but
+    the columns are the stored ones: the first bars carry values where
+    `analyze(df)` is still warming up (NaN until a rolling window fills,
+    e.g. 199 bars for SMA_200), and MACD and its signal line keep the
+    fading influence of the earlier bars on their EMAs.
+
+    Args:
+        ticker (str): Stock ticker.
+        df (pd.DataFrame): Stock data as returned by fetch_stock_data.
+
+    Returns:
+        AnalysisResult: Same columns as `analyze(df)`.
+    """
+    with span("analysis") as s:
+        return _load_analysis(ticker, df, s)
+
+def _full_analysis(df, s):
+    s.set(cache="miss", rows=len(df))
+    return analyze(df)
+
+def _load_analysis(ticker, df, s):
+    """Body of load_analysis; records on the span `s` whether the store was used."""
+    store = read_analytics(ticker)
+    if store is None or df.empty:
+        return _full_analysis(df, s)
+
+    index = store["index"]
+    last_bar = index[-1]
+    try:
+        # Position of the store's last bar in df (positional lookups keep this cheap)
+        position = df.index.searchsorted(last_bar)
+        start = index.searchsorted(df.index[0])
+        matches = (
+            position < len(df)
+            and len(index) - start == position + 1
+            and df.index[:position + 1].equals(index[start:])
+            and np.isclose(df['Adj Close'].iat[position], store["columns"]['Adj Close'][-1], rtol=1e-9)
+        )
+    except Exception:
+        matches = False
+    if not matches:
+        return _full_analysis(df, s)
+
+    tail = df.iloc[position + 1:]
+    stored = {name: values[start:] for name, values in store["columns"].items()}
+    if start == 0:
+        sums = {key: value if key == 'first_year' else np.asarray(value)
+                for key, value in store["meta"]["calendar"].items()}
+    else:
+        # The stored sums include bars before df: recount over df's dates,
+        # where the first bar has no return, as in analyze(df)
+        returns = np.array(stored['Daily Return'])
+        returns[0] = np.nan
+        sums = calendar_sums(index[start:], returns, stored['Volume'])
+
+    if tail.empty:
+        s.set(cache="hit", rows=0)
+        columns = stored
+        result_index = index[start:]
+    else:
+        s.set(cache="refresh", rows=len(tail))
+        derived, tail_sums = _tail_columns(store, tail)
+        columns = {}
+        for name, values in stored.items():
+            new = derived[name] if name in derived else tail[name].to_numpy(dtype=np.float64)
+            columns[name] = np.concatenate([values, new])
+        result_index = index[start:].append(tail.index)
+        sums = merge_calendar_sums(sums, tail_sums)
+
+    seasonal, monthly_volume = seasonal_from_sums(sums)
+    return AnalysisResult(result_index, columns, seasonal, monthly_volume)
+
+
+def build_store(tickers=None, period="10y"):
+    """
+    Batch job: fetches and analyses every ticker of the universe.
+
+    Args:
+        tickers (list): Tickers to build (default: the Nifty 50).
+        period (str): History to analyse (default: "10y", the dashboard's period).
+
+    Returns:
+        dict: 'built' and 'failed' ticker lists.
+    """
+    tickers = data_loader.NIFTY50_SYMBOLS if tickers is None else tickers
+    built, failed = [], []
+    for ticker in tickers:
+        try:
+            df = data_loader.fetch_stock_data(ticker, period=period)
+            if df.empty:
+                failed.append(ticker)
+                continue
+            write_analytics(ticker, df)
+            built.append(ticker)
+        except Exception as e:
+            print(f"Error precomputing {ticker}: {e}")
+            failed.append(ticker)
+    return {"built": built, "failed": failed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', nargs='+', default=None, help="default: the Nifty 50")
+    parser.add_argument('--period', default="10y")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    summary = build_store(args.tickers, args.period)
+    print(f"Precomputed {len(summary['built'])} tickers in {time.perf_counter() - started:.1f} s")
+    if summary["failed"]:
+        print(f"Failed: {', '.join(summary['failed'])}")
+
+
+if __name__ == '__main__':
+    main()
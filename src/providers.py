@@ -0,0 +1,459 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Synthetic histories start here and run up to today
+SYNTHETIC_START = pd.Timestamp("2000-01-03")
+# Synthetic intraday bars: the last few NSE sessions, 09:15 to 15:30, up to the current minute
+SYNTHETIC_SESSIONS = 5
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=15)
+SESSION_MINUTES = 375
+
+
+class ProviderError(Exception):
+    """Raised by a provider when a request fails (real or injected)."""
+
+
+def period_start(period, now=None):
+    """
+    Converts a yfinance period string into the first date it covers.
+
+    Args:
+        period (str): Period such as "1mo", "5y", "ytd" or "max".
+        now (pd.Timestamp): Reference time (default: now).
+
+    Returns:
+        pd.Timestamp or None: Start date, or None for "max".
+    """
+    now = (now or pd.Timestamp.now()).normalize()
+    if period == "max":
+        return None
+    if period == "ytd":
+        return now.replace(month=1, day=1)
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    count, unit = int(match.group(1)), match.group(2)
+    offsets = {
+        "d": pd.DateOffset(days=count),
+        "wk": pd.DateOffset(weeks=count),
+        "mo": pd.DateOffset(months=count),
+        "y": pd.DateOffset(years=count),
+    }
+    return now - offsets[unit]
+
+
+def ticker_seed(ticker):
+    """Returns a stable integer seed for a ticker symbol."""
+    return zlib.crc32(ticker.upper().encode("utf-8"))
+
+
+def generate_ohlcv(seed=0, periods=None, start=SYNTHETIC_START, end=None,
+                   start_price=100.0, drift=0.0003, volatility=0.015, dates=None):
+    """
+    Generates a synthetic daily OHLCV history from a geometric random walk.
+
+    The same seed always produces the same bars, and a longer history
+    starts with the bars of a shorter one, so it behaves like a real feed
+    for caching and delta fetches.
+
+    Args:
+        seed (int): Random seed (see `ticker_seed`).
+        periods (int): Number of business days; overrides `end` if given.
+        start (pd.Timestamp): First bar date.
+        end (pd.Timestamp): Last bar date (default: today).
+        start_price (float): Price of the first bar.
+        drift (float): Mean daily log return.
+        volatility (float): Standard deviation of daily log returns.
+        dates (np.ndarray): Bar timestamps, e.g. intraday; overrides
+            `start`, `end` and `periods`. `drift` and `volatility` then
+            apply per bar.
+
+    Returns:
+        pd.DataFrame: Frame with yfinance-style OHLCV columns.
+    """
+    if dates is None:
+        # numpy's business-day arithmetic is much faster than pd.bdate_range
+        first = np.busday_offset(np.datetime64(pd.Timestamp(start).date()), 0, roll='forward')
+        if periods is None:
+            last = np.datetime64(pd.Timestamp(end or pd.Timestamp.now()).date())
+            periods = max(int(np.busday_count(first, last + 1)), 0)
+        dates = np.busday_offset(first, np.arange(periods), roll='forward').astype('datetime64[ns]')
+    else:
+        dates = np.asarray(dates, dtype='datetime64[ns]')
+    n = len(dates)
+    # One row of draws per bar keeps the history prefix-stable across lengths
+    shocks = np.random.default_rng(seed).standard_normal((n, 5))
+
+    log_returns = drift + volatility * shocks[:, 0]
+    log_returns[0] = 0.0
+    close = start_price * np.exp(np.cumsum(log_returns))
+    open_price = np.empty(n)
+    open_price[0] = start_price
+    open_price[1:] = close[:-1] * np.exp(volatility / 4 * shocks[1:, 1])
+    high = np.maximum(open_price, close) * (1 + np.abs(volatility / 2 * shocks[:, 2]))
+    low = np.minimum(open_price, close) * (1 - np.abs(volatility / 2 * shocks[:, 3]))
+    volume = np.exp(13 + 0.4 * shocks[:, 4]).round()
+
+    return pd.DataFrame({
+        'Adj Close': close,
+        'Close': close,
+        'High': high,
+        'Low': low,
+        'Open': open_price,
+        'Volume': volume,
+    }, index=pd.DatetimeIndex(dates, name='Date'))
+
+
+def _combine(frames, tickers):
+    """Stacks per-ticker frames into yfinance's (Price, Ticker) column layout."""
+    data = pd.concat(frames, axis=1, keys=tickers, names=['Ticker', 'Price'])
+    return data.swaplevel(axis=1).sort_index(axis=1, level=0, sort_remaining=False)
+
+
+class DataProvider:
+    """
+    Interface behind every `fetch_*` function in data_loader.
+
+    `download` mirrors `yf.download`: a single ticker string returns flat
+    OHLCV columns, a list of tickers returns (Price, Ticker) columns.
+    """
+    name = "base"
+
+    def download(self, tickers, period=None, start=None, auto_adjust=False, interval="1d"):
+        raise NotImplementedError
+
+    def info(self, ticker):
+        raise NotImplementedError
+
+    def news(self, ticker):
+        raise NotImplementedError
+
+
+class YFinanceProvider(DataProvider):
+    """Live data from Yahoo Finance through yfinance (imported on first use, it is slow to load)."""
+    name = "yfinance"
+
+    def download(self, tickers, period=None, start=None, auto_adjust=False, interval="1d"):
+        import yfinance as yf
+        if start is not None:
+            start = pd.Timestamp(start)
+            # Daily bars start at a date; intraday polls ask from the last bar's minute, not the whole day
+            start = start.strftime("%Y-%m-%d") if interval == "1d" else start.to_pydatetime()
+            return yf.download(tickers, start=start, interval=interval, progress=False, auto_adjust=auto_adjust)
+        return yf.download(tickers, period=period, interval=interval, progress=False, auto_adjust=auto_adjust)
+
+    def info(self, ticker):
+        import yfinance as yf
+        return yf.Ticker(ticker).info
+
+    def news(self, ticker):
+        import yfinance as yf
+        return yf.Ticker(ticker).news
+
+
+class ReplayProvider(DataProvider):
+    """
+    Offline provider serving recorded fixtures or synthetic data.
+
+    Fixtures are read from `fixture_dir` using the layout written by
+    RecordingProvider: `ohlcv/<TICKER>.csv`, `info/<TICKER>.json` and
+    `news/<TICKER>.json`. Tickers without fixtures get a deterministic
+    synthetic history when `synthetic` is enabled. Intraday intervals
+    (1m, 5m, 15m) are always synthetic: the last SYNTHETIC_SESSIONS
+    sessions up to the current minute.
+
+    Every call sleeps for `latency` (+ up to `jitter`) seconds and fails
+    with probability `failure_rate`, which makes caching and concurrency
+    behaviour reproducible without a network.
+    """
+    name = "replay"
+
+    def __init__(self, fixture_dir=None, latency=0.0, jitter=0.0, failure_rate=0.0,
+                 seed=0, synthetic=True):
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.synthetic = synthetic
+        self.calls = {"download": 0, "info": 0, "news": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._history = {}
+        self._intraday = {}
+
+    def _simulate(self, kind):
+        """Counts the call, then injects latency and failures."""
+        with self._lock:
+            self.calls[kind] += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            failed = self._rng.random() < self.failure_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            raise ProviderError(f"Injected {kind} failure")
+
+    def _fixture_path(self, kind, ticker, ext):
+        if not self.fixture_dir:
+            return None
+        path = os.path.join(self.fixture_dir, kind, f"{ticker.upper()}.{ext}")
+        return path if os.path.exists(path) else None
+
+    def _load_history(self, ticker):
+        with self._lock:
+            if ticker in self._history:
+                return self._history[ticker]
+
+        path = self._fixture_path("ohlcv", ticker, "csv")
+        if path:
+            history = pd.read_csv(path, index_col=0, parse_dates=True)
+            history.index = pd.DatetimeIndex(history.index).as_unit("ns")
+        elif self.synthetic:
+            history = generate_ohlcv(seed=ticker_seed(ticker))
+        else:
+            history = pd.DataFrame()
+
+        with self._lock:
+            self._history[ticker] = history
+        return history
+
+    def _load_intraday(self, ticker, now):
+        """Synthetic 1-minute bars of the last SYNTHETIC_SESSIONS sessions up to `now`."""
+        today = now.normalize()
+        with self._lock:
+            cached = self._intraday.get(ticker)
+        if cached is None or cached[0] != today:
+            last = np.busday_offset(np.datetime64(today.date()), 0, roll='backward')
+            days = np.busday_offset(last, np.arange(1 - SYNTHETIC_SESSIONS, 1)).astype('datetime64[ns]')
+            minutes = np.timedelta64(SESSION_OPEN.value, 'ns') + np.arange(SESSION_MINUTES) * np.timedelta64(1, 'm')
+            daily = self._load_history(ticker)
+            before = daily[daily.index < pd.Timestamp(days[0])]
+            start_price = float(before['Close'].iloc[-1]) if not before.empty else 100.0
+            # Daily drift and volatility spread over the session's minutes
+            bars = generate_ohlcv(seed=ticker_seed(ticker) ^ int(days[0].astype(np.int64) // 10**9),
+                                  dates=(days[:, None] + minutes[None, :]).ravel(), start_price=start_price,
+                                  drift=0.0, volatility=0.015 / np.sqrt(SESSION_MINUTES))
+            bars['Volume'] = (bars['Volume'] / SESSION_MINUTES).round()
+            bars.index.name = 'Datetime'
+            cached = (today, bars)
+            with self._lock:
+                self._intraday[ticker] = cached
+        bars = cached[1]
+        return bars[bars.index <= now.floor('min')]
+
+    def _download_intraday(self, ticker, period, start, interval):
+        # Imported here: intraday pulls in analysis, which daily-only callers do not need
+        from intraday import INTERVALS, resample_bars
+
+        if interval not in INTERVALS:
+            raise ProviderError(f"Unsupported interval: {interval}")
+        if not self.synthetic:
+            return pd.DataFrame()
+        now = pd.Timestamp.now()
+        bars = self._load_intraday(ticker, now)
+        if start is not None:
+            first = pd.Timestamp(start).tz_localize(None)
+        else:
+            # "1d" is the latest session, as yfinance serves it
+            first = bars.index[-1].normalize() if period == "1d" and not bars.empty else period_start(period or "5d", now)
+        if first is not None:
+            bars = bars[bars.index >= first]
+        return bars.copy() if interval == "1m" else resample_bars(bars, interval)
+
+    def _slice(self, history, period, start):
+        if history.empty:
+            return history
+        if start is not None:
+            return history[history.index >= pd.Timestamp(start)]
+        first = period_start(period or "1mo")
+        if first is None:
+            return history
+        if period == "1d":
+            return history.tail(1)
+        return history[history.index >= first]
+
+    def download(self, tickers, period=None, start=None, auto_adjust=False, interval="1d"):
+        self._simulate("download")
+        if interval != "1d":
+            if not isinstance(tickers, str):
+                raise ProviderError("Replay provider serves intraday bars one ticker at a time")
+            return self._download_intraday(tickers, period, start, interval)
+
+        if isinstance(tickers, str):
+            return self._slice(self._load_history(tickers), period, start).copy()
+
+        frames = [self._slice(self._load_history(t), period, start) for t in tickers]
+        available = [(t, f) for t, f in zip(tickers, frames) if not f.empty]
+        if not available:
+            return pd.DataFrame()
+        return _combine([f for _, f in available], [t for t, _ in available])
+
+    def info(self, ticker):
+        self._simulate("info")
+        path = self._fixture_path("info", ticker, "json")
+        if path:
+            with open(path) as f:
+                return json.load(f)
+        if not self.synthetic:
+            return {}
+
+        history = self._load_history(ticker)
+        if history.empty:
+            return {}
+        last = history.iloc[-1]
+        rng = np.random.default_rng(ticker_seed(ticker))
+        return {
+            "marketCap": float(last['Close'] * rng.integers(10**8, 10**10)),
+            "trailingPE": float(rng.uniform(8, 60)),
+            "priceToBook": float(rng.uniform(0.5, 12)),
+            "dividendYield": float(rng.uniform(0, 4)),
+            "currentPrice": float(last['Close']),
+            "open": float(last['Open']),
+            "dayHigh": float(last['High']),
+            "dayLow": float(last['Low']),
+            "volume": int(last['Volume']),
+            "currency": "INR",
+        }
+
+    def news(self, ticker):
+        self._simulate("news")
+        path = self._fixture_path("news", ticker, "json")
+        if path:
+            with open(path) as f:
+                return json.load(f)
+        if not self.synthetic:
+            return []
+
+        return [{
+            'content': {
+                'title': f"{ticker} synthetic headline {i + 1}",
+                'provider': {'displayName': "Replay Wire"},
+                'clickThroughUrl': {'url': f"https://example.com/{ticker.lower()}/{i + 1}"},
+            }
+        } for i in range(5)]
+
+
+class RecordingProvider(DataProvider):
+    """
+    Wraps another provider and records its responses as replay fixtures.
+
+    OHLCV responses are merged into `ohlcv/<TICKER>.csv` so repeated
+    recordings build up a history; info and news are overwritten.
+    """
+    name = "recording"
+
+    def __init__(self, inner, fixture_dir):
+        self.inner = inner
+        self.fixture_dir = fixture_dir
+
+    def _path(self, kind, ticker, ext):
+        directory = os.path.join(self.fixture_dir, kind)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{ticker.upper()}.{ext}")
+
+    def _record_ohlcv(self, ticker, frame):
+        if frame.empty:
+            return
+        path = self._path("ohlcv", ticker, "csv")
+        if os.path.exists(path):
+            existing = pd.read_csv(path, index_col=0, parse_dates=True)
+            frame = pd.concat([existing, frame])
+            frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+        frame.to_csv(path)
+
+    def download(self, tickers, period=None, start=None, auto_adjust=False, interval="1d"):
+        data = self.inner.download(tickers, period=period, start=start, auto_adjust=auto_adjust, interval=interval)
+        if data is None or data.empty or interval != "1d":
+            return data
+
+        if isinstance(tickers, str):
+            frame = data
+            if isinstance(frame.columns, pd.MultiIndex):
+                frame = frame.copy()
+                frame.columns = frame.columns.get_level_values(0)
+            self._record_ohlcv(tickers, frame)
+        else:
+            for ticker in tickers:
+                if ticker in data.columns.get_level_values(1):
+                    self._record_ohlcv(ticker, data.xs(ticker, axis=1, level=1).dropna(how='all'))
+        return data
+
+    def info(self, ticker):
+        info = self.inner.info(ticker)
+        with open(self._path("info", ticker, "json"), "w") as f:
+            json.dump(info, f, default=str)
+        return info
+
+    def news(self, ticker):
+        news = self.inner.news(ticker)
+        with open(self._path("news", ticker, "json"), "w") as f:
+            json.dump(news, f, default=str)
+        return news
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def provider_from_env():
+    """
+    Builds the provider selected by environment variables.
+
+    STOCK_DATA_PROVIDER: "yfinance" (default), "replay" or "record".
+    STOCK_FIXTURE_DIR: Fixture directory for replay and record.
+    REPLAY_LATENCY, REPLAY_JITTER: Injected latency in seconds.
+    REPLAY_FAILURE_RATE: Probability of an injected failure per call.
+    REPLAY_SEED: Seed for latency jitter and failures.
+
+    Returns:
+        DataProvider: The configured provider.
+    """
+    kind = os.environ.get("STOCK_DATA_PROVIDER", "yfinance").lower()
+    fixture_dir = os.environ.get("STOCK_FIXTURE_DIR")
+    if kind == "replay":
+        return ReplayProvider(
+            fixture_dir=fixture_dir,
+            latency=float(os.environ.get("REPLAY_LATENCY", 0)),
+            jitter=float(os.environ.get("REPLAY_JITTER", 0)),
+            failure_rate=float(os.environ.get("REPLAY_FAILURE_RATE", 0)),
+            seed=int(os.environ.get("REPLAY_SEED", 0)),
+        )
+    if kind == "record":
+        if not fixture_dir:
+            raise ValueError("STOCK_FIXTURE_DIR is required when recording")
+        return RecordingProvider(YFinanceProvider(), fixture_dir)
+    if kind == "yfinance":
+        return YFinanceProvider()
+    raise ValueError(f"Unknown STOCK_DATA_PROVIDER: {kind}")
+
+
+def get_provider():
+    """Returns the active data provider, creating it from the environment on first use."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = provider_from_env()
+        return _provider
+
+
+def set_provider(provider):
+    """
+    Replaces the active data provider.
+
+    Args:
+        provider (DataProvider): New provider, or None to re-read the environment.
+
+    Returns:
+        DataProvider: The previously active provider.
+    """
+    global _provider
+    with _provider_lock:
+        previous, _provider = _provider, provider
+        return previous
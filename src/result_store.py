@@ -0,0 +1,70 @@
+import threading
+from collections import OrderedDict
+
+from coalesce import SingleFlight
+
+
+class ResultStore:
+    """
+    Process-local LRU of intermediate results shared between callbacks.
+
+    The dashboard is filled by several callbacks that all start from the
+    same prices and analysis. The first one to need a key computes it and
+    the others read it from here; concurrent callers of a missing key
+    wait for that one computation; callers in other worker processes do
+    not, since they could not read its result anyway. Values are kept as Python objects
+    (DataFrames, memory-mapped arrays), so they are not copied or
+    serialised between callbacks.
+    """
+
+    def __init__(self, name, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Values live in this process only, so coalescing stops at its threads
+        self._flight = SingleFlight(name, cross_process=False)
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key):
+        """Returns the stored value, or None if the key is missing."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        """Stores a value, evicting the least recently used entries over the limit."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the stored value or computes, stores and returns it.
+
+        Args:
+            key (str): Identity of the result.
+            compute (callable): Computes the value; called once per missing key.
+
+        Returns:
+            Any: The stored or computed value.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return self._flight.do(key, lambda: self._compute(key, compute))
+
+    def _compute(self, key, compute):
+        # A caller that finished while this one waited for the key's lock may have stored it
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            self.stats["misses"] += 1
+        value = compute()
+        self.put(key, value)
+        return value
@@ -0,0 +1,306 @@
+"""
+Portfolio risk: returns, covariance, Value at Risk and Expected Shortfall.
+
+Works on a (dates x tickers) price frame, the layout of
+`data_loader.fetch_sector_data` and `UniversePanel.frame('Adj Close')`,
+and a weight per ticker. VaR and CVaR (Expected Shortfall) are reported
+as positive fractions of the portfolio's value lost over the horizon at
+the given confidence, three ways:
+
+  * historical: quantiles of the portfolio's own past returns,
+  * parametric: a normal distribution with the portfolio's mean and
+    standard deviation (statistics.NormalDist),
+  * Monte Carlo: correlated log-normal prices of every asset at the
+    horizon (geometric Brownian motion fitted to the daily log returns).
+
+Historical and parametric VaR rebalance to the weights daily; Monte Carlo
+buys and holds them over the horizon (see `portfolio_risk`).
+
+The Monte Carlo simulation runs in chunks of MC_CHUNK_PATHS paths, so a
+chunk's (paths, assets) arrays bound the memory whatever the number of
+paths; only each path's final portfolio return is kept. Every chunk draws
+from its own child of one numpy SeedSequence, so a seed gives the same
+paths on any number of worker processes:
+
+    python src/risk.py --tickers TCS.NS INFY.NS WIPRO.NS --paths 1000000 --horizon 10
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from analysis import TRADING_DAYS
+
+# Paths simulated at once: a chunk holds a few (paths, assets) float64 arrays
+MC_CHUNK_PATHS = int(os.environ.get("MC_CHUNK_PATHS", 50_000))
+# Processes of a Monte Carlo simulation (0: one per CPU)
+MC_WORKERS = int(os.environ.get("MC_WORKERS", 0))
+# 'spawn' starts clean workers; 'fork' starts faster but copies the parent's threads' locks
+MC_START_METHOD = os.environ.get("MC_START_METHOD", "spawn")
+
+
+def _weights(prices, weights):
+    """Weights aligned with the price columns, scaled to sum to 1 (equal weights by default)."""
+    if weights is None:
+        values = np.ones(prices.shape[1])
+    elif isinstance(weights, dict):
+        unknown = set(weights) - set(prices.columns)
+        if unknown:
+            raise ValueError(f"No prices for {', '.join(sorted(unknown))}")
+        values = np.array([weights.get(ticker, 0.0) for ticker in prices.columns], dtype=np.float64)
+    else:
+        values = np.asarray(weights, dtype=np.float64)
+        if values.shape != (prices.shape[1],):
+            raise ValueError(f"Expected {prices.shape[1]} weights, got {values.shape[0]}")
+    total = values.sum()
+    if total == 0:
+        raise ValueError("Weights sum to zero")
+    return values / total
+
+def asset_returns(prices, log=False):
+    """
+    Daily returns of each asset over the dates all of them traded.
+
+    Args:
+        prices (pd.DataFrame): (dates x tickers) prices.
+        log (bool): Log returns instead of simple ones.
+
+    Returns:
+        pd.DataFrame: (dates x tickers) returns without missing values.
+    """
+    prices = prices.astype(np.float64)
+    returns = np.log(prices).diff() if log else prices.pct_change(fill_method=None)
+    return returns.dropna(how='any')
+
+def portfolio_returns(prices, weights=None):
+    """
+    Daily returns of a portfolio rebalanced to constant weights.
+
+    Args:
+        prices (pd.DataFrame): (dates x tickers) prices.
+        weights (dict or list): Weight per ticker (default: equal weights);
+            scaled to sum to 1.
+
+    Returns:
+        pd.Series: The portfolio's daily returns.
+    """
+    returns = asset_returns(prices)
+    return pd.Series(returns.to_numpy() @ _weights(prices, weights), index=returns.index, name='Portfolio')
+
+def covariance(prices, annualise=False):
+    """
+    Sample covariance of the assets' daily returns.
+
+    Args:
+        prices (pd.DataFrame): (dates x tickers) prices.
+        annualise (bool): Scale to a year of TRADING_DAYS.
+
+    Returns:
+        pd.DataFrame: (tickers x tickers) covariance.
+    """
+    cov = asset_returns(prices).cov()
+    return cov * TRADING_DAYS if annualise else cov
+
+def _horizon_returns(returns, horizon):
+    """Compounded returns over every window of `horizon` consecutive days (overlapping)."""
+    if horizon == 1:
+        return returns
+    growth = np.cumsum(np.log1p(returns))
+    return np.expm1(growth[horizon - 1:] - np.concatenate(([0.0], growth[:-horizon])))
+
+def historical_var(returns, confidence=0.95, horizon=1):
+    """
+    Historical VaR and CVaR of a return series.
+
+    Args:
+        returns (pd.Series or np.ndarray): Daily portfolio returns.
+        confidence (float): Confidence level, e.g. 0.95 or 0.99.
+        horizon (int): Holding period in days, from overlapping compounded windows.
+
+    Returns:
+        tuple: (VaR, CVaR) as positive fractions of the portfolio lost.
+    """
+    losses = -_horizon_returns(np.asarray(returns, dtype=np.float64), horizon)
+    if len(losses) == 0:
+        return np.nan, np.nan
+    var = np.quantile(losses, confidence)
+    return var, losses[losses >= var].mean()
+
+def parametric_var(mean, std, confidence=0.95, horizon=1):
+    """
+    VaR and CVaR of normally distributed returns.
+
+    Args:
+        mean (float): Mean daily return.
+        std (float): Standard deviation of daily returns.
+        confidence (float): Confidence level.
+        horizon (int): Holding period in days (mean and variance scale with it).
+
+    Returns:
+        tuple: (VaR, CVaR) as positive fractions of the portfolio lost.
+    """
+    standard = NormalDist()
+    z = standard.inv_cdf(confidence)
+    mu = mean * horizon
+    sigma = std * math.sqrt(horizon)
+    return sigma * z - mu, sigma * standard.pdf(z) / (1.0 - confidence) - mu
+
+
+# ---------------------------------------------------------------------------
+# Monte Carlo
+# ---------------------------------------------------------------------------
+
+def _factor(cov):
+    """A matrix L with L @ L.T == cov, even when cov is only semi-definite (e.g. duplicate assets)."""
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.maximum(values, 0.0))
+
+def _simulate_chunk(seed, paths, mean, factor, weights, horizon):
+    """Portfolio returns of `paths` buy-and-hold paths over `horizon` days."""
+    rng = np.random.default_rng(seed)
+    # Daily log returns are i.i.d. normal, so their sum over the horizon is
+    # exactly N(horizon * mean, horizon * cov): one draw per path and asset
+    # instead of one per day
+    log_growth = rng.standard_normal((paths, len(mean))) @ (factor.T * math.sqrt(horizon))
+    log_growth += mean * horizon
+    np.exp(log_growth, out=log_growth)
+    return log_growth @ weights - 1.0
+
+def _simulate_task(args):
+    return _simulate_chunk(*args)
+
+def monte_carlo_returns(mean, cov, weights, paths=100_000, horizon=1, seed=None, workers=None,
+                        chunk_paths=None):
+    """
+    Simulates a portfolio's returns over a horizon from correlated asset paths.
+
+    Each asset's daily log return is drawn from a multivariate normal
+    with `mean` and `cov`; the portfolio holds its starting weights over
+    the horizon.
+
+    Args:
+        mean (np.ndarray): Mean daily log return of each asset.
+        cov (np.ndarray): (assets x assets) covariance of daily log returns.
+        weights (np.ndarray): Starting weight of each asset.
+        paths (int): Number of simulated paths.
+        horizon (int): Days per path.
+        seed (int): Seed of the SeedSequence; the same seed and chunk size
+            give the same returns on any number of workers.
+        workers (int): Processes (default: MC_WORKERS, or one per CPU);
+            1 runs in this process.
+        chunk_paths (int): Paths per chunk (default: MC_CHUNK_PATHS).
+
+    Returns:
+        np.ndarray: (paths,) simulated portfolio returns over the horizon.
+    """
+    mean = np.asarray(mean, dtype=np.float64)
+    factor = _factor(np.asarray(cov, dtype=np.float64))
+    weights = np.asarray(weights, dtype=np.float64)
+    chunk_paths = chunk_paths or MC_CHUNK_PATHS
+    sizes = [min(chunk_paths, paths - start) for start in range(0, paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(child, size, mean, factor, weights, horizon) for child, size in zip(seeds, sizes)]
+    workers = min(workers or MC_WORKERS or os.cpu_count() or 1, len(tasks))
+
+    if workers <= 1:
+        return np.concatenate([_simulate_chunk(*task) for task in tasks])
+    context = multiprocessing.get_context(MC_START_METHOD)
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        return np.concatenate(list(pool.map(_simulate_task, tasks)))
+
+def monte_carlo_var(prices, weights=None, confidence=0.95, horizon=1, paths=100_000, seed=None, workers=None):
+    """
+    Monte Carlo VaR and CVaR of a portfolio, fitted to its assets' history.
+
+    Args:
+        prices (pd.DataFrame): (dates x tickers) prices.
+        weights (dict or list): Weight per ticker (default: equal weights).
+        confidence (float): Confidence level.
+        horizon (int): Holding period in days.
+        paths (int): Number of simulated paths.
+        seed (int): Seed for reproducible paths.
+        workers (int): Processes (see `monte_carlo_returns`).
+
+    Returns:
+        tuple: (VaR, CVaR) as positive fractions of the portfolio lost.
+    """
+    log_returns = asset_returns(prices, log=True)
+    simulated = monte_carlo_returns(log_returns.mean().to_numpy(), log_returns.cov().to_numpy(),
+                                    _weights(prices, weights), paths, horizon, seed, workers)
+    return historical_var(simulated, confidence)
+
+
+def portfolio_risk(prices, weights=None, confidence=0.95, horizon=1, paths=100_000, seed=None, workers=None):
+    """
+    VaR and CVaR of a portfolio by every method.
+
+    Over a horizon of more than a day the methods hold the portfolio
+    differently: 'Historical' and 'Parametric' compound the daily returns
+    of a portfolio rebalanced to `weights` every day, while 'Monte Carlo'
+    buys `weights` on the first day and holds them, so the simulated
+    weights drift with prices. For one day the two are the same.
+
+    Args:
+        prices (pd.DataFrame): (dates x tickers) prices.
+        weights (dict or list): Weight per ticker (default: equal weights).
+        confidence (float): Confidence level.
+        horizon (int): Holding period in days.
+        paths (int): Monte Carlo paths (0 skips the simulation).
+        seed (int): Monte Carlo seed.
+        workers (int): Monte Carlo processes.
+
+    Returns:
+        pd.DataFrame: VaR and CVaR (%) with rows 'Historical',
+        'Parametric' and 'Monte Carlo'.
+    """
+    returns = portfolio_returns(prices, weights)
+    rows = {
+        'Historical': historical_var(returns, confidence, horizon),
+        'Parametric': parametric_var(returns.mean(), returns.std(), confidence, horizon),
+    }
+    if paths:
+        rows['Monte Carlo'] = monte_carlo_var(prices, weights, confidence, horizon, paths, seed, workers)
+    return pd.DataFrame(rows, index=['VaR', 'CVaR']).T * 100
+
+
+def main():
+    import data_loader
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', nargs='+', default=None, help="default: the Nifty 50")
+    parser.add_argument('--weights', nargs='+', type=float, default=None, help="one per ticker (default: equal)")
+    parser.add_argument('--period', default="5y")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--horizon', type=int, default=1, help="days")
+    parser.add_argument('--paths', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    prices = data_loader.fetch_sector_data(args.tickers or data_loader.NIFTY50_SYMBOLS, args.period)
+    if prices.empty:
+        return
+    if args.weights is None:
+        # Tickers without any price cannot be held
+        prices = prices.dropna(axis=1, how='all')
+    returns = portfolio_returns(prices, args.weights)
+    print(f"{prices.shape[1]} assets, {len(returns)} days: annual return {returns.mean() * TRADING_DAYS * 100:.1f}%, "
+          f"volatility {returns.std() * math.sqrt(TRADING_DAYS) * 100:.1f}%")
+    started = time.perf_counter()
+    table = portfolio_risk(prices, args.weights, args.confidence, args.horizon, args.paths, args.seed, args.workers)
+    print(f"{args.horizon}-day VaR/CVaR at {args.confidence:.0%} ({args.paths} paths, "
+          f"{time.perf_counter() - started:.1f} s):")
+    print(table.round(2).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,421 @@
+"""
+Technical screener over a ticker universe.
+
+Conditions are written in a small expression language:
+
+    RSI < 30 and MACD crosses above Signal_Line
+    close above SMA_200 and volume > 2x avg(volume, 20)
+    change(close, 20) > 10 or not (RSI between 40 and 60)
+
+Names are the fields of `universe.analyze_universe` (the indicators of
+`analysis.calculate_technical_indicators`), case-insensitive: close (the
+adjusted close the indicators use), open, high, low, volume, return,
+SMA_50, SMA_200, RSI, MACD, Signal_Line (or signal), vol_30, vol_90 and
+volume_ma20. Operators are + - * / (also x and ×), the comparisons
+< <= > >= == != (also 'above' and 'below'), 'crosses above',
+'crosses below', 'between ... and ...', and, or (also 'with'), not and
+parentheses. Functions work per ticker along the dates:
+
+    avg(x, n)  ema(x, n)  std(x, n)  max(x, n)  min(x, n)
+    rsi(x, n)  prev(x, n)  change(x, n)  abs(x)
+
+A condition compiles once into a tree of NumPy calls. Evaluating it
+computes every node for the whole (tickers, dates) panel at once, so a
+universe of thousands of tickers is screened in a few array passes
+instead of one analysis per ticker.
+"""
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from analysis import ema, rolling_mean, rolling_std, rsi
+
+# Field names that differ from the panel's, by lower-case name
+FIELD_ALIASES = {
+    'close': 'Adj Close', 'price': 'Adj Close', 'adj_close': 'Adj Close', 'raw_close': 'Close',
+    'return': 'Daily Return', 'daily_return': 'Daily Return',
+    'signal': 'Signal_Line',
+    'vol_30': 'RollingVol_30', 'vol_90': 'RollingVol_90',
+}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>\d+(?:\.\d*)?|\.\d+)(?P<times>\s*[x×](?![\w]))?
+      | (?P<name>[A-Za-z_][A-Za-z_0-9]*)
+      | (?P<op><=|>=|==|!=|<|>|[-+*/×(),])
+    )""", re.VERBOSE)
+
+_COMPARISONS = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+    '==': np.equal, '!=': np.not_equal, 'above': np.greater, 'below': np.less,
+}
+_ARITHMETIC = {'+': np.add, '-': np.subtract, '*': np.multiply, '×': np.multiply, '/': np.divide}
+_KEYWORDS = {'and', 'or', 'with', 'not', 'above', 'below', 'crosses', 'between'}
+
+
+class ScreenerError(ValueError):
+    """Raised for a condition that cannot be parsed or compiled."""
+
+
+def _lag(values, n):
+    out = np.full_like(values, np.nan)
+    if n < values.shape[-1]:
+        out[..., n:] = values[..., :values.shape[-1] - n]
+    return out
+
+
+def _rolling_extreme(values, n, reduce):
+    out = np.full_like(values, np.nan)
+    if n <= values.shape[-1]:
+        # A window containing a NaN yields NaN, as with pandas' default min_periods
+        out[..., n - 1:] = reduce(np.lib.stride_tricks.sliding_window_view(values, n, axis=-1), axis=-1)
+    return out
+
+
+def _change(values, n):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (values / _lag(values, n) - 1.0) * 100.0
+
+
+# name -> (function(values, n), default n or None if n is required)
+FUNCTIONS = {
+    'avg': (rolling_mean, None),
+    'sma': (rolling_mean, None),
+    'ema': (ema, None),
+    'std': (rolling_std, None),
+    'max': (lambda values, n: _rolling_extreme(values, n, np.max), None),
+    'min': (lambda values, n: _rolling_extreme(values, n, np.min), None),
+    'rsi': (rsi, 14),
+    'prev': (_lag, 1),
+    'change': (_change, 1),
+    'abs': (lambda values, n: np.abs(values), 0),
+}
+
+
+class _Node:
+    """A compiled expression: evaluate(fields) -> array, and whether it is a condition."""
+
+    def __init__(self, evaluate, boolean, text, fields=()):
+        self.evaluate = evaluate
+        self.boolean = boolean
+        self.text = text
+        self.fields = set(fields)
+
+
+class _Parser:
+    """Recursive-descent parser emitting _Node closures (see the module docstring for the grammar)."""
+
+    def __init__(self, text, names):
+        self.text = text
+        self.names = names
+        self.tokens = self._tokenize(text)
+        self.pos = 0
+
+    def _tokenize(self, text):
+        tokens = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None or match.end() == position:
+                position = len(text) - len(text[position:].lstrip())
+                raise ScreenerError(f"Unexpected character at {position + 1}: '{text[position:position + 10]}'")
+            if match.group('number') is not None:
+                tokens.append(('number', match.group('number'), match.start('number')))
+                if match.group('times'):
+                    tokens.append(('op', '*', match.start('times')))
+            elif match.group('name') is not None:
+                word = match.group('name')
+                if word.lower() in _KEYWORDS:
+                    tokens.append(('keyword', word.lower(), match.start('name')))
+                else:
+                    tokens.append(('name', word, match.start('name')))
+            else:
+                tokens.append(('op', match.group('op'), match.start('op')))
+            position = match.end()
+        tokens.append(('end', '', len(text)))
+        return tokens
+
+    def _peek(self, *values):
+        kind, value, _ = self.tokens[self.pos]
+        return kind != 'end' and (not values or value in values)
+
+    def _next(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _expect(self, value):
+        kind, found, position = self._next()
+        if found != value:
+            raise ScreenerError(f"Expected '{value}' at {position + 1}, found '{found or 'end'}'")
+
+    def _fail(self, message):
+        raise ScreenerError(f"{message} at {self.tokens[self.pos][2] + 1}")
+
+    def parse(self):
+        node = self._or()
+        if self.tokens[self.pos][0] != 'end':
+            self._fail(f"Unexpected '{self.tokens[self.pos][1]}'")
+        if not node.boolean:
+            raise ScreenerError(f"'{self.text}' is a value, not a condition: compare it with something")
+        return node
+
+    def _boolean(self, node, word):
+        if not node.boolean:
+            raise ScreenerError(f"'{word}' needs conditions on both sides, not '{node.text}'")
+        return node
+
+    def _or(self):
+        node = self._and()
+        while self._peek('or'):
+            self._next()
+            left, right = self._boolean(node, 'or'), self._boolean(self._and(), 'or')
+            node = _Node(lambda f, l=left, r=right: np.logical_or(l.evaluate(f), r.evaluate(f)), True,
+                         f"{left.text} or {right.text}", left.fields | right.fields)
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._peek('and', 'with'):
+            word = self._next()[1]
+            left, right = self._boolean(node, word), self._boolean(self._not(), word)
+            node = _Node(lambda f, l=left, r=right: np.logical_and(l.evaluate(f), r.evaluate(f)), True,
+                         f"{left.text} and {right.text}", left.fields | right.fields)
+        return node
+
+    def _not(self):
+        if self._peek('not'):
+            self._next()
+            operand = self._boolean(self._not(), 'not')
+            return _Node(lambda f, o=operand: np.logical_not(o.evaluate(f)), True, f"not {operand.text}", operand.fields)
+        return self._comparison()
+
+    def _value(self, node, word):
+        if node.boolean:
+            raise ScreenerError(f"'{word}' needs values, not the condition '{node.text}'")
+        return node
+
+    def _comparison(self):
+        left = self._sum()
+        kind, word, _ = self.tokens[self.pos]
+        if kind == 'keyword' and word == 'crosses':
+            self._next()
+            if not self._peek('above', 'below'):
+                self._fail("Expected 'above' or 'below' after 'crosses'")
+            direction = self._next()[1]
+            left, right = self._value(left, 'crosses'), self._value(self._sum(), 'crosses')
+            compare = np.greater if direction == 'above' else np.less
+
+            def crosses(f, l=left, r=right):
+                a, b = np.broadcast_arrays(l.evaluate(f), r.evaluate(f))
+                with np.errstate(invalid='ignore'):
+                    # On this bar a is beyond b; on the bar before it was not
+                    return compare(a, b) & ~compare(_lag(a, 1), _lag(b, 1)) & ~np.isnan(_lag(a - b, 1))
+            return _Node(crosses, True, f"{left.text} crosses {direction} {right.text}", left.fields | right.fields)
+        if kind == 'keyword' and word == 'between':
+            self._next()
+            low = self._value(self._sum(), 'between')
+            self._expect('and')
+            high = self._value(self._sum(), 'between')
+            left = self._value(left, 'between')
+
+            def between(f, v=left, lo=low, hi=high):
+                values = v.evaluate(f)
+                return (values >= lo.evaluate(f)) & (values <= hi.evaluate(f))
+            return _Node(between, True, f"{left.text} between {low.text} and {high.text}",
+                         left.fields | low.fields | high.fields)
+        if word in _COMPARISONS and kind in ('op', 'keyword'):
+            self._next()
+            left, right = self._value(left, word), self._value(self._sum(), word)
+            compare = _COMPARISONS[word]
+            return _Node(lambda f, l=left, r=right: compare(l.evaluate(f), r.evaluate(f)), True,
+                         f"{left.text} {word} {right.text}", left.fields | right.fields)
+        return left
+
+    def _arithmetic(self, operators, operand):
+        node = operand()
+        while self._peek(*operators) and self.tokens[self.pos][0] == 'op':
+            symbol = self._next()[1]
+            left, right = self._value(node, symbol), self._value(operand(), symbol)
+            operation = _ARITHMETIC[symbol]
+
+            def evaluate(f, l=left, r=right, op=operation):
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    return op(l.evaluate(f), r.evaluate(f))
+            node = _Node(evaluate, False, f"{left.text} {symbol} {right.text}", left.fields | right.fields)
+        return node
+
+    def _sum(self):
+        return self._arithmetic(('+', '-'), self._product)
+
+    def _product(self):
+        return self._arithmetic(('*', '×', '/'), self._unary)
+
+    def _unary(self):
+        if self._peek('-') and self.tokens[self.pos][0] == 'op':
+            self._next()
+            operand = self._value(self._unary(), '-')
+            return _Node(lambda f, o=operand: -o.evaluate(f), False, f"-{operand.text}", operand.fields)
+        return self._atom()
+
+    def _atom(self):
+        kind, value, position = self._next()
+        if kind == 'number':
+            number = float(value)
+            return _Node(lambda f: number, False, value)
+        if kind == 'op' and value == '(':
+            node = self._or()
+            self._expect(')')
+            return _Node(node.evaluate, node.boolean, f"({node.text})", node.fields)
+        if kind == 'name':
+            if self._peek('(') and self.tokens[self.pos][0] == 'op':
+                return self._call(value, position)
+            return self._field(value, position)
+        raise ScreenerError(f"Expected a value at {position + 1}, found '{value or 'end'}'")
+
+    def _field(self, word, position):
+        key = word.lower()
+        field = FIELD_ALIASES.get(key) or self.names.get(key)
+        if field is None:
+            raise ScreenerError(f"Unknown field '{word}' at {position + 1}")
+        return _Node(lambda f: f[field], False, word, [field])
+
+    def _call(self, word, position):
+        name = word.lower()
+        if name not in FUNCTIONS:
+            raise ScreenerError(f"Unknown function '{word}' at {position + 1}")
+        function, default = FUNCTIONS[name]
+        self._expect('(')
+        argument = self._value(self._sum(), name)
+        window = default
+        if self._peek(','):
+            self._next()
+            kind, value, at = self._next()
+            if kind != 'number' or float(value) != int(float(value)) or int(float(value)) < 1:
+                raise ScreenerError(f"Expected a whole number of bars at {at + 1}, found '{value}'")
+            window = int(float(value))
+        self._expect(')')
+        if window is None:
+            raise ScreenerError(f"'{name}' needs a window: {name}(x, bars)")
+
+        def evaluate(f, a=argument, n=window):
+            values = np.asarray(a.evaluate(f), dtype=np.float64)
+            return function(values, n)
+        text = f"{name}({argument.text}, {window})" if default != 0 else f"{name}({argument.text})"
+        return _Node(evaluate, False, text, argument.fields)
+
+
+class Condition:
+    """
+    A compiled screener condition.
+
+    Attributes:
+        text (str): The condition as written.
+        fields (list): Panel fields it reads, sorted.
+    """
+
+    def __init__(self, text, root):
+        self.text = text
+        self._root = root
+        self.fields = sorted(root.fields)
+
+    def evaluate(self, panel):
+        """
+        Evaluates the condition on every ticker and date of a panel.
+
+        Args:
+            panel (universe.UniversePanel): Panel with the fields the condition reads.
+
+        Returns:
+            np.ndarray: (tickers, dates) boolean array.
+        """
+        missing = [field for field in self.fields if field not in panel]
+        if missing:
+            raise ScreenerError(f"The universe has no {', '.join(missing)} data")
+        with np.errstate(invalid='ignore'):
+            result = self._root.evaluate(panel)
+        return np.broadcast_to(result, (len(panel), len(panel.index)))
+
+
+def compile_condition(text, fields=None):
+    """
+    Compiles a screener condition.
+
+    Args:
+        text (str): Condition in the screener language (see the module docstring).
+        fields (list): Field names that may be used (default: the fields of
+            `universe.analyze_universe`).
+
+    Returns:
+        Condition: The compiled condition.
+    """
+    if not text or not text.strip():
+        raise ScreenerError("Enter a condition, e.g. RSI < 30 and MACD crosses above Signal_Line")
+    if fields is None:
+        fields = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume', 'Daily Return', 'RollingVol_30',
+                  'RollingVol_90', 'SMA_50', 'SMA_200', 'RSI', 'MACD', 'Signal_Line', 'Volume_MA20']
+    names = {field.lower().replace(' ', '_'): field for field in fields}
+    return Condition(text.strip(), _Parser(text, names).parse())
+
+
+def screen(panel, condition):
+    """
+    Tickers whose latest bar meets a condition.
+
+    Args:
+        panel (universe.UniversePanel): Analysed panel (`analyze_universe`).
+        condition (Condition or str): The condition, compiled or as text.
+
+    Returns:
+        pd.DataFrame: One row per matching ticker, with the close and the
+        fields the condition reads at its latest bar, and 'Since', the
+        first date of the run of bars that meet it.
+    """
+    if isinstance(condition, str):
+        condition = compile_condition(condition, list(panel.fields))
+    matches = condition.evaluate(panel)
+    positions = panel.last_valid_positions()
+    has_data = positions >= 0
+    latest = np.take_along_axis(matches, np.maximum(positions, 0)[:, None], axis=-1)[:, 0] & has_data
+    rows = np.flatnonzero(latest)
+
+    # Start of each match's current run: the bar after the last one that did not match
+    dates = np.arange(matches.shape[-1])
+    before = np.where(~matches[rows] & (dates <= positions[rows, None]), dates, -1).max(axis=-1)
+    columns = ['Adj Close'] + [field for field in condition.fields if field != 'Adj Close']
+    result = pd.DataFrame({field: panel[field][rows, positions[rows]] for field in columns},
+                          index=pd.Index([panel.tickers[row] for row in rows], name='Ticker'))
+    result['Since'] = panel.index[before + 1]
+    return result
+
+
+def load_universe(path=None):
+    """
+    Reads the screener's ticker universe.
+
+    Args:
+        path (str): Text file with one ticker per line, or a JSON list
+            (default: SCREENER_UNIVERSE, or the Nifty 50 and sector tickers).
+
+    Returns:
+        list: Upper-case tickers, without duplicates.
+    """
+    path = path or os.environ.get("SCREENER_UNIVERSE")
+    tickers = []
+    if path:
+        try:
+            with open(path) as f:
+                text = f.read()
+            tickers = json.loads(text) if text.lstrip().startswith('[') else text.split()
+        except Exception as e:
+            print(f"Error reading screener universe {path}: {e}")
+            tickers = []
+    if not tickers:
+        from data_loader import NIFTY50_SYMBOLS
+        from sectors import get_sectors
+        tickers = NIFTY50_SYMBOLS + [t for config in get_sectors().values() for t in config["tickers"]]
+    return list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
@@ -0,0 +1,93 @@
+"""
+Sector universes for the sector comparison panel.
+
+Each sector lists its member tickers and the index it is compared with.
+The defaults cover the Nifty 50; set SECTOR_CONFIG to a JSON file with
+the same layout to use other universes:
+
+    {"IT": {"index": "^CNXIT", "tickers": ["TCS.NS", "INFY.NS", ...]}, ...}
+"""
+import json
+import os
+
+# Benchmark for tickers outside every sector, and for the whole-market beta
+MARKET_INDEX = "^NSEI"
+
+DEFAULT_SECTORS = {
+    "IT": {"index": "^CNXIT",
+           "tickers": ["TCS.NS", "INFY.NS", "HCLTECH.NS", "WIPRO.NS", "TECHM.NS", "LTIM.NS"]},
+    "Banking": {"index": "^NSEBANK",
+                "tickers": ["HDFCBANK.NS", "ICICIBANK.NS", "SBIN.NS", "KOTAKBANK.NS", "AXISBANK.NS", "INDUSINDBK.NS"]},
+    "Financial Services": {"index": "^CNXFIN",
+                           "tickers": ["BAJFINANCE.NS", "BAJAJFINSV.NS", "HDFCLIFE.NS", "SBILIFE.NS"]},
+    "Energy": {"index": "^CNXENERGY",
+               "tickers": ["RELIANCE.NS", "ONGC.NS", "NTPC.NS", "POWERGRID.NS", "BPCL.NS", "COALINDIA.NS"]},
+    "FMCG": {"index": "^CNXFMCG",
+             "tickers": ["HINDUNILVR.NS", "ITC.NS", "NESTLEIND.NS", "BRITANNIA.NS", "TATACONSUM.NS"]},
+    "Auto": {"index": "^CNXAUTO",
+             "tickers": ["MARUTI.NS", "TATAMOTORS.NS", "M&M.NS", "BAJAJ-AUTO.NS", "EICHERMOT.NS", "HEROMOTOCO.NS"]},
+    "Pharma": {"index": "^CNXPHARMA",
+               "tickers": ["SUNPHARMA.NS", "DRREDDY.NS", "CIPLA.NS", "DIVISLAB.NS", "APOLLOHOSP.NS"]},
+    "Metals": {"index": "^CNXMETAL",
+               "tickers": ["TATASTEEL.NS", "JSWSTEEL.NS", "HINDALCO.NS", "ADANIENT.NS"]},
+    "Infrastructure": {"index": "^CNXINFRA",
+                       "tickers": ["LT.NS", "ADANIPORTS.NS", "ULTRACEMCO.NS", "GRASIM.NS", "BHARTIARTL.NS"]},
+}
+
+_sectors = None
+
+
+def load_sectors(path=None):
+    """
+    Reads sector universes from a JSON file.
+
+    Args:
+        path (str): JSON file (default: SECTOR_CONFIG, or the built-in sectors).
+
+    Returns:
+        dict: {sector: {"index": str, "tickers": list}} with upper-case tickers.
+    """
+    path = path or os.environ.get("SECTOR_CONFIG")
+    sectors = DEFAULT_SECTORS
+    if path:
+        try:
+            with open(path) as f:
+                sectors = json.load(f)
+        except Exception as e:
+            print(f"Error reading sector config {path}: {e}")
+            sectors = DEFAULT_SECTORS
+    return {
+        name: {"index": config.get("index") or MARKET_INDEX,
+               "tickers": [ticker.upper() for ticker in config.get("tickers", [])]}
+        for name, config in sectors.items()
+    }
+
+
+def get_sectors():
+    """Returns the configured sectors, read once per process."""
+    global _sectors
+    if _sectors is None:
+        _sectors = load_sectors()
+    return _sectors
+
+
+def sector_universe(ticker, sectors=None):
+    """
+    Maps a ticker to its sector and peers.
+
+    Args:
+        ticker (str): Stock ticker.
+        sectors (dict): Sector universes (default: the configured ones).
+
+    Returns:
+        dict: 'sector' (None for tickers outside every sector), 'index' (the
+        sector index, or the market index), 'peers' (the other members) and
+        'tickers' (the ticker first, then its peers).
+    """
+    sectors = get_sectors() if sectors is None else sectors
+    ticker = ticker.upper()
+    for name, config in sectors.items():
+        if ticker in config["tickers"]:
+            peers = [peer for peer in config["tickers"] if peer != ticker]
+            return {"sector": name, "index": config["index"], "peers": peers, "tickers": [ticker] + peers}
+    return {"sector": None, "index": MARKET_INDEX, "peers": [], "tickers": [ticker]}
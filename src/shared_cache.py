@@ -0,0 +1,201 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Entry limits of the shared cache; least recently used entries go first
+SHARED_CACHE_MAX_ENTRIES = int(os.environ.get("SHARED_CACHE_MAX_ENTRIES", 5000))
+SHARED_CACHE_MAX_BYTES = int(os.environ.get("SHARED_CACHE_MAX_BYTES", 64 * 2**20))
+
+# Time to live (seconds) of each kind of cached data
+CACHE_TTLS = {
+    # Headlines change through the day
+    "news": int(os.environ.get("NEWS_CACHE_TTL", 10 * 60)),
+    # Price, day range and volume from the quote
+    "quote": int(os.environ.get("QUOTE_CACHE_TTL", 15 * 60)),
+    # Market cap, P/E, P/B and dividend yield move slowly
+    "fundamentals": int(os.environ.get("FUNDAMENTALS_CACHE_TTL", 6 * 60 * 60)),
+    # Rendered dashboard callback outputs (they embed the news and quote above)
+    "dashboard": int(os.environ.get("DASHBOARD_CACHE_TTL", 5 * 60)),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS counters (
+    namespace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (namespace, name)
+);
+"""
+
+
+class SharedCache:
+    """
+    TTL + LRU cache of JSON values in a SQLite file.
+
+    Every worker process that opens the same file shares the entries and
+    the hit/miss counters, so one worker's fetch serves all of them.
+    Entries expire after their namespace's TTL and the least recently
+    used ones are evicted once the entry count or total size exceeds the
+    limits.
+    """
+
+    def __init__(self, path, max_entries=None, max_bytes=None, ttls=None):
+        self.path = path
+        self.max_entries = SHARED_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = SHARED_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.ttls = dict(CACHE_TTLS if ttls is None else ttls)
+        # sqlite3 connections cannot be shared between threads, so keep one per thread
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _count(self, db, namespace, name, amount=1):
+        db.execute(
+            "INSERT INTO counters (namespace, name, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (namespace, name) DO UPDATE SET value = value + excluded.value",
+            (namespace, name, amount),
+        )
+
+    def get(self, namespace, key):
+        """
+        Returns a cached value, or None if it is missing or expired.
+
+        Args:
+            namespace (str): Kind of data, which sets the TTL (e.g. "news").
+            key (str): Entry key within the namespace (e.g. the ticker).
+
+        Returns:
+            Any: The stored JSON value, or None on a miss.
+        """
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, key, now),
+            ).fetchone()
+            if row is None:
+                self._count(db, namespace, "misses")
+                return None
+            db.execute("UPDATE entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                       (now, namespace, key))
+            self._count(db, namespace, "hits")
+        return json.loads(row[0])
+
+    def set(self, namespace, key, value, ttl=None):
+        """
+        Stores a JSON-serialisable value, evicting old entries if needed.
+
+        Args:
+            namespace (str): Kind of data.
+            key (str): Entry key within the namespace.
+            value: JSON-serialisable value.
+            ttl (float): Seconds to keep the entry (default: the namespace's TTL).
+        """
+        ttl = self.ttls.get(namespace, 0) if ttl is None else ttl
+        payload = json.dumps(value)
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, payload, len(payload), now + ttl, now),
+            )
+            self._evict(db, now)
+
+    def _evict(self, db, now):
+        expired = db.execute("SELECT namespace, COUNT(*) FROM entries WHERE expires_at <= ? GROUP BY namespace",
+                             (now,)).fetchall()
+        if expired:
+            db.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            for namespace, amount in expired:
+                self._count(db, namespace, "expired", amount)
+
+        count, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        victims = []
+        for namespace, key, size in db.execute(
+                "SELECT namespace, key, size FROM entries ORDER BY last_access"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((namespace, key))
+            count -= 1
+            total -= size
+        db.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+        for namespace, _ in victims:
+            self._count(db, namespace, "evictions")
+
+    def get_or_fetch(self, namespace, key, fetch, ttl=None):
+        """
+        Returns the cached value or computes, stores and returns it.
+
+        Empty results (None, {}, []) are returned but not stored, so a
+        failed fetch is retried on the next call.
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            return value
+        value = fetch()
+        if value:
+            self.set(namespace, key, value, ttl)
+        return value
+
+    def stats(self):
+        """
+        Returns hit/miss/eviction counters and current size per namespace.
+
+        Returns:
+            dict: {namespace: {"hits", "misses", "evictions", "expired", "entries", "bytes"}}.
+        """
+        with self._connect() as db:
+            stats = {}
+            for namespace, entries, size in db.execute(
+                    "SELECT namespace, COUNT(*), SUM(size) FROM entries GROUP BY namespace"):
+                stats.setdefault(namespace, {}).update(entries=entries, bytes=size)
+            for namespace, name, value in db.execute("SELECT namespace, name, value FROM counters"):
+                stats.setdefault(namespace, {})[name] = value
+        for values in stats.values():
+            for name in ("hits", "misses", "evictions", "expired", "entries", "bytes"):
+                values.setdefault(name, 0)
+        return stats
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        with self._connect() as db:
+            db.execute("DELETE FROM entries")
+            db.execute("DELETE FROM counters")
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_shared_cache(cache_dir):
+    """Returns the process-wide SharedCache stored under `cache_dir`."""
+    path = os.path.join(cache_dir, "shared_cache.sqlite3")
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = SharedCache(path)
+        return _caches[path]
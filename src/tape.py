@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, each process refreshes on its own
+    fcntl = None
+
+import data_loader
+from providers import get_provider
+
+# Seconds between background downloads of the Nifty 50 tape (0 disables the refresher)
+TAPE_REFRESH_INTERVAL = int(os.environ.get("TAPE_REFRESH_INTERVAL", 5 * 60))
+# Seconds before retrying a failed or skipped refresh
+TAPE_RETRY_DELAY = 60
+# Seconds between browser polls of the shared snapshot
+TAPE_POLL_INTERVAL = int(os.environ.get("TAPE_POLL_INTERVAL", 15))
+
+# Last snapshot read by this process, reused while the file is unchanged
+_snapshot_memo = {"key": None, "snapshot": None}
+
+
+def _snapshot_path():
+    """Returns the tape snapshot file shared by every worker."""
+    return os.path.join(data_loader.CACHE_DIR, "tape", f"{get_provider().name}.json")
+
+
+def read_tape_snapshot():
+    """
+    Reads the last tape snapshot written by any worker.
+
+    Returns:
+        dict: 'items' (ticker tape entries) and 'fetched_at' (epoch seconds),
+        or None if no snapshot exists yet.
+    """
+    path = _snapshot_path()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if _snapshot_memo["key"] == key:
+        return _snapshot_memo["snapshot"]
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+    except Exception as e:
+        print(f"Ignoring unreadable tape snapshot {path}: {e}")
+        return None
+    _snapshot_memo.update(key=key, snapshot=snapshot)
+    return snapshot
+
+
+def write_tape_snapshot(items, fetched_at=None):
+    """Atomically replaces the shared tape snapshot."""
+    path = _snapshot_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    snapshot = {"items": items, "fetched_at": time.time() if fetched_at is None else fetched_at}
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+    return snapshot
+
+
+def _is_fresh(snapshot, max_age):
+    return snapshot is not None and time.time() - snapshot["fetched_at"] < max_age
+
+
+def refresh_tape(max_age=None):
+    """
+    Downloads a new tape unless the shared snapshot is younger than `max_age`.
+
+    Only one process downloads at a time: the others skip the refresh and
+    keep serving the snapshot the lock holder is about to write.
+
+    Args:
+        max_age (float): Snapshot age (seconds) that still counts as fresh
+            (default: TAPE_REFRESH_INTERVAL).
+
+    Returns:
+        dict: The current snapshot, or None if there is none yet.
+    """
+    max_age = TAPE_REFRESH_INTERVAL if max_age is None else max_age
+    snapshot = read_tape_snapshot()
+    if _is_fresh(snapshot, max_age):
+        return snapshot
+
+    lock_path = _snapshot_path() + ".lock"
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, "w") as lock_file:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return snapshot
+
+        # Another worker may have finished a refresh between our check and taking the lock
+        snapshot = read_tape_snapshot()
+        if _is_fresh(snapshot, max_age):
+            return snapshot
+
+        items = data_loader.fetch_nifty50_ticker_data(fallback=False)
+        if not items:
+            # Keep serving the stale snapshot rather than blanking the tape
+            return snapshot
+        return write_tape_snapshot(items)
+
+
+class TapeRefresher:
+    """
+    Daemon thread that keeps the shared tape snapshot fresh.
+
+    The first refresh runs as soon as the thread starts, so a server with
+    a stale or missing snapshot fills it in the background instead of
+    blocking startup.
+    """
+
+    def __init__(self, interval=None):
+        self.interval = TAPE_REFRESH_INTERVAL if interval is None else interval
+        self._stop = threading.Event()
+        self._thread = None
+        # Concurrent first requests may all call start()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Starts the refresher thread (no-op if already running or disabled)."""
+        with self._lock:
+            if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="tape-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Signals the thread to exit and waits for it."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                refresh_tape(self.interval)
+            except Exception as e:
+                print(f"Error refreshing ticker tape: {e}")
+            # Wake up when the snapshot (possibly written by another worker) goes stale,
+            # or retry sooner if there is still no fresh one
+            snapshot = read_tape_snapshot()
+            if _is_fresh(snapshot, self.interval):
+                wait = self.interval - (time.time() - snapshot["fetched_at"])
+            else:
+                wait = min(self.interval, TAPE_RETRY_DELAY)
+            self._stop.wait(max(wait, 1.0))
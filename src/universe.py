@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+from analysis import pct_change, ema, _prefix_sums, _window_mean, _window_std, _rsi_from_delta
+from calendar_index import calendar_index
+
+# Price fields kept from a multi-ticker download, in yfinance naming
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+
+
+class UniversePanel:
+    """
+    A ticker universe held as 2-D (tickers, dates) arrays.
+
+    Every field shares one DatetimeIndex and one ticker order, so a single
+    NumPy call computes an indicator for the whole universe. Dates missing
+    for a ticker (late listings, suspensions) are NaN.
+    """
+
+    def __init__(self, tickers, index, fields):
+        self.tickers = list(tickers)
+        self.index = index
+        self.fields = fields
+        self._rows = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_download(cls, data, tickers=None):
+        """
+        Builds a panel from a multi-ticker download in yfinance layout.
+
+        Args:
+            data (pd.DataFrame): Frame with (Price, Ticker) MultiIndex columns.
+            tickers (list): Ticker order of the panel (default: as downloaded).
+                Tickers missing from the download get all-NaN rows.
+
+        Returns:
+            UniversePanel: Panel with one row per ticker.
+        """
+        if tickers is None:
+            tickers = list(dict.fromkeys(data.columns.get_level_values(-1)))
+        fields = {}
+        for field in PRICE_FIELDS:
+            if field in data.columns.get_level_values(0):
+                values = data[field].reindex(columns=tickers).to_numpy(dtype=np.float64)
+                fields[field] = np.ascontiguousarray(values.T)
+        return cls(tickers, data.index, fields)
+
+    def __getitem__(self, name):
+        return self.fields[name]
+
+    def __contains__(self, name):
+        return name in self.fields
+
+    def __len__(self):
+        return len(self.tickers)
+
+    @property
+    def empty(self):
+        return len(self.tickers) == 0 or len(self.index) == 0
+
+    def series(self, ticker, name):
+        """Returns one ticker's values of a field as a Series."""
+        return pd.Series(self.fields[name][self._rows[ticker]], index=self.index, name=ticker)
+
+    def frame(self, name):
+        """Returns a field as a (dates x tickers) DataFrame, the layout of `fetch_sector_data`."""
+        return pd.DataFrame(self.fields[name].T, index=self.index, columns=self.tickers)
+
+    def last_valid_positions(self):
+        """Position of each ticker's latest bar with a price, or -1 if it has none."""
+        close = self.fields['Adj Close'] if 'Adj Close' in self.fields else self.fields['Close']
+        valid = ~np.isnan(close)
+        last = close.shape[-1] - 1 - np.argmax(valid[:, ::-1], axis=-1)
+        return np.where(valid.any(axis=-1), last, -1)
+
+    def latest(self, name):
+        """Value of a field at each ticker's latest bar (NaN for tickers without data)."""
+        positions = self.last_valid_positions()
+        values = np.take_along_axis(self.fields[name], np.maximum(positions, 0)[:, None], axis=-1)[:, 0]
+        return np.where(positions >= 0, values, np.nan)
+
+    def snapshot(self, names=None):
+        """
+        Latest value of several fields for every ticker.
+
+        Args:
+            names (list): Fields to include (default: all of them).
+
+        Returns:
+            pd.DataFrame: One row per ticker, one column per field.
+        """
+        names = list(self.fields) if names is None else names
+        return pd.DataFrame({name: self.latest(name) for name in names},
+                            index=pd.Index(self.tickers, name='Ticker'))
+
+
+def analyze_universe(panel, float32=False):
+    """
+    Computes returns, volatility, moving averages, RSI and MACD for every
+    ticker of a panel at once.
+
+    Uses the same kernels as `analysis.analyze`, which work along the last
+    axis, so each ticker's row matches a single-ticker `analyze` run on
+    the same dates.
+
+    Args:
+        panel (UniversePanel): Panel with at least 'Adj Close'.
+        float32 (bool): Store derived fields as float32 to halve their memory.
+
+    Returns:
+        UniversePanel: The same panel with the derived fields added.
+    """
+    dtype = np.float32 if float32 else np.float64
+    fields = panel.fields
+    close = fields['Adj Close']
+
+    returns = pct_change(close)
+    rsum, rsum2, rcount = _prefix_sums(returns, squares=True)
+    fields['Daily Return'] = returns.astype(dtype, copy=False)
+    fields['RollingVol_30'] = _window_std(rsum, rsum2, rcount, 30).astype(dtype, copy=False)
+    fields['RollingVol_90'] = _window_std(rsum, rsum2, rcount, 90).astype(dtype, copy=False)
+    del rsum, rsum2, rcount
+
+    csum, ccount = _prefix_sums(close)
+    fields['SMA_50'] = _window_mean(csum, ccount, 50).astype(dtype, copy=False)
+    fields['SMA_200'] = _window_mean(csum, ccount, 200).astype(dtype, copy=False)
+    del csum, ccount
+
+    delta = np.zeros_like(close)
+    delta[:, 1:] = close[:, 1:] - close[:, :-1]
+    fields['RSI'] = _rsi_from_delta(delta, 14).astype(dtype, copy=False)
+    del delta
+
+    macd = ema(close, 12) - ema(close, 26)
+    fields['MACD'] = macd.astype(dtype, copy=False)
+    fields['Signal_Line'] = ema(macd, 9).astype(dtype, copy=False)
+
+    if 'Volume' in fields:
+        vsum, vcount = _prefix_sums(fields['Volume'])
+        fields['Volume_MA20'] = _window_mean(vsum, vcount, 20).astype(dtype, copy=False)
+
+    return panel
+
+
+def seasonality_matrix(panel, by='month', stat='mean'):
+    """
+    One seasonal statistic of every ticker's daily returns.
+
+    All tickers are reduced by the same integer-coded bincount pass over
+    the panel's shared calendar index, with no groupby per ticker.
+
+    Args:
+        panel (UniversePanel): Panel with 'Adj Close' (or 'Daily Return').
+        by (str): Calendar group: 'month', 'weekday', 'year' or 'week'.
+        stat (str): Statistic from calendar_index.STATISTICS, e.g. 'mean',
+            'median' or 'hit_rate'.
+
+    Returns:
+        pd.DataFrame: (tickers x groups) matrix with the groups that have dates.
+    """
+    returns = panel['Daily Return'] if 'Daily Return' in panel else pct_change(panel['Adj Close'])
+    calendar = calendar_index(panel.index)
+    values = calendar.aggregate(returns, by, (stat,))[stat]
+    present = calendar.rows(by) > 0
+    return pd.DataFrame(values[:, present], index=pd.Index(panel.tickers, name='Ticker'),
+                        columns=calendar.labels(by)[present])
+
+
+def ticker_tape_items(panel):
+    """
+    Formats each ticker's latest price and intraday change for the ticker tape.
+
+    Args:
+        panel (UniversePanel): Panel with 'Open' and 'Close'.
+
+    Returns:
+        list: Dictionaries with symbol, price and change, skipping tickers
+        without a price.
+    """
+    close = panel.latest('Close')
+    open_price = panel.latest('Open')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_pct = np.where(open_price != 0, (close - open_price) / open_price * 100, 0.0)
+
+    items = []
+    for ticker, price, change in zip(panel.tickers, close.tolist(), change_pct.tolist()):
+        if np.isnan(price) or np.isnan(change):
+            continue
+        items.append({
+            "symbol": ticker.replace(".NS", ""),
+            "price": f"{price:.2f}",
+            "change": f"{'+' if change >= 0 else ''}{change:.2f}%"
+        })
+    return items
@@ -47,5 +47,82 @@ class TestAnalysis(unittest.TestCase):
         self.assertIn('MACD', df.columns)
         self.assertIn('Signal_Line', df.columns)
 
+    def test_fused_pipeline_matches_chained_functions(self):
+        from analysis import analyze, calculate_technical_indicators
+        dates = pd.date_range(start='2020-01-01', periods=400)
+        df = pd.DataFrame({
+            'Adj Close': 100 + np.cumsum(np.random.randn(400)),
+            'Volume': np.random.randint(1000, 10000, 400)
+        }, index=dates)
+
+        expected = calculate_technical_indicators(calculate_volatility(df))
+        expected, monthly_vol = calculate_volume_analysis(expected)
+        trends = calculate_seasonal_trends(expected)
+        result = analyze(df)
+
+        for column in ['Daily Return', 'RollingVol_30', 'RollingVol_90', 'SMA_50', 'SMA_200',
+                       'RSI', 'MACD', 'Signal_Line', 'Volume_MA20']:
+            np.testing.assert_allclose(result[column], expected[column], rtol=1e-9, atol=1e-12, err_msg=column)
+        for key in ('monthly', 'day_of_week', 'yearly'):
+            pd.testing.assert_series_equal(result.seasonal[key], trends[key], check_names=False)
+        pd.testing.assert_series_equal(result.monthly_volume, monthly_vol, check_names=False)
+
+    def test_fused_pipeline_float32(self):
+        from analysis import analyze
+        result = analyze(self.df, float32=True)
+        self.assertEqual(result['RollingVol_30'].dtype, np.float32)
+        self.assertEqual(len(result.to_frame()), len(self.df))
+
+    def test_rolling_ols_matches_predict_price(self):
+        from analysis import predict_price, rolling_ols
+        dates = pd.date_range(start='2020-01-01', periods=300)
+        df = pd.DataFrame({'Adj Close': 100 + np.cumsum(np.random.randn(300))}, index=dates)
+
+        fit = rolling_ols(df['Adj Close'].to_numpy(), 60)
+        expected = predict_price(df, days=60)
+        self.assertAlmostEqual(fit['prediction'][-1], expected['predicted_price'], places=8)
+        self.assertAlmostEqual(fit['r2'][-1], expected['score'], places=8)
+        self.assertTrue(np.isnan(fit['slope'][:59]).all())
+
+        slope, intercept = np.polyfit(np.arange(100, 160), df['Adj Close'].iloc[100:160], 1)
+        self.assertAlmostEqual(fit['slope'][159], slope, places=8)
+        self.assertAlmostEqual(fit['intercept'][159], intercept, places=6)
+
+    def test_walk_forward_evaluation(self):
+        from analysis import walk_forward_evaluation
+        dates = pd.date_range(start='2020-01-01', periods=200)
+        trend = pd.Series(np.arange(200.0) + 50, index=dates)
+        prices = pd.DataFrame({'UP': trend, 'NOISY': trend + np.random.randn(200) * 5})
+
+        report = walk_forward_evaluation(prices, windows=[20, 60])
+        self.assertEqual(len(report), 4)
+        perfect = report.loc[('UP', 20)]
+        self.assertEqual(perfect['Forecasts'], 180)
+        self.assertAlmostEqual(perfect['MAE'], 0.0, places=8)
+        self.assertEqual(perfect['Hit Rate'], 100.0)
+        self.assertGreater(report.loc[('NOISY', 60), 'MAE'], 0)
+
+    def test_rolling_correlation_and_beta_match_pandas(self):
+        from analysis import rolling_correlation, rolling_beta
+        rng = np.random.default_rng(0)
+        market = rng.normal(0, 0.01, 300)
+        returns = market + rng.normal(0, 0.01, (4, 300))
+        returns[1, :40] = np.nan   # late listing
+        returns[2, 150] = np.nan   # missing bar
+        frame = pd.DataFrame(returns.T)
+
+        corr = rolling_correlation(returns, 30)
+        self.assertEqual(corr.shape, (4, 4, 300))
+        for i in range(4):
+            for j in range(4):
+                expected = frame[i].rolling(30).corr(frame[j]).to_numpy()
+                np.testing.assert_allclose(corr[i, j], expected, atol=1e-10)
+
+        beta = rolling_beta(returns, market, 30)
+        bench = pd.Series(market)
+        for i in range(4):
+            expected = (frame[i].rolling(30).cov(bench) / bench.rolling(30).var()).to_numpy()
+            np.testing.assert_allclose(beta[i], expected, atol=1e-10)
+
 if __name__ == '__main__':
     unittest.main()
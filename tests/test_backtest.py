@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from backtest import backtest, sweep, _chunks, simulate, hold_between, condition_positions, parameter_grid
+from providers import ReplayProvider
+from universe import UniversePanel, analyze_universe
+
+TICKERS = ["AAA.NS", "BBB.NS", "CCC.NS"]
+
+
+class TestBacktest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data = ReplayProvider().download(TICKERS, period="3y")
+        cls.data = data
+        cls.panel = analyze_universe(UniversePanel.from_download(data, TICKERS))
+
+    def test_sma_cross_matches_pandas(self):
+        result = backtest(self.panel, 'sma_cross', cost_bps=10, fast=20, slow=50)
+        stats = result.stats()
+        for row, ticker in enumerate(TICKERS):
+            close = self.data['Adj Close'][ticker]
+            signal = (close.rolling(20).mean() > close.rolling(50).mean()).astype(float)
+            held = signal.shift().fillna(0)
+            returns = held * close.pct_change().fillna(0) - held.diff().fillna(held).abs() * 0.001
+            equity = (1 + returns).cumprod()
+            np.testing.assert_allclose(result.equity[row], equity.to_numpy(), err_msg=ticker)
+            self.assertAlmostEqual(stats.loc[ticker, 'Total Return'], (equity.iloc[-1] - 1) * 100)
+            self.assertAlmostEqual(stats.loc[ticker, 'Max Drawdown'], (equity / equity.cummax() - 1).min() * 100)
+            self.assertAlmostEqual(stats.loc[ticker, 'Sharpe'],
+                                   returns.iloc[1:].mean() / returns.iloc[1:].std() * np.sqrt(252))
+
+    def test_positions_trade_on_the_next_bar(self):
+        close = np.array([100.0, 110.0, 121.0, 121.0, 108.9])
+        positions = np.array([0.0, 1.0, 1.0, 0.0, 0.0])
+        sim = simulate(close, positions, cost_bps=0)
+        # Decided at the close of bar 1: earns bars 2 and 3, not the move into bar 1
+        np.testing.assert_array_equal(sim['held'], [0, 0, 1, 1, 0])
+        np.testing.assert_allclose(sim['returns'], [0, 0, 0.1, 0, 0])
+
+        # Charged on the bars whose position changed: the entry and the exit
+        costly = simulate(close, positions, cost_bps=50)
+        np.testing.assert_allclose(sim['returns'] - costly['returns'], [0, 0, 0.005, 0, 0.005])
+
+    def test_hold_between_entries_and_exits(self):
+        entries = np.array([False, True, False, True, False, False, True])
+        exits = np.array([True, False, False, False, True, True, True])
+        np.testing.assert_array_equal(hold_between(entries, exits), [0, 1, 1, 1, 0, 0, 0])
+
+        rsi = self.panel['RSI']
+        positions = condition_positions(self.panel, "RSI < 30", "RSI > 70")
+        for row in range(len(TICKERS)):
+            expected, state = [], 0.0
+            for value in rsi[row]:
+                state = 0.0 if value > 70 else 1.0 if value < 30 else state
+                expected.append(state)
+            np.testing.assert_array_equal(positions[row], expected)
+        np.testing.assert_array_equal(backtest(self.panel, 'rsi_reversion').held,
+                                      backtest(self.panel, positions).held)
+
+    def test_sweep_in_parallel_matches_single_runs(self):
+        grid = {'fast': [10, 20, 50], 'slow': [50, 100]}
+        self.assertEqual(len(parameter_grid('sma_cross', grid)), 5)
+        results = sweep(self.panel, 'sma_cross', grid, workers=2)
+        self.assertEqual(results.index.names, ['Ticker', 'fast', 'slow'])
+        self.assertEqual(len(results), 5 * len(TICKERS))
+        pd.testing.assert_frame_equal(results, sweep(self.panel, 'sma_cross', grid, workers=1))
+
+        single = backtest(self.panel, 'sma_cross', fast=20, slow=100).stats()
+        for ticker in TICKERS:
+            np.testing.assert_allclose(results.loc[(ticker, 20, 100)].to_numpy(dtype=float),
+                                       single.loc[ticker].to_numpy(dtype=float))
+        with self.assertRaises(ValueError):
+            sweep(self.panel, 'sma_cross', {'window': [10]})
+
+    def test_sweep_chunks_share_the_leading_parameter(self):
+        combos = parameter_grid('sma_cross', {'fast': [10, 20, 50], 'slow': [50, 100, 150, 200]})
+        for workers in (1, 2, 8):
+            chunks = _chunks(combos, 'fast', workers)
+            self.assertEqual([combo for chunk in chunks for combo in chunk], combos)
+            self.assertTrue(all(len({combo['fast'] for combo in chunk}) == 1 for chunk in chunks))
+            self.assertGreaterEqual(len(chunks), min(workers, len(combos)))
+        self.assertEqual([len(chunk) for chunk in _chunks(combos, 'fast', 2)], [4, 4, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from calendar_index import CalendarIndex, calendar_index
+from providers import ReplayProvider
+from universe import UniversePanel, seasonality_matrix
+
+
+class TestCalendarIndex(unittest.TestCase):
+    def setUp(self):
+        dates = pd.bdate_range(start='2019-01-01', periods=900)
+        returns = np.random.default_rng(1).normal(0, 0.01, 900)
+        returns[[0, 10, 500]] = np.nan
+        self.returns = pd.Series(returns, index=dates)
+
+    def test_statistics_match_pandas_groupby(self):
+        calendar = CalendarIndex(self.returns.index)
+        keys = {
+            'month': self.returns.index.month,
+            'weekday': self.returns.index.dayofweek,
+            'year': self.returns.index.year,
+            'week': self.returns.index.isocalendar().week.to_numpy(),
+        }
+        for by, key in keys.items():
+            grouped = self.returns.groupby(key)
+            expected = pd.DataFrame({
+                'mean': grouped.mean(),
+                'median': grouped.median(),
+                'hit_rate': grouped.apply(lambda r: (r.dropna() > 0).mean() * 100),
+                'count': grouped.count(),
+            })
+            table = calendar.table(self.returns.to_numpy(), by, ('mean', 'median', 'hit_rate', 'count'))
+            np.testing.assert_allclose(table.to_numpy(dtype=np.float64), expected.to_numpy(dtype=np.float64),
+                                       rtol=1e-9, err_msg=by)
+
+    def test_unknown_statistic_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CalendarIndex(self.returns.index).aggregate(self.returns.to_numpy(), 'month', ('mode',))
+
+    def test_index_is_cached_by_content(self):
+        first = calendar_index(self.returns.index)
+        copy = pd.DatetimeIndex(self.returns.index.to_numpy().copy())
+        self.assertIs(calendar_index(copy), first)
+        self.assertIsNot(calendar_index(self.returns.index[1:]), first)
+        # Same length and dtype, one date moved: a different entry
+        shifted = self.returns.index.to_numpy().copy()
+        shifted[-1] += np.timedelta64(1, 'D')
+        self.assertIsNot(calendar_index(pd.DatetimeIndex(shifted)), first)
+
+    def test_seasonality_matrix_matches_single_tickers(self):
+        tickers = ["AAA.NS", "BBB.NS", "CCC.NS"]
+        data = ReplayProvider().download(tickers, period="3y")
+        panel = UniversePanel.from_download(data, tickers)
+        matrix = seasonality_matrix(panel, 'month', 'median')
+
+        self.assertEqual(list(matrix.index), tickers)
+        self.assertEqual(list(matrix.columns), list(range(1, 13)))
+        for ticker in tickers:
+            returns = panel.series(ticker, 'Adj Close').pct_change()
+            expected = returns.groupby(returns.index.month).median()
+            np.testing.assert_allclose(matrix.loc[ticker].to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
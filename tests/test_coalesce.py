@@ -0,0 +1,112 @@
+import unittest
+from unittest import mock
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import data_loader
+from coalesce import SingleFlight
+from shared_cache import SharedCache
+
+
+def _compute_once_across_processes(cache_dir, barrier):
+    """Worker: computes 'result' unless another process already stored it."""
+    data_loader.CACHE_DIR = cache_dir
+    cache = SharedCache(os.path.join(cache_dir, "results.sqlite3"), ttls={"dashboard": 60})
+
+    def compute():
+        cached = cache.get("dashboard", "TCS.NS")
+        if cached is not None:
+            return cached
+        time.sleep(0.3)
+        cache.set("dashboard", "TCS.NS", {"computed_by": os.getpid()})
+        return {"computed_by": os.getpid()}
+
+    barrier.wait()
+    SingleFlight("test").do("TCS.NS", compute)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(data_loader, 'CACHE_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_callers_share_one_computation(self):
+        flight = SingleFlight("test")
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return {"value": 42}
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(flight.do, "TCS.NS", compute) for _ in range(8)]
+            time.sleep(0.2)
+            release.set()
+            results = [f.result() for f in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(flight.stats, {"leaders": 1, "followers": 7})
+        # Once finished, the next call computes again
+        flight.do("TCS.NS", compute)
+        self.assertEqual(len(calls), 2)
+
+    def test_leader_error_reaches_followers(self):
+        flight = SingleFlight("test")
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError("provider down")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, "TCS.NS", fail)
+            started.wait(5)
+            follower = pool.submit(flight.do, "TCS.NS", fail)
+            for future in (leader, follower):
+                with self.assertRaises(ValueError):
+                    future.result()
+
+    def test_processes_compute_once_with_shared_cache(self):
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(3)
+        workers = [context.Process(target=_compute_once_across_processes, args=(self.tmp.name, barrier))
+                   for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+        cache = SharedCache(os.path.join(self.tmp.name, "results.sqlite3"))
+        stats = cache.stats()["dashboard"]
+        # The first process computes; the other two find its result after the lock
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+
+class TestConcurrentCacheWrites(unittest.TestCase):
+    def test_threads_writing_same_ticker(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(cache_dir, "ohlcv", "TCS.NS.raw.parquet")
+            frame = pd.DataFrame({'Close': [1.0, 2.0]})
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda _: data_loader._write_cache(path, frame), range(16)))
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["TCS.NS.raw.parquet"])
+
+
+if __name__ == '__main__':
+    unittest.main()
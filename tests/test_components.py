@@ -0,0 +1,128 @@
+import unittest
+import base64
+import json
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from plotly.io.json import to_json_plotly
+
+import components
+from analysis import analyze, calculate_sector_performance
+from providers import ReplayProvider, generate_ohlcv
+
+
+def normalise(figure):
+    """Serialises a figure the way Dash does and decodes typed arrays to lists."""
+    def decode(value):
+        if isinstance(value, dict):
+            if set(value) >= {'dtype', 'bdata'}:
+                dtype = {'f8': np.float64, 'f4': np.float32, 'i4': np.int32, 'u1': np.uint8,
+                         'i1': np.int8, 'i2': np.int16, 'u2': np.uint16, 'u4': np.uint32}[value['dtype']]
+                array = np.frombuffer(base64.b64decode(value['bdata']), dtype=dtype).astype(np.float64)
+                return [None if np.isnan(v) else v for v in array]
+            return {k: decode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [decode(v) for v in value]
+        if isinstance(value, str):
+            # Both spellings of a midnight timestamp draw the same point
+            return re.sub(r'^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)\.0+$', r'\1', value)
+        return value
+    return decode(json.loads(to_json_plotly(figure)))
+
+
+class TestFastFigures(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.result = analyze(generate_ohlcv(seed=3, periods=300))
+
+    def assertSameFigure(self, fast, slow):
+        self.assertEqual(normalise(fast), normalise(slow))
+
+    def test_line_and_bar_charts_match(self):
+        r = self.result
+        self.assertSameFigure(components.create_volatility_chart_fast(r), components.create_volatility_chart(r))
+        for fast, slow in zip(components.create_technical_charts_fast(r), components.create_technical_charts(r)):
+            self.assertSameFigure(fast, slow)
+        for fast, slow in zip(components.create_seasonal_charts_fast(r.seasonal),
+                              components.create_seasonal_charts(r.seasonal)):
+            self.assertSameFigure(fast, slow)
+        for fast, slow in zip(components.create_volume_chart_fast(r, r.monthly_volume),
+                              components.create_volume_chart(r, r.monthly_volume)):
+            self.assertSameFigure(fast, slow)
+
+    def test_sector_chart_matches(self):
+        sector = ReplayProvider().download(["AAA.NS", "BBB.NS", "CCC.NS"], period="1y")['Adj Close']
+        perf = calculate_sector_performance(sector)
+        self.assertSameFigure(components.create_sector_chart_fast(perf), components.create_sector_chart(perf))
+
+    def test_main_chart_matches_with_coded_volume_colours(self):
+        fast = normalise(components.create_main_chart_fast(self.result))
+        slow = normalise(components.create_main_chart(self.result))
+
+        fast_marker = fast['data'][3].pop('marker')
+        slow_marker = slow['data'][3].pop('marker')
+        scale = dict((int(code), color) for code, color in fast_marker['colorscale'])
+        self.assertEqual([scale[int(code)] for code in fast_marker['color']], slow_marker['color'])
+        self.assertEqual(fast, slow)
+
+
+class TestCompactFigures(unittest.TestCase):
+    def test_values_keep_their_significant_digits(self):
+        values = np.array([4235.2998046875, 0.0152345678, -0.000123456789, 0.0, np.nan, 123456789.0])
+        rounded = components._significant(values, 6)
+        self.assertEqual([repr(v) for v in rounded.tolist()],
+                         ['4235.3', '0.0152346', '-0.000123457', '0.0', 'nan', '123457000.0'])
+        # Any 6-digit decimal survives the trip through float32
+        np.testing.assert_array_equal(rounded.astype(np.float32).astype(str).astype(np.float64), rounded)
+
+    def test_compact_figure_draws_the_same_points(self):
+        result = analyze(generate_ohlcv(seed=3, periods=300))
+        full = normalise(components.create_main_chart_reduced(result))
+        compact = components.compact_figure(components.create_main_chart_reduced(result))
+        full_bytes = len(to_json_plotly(components.create_main_chart_reduced(result)))
+        self.assertLess(len(to_json_plotly(compact)), full_bytes * 0.75)
+
+        for ours, theirs in zip(normalise(compact)['data'], full['data']):
+            # Daily bars are sent as plain dates
+            self.assertEqual(ours['x'][0], theirs['x'][0][:10])
+            self.assertEqual([np.datetime64(x) for x in ours['x']], [np.datetime64(x) for x in theirs['x']])
+            for attribute in ('open', 'high', 'low', 'close', 'y'):
+                if attribute in theirs:
+                    np.testing.assert_allclose(np.array(ours[attribute], dtype=float),
+                                               np.array(theirs[attribute], dtype=float), rtol=5e-6)
+        # Volumes are whole numbers and stay exact
+        volume = compact['data'][3]['y']
+        self.assertIn(volume['dtype'], ('u4', 'i4'))
+        self.assertEqual(normalise(compact)['data'][3]['y'], full['data'][3]['y'])
+
+    def test_plain_lists_stay_lists(self):
+        figure = {'data': [{'x': [pd.Timestamp("2024-03-04 09:15"), pd.Timestamp("2024-03-04 09:20:30")],
+                            'y': [101.23456789, float('nan')], 'marker': {'color': [0, 1]}}]}
+        components.compact_figure(figure)
+        self.assertEqual(figure['data'][0]['x'], ['2024-03-04T09:15', '2024-03-04T09:20:30'])
+        self.assertEqual(figure['data'][0]['y'][0], 101.235)
+        self.assertEqual(figure['data'][0]['marker']['color'], [0, 1])
+
+    def test_large_prices_keep_their_paise(self):
+        index = np.array([24567.85, 24601.15, 9999.99, np.nan])
+        stock = np.array([101.25, 99.5, 100.75, 98.05])
+        figure = {'data': [{'y': index}, {'y': stock}, {'y': [24567.849999, 24601.15]}]}
+        components.compact_figure(figure)
+        self.assertEqual(figure['data'][0]['y']['dtype'], 'f8')
+        self.assertEqual(figure['data'][1]['y']['dtype'], 'f4')
+        data = normalise(figure)['data']
+        self.assertEqual(data[0]['y'], [24567.85, 24601.15, 9999.99, None])
+        np.testing.assert_array_equal(np.array(data[1]['y'], dtype=np.float32), stock.astype(np.float32))
+        self.assertEqual(figure['data'][2]['y'], [24567.85, 24601.15])
+        self.assertEqual(components._wire_values(np.array([24567.849999])), [24567.85])
+
+
+if __name__ == '__main__':
+    unittest.main()
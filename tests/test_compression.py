@@ -0,0 +1,67 @@
+import unittest
+from unittest import mock
+import gzip
+import json
+import os
+import sys
+
+import flask
+from werkzeug.http import parse_accept_header
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import compression
+from compression import ResponseCompressor, choose_encoding
+
+
+def json_response(size=5000):
+    body = json.dumps({"x": [f"2024-03-{1 + i % 28:02d}" for i in range(size)]})
+    return flask.Response(body, mimetype="application/json")
+
+
+class TestResponseCompressor(unittest.TestCase):
+    def test_compresses_for_the_accepted_encoding(self):
+        response = json_response()
+        original = response.get_data()
+        compressed = ResponseCompressor()(response, parse_accept_header("gzip, deflate"))
+        self.assertEqual(compressed.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", compressed.headers["Vary"])
+        self.assertEqual(gzip.decompress(compressed.get_data()), original)
+        self.assertEqual(int(compressed.headers["Content-Length"]), len(compressed.get_data()))
+
+    def test_leaves_responses_it_should_not_touch(self):
+        compressor = ResponseCompressor()
+        for response, accepted in [
+            (json_response(), ""),                        # client accepts nothing
+            (json_response(), "gzip;q=0"),
+            (json_response(size=10), "gzip"),             # too small
+            (flask.Response(b"\x89PNG" * 1000, mimetype="image/png"), "gzip"),
+            (flask.Response("{}" * 1000, status=500, mimetype="application/json"), "gzip"),
+        ]:
+            original = response.get_data()
+            compressor(response, parse_accept_header(accepted))
+            self.assertNotIn("Content-Encoding", response.headers)
+            self.assertEqual(response.get_data(), original)
+
+    def test_prefers_brotli_when_installed(self):
+        with mock.patch.object(compression, "brotli", None):
+            self.assertEqual(choose_encoding(parse_accept_header("gzip, br")), "gzip")
+        with mock.patch.object(compression, "brotli", mock.Mock()):
+            self.assertEqual(choose_encoding(parse_accept_header("gzip, br")), "br")
+            self.assertEqual(choose_encoding(parse_accept_header("gzip")), "gzip")
+
+    def test_static_bodies_are_compressed_once(self):
+        compressor = ResponseCompressor(cache_size=1)
+        for _ in range(3):
+            response = json_response()
+            response.cache_control.max_age = 31536000
+            compressor(response, parse_accept_header("gzip"), path="/bundle.js")
+        self.assertEqual(compressor.stats["cached"], 2)
+        # Callback responses differ every time, so they are not kept
+        compressor(json_response(), parse_accept_header("gzip"), path="/_dash-update-component")
+        self.assertEqual(len(compressor._cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
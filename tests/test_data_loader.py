@@ -0,0 +1,151 @@
+import unittest
+from unittest import mock
+import tempfile
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import data_loader
+import providers
+
+
+def make_ohlcv(start, periods):
+    dates = pd.bdate_range(start=start, periods=periods)
+    close = np.linspace(100, 200, periods)
+    return pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1,
+        'Close': close, 'Adj Close': close, 'Volume': np.full(periods, 1000)
+    }, index=dates)
+
+
+class TestOhlcvCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(data_loader, 'CACHE_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+        self.provider = providers.ReplayProvider()
+        previous = providers.set_provider(self.provider)
+        self.addCleanup(providers.set_provider, previous)
+
+        end = pd.Timestamp.now().normalize()
+        self.history = make_ohlcv(end - pd.DateOffset(years=1, days=10), 270)
+
+    def test_fresh_cache_skips_network(self):
+        with mock.patch.object(self.provider, 'download', return_value=self.history) as download:
+            first = data_loader.fetch_stock_data("TEST.NS", period="1y")
+            second = data_loader.fetch_stock_data("TEST.NS", period="1y")
+        self.assertEqual(download.call_count, 1)
+        pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+    def test_stale_cache_fetches_only_delta(self):
+        with mock.patch.object(self.provider, 'download', return_value=self.history):
+            data_loader.fetch_stock_data("TEST.NS", period="1y")
+
+        # The unchanged bar before the last cached one, a revised bar for the
+        # last cached date and one new bar
+        last = self.history.index[-1]
+        revised = make_ohlcv(last, 2)
+        revised['Adj Close'] = [111.0, 222.0]
+        delta = pd.concat([self.history.iloc[-2:-1], revised])
+        with mock.patch.object(data_loader, 'OHLCV_CACHE_TTL', 0), \
+             mock.patch.object(self.provider, 'download', return_value=delta) as download:
+            result = data_loader.fetch_stock_data("TEST.NS", period="1y")
+
+        self.assertEqual(download.call_count, 1)
+        self.assertEqual(download.call_args.kwargs['start'], self.history.index[-2])
+        self.assertEqual(result['Adj Close'].iloc[-2], 111.0)
+        self.assertEqual(result['Adj Close'].iloc[-1], 222.0)
+        self.assertTrue(result.index.is_unique)
+
+    def test_rescaled_history_is_downloaded_again(self):
+        with mock.patch.object(self.provider, 'download', return_value=self.history):
+            data_loader.fetch_stock_data("TEST.NS", period="1y")
+
+        # A 1:5 split: the provider now reports every past price a fifth as large
+        split = self.history.copy()
+        for column in ('Open', 'High', 'Low', 'Close', 'Adj Close'):
+            split[column] = split[column] * 0.2
+        calls = []
+        def download(ticker, period=None, start=None, **kwargs):
+            calls.append(period or start)
+            return split if start is None else split[split.index >= start]
+
+        with mock.patch.object(data_loader, 'OHLCV_CACHE_TTL', 0), \
+             mock.patch.object(self.provider, 'download', side_effect=download):
+            result = data_loader.fetch_stock_data("TEST.NS", period="1y")
+            again = data_loader.fetch_stock_data("TEST.NS", period="1y")
+
+        self.assertEqual(calls[:2], [self.history.index[-2], "1y"])
+        start = data_loader.period_start("1y")
+        pd.testing.assert_frame_equal(result, split[split.index >= start], check_freq=False)
+        pd.testing.assert_frame_equal(again, result, check_freq=False)
+        # Daily moves stay the history's own: no jump where old and new bars meet
+        self.assertLess(again['Adj Close'].pct_change().abs().max(), 0.01)
+        cached = data_loader._read_cache(data_loader._cache_path("TEST.NS", False))
+        self.assertEqual(cached.attrs["requested_start"], start.isoformat())
+
+    def test_longer_period_refetches_full_history(self):
+        with mock.patch.object(self.provider, 'download', return_value=self.history):
+            data_loader.fetch_stock_data("TEST.NS", period="1y")
+        with mock.patch.object(self.provider, 'download', return_value=self.history) as download:
+            data_loader.fetch_stock_data("TEST.NS", period="10y")
+        self.assertEqual(download.call_args.kwargs['period'], "10y")
+
+    def test_short_history_ticker_uses_cache(self):
+        # Listed a year ago but asked for ten years: the cache never starts near the period start
+        with mock.patch.object(self.provider, 'download', return_value=self.history) as download:
+            data_loader.fetch_stock_data("IPO.NS", period="10y")
+            data_loader.fetch_stock_data("IPO.NS", period="10y")
+            data_loader.fetch_stock_data("IPO.NS", period="5y")
+        self.assertEqual(download.call_count, 1)
+
+        with mock.patch.object(data_loader, 'OHLCV_CACHE_TTL', 0), \
+             mock.patch.object(self.provider, 'download', return_value=self.history.tail(1)) as download:
+            data_loader.fetch_stock_data("IPO.NS", period="10y")
+            data_loader.fetch_stock_data("IPO.NS", period="10y")
+        # Delta fetches only, and the refreshed cache still remembers the requested start
+        self.assertTrue(all('start' in call.kwargs and call.kwargs['start'] is not None
+                            for call in download.call_args_list))
+        self.assertEqual(download.call_count, 2)
+
+        with mock.patch.object(self.provider, 'download', return_value=self.history) as download:
+            data_loader.fetch_stock_data("IPO.NS", period="max")
+        self.assertEqual(download.call_args.kwargs['period'], "max")
+
+    def test_adjustment_modes_are_cached_separately(self):
+        self.assertNotEqual(data_loader._cache_path("TEST.NS", True),
+                            data_loader._cache_path("TEST.NS", False))
+
+
+class TestFetchConcurrently(unittest.TestCase):
+    def test_sources_run_concurrently(self):
+        started = time.monotonic()
+        results = data_loader.fetch_concurrently({
+            name: (time.sleep, (0.2,), 'default') for name in ('a', 'b', 'c', 'd')
+        })
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual(set(results), {'a', 'b', 'c', 'd'})
+
+    def test_failed_and_slow_sources_use_defaults(self):
+        def fail():
+            raise RuntimeError("provider down")
+
+        results = data_loader.fetch_concurrently({
+            'ok': (lambda: 42, (), None),
+            'failed': (fail, (), []),
+            'slow': (time.sleep, (1,), {}),
+        }, timeouts={'slow': 0.1})
+        self.assertEqual(results, {'ok': 42, 'failed': [], 'slow': {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
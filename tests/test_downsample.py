@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import analyze
+from components import create_main_chart_reduced, create_volatility_chart_reduced
+from downsample import lttb_indices, resample_ohlc, choose_resolution, visible_range
+from providers import generate_ohlcv
+
+
+class TestDownsample(unittest.TestCase):
+    def setUp(self):
+        self.df = generate_ohlcv(seed=5, periods=2500)
+
+    def test_lttb_keeps_endpoints_and_peaks(self):
+        x = np.arange(1000)
+        y = np.sin(x / 50.0)
+        y[500] = 10.0
+        keep = lttb_indices(x, y, 100)
+        self.assertEqual(len(keep), 100)
+        self.assertEqual(keep[0], 0)
+        self.assertEqual(keep[-1], 999)
+        self.assertIn(500, keep)
+        self.assertTrue(np.all(np.diff(keep) > 0))
+
+    def test_lttb_skips_nan_warmup(self):
+        y = np.r_[np.full(200, np.nan), np.arange(800.0)]
+        keep = lttb_indices(np.arange(1000), y, 50)
+        self.assertEqual(keep[0], 200)
+        self.assertFalse(np.isnan(y[keep]).any())
+
+    def test_weekly_candles_match_pandas_resample(self):
+        df = self.df
+        bars = resample_ohlc(df.index, df['Open'], df['High'], df['Low'], df['Adj Close'], df['Volume'], 'W')
+        expected = df.resample('W-SUN').agg({'Open': 'first', 'High': 'max', 'Low': 'min',
+                                             'Adj Close': 'last', 'Volume': 'sum'}).dropna()
+        np.testing.assert_allclose(bars['High'], expected['High'])
+        np.testing.assert_allclose(bars['Low'], expected['Low'])
+        np.testing.assert_allclose(bars['Close'], expected['Adj Close'])
+        np.testing.assert_allclose(bars['Volume'], expected['Volume'])
+
+    def test_resolution_and_relayout_parsing(self):
+        self.assertEqual(choose_resolution(500, 800), 'D')
+        self.assertEqual(choose_resolution(2500, 800), 'W')
+        self.assertEqual(choose_resolution(20000, 800), 'M')
+        self.assertEqual(visible_range({'xaxis2.autorange': True}), 'reset')
+        self.assertIsNone(visible_range({'autosize': True}))
+        start, end = visible_range({'xaxis.range[0]': '2020-01-01', 'xaxis.range[1]': '2020-03-01 12:00'})
+        self.assertEqual(end, pd.Timestamp('2020-03-01 12:00'))
+
+    def test_reduced_charts_respect_budget(self):
+        result = analyze(self.df)
+        full = create_main_chart_reduced(result, budget=300)
+        self.assertEqual(full['layout']['meta']['resolution'], 'M')
+        for trace in full['data']:
+            self.assertLessEqual(len(trace['x']), 300)
+
+        x_range = (result.index[-100], result.index[-1])
+        zoomed = create_main_chart_reduced(result, x_range=x_range, budget=300)
+        self.assertEqual(zoomed['layout']['meta']['resolution'], 'D')
+
+        vol = create_volatility_chart_reduced(result, budget=250)
+        for trace in vol['data']:
+            self.assertLessEqual(len(trace['x']), 250)
+
+
+if __name__ == '__main__':
+    unittest.main()
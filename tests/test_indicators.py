@@ -0,0 +1,64 @@
+import unittest
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import calculate_technical_indicators, pct_change, rolling_std
+from indicators import IndicatorEngine, RollingStd
+
+
+class TestIndicatorEngine(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        dates = pd.date_range(start='2020-01-01', periods=600)
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 600)))
+        self.df = pd.DataFrame({'Adj Close': prices}, index=dates)
+
+    def test_backfill_matches_pandas(self):
+        expected = calculate_technical_indicators(self.df)
+        result = IndicatorEngine().backfill(self.df)
+        for column in IndicatorEngine.COLUMNS:
+            np.testing.assert_allclose(result[column], expected[column], rtol=1e-9, atol=1e-9,
+                                       err_msg=column)
+
+    def test_flat_prices_give_undefined_rsi(self):
+        flat = pd.DataFrame({'Adj Close': np.full(30, 50.0)}, index=pd.date_range('2020-01-01', periods=30))
+        expected = calculate_technical_indicators(flat)['RSI']
+        result = IndicatorEngine().backfill(flat)['RSI']
+        np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+
+    def test_restored_state_continues_stream(self):
+        warm = IndicatorEngine()
+        warm.backfill(self.df.iloc[:400])
+        restored = IndicatorEngine.from_state(json.loads(json.dumps(warm.to_state())))
+
+        tail = restored.update_frame(self.df)
+        self.assertEqual(len(tail), 200)
+        expected = calculate_technical_indicators(self.df).iloc[400:]
+        np.testing.assert_allclose(tail['MACD'], expected['MACD'], rtol=1e-9)
+        np.testing.assert_allclose(tail['SMA_200'], expected['SMA_200'], rtol=1e-9)
+
+    def test_custom_windows_survive_state_round_trip(self):
+        engine = IndicatorEngine(sma_50=12, sma_200=36, rsi=7)
+        engine.backfill(self.df.iloc[:100])
+        restored = IndicatorEngine.from_state(json.loads(json.dumps(engine.to_state())))
+        self.assertEqual((restored.sma_50.window, restored.sma_200.window, restored.rsi.window), (12, 36, 7))
+        expected = self.df['Adj Close'].rolling(36).mean().iloc[100:]
+        np.testing.assert_allclose(restored.update_frame(self.df)['SMA_200'], expected, rtol=1e-9)
+
+    def test_rolling_std_matches_batch(self):
+        returns = pct_change(self.df['Adj Close'].to_numpy())
+        returns[300] = np.nan
+        stream = RollingStd(30)
+        result = [stream.update(value) for value in returns]
+        np.testing.assert_allclose(result, rolling_std(returns, 30), rtol=1e-9, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
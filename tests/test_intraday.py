@@ -0,0 +1,168 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import analyze, rolling_mean, window_bars
+from intraday import BarAggregator, IntradayFeed, FeedRegistry, RollingBars, resample_bars
+
+
+def session_ticks(minutes=375, per_minute=6, seed=0, day="2024-03-04"):
+    """Random trades over one session, sorted by time."""
+    rng = np.random.default_rng(seed)
+    n = minutes * per_minute
+    offsets = np.sort(rng.integers(0, minutes * 60 * 10**9, n))
+    times = pd.Timestamp(f"{day} 09:15") + pd.to_timedelta(offsets, unit='ns')
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, n)))
+    sizes = rng.integers(1, 500, n).astype(float)
+    return pd.DataFrame({'price': prices, 'size': sizes}, index=times)
+
+
+def pandas_bars(ticks, rule):
+    bars = ticks['price'].resample(rule).ohlc()
+    bars['volume'] = ticks['size'].resample(rule).sum()
+    return bars.dropna()
+
+
+class TestBarAggregator(unittest.TestCase):
+    def test_ticks_match_pandas_resample(self):
+        ticks = session_ticks()
+        aggregator = BarAggregator("5m", history="1000min")
+        for timestamp, price, size in zip(ticks.index, ticks['price'], ticks['size']):
+            aggregator.add_tick(timestamp, price, size)
+
+        result = aggregator.frame()
+        expected = pandas_bars(ticks, '5min')
+        self.assertEqual(len(result), len(expected))
+        np.testing.assert_array_equal(result.index, expected.index)
+        for ours, theirs in (('Open', 'open'), ('High', 'high'), ('Low', 'low'), ('Close', 'close'),
+                             ('Volume', 'volume')):
+            np.testing.assert_allclose(result[ours], expected[theirs], err_msg=ours)
+
+    def test_vectorised_frame_matches_tick_by_tick(self):
+        ticks = session_ticks(minutes=60)
+        one_by_one = BarAggregator("1m")
+        for timestamp, price, size in zip(ticks.index, ticks['price'], ticks['size']):
+            one_by_one.add_tick(timestamp, price, size)
+
+        bars = pd.DataFrame({'Open': ticks['price'], 'High': ticks['price'], 'Low': ticks['price'],
+                             'Close': ticks['price'], 'Volume': ticks['size']}, index=ticks.index)
+        batched = BarAggregator("1m")
+        # Split mid-bar so the second batch continues the forming bar
+        batched.add_frame(bars.iloc[:1000])
+        batched.add_frame(bars.iloc[1000:])
+        pd.testing.assert_frame_equal(batched.frame(), one_by_one.frame())
+
+        quarter = resample_bars(bars, "15m")
+        expected = pandas_bars(ticks, '15min')
+        np.testing.assert_array_equal(quarter.index, expected.index)
+        np.testing.assert_allclose(quarter['High'], expected['high'])
+        np.testing.assert_allclose(quarter['Volume'], expected['volume'])
+
+    def test_late_ticks_are_dropped(self):
+        aggregator = BarAggregator("1m")
+        aggregator.add_tick("2024-03-04 09:16:10", 101.0, 5)
+        completed = aggregator.add_tick("2024-03-04 09:17:00", 102.0, 5)
+        self.assertEqual(completed[0], pd.Timestamp("2024-03-04 09:16"))
+        self.assertIsNone(aggregator.add_tick("2024-03-04 09:16:50", 99.0, 5))
+        self.assertEqual(aggregator.late, 1)
+        self.assertEqual(aggregator.frame()['Low'].min(), 101.0)
+
+    def test_quotes_turn_cumulative_volume_into_bar_volume(self):
+        aggregator = BarAggregator("1m")
+        aggregator.add_quote("2024-03-04 09:15:05", 100.0, 1000)
+        aggregator.add_quote("2024-03-04 09:15:40", 100.5, 1600)
+        aggregator.add_quote("2024-03-04 09:16:10", 100.2, 1900)
+        # Next session starts from zero again
+        aggregator.add_quote("2024-03-05 09:15:10", 101.0, 300)
+        np.testing.assert_array_equal(aggregator.frame()['Volume'], [1600, 300, 300])
+
+    def test_memory_stays_flat_over_a_session(self):
+        aggregator = BarAggregator("1m", history="60min")
+        ticks = session_ticks(per_minute=3)
+        sizes = set()
+        for timestamp, price in zip(ticks.index, ticks['price']):
+            aggregator.add_tick(timestamp, price)
+            sizes.add(aggregator.nbytes)
+        self.assertEqual(len(sizes), 1)
+        frame = aggregator.frame()
+        self.assertEqual(len(frame), 61)
+        self.assertEqual(frame.index[-1], pd.Timestamp("2024-03-04 15:29"))
+
+    def test_rolling_bars_keep_newest_in_order(self):
+        bars = RollingBars(4)
+        for start in range(0, 10, 3):
+            times = np.arange(start, start + 3, dtype=np.int64)
+            bars.extend(times, np.vstack([times.astype(float)] * 5))
+        times, values = bars.arrays()
+        np.testing.assert_array_equal(times, [8, 9, 10, 11])
+        np.testing.assert_array_equal(values[3], [8, 9, 10, 11])
+        np.testing.assert_array_equal(bars.since(9)[0], [10, 11])
+        self.assertEqual(len(bars.since(11)[0]), 0)
+        self.assertEqual(len(bars.since(None)[0]), 4)
+
+        rows = RollingBars(3, width=2)
+        rows.extend(np.arange(2, dtype=np.int64), np.ones((2, 2)))
+        self.assertEqual(rows.arrays()[1].shape, (2, 2))
+
+
+class TestIntradayFeed(unittest.TestCase):
+    def minute_bars(self, start, closes, volume=100.0):
+        index = pd.date_range(start, periods=len(closes), freq="min")
+        closes = np.asarray(closes, dtype=float)
+        return pd.DataFrame({'Open': closes, 'High': closes + 1, 'Low': closes - 1, 'Close': closes,
+                             'Volume': volume}, index=index)
+
+    def test_resent_forming_bar_is_not_counted_twice(self):
+        feed = IntradayFeed()
+        feed.add_bars(self.minute_bars("2024-03-04 09:15", [100, 101, 102]))
+        # The provider re-sends 09:17 (now final, more volume) with a new 09:18 bar
+        update = self.minute_bars("2024-03-04 09:17", [103, 104], volume=150.0)
+        feed.add_bars(update)
+        five = feed.frame("5m")
+        self.assertEqual(len(five), 1)
+        self.assertEqual(five['Volume'].iloc[0], 100 + 100 + 150 + 150)
+        self.assertEqual(five['Close'].iloc[0], 104)
+        self.assertEqual(feed.last_time, pd.Timestamp("2024-03-04 09:18"))
+
+    def test_timezone_aware_bars_use_exchange_time(self):
+        feed = IntradayFeed()
+        bars = self.minute_bars("2024-03-04 09:15", [100, 101])
+        bars.index = bars.index.tz_localize("Asia/Kolkata")
+        feed.add_bars(bars)
+        self.assertEqual(feed.frame("1m").index[0], pd.Timestamp("2024-03-04 09:15"))
+
+    def test_registry_is_bounded(self):
+        registry = FeedRegistry(max_tickers=2)
+        first = registry.get("AAA.NS")
+        registry.get("BBB.NS")
+        registry.get("aaa.ns")
+        registry.get("CCC.NS")
+        self.assertEqual(len(registry), 2)
+        self.assertIs(registry.get("AAA.NS"), first)
+
+
+class TestTimeWindows(unittest.TestCase):
+    def test_window_bars(self):
+        self.assertEqual(window_bars(50, "5min"), 50)
+        self.assertEqual(window_bars("1h", "5min"), 12)
+        self.assertEqual(window_bars("30min", "15min"), 2)
+
+    def test_analyze_with_time_windows(self):
+        index = pd.date_range("2024-03-04 09:15", periods=300, freq="5min")
+        close = 100 + np.cumsum(np.random.default_rng(1).normal(0, 0.2, 300))
+        bars = pd.DataFrame({'Adj Close': close, 'Volume': 1000.0}, index=index)
+        result = analyze(bars, windows={'SMA_50': '1h'})
+        np.testing.assert_allclose(result['SMA_50'], rolling_mean(close, 12))
+        self.assertEqual(result.labels['SMA_50'], '1h')
+        self.assertEqual(result.labels['SMA_200'], '200-Bar')
+        self.assertEqual(analyze(bars.iloc[:10].set_axis(pd.date_range("2024-01-01", periods=10))).labels['SMA_50'],
+                         '50-Day')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import analyze
+from components import (create_main_chart_reduced, create_technical_charts_fast, create_volatility_chart_reduced,
+                        add_forming_bar, plain_arrays, compact_figure, trace_lengths, live_patch)
+from intraday import IntradayFeed, INTERVALS, INTRADAY_WINDOWS
+from live import LiveStream, StreamRegistry, COLUMNS
+from plotly.io.json import to_json_plotly
+
+
+def minute_bars(start="2024-03-04 09:15", periods=600, seed=3):
+    index = pd.date_range(start, periods=periods, freq="min")
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, periods)))
+    return pd.DataFrame({'Open': close * 0.999, 'High': close * 1.002, 'Low': close * 0.997, 'Close': close,
+                         'Volume': rng.integers(100, 1000, periods).astype(float)}, index=index)
+
+
+def build_figures(bars, interval, budget=10_000):
+    """The live charts of app.build_intraday_overview, as JSON."""
+    result = analyze(bars.iloc[:-1], windows=INTRADAY_WINDOWS, interval=INTERVALS[interval])
+    figures = {
+        'main': add_forming_bar(create_main_chart_reduced(result, budget=budget), bars.iloc[-1:]),
+        'volatility': create_volatility_chart_reduced(result, budget=budget),
+    }
+    figures['rsi'], figures['macd'] = create_technical_charts_fast(result)
+    return {chart: json.loads(to_json_plotly(compact_figure(plain_arrays(fig)))) for chart, fig in figures.items()}
+
+
+def apply_patch(figure, patch):
+    """Applies a Patch's operations the way the Dash renderer does."""
+    for operation in json.loads(to_json_plotly(patch))['operations']:
+        *path, last = operation['location']
+        target = figure
+        for key in path:
+            target = target[key]
+        if operation['operation'] == 'Extend':
+            target[last] = target[last] + operation['params']['value']
+        elif operation['operation'] == 'Delete':
+            del target[last]
+        else:
+            target[last] = operation['params']['value']
+
+
+def as_array(values):
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+class TestLiveStream(unittest.TestCase):
+    def test_rows_match_analyze(self):
+        feed = IntradayFeed(history="1000min")
+        feed.add_bars(minute_bars(periods=300))
+        stream = LiveStream("5m", history="1000min")
+        with feed.lock, stream.lock:
+            self.assertEqual(stream.update(feed), 59)
+            # Halfway through the session, then the rest
+            feed.add_bars(minute_bars(periods=600).iloc[299:])
+            self.assertEqual(stream.update(feed), 60)
+            self.assertEqual(stream.update(feed), 0)
+
+        times, values = stream.rows.arrays()
+        completed = feed.frame("5m").iloc[:-1]
+        np.testing.assert_array_equal(times, completed.index.as_unit('ns').asi8)
+        expected = analyze(completed, windows=INTRADAY_WINDOWS, interval=INTERVALS["5m"])
+        for row, column in enumerate(COLUMNS):
+            source = 'Adj Close' if column == 'Close' else column
+            np.testing.assert_allclose(values[row], expected[source], rtol=1e-9, atol=1e-9, err_msg=column)
+
+    def test_new_feed_starts_over(self):
+        stream = LiveStream("1m")
+        for _ in range(2):
+            feed = IntradayFeed()
+            feed.add_bars(minute_bars(periods=30))
+            self.assertEqual(stream.update(feed), 28)
+        self.assertEqual(len(stream.rows), 28)
+
+    def test_registry_is_bounded(self):
+        registry = StreamRegistry(max_streams=2)
+        first = registry.get("AAA.NS", "5m")
+        registry.get("AAA.NS", "1m")
+        self.assertIs(registry.get("aaa.ns", "5m"), first)
+        registry.get("BBB.NS", "5m")
+        self.assertEqual(len(registry), 2)
+        self.assertIsNot(registry.get("AAA.NS", "1m"), first)
+
+
+class TestLivePatch(unittest.TestCase):
+    def test_patched_charts_equal_a_rebuild(self):
+        bars = minute_bars(periods=600)
+        feed = IntradayFeed(history="1000min")
+        feed.add_bars(bars.iloc[:400])
+        first = feed.frame("5m")
+        figures = build_figures(first, "5m")
+        lengths = {chart: trace_lengths(fig, chart) for chart, fig in figures.items()}
+
+        stream = LiveStream("5m", history="1000min")
+        feed.add_bars(bars.iloc[399:])
+        after = first.index[-2].as_unit('ns').value
+        rows, forming = stream.read(feed, after)
+        self.assertEqual(list(forming.index), list(feed.frame("5m").index[-1:]))
+        for chart, figure in figures.items():
+            apply_patch(figure, live_patch(chart, rows, lengths[chart], 1000, forming))
+
+        rebuilt = build_figures(feed.frame("5m"), "5m")
+        for chart, figure in figures.items():
+            self.assertEqual(lengths[chart], trace_lengths(figure, chart))
+            for ours, theirs in zip(figure['data'], rebuilt[chart]['data']):
+                self.assertEqual(ours['x'], theirs['x'], msg=f"{chart} {ours['name']}")
+                for attribute in ('y', 'open', 'high', 'low', 'close'):
+                    if attribute in theirs:
+                        np.testing.assert_allclose(as_array(ours[attribute]), as_array(theirs[attribute]),
+                                                   rtol=1e-9, err_msg=f"{chart} {ours['name']} {attribute}")
+        self.assertEqual(figures['main']['data'][3]['marker']['color'],
+                         rebuilt['main']['data'][3]['marker']['color'])
+
+    def test_figures_and_patches_stay_bounded(self):
+        bars = minute_bars(periods=1500)
+        feed = IntradayFeed(history="60min")
+        feed.add_bars(bars.iloc[:120])
+        figures = build_figures(feed.frame("1m"), "1m")
+        lengths = {chart: trace_lengths(fig, chart) for chart, fig in figures.items()}
+        after = feed.frame("1m").index[-2].as_unit('ns').value
+
+        stream = LiveStream("1m", history="60min")
+        sizes = set()
+        for end in range(130, 1500, 10):
+            feed.add_bars(bars.iloc[end - 11:end])
+            rows = stream.read(feed, after)[0]
+            after = rows.index[-1].as_unit('ns').value
+            patch = live_patch("main", rows, lengths["main"], 61)
+            apply_patch(figures["main"], patch)
+            if end > 500:
+                # Once every trace is full, each poll appends and drops the same number of points
+                sizes.add(len(patch.to_plotly_json()['operations']))
+        self.assertEqual(len(sizes), 1)
+        self.assertEqual(trace_lengths(figures["main"], "main"), [61, 61, 61, 61])
+        self.assertEqual(lengths["main"], [61, 61, 61, 61])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+import os
+import subprocess
+import sys
+import tempfile
+
+# Add src to path
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.append(SRC_DIR)
+
+import metrics
+from metrics import span
+
+
+class TestMetrics(unittest.TestCase):
+    def test_span_records_duration_cache_rows_and_bytes(self):
+        before = metrics.STAGE_SECONDS.count(stage="test.span")
+        with span("test.span") as s:
+            s.set(cache="hit", rows=120, bytes=2048)
+
+        self.assertEqual(metrics.STAGE_SECONDS.count(stage="test.span"), before + 1)
+        self.assertGreaterEqual(metrics.CACHE_REQUESTS.value(stage="test.span", result="hit"), 1)
+        self.assertGreaterEqual(metrics.ROWS_PROCESSED.value(stage="test.span"), 120)
+        self.assertGreaterEqual(metrics.PAYLOAD_BYTES.count(stage="test.span"), 1)
+        self.assertIn("test.span", metrics.stage_summary())
+
+    def test_span_counts_errors_and_reraises(self):
+        with self.assertRaises(ValueError):
+            with span("test.error"):
+                raise ValueError("boom")
+        self.assertEqual(metrics.STAGE_ERRORS.value(stage="test.error"), 1)
+        # The failed stage's duration is still recorded
+        self.assertEqual(metrics.STAGE_SECONDS.count(stage="test.error"), 1)
+
+    def test_render_prometheus_text(self):
+        histogram = metrics.Histogram("demo_seconds", "Demo.", ["stage"], buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage='a"b')
+        histogram.observe(0.5, stage='a"b')
+        counter = metrics.Counter("demo_total", "Demo.", ["stage"])
+        counter.inc(3, stage="x")
+        registry = metrics.Registry()
+        registry.register(histogram)
+        registry.register(counter)
+
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE demo_seconds histogram", lines)
+        self.assertIn('demo_seconds_bucket{stage="a\\"b",le="0.1"} 1', lines)
+        self.assertIn('demo_seconds_bucket{stage="a\\"b",le="1.0"} 2', lines)
+        self.assertIn('demo_seconds_bucket{stage="a\\"b",le="+Inf"} 2', lines)
+        self.assertIn('demo_seconds_count{stage="a\\"b"} 2', lines)
+        self.assertIn('demo_total{stage="x"} 3', lines)
+
+    def test_disabled_spans_record_nothing(self):
+        with mock.patch.object(metrics, 'METRICS_ENABLED', False):
+            with span("test.disabled") as s:
+                s.set(cache="miss", rows=5)
+            metrics.observe_bytes("test.disabled", 100)
+        self.assertEqual(metrics.STAGE_SECONDS.count(stage="test.disabled"), 0)
+        self.assertEqual(metrics.CACHE_REQUESTS.value(stage="test.disabled", result="miss"), 0)
+        self.assertNotIn("test.disabled", metrics.stage_summary())
+
+
+class TestResponseSizes(unittest.TestCase):
+    def test_unknown_outputs_add_no_series(self):
+        code = """
+import flask, app, metrics
+client = app.server.test_client()
+series = lambda: len(list(metrics.PAYLOAD_BYTES.samples()))
+before = series()
+for i in range(20):
+    client.post('/_dash-update-component', json={'output': f'bogus-{i}.children', 'inputs': []})
+print('failed:', series() - before)
+# A successful response for an output the app has no callback for is labelled 'other'
+for output in ('main-chart.figure', 'bogus.children', 'other-bogus.children'):
+    with app.server.test_request_context('/_dash-update-component', method='POST', json={'output': output}):
+        app.record_response_size(flask.Response('{}', status=200))
+print('main-chart:', metrics.PAYLOAD_BYTES.count(stage='response.main-chart'))
+print('other:', metrics.PAYLOAD_BYTES.count(stage='response.other'))
+print('bogus:', metrics.PAYLOAD_BYTES.count(stage='response.bogus'))
+"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = dict(os.environ, STOCK_DATA_PROVIDER='replay', STOCK_CACHE_DIR=cache_dir,
+                       TAPE_REFRESH_INTERVAL='0')
+            result = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, env=env,
+                                    capture_output=True, text=True, check=True)
+        lines = result.stdout.strip().splitlines()
+        self.assertIn('failed: 0', lines)
+        self.assertEqual(lines[-3:], ['main-chart: 1', 'other: 2', 'bogus: 0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest import mock
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import data_loader
+import precompute
+from analysis import analyze
+from providers import ReplayProvider, generate_ohlcv, set_provider
+
+
+class TestPrecomputedStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(data_loader, 'CACHE_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        previous = set_provider(ReplayProvider())
+        self.addCleanup(set_provider, previous)
+        self.df = generate_ohlcv(seed=11, periods=1500)
+
+    def assert_same_analysis(self, result, expected):
+        self.assertTrue(result.index.equals(expected.index))
+        for name, values in expected.columns.items():
+            np.testing.assert_allclose(result[name], values, rtol=1e-9, atol=1e-12, err_msg=name)
+        for key in ('monthly', 'day_of_week', 'yearly'):
+            pd.testing.assert_series_equal(result.seasonal[key], expected.seasonal[key])
+        pd.testing.assert_series_equal(result.monthly_volume, expected.monthly_volume)
+
+    def test_stored_history_is_memory_mapped(self):
+        precompute.write_analytics("AAA.NS", self.df)
+        result = precompute.load_analysis("AAA.NS", self.df)
+        self.assertIsInstance(result['SMA_200'].base, np.memmap)
+        self.assert_same_analysis(result, analyze(self.df))
+
+    def test_only_new_bars_are_computed(self):
+        precompute.write_analytics("AAA.NS", self.df.iloc[:-7])
+        with mock.patch.object(precompute, 'analyze', side_effect=AssertionError("full recompute")):
+            result = precompute.load_analysis("AAA.NS", self.df)
+        self.assert_same_analysis(result, analyze(self.df))
+
+    def test_rewritten_history_falls_back_to_full_analysis(self):
+        precompute.write_analytics("AAA.NS", self.df.iloc[:-7])
+        adjusted = self.df.copy()
+        adjusted['Adj Close'] *= 0.5
+        self.assert_same_analysis(precompute.load_analysis("AAA.NS", adjusted), analyze(adjusted))
+        self.assert_same_analysis(precompute.load_analysis("ZZZ.NS", self.df), analyze(self.df))
+
+    def test_later_start_serves_store_with_df_calendar(self):
+        precompute.write_analytics("AAA.NS", self.df.iloc[:-7])
+        df = self.df.iloc[300:]
+        with mock.patch.object(precompute, 'analyze', side_effect=AssertionError("full recompute")):
+            result = precompute.load_analysis("AAA.NS", df)
+        expected = analyze(df)
+        self.assertTrue(result.index.equals(expected.index))
+        for key in ('monthly', 'day_of_week', 'yearly'):
+            pd.testing.assert_series_equal(result.seasonal[key], expected.seasonal[key])
+        pd.testing.assert_series_equal(result.monthly_volume, expected.monthly_volume)
+        # Equal once df's own warm-up is over; the stored warm-up bars are filled in
+        for name in ('SMA_200', 'RollingVol_90', 'RSI', 'Volume_MA20', 'Daily Return'):
+            np.testing.assert_allclose(result[name][200:], expected[name][200:], rtol=1e-9, err_msg=name)
+        self.assertFalse(np.isnan(result['SMA_200'][0]))
+        np.testing.assert_allclose(result['MACD'][-100:], expected['MACD'][-100:], rtol=1e-6)
+
+    def test_gap_falls_back_to_full_analysis(self):
+        precompute.write_analytics("AAA.NS", self.df.iloc[:-7])
+        for df in (self.df.drop(self.df.index[500]), self.df.iloc[300:].drop(self.df.index[301])):
+            with mock.patch.object(precompute, 'analyze', wraps=analyze) as full:
+                result = precompute.load_analysis("AAA.NS", df)
+            full.assert_called_once()
+            self.assert_same_analysis(result, analyze(df))
+
+    def test_batch_job_builds_universe(self):
+        summary = precompute.build_store(["AAA.NS", "BBB.NS"], period="2y")
+        self.assertEqual(summary, {"built": ["AAA.NS", "BBB.NS"], "failed": []})
+        df = data_loader.fetch_stock_data("BBB.NS", period="2y")
+        self.assert_same_analysis(precompute.load_analysis("BBB.NS", df), analyze(df))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from unittest import mock
+import tempfile
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import data_loader
+from providers import YFinanceProvider, ReplayProvider, RecordingProvider, ProviderError, generate_ohlcv, set_provider
+
+
+class TestReplayProvider(unittest.TestCase):
+    def test_synthetic_history_is_deterministic(self):
+        first = ReplayProvider().download("AAA.NS", period="1y")
+        second = ReplayProvider().download("AAA.NS", period="1y")
+        pd.testing.assert_frame_equal(first, second)
+        self.assertFalse(first.equals(ReplayProvider().download("BBB.NS", period="1y")))
+
+    def test_longer_history_extends_shorter_one(self):
+        short = generate_ohlcv(seed=7, periods=100)
+        long = generate_ohlcv(seed=7, periods=200)
+        pd.testing.assert_frame_equal(short, long.iloc[:100], check_freq=False)
+
+    def test_explicit_dates_for_intraday_bars(self):
+        dates = pd.date_range("2024-01-01 09:15", periods=375, freq="min")
+        bars = generate_ohlcv(seed=7, dates=dates)
+        self.assertTrue(bars.index.equals(pd.DatetimeIndex(dates, name='Date')))
+        # Same draws as a daily history of the same length
+        np.testing.assert_array_equal(bars['Close'].to_numpy(), generate_ohlcv(seed=7, periods=375)['Close'].to_numpy())
+
+    def test_multi_ticker_download_matches_yfinance_layout(self):
+        data = ReplayProvider().download(["AAA.NS", "BBB.NS"], period="1mo")
+        self.assertIsInstance(data.columns, pd.MultiIndex)
+        self.assertEqual(list(data['Adj Close'].columns), ["AAA.NS", "BBB.NS"])
+
+    def test_latency_and_failures_are_injected(self):
+        provider = ReplayProvider(latency=0.05)
+        started = time.monotonic()
+        provider.info("AAA.NS")
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+        with self.assertRaises(ProviderError):
+            ReplayProvider(failure_rate=1.0).news("AAA.NS")
+
+    def test_recorded_fixtures_are_replayed(self):
+        with tempfile.TemporaryDirectory() as fixture_dir:
+            recorder = RecordingProvider(ReplayProvider(), fixture_dir)
+            recorded = recorder.download("AAA.NS", period="3mo")
+            recorder.info("AAA.NS")
+            recorder.news("AAA.NS")
+
+            replay = ReplayProvider(fixture_dir=fixture_dir, synthetic=False)
+            replayed = replay.download("AAA.NS", period="3mo")
+            pd.testing.assert_frame_equal(recorded, replayed, check_freq=False)
+            self.assertEqual(replay.info("AAA.NS")["currency"], "INR")
+            self.assertEqual(len(replay.news("AAA.NS")), 5)
+            self.assertTrue(replay.download("ZZZ.NS", period="3mo").empty)
+
+
+class TestDataLoaderWithReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(data_loader, 'CACHE_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        previous = set_provider(ReplayProvider())
+        self.addCleanup(set_provider, previous)
+
+    def test_fetch_functions_work_offline(self):
+        self.assertFalse(data_loader.fetch_stock_data("AAA.NS", period="1y").empty)
+        self.assertEqual(list(data_loader.fetch_sector_data(["AAA.NS", "BBB.NS"]).columns), ["AAA.NS", "BBB.NS"])
+        self.assertEqual(data_loader.fetch_fundamentals("AAA.NS")["currency"], "INR")
+        self.assertEqual(data_loader.fetch_stock_news("AAA.NS")[0]["publisher"], "Replay Wire")
+        self.assertEqual(len(data_loader.fetch_nifty50_ticker_data()), 50)
+
+    def test_intraday_bars_poll_only_new_minutes(self):
+        provider = ReplayProvider()
+        set_provider(provider)
+        with mock.patch.object(data_loader, 'intraday_feeds', data_loader.FeedRegistry()):
+            first = data_loader.fetch_intraday_data("AAA.NS", interval="5m")
+            self.assertFalse(first.empty)
+            self.assertTrue((first.index.to_series().diff().dropna() >= pd.Timedelta("5min")).all())
+
+            with mock.patch.object(provider, 'download', wraps=provider.download) as download:
+                data_loader.fetch_intraday_data("AAA.NS", interval="1m")
+                self.assertEqual(download.call_count, 0)
+                with mock.patch.object(data_loader, 'INTRADAY_REFRESH_INTERVAL', 0):
+                    data_loader.fetch_intraday_data("AAA.NS", interval="15m")
+                self.assertEqual(download.call_count, 1)
+                self.assertIsNotNone(download.call_args.kwargs['start'])
+
+
+class TestYFinanceProvider(unittest.TestCase):
+    def test_intraday_start_keeps_the_minute(self):
+        last_bar = pd.Timestamp("2024-03-04 11:42", tz="Asia/Kolkata")
+        with mock.patch("yfinance.download", return_value=pd.DataFrame()) as download:
+            YFinanceProvider().download("TCS.NS", start=last_bar, interval="1m")
+            self.assertEqual(download.call_args.kwargs['start'], last_bar.to_pydatetime())
+            YFinanceProvider().download("TCS.NS", start=last_bar)
+            self.assertEqual(download.call_args.kwargs['start'], "2024-03-04")
+
+
+if __name__ == '__main__':
+    unittest.main()
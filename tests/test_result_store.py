@@ -0,0 +1,100 @@
+import unittest
+from unittest import mock
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import data_loader
+from result_store import ResultStore
+
+
+def _compute_in_process(cache_dir, barrier, queue):
+    """Worker: computes a slow result in its own store and reports when it ran."""
+    data_loader.CACHE_DIR = cache_dir
+    store = ResultStore("test")
+
+    def compute():
+        started = time.time()
+        time.sleep(0.5)
+        return started, time.time()
+
+    barrier.wait()
+    queue.put(store.get_or_compute("TCS.NS", compute))
+
+
+class TestResultStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(data_loader, 'CACHE_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_callers_compute_once(self):
+        store = ResultStore("test")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"df": "prices"}
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(lambda _: store.get_or_compute("TCS.NS", compute), range(5)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(store.stats["misses"], 1)
+        # Stored values are returned without computing again
+        self.assertIs(store.get_or_compute("TCS.NS", compute), results[0])
+        self.assertEqual(len(calls), 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        store = ResultStore("test", max_entries=2)
+        store.put("a", 1)
+        store.put("b", 2)
+        store.get("a")
+        store.put("c", 3)
+
+        self.assertEqual(store.get("a"), 1)
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("c"), 3)
+
+    def test_failed_computation_is_not_stored(self):
+        store = ResultStore("test")
+        failing = threading.Event()
+
+        def compute():
+            if not failing.is_set():
+                failing.set()
+                raise ValueError("provider down")
+            return {"df": "prices"}
+
+        with self.assertRaises(ValueError):
+            store.get_or_compute("TCS.NS", compute)
+        self.assertEqual(store.get_or_compute("TCS.NS", compute), {"df": "prices"})
+
+    def test_processes_do_not_wait_for_each_other(self):
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(2)
+        queue = context.Queue()
+        workers = [context.Process(target=_compute_in_process, args=(self.tmp.name, barrier, queue))
+                   for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        runs = sorted(queue.get(timeout=30) for _ in workers)
+        for worker in workers:
+            worker.join(30)
+        # Each process computes its own copy, the second without waiting for the first to finish
+        self.assertLess(runs[1][0], runs[0][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from providers import ReplayProvider
+from risk import (portfolio_returns, covariance, historical_var, parametric_var, monte_carlo_returns,
+                  monte_carlo_var, portfolio_risk)
+
+TICKERS = ["AAA.NS", "BBB.NS", "CCC.NS", "DDD.NS"]
+
+
+class TestRisk(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.prices = ReplayProvider().download(TICKERS, period="3y")['Adj Close']
+
+    def test_portfolio_returns_and_covariance(self):
+        weights = {"AAA.NS": 2, "BBB.NS": 1, "CCC.NS": 1}
+        returns = portfolio_returns(self.prices, weights)
+        expected = self.prices.pct_change().dropna() @ pd.Series([0.5, 0.25, 0.25, 0.0], index=TICKERS)
+        pd.testing.assert_series_equal(returns, expected, check_names=False)
+        pd.testing.assert_frame_equal(covariance(self.prices, annualise=True),
+                                      self.prices.pct_change().dropna().cov() * 252)
+        with self.assertRaises(ValueError):
+            portfolio_returns(self.prices, {"ZZZ.NS": 1})
+
+    def test_historical_and_parametric_var(self):
+        returns = portfolio_returns(self.prices)
+        var, cvar = historical_var(returns, 0.99)
+        self.assertAlmostEqual(var, -np.quantile(returns, 0.01))
+        self.assertAlmostEqual(cvar, -returns[returns <= -var].mean())
+
+        weekly = (1 + returns).rolling(5).apply(np.prod, raw=True).dropna() - 1
+        self.assertAlmostEqual(historical_var(returns, 0.95, horizon=5)[0], -np.quantile(weekly, 0.05))
+
+        var, cvar = parametric_var(0.0, 0.01, 0.95)
+        self.assertAlmostEqual(var, 0.0164485, places=6)
+        self.assertAlmostEqual(cvar, 0.0206271, places=6)
+        self.assertAlmostEqual(parametric_var(0.001, 0.01, 0.95, horizon=4)[0], 0.02 * 1.6448536 - 0.004, places=6)
+
+    def test_monte_carlo_is_reproducible_across_workers(self):
+        mean = np.array([0.0005, 0.0002])
+        cov = np.array([[1e-4, 5e-5], [5e-5, 2e-4]])
+        weights = np.array([0.6, 0.4])
+        single = monte_carlo_returns(mean, cov, weights, paths=25_000, seed=7, workers=1, chunk_paths=4_000)
+        pooled = monte_carlo_returns(mean, cov, weights, paths=25_000, seed=7, workers=2, chunk_paths=4_000)
+        self.assertEqual(single.shape, (25_000,))
+        np.testing.assert_array_equal(single, pooled)
+        self.assertFalse(np.array_equal(single, monte_carlo_returns(mean, cov, weights, paths=25_000, seed=8,
+                                                                    workers=1, chunk_paths=4_000)))
+
+        # Log-normal paths of small daily moves are close to the normal model
+        std = np.sqrt(weights @ cov @ weights)
+        simulated = monte_carlo_returns(mean, cov, weights, paths=200_000, horizon=5, seed=1, workers=1)
+        self.assertAlmostEqual(simulated.std(), std * np.sqrt(5), delta=std * 0.05)
+        np.testing.assert_allclose(historical_var(simulated, 0.95),
+                                   parametric_var(weights @ mean, std, 0.95, horizon=5), rtol=0.05)
+
+        # Duplicate assets leave a singular covariance
+        duplicated = np.block([[cov, cov], [cov, cov]])
+        self.assertTrue(np.isfinite(monte_carlo_returns(np.tile(mean, 2), duplicated, np.full(4, 0.25),
+                                                        paths=1000, seed=1, workers=1)).all())
+
+    def test_portfolio_risk_table(self):
+        table = portfolio_risk(self.prices, confidence=0.95, horizon=1, paths=50_000, seed=3, workers=1)
+        self.assertEqual(list(table.index), ['Historical', 'Parametric', 'Monte Carlo'])
+        self.assertEqual(list(table.columns), ['VaR', 'CVaR'])
+        self.assertTrue((table['CVaR'] > table['VaR']).all())
+        np.testing.assert_allclose(table['VaR'], table.loc['Parametric', 'VaR'], rtol=0.15)
+        self.assertEqual(monte_carlo_var(self.prices, paths=10_000, seed=3, workers=1),
+                         monte_carlo_var(self.prices, paths=10_000, seed=3, workers=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
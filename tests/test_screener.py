@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import calculate_technical_indicators
+from providers import ReplayProvider
+from screener import compile_condition, screen, load_universe, ScreenerError
+from universe import UniversePanel, analyze_universe
+
+TICKERS = ["AAA.NS", "BBB.NS", "CCC.NS", "DDD.NS", "EEE.NS"]
+
+
+class TestScreener(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        data = ReplayProvider().download(TICKERS, period="2y")
+        cls.panel = analyze_universe(UniversePanel.from_download(data, TICKERS))
+        cls.frames = {}
+        for ticker in TICKERS:
+            frame = pd.DataFrame({field: data[field][ticker] for field in ('Adj Close', 'High', 'Volume')})
+            cls.frames[ticker] = calculate_technical_indicators(frame)
+
+    def assertMatchesPandas(self, text, reference):
+        matches = compile_condition(text).evaluate(self.panel)
+        for row, ticker in enumerate(TICKERS):
+            expected = reference(self.frames[ticker]).fillna(False).to_numpy(dtype=bool)
+            np.testing.assert_array_equal(matches[row], expected, err_msg=f"{text} {ticker}")
+
+    def test_conditions_match_per_ticker_pandas(self):
+        self.assertMatchesPandas(
+            "RSI < 30 and MACD crosses above Signal_Line",
+            lambda df: (df['RSI'] < 30) & (df['MACD'] > df['Signal_Line'])
+            & (df['MACD'].shift() <= df['Signal_Line'].shift()))
+        self.assertMatchesPandas(
+            "close above SMA_200 with volume > 2x avg(volume, 20)",
+            lambda df: (df['Adj Close'] > df['SMA_200']) & (df['Volume'] > 2 * df['Volume'].rolling(20).mean()))
+        self.assertMatchesPandas(
+            "change(close, 20) > 10 or not (rsi between 40 and 60)",
+            lambda df: ((df['Adj Close'].pct_change(20) * 100 > 10)
+                        | ~((df['RSI'] >= 40) & (df['RSI'] <= 60))))
+        self.assertMatchesPandas(
+            "high >= max(high, 20) and rsi(close, 7) > 60 and std(return, 10) * 100 < 3",
+            lambda df: (df['High'] >= df['High'].rolling(20).max())
+            & (100 - 100 / (1 + df['Adj Close'].diff().clip(lower=0).rolling(7).mean()
+                            / (-df['Adj Close'].diff().clip(upper=0)).rolling(7).mean()) > 60)
+            & (df['Adj Close'].pct_change().rolling(10).std() * 100 < 3))
+
+    def test_screen_reports_latest_matches(self):
+        result = screen(self.panel, "RSI > 0")
+        self.assertEqual(list(result.index), TICKERS)
+        self.assertEqual(list(result.columns), ['Adj Close', 'RSI', 'Since'])
+        np.testing.assert_allclose(result['RSI'], [self.frames[t]['RSI'].iloc[-1] for t in TICKERS])
+
+        crossed = screen(self.panel, "close crosses above SMA_50")
+        for ticker, since in crossed['Since'].items():
+            # A cross only lasts one bar
+            self.assertEqual(since, self.panel.index[-1], ticker)
+        self.assertTrue(screen(self.panel, "RSI < 0").empty)
+
+    def test_errors_point_at_the_problem(self):
+        for text, message in [
+            ("RSI <", "Expected a value at 6"),
+            ("RSI", "is a value, not a condition"),
+            ("foo > 1", "Unknown field 'foo' at 1"),
+            ("avg(close) > 1", "needs a window"),
+            ("RSI < 30 or MACD", "'or' needs conditions"),
+            ("(RSI < 30", "Expected ')'"),
+            ("RSI # 3", "Unexpected character at 5"),
+            ("RSI < 30 > 2", "Unexpected '>' at 10"),
+            ("", "Enter a condition"),
+        ]:
+            with self.assertRaises(ScreenerError, msg=text) as context:
+                compile_condition(text)
+            self.assertIn(message, str(context.exception))
+
+    def test_universe_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write("tcs.ns\nINFY.NS\n\nTCS.NS\n")
+        try:
+            self.assertEqual(load_universe(f.name), ["TCS.NS", "INFY.NS"])
+        finally:
+            os.remove(f.name)
+        self.assertIn("RELIANCE.NS", load_universe())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from sectors import load_sectors, sector_universe, MARKET_INDEX
+
+
+class TestSectors(unittest.TestCase):
+    def test_ticker_maps_to_its_peers(self):
+        universe = sector_universe("infy.ns", load_sectors())
+        self.assertEqual(universe["sector"], "IT")
+        self.assertEqual(universe["tickers"][0], "INFY.NS")
+        self.assertIn("TCS.NS", universe["peers"])
+        self.assertNotIn("INFY.NS", universe["peers"])
+
+    def test_unknown_ticker_is_compared_with_the_market(self):
+        universe = sector_universe("ZOMATO.NS", load_sectors())
+        self.assertIsNone(universe["sector"])
+        self.assertEqual(universe["index"], MARKET_INDEX)
+        self.assertEqual(universe["tickers"], ["ZOMATO.NS"])
+
+    def test_sectors_from_config_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sectors.json")
+            with open(path, "w") as f:
+                json.dump({"Cement": {"tickers": ["ultracemco.ns", "GRASIM.NS"]}}, f)
+            sectors = load_sectors(path)
+
+        self.assertEqual(list(sectors), ["Cement"])
+        universe = sector_universe("GRASIM.NS", sectors)
+        self.assertEqual(universe["peers"], ["ULTRACEMCO.NS"])
+        # Sectors without an index are compared with the market
+        self.assertEqual(universe["index"], MARKET_INDEX)
+
+
+if __name__ == '__main__':
+    unittest.main()
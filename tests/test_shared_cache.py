@@ -0,0 +1,106 @@
+import unittest
+from unittest import mock
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import data_loader
+from providers import ReplayProvider, set_provider
+from shared_cache import SharedCache
+
+
+def _write_from_other_process(path):
+    SharedCache(path).set("news", "TCS.NS", [{"title": "From another worker"}])
+
+
+class TestSharedCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "cache.sqlite3")
+
+    def test_ttl_per_namespace(self):
+        cache = SharedCache(self.path, ttls={"news": 0.05, "fundamentals": 60})
+        cache.set("news", "TCS.NS", ["headline"])
+        cache.set("fundamentals", "TCS.NS", {"trailingPE": 30.5})
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("news", "TCS.NS"))
+        self.assertEqual(cache.get("fundamentals", "TCS.NS"), {"trailingPE": 30.5})
+
+        stats = cache.stats()
+        self.assertEqual((stats["news"]["hits"], stats["news"]["misses"]), (0, 1))
+        self.assertEqual(stats["fundamentals"]["hits"], 1)
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        cache = SharedCache(self.path, max_entries=2, ttls={"news": 60})
+        cache.set("news", "A", [1])
+        cache.set("news", "B", [2])
+        cache.get("news", "A")  # B is now least recently used
+        time.sleep(0.01)
+        cache.set("news", "C", [3])
+        self.assertIsNone(cache.get("news", "B"))
+        self.assertEqual(cache.get("news", "A"), [1])
+        self.assertEqual(cache.stats()["news"]["evictions"], 1)
+
+        small = SharedCache(os.path.join(self.tmp.name, "small.sqlite3"), max_bytes=30, ttls={"news": 60})
+        small.set("news", "A", "x" * 20)
+        small.set("news", "B", "y" * 20)
+        self.assertIsNone(small.get("news", "A"))
+        self.assertEqual(small.stats()["news"]["entries"], 1)
+
+    def test_entries_are_shared_between_processes(self):
+        SharedCache(self.path)
+        worker = multiprocessing.get_context("spawn").Process(target=_write_from_other_process, args=(self.path,))
+        worker.start()
+        worker.join(30)
+        self.assertEqual(SharedCache(self.path).get("news", "TCS.NS"), [{"title": "From another worker"}])
+
+
+class TestCachedFetchers(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(data_loader, 'CACHE_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.provider = ReplayProvider()
+        previous = set_provider(self.provider)
+        self.addCleanup(set_provider, previous)
+
+    def test_repeat_clicks_hit_the_cache(self):
+        first = data_loader.fetch_fundamentals("TCS.NS")
+        self.assertEqual(data_loader.fetch_fundamentals("TCS.NS"), first)
+        data_loader.fetch_stock_news("TCS.NS")
+        data_loader.fetch_stock_news("TCS.NS")
+        self.assertEqual(self.provider.calls["info"], 1)
+        self.assertEqual(self.provider.calls["news"], 1)
+        self.assertEqual(data_loader.shared_cache_stats()["news"]["hits"], 1)
+
+    def test_stale_quote_refreshes_fundamentals(self):
+        data_loader.fetch_fundamentals("TCS.NS")
+        cache = data_loader.get_data_cache()
+        cache.set("quote", data_loader._cache_key("TCS.NS"), {"currentPrice": 1.0}, ttl=-1)
+        data_loader.fetch_fundamentals("TCS.NS")
+        self.assertEqual(self.provider.calls["info"], 2)
+
+    def test_failed_fetch_is_not_cached(self):
+        failing = ReplayProvider(failure_rate=1.0)
+        set_provider(failing)
+        self.assertEqual(data_loader.fetch_stock_news("TCS.NS"), [])
+        set_provider(self.provider)
+        self.assertTrue(data_loader.fetch_stock_news("TCS.NS"))
+
+    def test_empty_info_is_not_cached(self):
+        with mock.patch.object(self.provider, 'info', return_value={}):
+            self.assertEqual(data_loader.fetch_fundamentals("TCS.NS"), {})
+        self.assertIsNone(data_loader.get_data_cache().get("fundamentals", data_loader._cache_key("TCS.NS")))
+        self.assertTrue(data_loader.fetch_fundamentals("TCS.NS")["marketCap"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+
+
+class TestColdStart(unittest.TestCase):
+    def test_heavy_modules_are_not_imported_with_app(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = dict(os.environ, STOCK_DATA_PROVIDER='replay', STOCK_CACHE_DIR=cache_dir,
+                       TAPE_REFRESH_INTERVAL='0')
+            code = ("import sys, app; "
+                    "print('eager:' + ','.join(m for m in ('scipy.signal', 'sklearn', 'yfinance', 'plotly.express', 'rich') "
+                    "if m in sys.modules))")
+            result = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, env=env,
+                                    capture_output=True, text=True, check=True)
+        self.assertIn('eager:', result.stdout)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'eager:')
+
+    def test_tape_refresher_starts_with_first_request(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = dict(os.environ, STOCK_DATA_PROVIDER='replay', STOCK_CACHE_DIR=cache_dir,
+                       TAPE_REFRESH_INTERVAL='60')
+            code = ("import threading, app; "
+                    "running = lambda: any(t.name == 'tape-refresher' for t in threading.enumerate()); "
+                    "print('imported:', running()); "
+                    "app.server.test_client().get('/cache-stats'); "
+                    "print('served:', running())")
+            result = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, env=env,
+                                    capture_output=True, text=True, check=True)
+        lines = result.stdout.strip().splitlines()
+        self.assertIn('imported: False', lines)
+        self.assertIn('served: True', lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
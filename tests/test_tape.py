@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+import fcntl
+import os
+import sys
+import tempfile
+import time
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import data_loader
+import tape
+from providers import ReplayProvider, set_provider
+
+
+class TestTapeRefresh(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(data_loader, 'CACHE_DIR', self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        previous = set_provider(ReplayProvider())
+        self.addCleanup(set_provider, previous)
+
+    def test_refresh_writes_shared_snapshot_once(self):
+        self.assertIsNone(tape.read_tape_snapshot())
+        with mock.patch.object(data_loader, 'fetch_nifty50_ticker_data',
+                               wraps=data_loader.fetch_nifty50_ticker_data) as fetch:
+            snapshot = tape.refresh_tape(max_age=60)
+            self.assertEqual(len(snapshot["items"]), 50)
+            # A fresh snapshot is served without downloading again
+            self.assertEqual(tape.refresh_tape(max_age=60), snapshot)
+            self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(tape.read_tape_snapshot(), snapshot)
+
+    def test_stale_snapshot_kept_when_refresh_fails(self):
+        stale = tape.write_tape_snapshot([{"symbol": "TCS", "price": "1.00", "change": "+0.00%"}],
+                                         fetched_at=time.time() - 3600)
+        with mock.patch.object(data_loader, 'fetch_nifty50_ticker_data', return_value=[]):
+            self.assertEqual(tape.refresh_tape(max_age=60), stale)
+
+    def test_refresh_skipped_while_another_worker_holds_lock(self):
+        lock_path = tape._snapshot_path() + ".lock"
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with open(lock_path, "w") as held:
+            fcntl.flock(held, fcntl.LOCK_EX)
+            with mock.patch.object(data_loader, 'fetch_nifty50_ticker_data') as fetch:
+                self.assertIsNone(tape.refresh_tape(max_age=60))
+                fetch.assert_not_called()
+
+    def test_refresher_fills_snapshot_in_background(self):
+        refresher = tape.TapeRefresher(interval=60).start()
+        self.addCleanup(refresher.stop, 5)
+        deadline = time.monotonic() + 10
+        while tape.read_tape_snapshot() is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertIsNotNone(tape.read_tape_snapshot())
+
+
+if __name__ == '__main__':
+    unittest.main()
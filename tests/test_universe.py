@@ -0,0 +1,54 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from analysis import analyze
+from providers import ReplayProvider
+from universe import UniversePanel, analyze_universe, ticker_tape_items
+
+
+class TestUniversePanel(unittest.TestCase):
+    def setUp(self):
+        self.tickers = ["AAA.NS", "BBB.NS", "CCC.NS"]
+        self.data = ReplayProvider().download(self.tickers, period="2y")
+
+    def test_batch_matches_single_ticker_analysis(self):
+        panel = analyze_universe(UniversePanel.from_download(self.data, self.tickers))
+        for ticker in self.tickers:
+            single = analyze(self.data.xs(ticker, axis=1, level=1))
+            for name in ['Daily Return', 'RollingVol_30', 'RollingVol_90', 'SMA_50', 'SMA_200',
+                         'RSI', 'MACD', 'Signal_Line', 'Volume_MA20']:
+                np.testing.assert_allclose(panel.series(ticker, name), single[name],
+                                           rtol=1e-9, atol=1e-12, err_msg=f"{ticker} {name}")
+
+    def test_missing_ticker_and_late_listing(self):
+        data = self.data.copy()
+        data.loc[data.index[:100], ('Adj Close', 'BBB.NS')] = np.nan
+        panel = analyze_universe(UniversePanel.from_download(data, self.tickers + ["ZZZ.NS"]))
+
+        self.assertEqual(panel['SMA_50'].shape, (4, len(data)))
+        self.assertTrue(np.isnan(panel.series("BBB.NS", 'SMA_50').iloc[:149]).all())
+        self.assertFalse(np.isnan(panel.series("BBB.NS", 'SMA_50').iloc[149]))
+
+        snapshot = panel.snapshot(['Adj Close', 'RSI'])
+        self.assertEqual(list(snapshot.index), self.tickers + ["ZZZ.NS"])
+        self.assertTrue(snapshot.loc["ZZZ.NS"].isna().all())
+        self.assertEqual(snapshot.loc["AAA.NS", 'Adj Close'], data[('Adj Close', 'AAA.NS')].iloc[-1])
+
+    def test_ticker_tape_items(self):
+        index = pd.DatetimeIndex(['2024-01-02'])
+        data = pd.concat({'Open': pd.DataFrame({'AAA.NS': [100.0], 'BBB.NS': [50.0]}, index=index),
+                          'Close': pd.DataFrame({'AAA.NS': [101.0], 'BBB.NS': [np.nan]}, index=index)},
+                         axis=1)
+        items = ticker_tape_items(UniversePanel.from_download(data))
+        self.assertEqual(items, [{"symbol": "AAA", "price": "101.00", "change": "+1.00%"}])
+
+
+if __name__ == '__main__':
+    unittest.main()